@@ -0,0 +1,173 @@
+"""
+Benchmark admission control jalur tulis pada beban 10x kapasitas.
+
+Kapasitas penulis diukur dulu (pemesanan berurutan, satu thread). Lalu
+request pemesanan datang open-loop (jadwal tetap, tidak menunggu jawaban)
+dengan laju 10x kapasitas selama beberapa detik, dalam dua mode:
+- sqlite_lock: langsung ke BookingModel, semua thread berebut write lock SQLite
+- admission: lewat booking_service (antrean terbatas, tolak cepat, adil per pengguna)
+Request dijalankan oleh 8 worker thread dengan antrean tak terbatas, sama
+seperti waitress (python -m server --threads 8).
+Satu pengguna "agresif" mengirim 30% request untuk melihat keadilan giliran.
+Dilaporkan goodput, penolakan, error, p50/p99 per detik kedatangan, dan
+porsi pengguna agresif di antara request yang dilayani.
+
+Jalankan dari root repo:
+    python -m benchmarks.bench_admission
+"""
+
+import os
+import json
+import time
+import uuid
+import random
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import models
+from models import init_db, get_db, BookingModel
+from utils import booking_service
+from utils.admission import Overloaded
+from utils.catalog import get_catalog, ticket_price
+
+USERS = 100
+GREEDY_SHARE = 0.3
+OVERLOAD = 10
+WORKERS = 8
+ALL_SEATS = [f"{chr(65 + row)}{col + 1}" for row in range(10) for col in range(10)]
+
+
+def percentile(samples, pct):
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return round(ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))], 2)
+
+
+def seed_users():
+    conn = get_db()
+    conn.executemany(
+        "INSERT INTO users (nama, username, password, usia, saldo) VALUES (?, ?, ?, ?, ?)",
+        [(f"Bench {i}", f"buyer{i}", "-", 20, 1_000_000_000) for i in range(USERS)] +
+        [("Greedy", "greedy", "-", 20, 1_000_000_000)]
+    )
+    conn.commit()
+    conn.close()
+
+
+class Requests:
+    """Pemesanan satu kursi unik per request (tanpa konflik kursi)"""
+
+    def __init__(self, prefix):
+        movie = get_catalog().movies[0]
+        self.prefix = prefix
+        self.base = {
+            "movie_title": movie["title"],
+            "cinema": "CGV Grand Indonesia",
+            "theater": "Theater 1",
+            "studio_type": "Regular",
+            "show_time": movie["schedule"][0],
+            "total_price": ticket_price(movie, "Regular"),
+        }
+        self.rng = random.Random(prefix)
+
+    def make(self, index):
+        username = "greedy" if self.rng.random() < GREEDY_SHARE else f"buyer{self.rng.randrange(USERS)}"
+        booking = dict(self.base, show_date=f"{self.prefix}-{index // 100}", seats=[ALL_SEATS[index % 100]])
+        return username, booking
+
+
+def measure_capacity(seconds=1.5):
+    requests = Requests("capacity")
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        username, booking = requests.make(count)
+        booking_service.create_booking(username, booking, str(uuid.uuid4()))
+        count += 1
+    return count / (time.perf_counter() - start)
+
+
+def run_overload(mode, rate, duration):
+    requests = Requests(mode)
+    results = []
+    lock = threading.Lock()
+
+    def handle(index, scheduled):
+        username, booking = requests.make(index)
+        key = str(uuid.uuid4())
+        try:
+            if mode == "admission":
+                success, _, _ = booking_service.create_booking(username, booking, key)
+            else:
+                success, _, _ = BookingModel.create_booking(username, booking, key)
+            outcome = "ok" if success else "error"
+        except Overloaded:
+            outcome = "rejected"
+        latency_ms = (time.perf_counter() - scheduled) * 1000
+        with lock:
+            results.append((scheduled, username, outcome, latency_ms))
+
+    executor = ThreadPoolExecutor(max_workers=WORKERS)
+    total = int(rate * duration)
+    start = time.perf_counter()
+    for index in range(total):
+        scheduled = start + index / rate
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        executor.submit(handle, index, scheduled)
+    executor.shutdown(wait=True)
+    elapsed = time.perf_counter() - start
+
+    ok = [r for r in results if r[2] == "ok"]
+    rejected = [r for r in results if r[2] == "rejected"]
+    per_second = []
+    for second in range(int(duration)):
+        window = [r[3] for r in ok if second <= r[0] - start < second + 1]
+        per_second.append({"second": second, "served": len(window),
+                           "p50_ms": percentile(window, 50), "p99_ms": percentile(window, 99)})
+    greedy_offered = sum(1 for r in results if r[1] == "greedy")
+    greedy_served = sum(1 for r in ok if r[1] == "greedy")
+    return {
+        "offered": len(results),
+        "offered_rps": round(len(results) / duration),
+        "served": len(ok),
+        "goodput_rps": round(len(ok) / elapsed, 1),
+        "rejected_503": len(rejected),
+        "errors": sum(1 for r in results if r[2] == "error"),
+        "drain_s": round(elapsed, 2),
+        "served_p50_ms": percentile([r[3] for r in ok], 50),
+        "served_p99_ms": percentile([r[3] for r in ok], 99),
+        "reject_p99_ms": percentile([r[3] for r in rejected], 99),
+        "p99_by_arrival_second": per_second,
+        "greedy_share_offered": round(greedy_offered / len(results), 3),
+        "greedy_share_served": round(greedy_served / len(ok), 3) if ok else None,
+    }
+
+
+def main(duration=3):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        models.DATABASE = os.path.join(tmp_dir, "bench_admission.db")
+        init_db()
+        models.enable_wal()
+        seed_users()
+
+        capacity = measure_capacity()
+        rate = capacity * OVERLOAD
+        report = {
+            "capacity_rps": round(capacity, 1),
+            "offered_rps": round(rate, 1),
+            "duration_s": duration,
+            "workers": WORKERS,
+        }
+        for mode in ("sqlite_lock", "admission"):
+            report[mode] = run_overload(mode, rate, duration)
+        report["queue"] = booking_service.write_queue_stats()
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
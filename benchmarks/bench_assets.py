@@ -0,0 +1,140 @@
+"""
+Benchmark penyajian poster lewat /api/assets ke 50 klien.
+
+Server waitress dijalankan di thread; 50 thread klien (koneksi keep-alive
+masing-masing) mengambil grid poster beberapa kali dalam tiga mode:
+- original: file poster asli
+- thumbnail: varian ?w=200 (dibuat sekali di disk lalu dipakai ulang)
+- revalidate: ?w=200 dengan If-None-Match (jawaban 304 tanpa body)
+Dilaporkan request/detik, MB/detik, p50/p99, serta cek Range (206).
+
+Jalankan dari root repo:
+    python -m benchmarks.bench_assets
+"""
+
+import os
+import json
+import time
+import logging
+import tempfile
+import threading
+import http.client
+
+from server.app import create_app
+import server.assets as assets_module
+from server.assets import ASSETS_DIR, IMAGE_TYPES
+
+CLIENTS = 50
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def poster_paths():
+    return sorted(
+        f"/api/assets/{name}" for name in os.listdir(ASSETS_DIR)
+        if os.path.splitext(name)[1].lower() in IMAGE_TYPES
+    )
+
+
+def run_clients(port, paths, rounds, query="", etags=None):
+    samples = []
+    totals = {"bytes": 0, "statuses": {}}
+    lock = threading.Lock()
+
+    def client():
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        local = []
+        local_bytes = 0
+        statuses = {}
+        for _ in range(rounds):
+            for path in paths:
+                headers = {"If-None-Match": etags[path]} if etags else {}
+                start = time.perf_counter()
+                conn.request("GET", path + query, headers=headers)
+                response = conn.getresponse()
+                body = response.read()
+                local.append((time.perf_counter() - start) * 1000)
+                local_bytes += len(body)
+                statuses[response.status] = statuses.get(response.status, 0) + 1
+        conn.close()
+        with lock:
+            samples.extend(local)
+            totals["bytes"] += local_bytes
+            for status, count in statuses.items():
+                totals["statuses"][status] = totals["statuses"].get(status, 0) + count
+
+    threads = [threading.Thread(target=client) for _ in range(CLIENTS)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return {
+        "requests": len(samples),
+        "requests_per_sec": round(len(samples) / elapsed),
+        "mb_per_sec": round(totals["bytes"] / elapsed / 1e6, 2),
+        "bytes_per_grid": totals["bytes"] // (CLIENTS * rounds),
+        "p50_ms": round(percentile(samples, 50), 2),
+        "p99_ms": round(percentile(samples, 99), 2),
+        "statuses": totals["statuses"],
+    }
+
+
+def fetch(port, path, headers=None):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    conn.request("GET", path, headers=headers or {})
+    response = conn.getresponse()
+    body = response.read()
+    conn.close()
+    return response, body
+
+
+def main(rounds=4):
+    from waitress.server import create_server
+    logging.getLogger("waitress").setLevel(logging.ERROR)
+
+    app = create_app()
+    server = create_server(app, host="127.0.0.1", port=0, threads=16, connection_limit=CLIENTS + 20)
+    port = server.effective_port
+    threading.Thread(target=server.run, daemon=True).start()
+
+    paths = poster_paths()
+    variant_dir = tempfile.TemporaryDirectory()
+    assets_module.VARIANT_DIR = variant_dir.name
+    try:
+        # Pembuatan varian pertama kali (cold) untuk seluruh grid
+        start = time.perf_counter()
+        etags = {path: fetch(port, path + "?w=200")[0].getheader("ETag") for path in paths}
+        first_variants_ms = (time.perf_counter() - start) * 1000
+
+        original = run_clients(port, paths, rounds)
+        thumbnail = run_clients(port, paths, rounds, "?w=200")
+        revalidate = run_clients(port, paths, rounds, "?w=200", etags)
+
+        response, body = fetch(port, paths[0], {"Range": "bytes=100-1099"})
+        range_check = {
+            "status": response.status,
+            "content_range": response.getheader("Content-Range"),
+            "bytes": len(body),
+        }
+    finally:
+        server.close()
+        variant_dir.cleanup()
+
+    print(json.dumps({
+        "clients": CLIENTS,
+        "posters": len(paths),
+        "first_variant_grid_ms": round(first_variants_ms, 1),
+        "original": original,
+        "thumbnail_w200": thumbnail,
+        "revalidate_304": revalidate,
+        "range": range_check,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Benchmark autentikasi API: token sesi vs verifikasi password per request.
+
+Mengukur request terautentikasi per detik untuk:
+- token sesi (GET /api/auth/me dengan Authorization: Bearer)
+- password per request (route khusus benchmark yang memanggil
+  UserModel.login_user, yaitu bcrypt, di setiap request)
+ditambah throughput SessionManager.verify mentah, penolakan token palsu,
+dan eviksi LRU tabel sesi.
+
+Jalankan dari root repo:
+    python -m benchmarks.bench_auth
+"""
+
+import os
+import json
+import time
+import tempfile
+
+from flask import jsonify, request
+
+import models
+from models import init_db, UserModel
+from server.app import create_app, bcrypt
+from utils.session import SessionManager, get_session_manager
+
+USERNAME = "bench_user"
+PASSWORD = "rahasia123"
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def timed_requests(send, count):
+    samples = []
+    start = time.perf_counter()
+    for _ in range(count):
+        t0 = time.perf_counter()
+        response = send()
+        samples.append((time.perf_counter() - t0) * 1000)
+        assert response.status_code == 200, response.status_code
+    elapsed = time.perf_counter() - start
+    return {
+        "requests": count,
+        "requests_per_sec": round(count / elapsed, 1),
+        "p50_ms": round(percentile(samples, 50), 3),
+        "p99_ms": round(percentile(samples, 99), 3),
+    }
+
+
+def make_app():
+    app = create_app()
+
+    @app.route("/bench/password-me", methods=["GET"])
+    def password_me():
+        auth = request.authorization
+        if auth is None:
+            return jsonify({"status": "error"}), 401
+        success, message, user = UserModel.login_user(auth.username, auth.password, bcrypt)
+        if not success:
+            return jsonify({"status": "error", "message": message}), 401
+        return jsonify({"status": "ok", "user": {"username": user["username"], "nama": user["nama"]}})
+
+    return app
+
+
+def bench_manager(count):
+    manager = SessionManager(max_sessions=1000)
+    tokens = [manager.create(f"user{i}")[0] for i in range(1000)]
+
+    start = time.perf_counter()
+    for i in range(count):
+        assert manager.verify(tokens[i % len(tokens)]) is not None
+    verify_rate = count / (time.perf_counter() - start)
+
+    # Token yang diubah satu karakter atau sudah logout harus ditolak
+    forged = tokens[0][:-1] + ("A" if tokens[0][-1] != "A" else "B")
+    assert manager.verify(forged) is None
+    manager.revoke(tokens[1])
+    assert manager.verify(tokens[1]) is None
+
+    # Melebihi kapasitas: sesi yang paling lama tidak dipakai dibuang
+    manager.verify(tokens[2])
+    for i in range(10):
+        manager.create(f"extra{i}")
+    assert manager.verify(tokens[2]) is not None
+    stats = manager.stats()
+    return {
+        "verify_per_sec": round(verify_rate),
+        "forged_rejected": True,
+        "lru_evicted": stats["evicted"],
+        "sessions": stats["sessions"],
+    }
+
+
+def main(token_requests=5000, password_requests=20):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        models.DATABASE = os.path.join(tmp_dir, "bench_auth.db")
+        init_db()
+        app = make_app()
+        UserModel.register_user("Bench", USERNAME, PASSWORD, 21, "Action", bcrypt)
+        client = app.test_client()
+
+        t0 = time.perf_counter()
+        login = client.post("/api/auth/login", json={"username": USERNAME, "password": PASSWORD})
+        login_ms = (time.perf_counter() - t0) * 1000
+        token = login.get_json()["token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        with_token = timed_requests(lambda: client.get("/api/auth/me", headers=headers), token_requests)
+        with_password = timed_requests(
+            lambda: client.get("/bench/password-me", auth=(USERNAME, PASSWORD)), password_requests
+        )
+        manager = bench_manager(200000)
+
+    print(json.dumps({
+        "login_ms": round(login_ms, 1),
+        "token": with_token,
+        "password_per_request": with_password,
+        "speedup": round(with_token["requests_per_sec"] / with_password["requests_per_sec"]),
+        "session_manager": manager,
+        "session_stats": get_session_manager().stats(),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
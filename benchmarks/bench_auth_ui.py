@@ -0,0 +1,154 @@
+"""
+Benchmark jeda frame GUI selama login/registrasi bcrypt.
+
+Timer Qt 16 ms (~60 fps) mencatat jarak antar tick selama:
+- login_sync: UserModel.login_user dipanggil di thread GUI (cara lama)
+- login_worker: AuthWorker.login (QThreadPool), GUI hanya menerima signal
+- bulk_thread / bulk_process: enrollment 16 pengguna lewat AuthWorker.register_many,
+  hash di thread worker vs di process pool
+Dilaporkan jeda frame terpanjang, jumlah frame > 50 ms dan lama operasi.
+
+Jalankan dari root repo:
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_auth_ui
+"""
+
+import os
+import json
+import time
+import tempfile
+
+from PyQt5.QtCore import QTimer, QEventLoop
+from PyQt5.QtWidgets import QApplication
+from flask_bcrypt import Bcrypt
+
+import models
+from models import init_db, UserModel
+from gui.auth_worker import AuthWorker
+from utils.password_hashing import shutdown_hash_pool
+
+FRAME_MS = 16
+STALL_MS = 50
+LOGINS = 5
+BULK_USERS = 16
+
+
+class FrameProbe:
+    """Mencatat jarak antar tick QTimer (jeda frame)"""
+
+    def __init__(self):
+        self.timer = QTimer()
+        self.timer.setInterval(FRAME_MS)
+        self.timer.timeout.connect(self._tick)
+        self.gaps = []
+        self._last = None
+
+    def _tick(self):
+        now = time.perf_counter()
+        if self._last is not None:
+            self.gaps.append((now - self._last) * 1000)
+        self._last = now
+
+    def start(self):
+        self.gaps = []
+        self._last = None
+        self.timer.start()
+
+    def stop(self):
+        self.timer.stop()
+        return {
+            "frames": len(self.gaps),
+            "max_gap_ms": round(max(self.gaps), 1) if self.gaps else None,
+            "stalls_over_50ms": sum(1 for gap in self.gaps if gap > STALL_MS),
+        }
+
+
+def run_event_loop_until(predicate, timeout_s=120):
+    loop = QEventLoop()
+    check = QTimer()
+    check.timeout.connect(lambda: predicate() and loop.quit())
+    check.start(5)
+    QTimer.singleShot(int(timeout_s * 1000), loop.quit)
+    loop.exec_()
+    check.stop()
+
+
+def measure(probe, start_work, is_done):
+    probe.start()
+    started = time.perf_counter()
+    QTimer.singleShot(50, start_work)
+    run_event_loop_until(is_done)
+    elapsed = time.perf_counter() - started - 0.05
+    # Beberapa frame setelah selesai agar jeda terakhir ikut tercatat
+    run_event_loop_until(lambda: False, 0.1)
+    result = probe.stop()
+    result["elapsed_ms"] = round(elapsed * 1000, 1)
+    return result
+
+
+def main():
+    app = QApplication.instance() or QApplication([])
+    bcrypt = Bcrypt()
+    bcrypt._log_rounds = 12
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        models.DATABASE = os.path.join(tmp_dir, "bench_auth_ui.db")
+        init_db()
+        UserModel.register_user("Bench", "bench", "rahasia123", 20, "Action", bcrypt)
+
+        probe = FrameProbe()
+        report = {"bcrypt_rounds": 12, "frame_interval_ms": FRAME_MS}
+
+        # Sebelum: login di thread GUI
+        done = []
+
+        def login_sync():
+            for _ in range(LOGINS):
+                UserModel.login_user("bench", "rahasia123", bcrypt)
+                app.processEvents()
+            done.append(True)
+
+        report["login_sync"] = measure(probe, login_sync, lambda: done)
+
+        # Sesudah: login di AuthWorker, satu per satu
+        worker = AuthWorker(bcrypt)
+        results = []
+
+        def next_login(*args):
+            if args:
+                results.append(args[0])
+            if len(results) < LOGINS:
+                worker.login("bench", "rahasia123")
+
+        worker.login_finished.connect(next_login)
+        report["login_worker"] = measure(probe, next_login, lambda: len(results) >= LOGINS)
+        report["login_worker"]["all_succeeded"] = all(results)
+
+        # Enrollment massal: hash di thread worker vs di process pool
+        for name, use_processes in (("bulk_thread", False), ("bulk_process", True)):
+            users = [
+                {"nama": f"Kiosk {i}", "username": f"{name}{i}", "password": f"pw{i}", "usia": 20,
+                 "genre_favorit": "Drama"}
+                for i in range(BULK_USERS)
+            ]
+            outcome = []
+            worker.bulk_register_finished.connect(lambda success, message, data: outcome.append(data))
+            report[name] = measure(probe, lambda: worker.register_many(users, use_processes), lambda: outcome)
+            report[name]["registered"] = len(outcome[0]["registered"]) if outcome and outcome[0] else 0
+            worker.bulk_register_finished.disconnect()
+
+        # Cancel: hasil login yang dibatalkan tidak boleh sampai ke jendela
+        late = []
+        worker.login_finished.disconnect()
+        worker.login_finished.connect(lambda *args: late.append(args))
+        worker.login("bench", "rahasia123")
+        worker.cancel()
+        run_event_loop_until(lambda: not worker._tasks, 10)
+        report["cancel"] = {"delivered_after_cancel": len(late), "busy": worker.is_busy()}
+
+        shutdown_hash_pool()
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
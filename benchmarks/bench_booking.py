@@ -0,0 +1,202 @@
+"""
+Benchmark pemesanan idempotent (reservasi + saldo + riwayat + tiket dalam satu transaksi).
+
+Beberapa thread pembeli memesan kursi acak pada sedikit jadwal sehingga
+sering berebut kursi yang sama. Setiap pemesanan yang berhasil dikirim
+ulang dengan idempotency key yang sama (simulasi retry setelah timeout)
+dan harus mendapat hasil yang sama tanpa potong saldo lagi. Diukur:
+- latensi p50/p99 lewat layanan in-process dan lewat POST /api/bookings
+- jumlah konflik kursi, replay, dan pengecekan invarian database
+
+Jalankan dari root repo:
+    python -m benchmarks.bench_booking
+"""
+
+import os
+import json
+import time
+import uuid
+import random
+import tempfile
+import threading
+
+from flask import Flask
+
+import models
+from models import init_db, get_db
+from utils.booking_service import create_booking
+from utils.catalog import get_catalog, ticket_price
+from utils.session import get_session_manager
+from server.bookings import bookings_bp
+
+START_SALDO = 10_000_000
+SHOW_TIMES = ["12:00", "15:00", "18:00"]
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def seed_users(count):
+    conn = get_db()
+    conn.executemany(
+        "INSERT INTO users (nama, username, password, usia, saldo) VALUES (?, ?, ?, ?, ?)",
+        [(f"Bench {i}", f"buyer{i}", "-", 20, START_SALDO) for i in range(count)]
+    )
+    conn.commit()
+    conn.close()
+
+
+def random_request(movie, rng):
+    seats = rng.sample([f"{chr(65 + r)}{c + 1}" for r in range(10) for c in range(10)], rng.randint(1, 3))
+    return {
+        "movie_id": movie["id"],
+        "movie_title": movie["title"],
+        "cinema": "CGV Grand Indonesia",
+        "theater": f"Theater {rng.randint(1, 2)}",
+        "studio_type": rng.choice(["Regular", "VIP"]),
+        "show_date": "19/03/2025",
+        "show_time": rng.choice(movie["schedule"][:len(SHOW_TIMES)]),
+        "seats": seats
+    }
+
+
+def run_buyers(buyers, attempts, book, label):
+    samples = []
+    counts = {"created": 0, "replayed": 0, "seats_taken": 0, "other_errors": 0, "replay_mismatch": 0}
+    lock = threading.Lock()
+
+    def buyer(index):
+        rng = random.Random(f"{label}-{index}")
+        username = f"buyer{index}"
+        local = []
+        local_counts = dict.fromkeys(counts, 0)
+        for _ in range(attempts):
+            request = random_request(rng.choice(movies), rng)
+            key = str(uuid.uuid4())
+            t0 = time.perf_counter()
+            status, result = book(username, request, key)
+            local.append((time.perf_counter() - t0) * 1000)
+            if status == "created":
+                local_counts["created"] += 1
+                # Retry dengan key yang sama harus mengembalikan hasil yang sama
+                t0 = time.perf_counter()
+                retry_status, retry = book(username, request, key)
+                local.append((time.perf_counter() - t0) * 1000)
+                if retry_status == "replayed" and retry["booking_id"] == result["booking_id"]:
+                    local_counts["replayed"] += 1
+                else:
+                    local_counts["replay_mismatch"] += 1
+            elif status == "seats_taken":
+                local_counts["seats_taken"] += 1
+            else:
+                local_counts["other_errors"] += 1
+        with lock:
+            samples.extend(local)
+            for name, value in local_counts.items():
+                counts[name] += value
+
+    catalog = get_catalog()
+    movies = [m for m in catalog.movies if len(m.get("schedule", [])) >= len(SHOW_TIMES)][:2]
+    threads = [threading.Thread(target=buyer, args=(i,)) for i in range(buyers)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    return {
+        "buyers": buyers,
+        "requests": len(samples),
+        "requests_per_sec": round(len(samples) / elapsed),
+        "p50_ms": round(percentile(samples, 50), 3),
+        "p99_ms": round(percentile(samples, 99), 3),
+        **counts
+    }
+
+
+def book_in_process(username, request, key):
+    movie = get_catalog().get_movie(request["movie_id"])
+    booking_data = dict(request)
+    booking_data["total_price"] = ticket_price(movie, request["studio_type"]) * len(request["seats"])
+    success, _, result = create_booking(username, booking_data, key)
+    if success:
+        return ("replayed" if result["replayed"] else "created"), result
+    return result["error"], result
+
+
+def make_http_booker():
+    app = Flask(__name__)
+    app.register_blueprint(bookings_bp)
+    local = threading.local()
+    tokens = {}
+
+    def book(username, request, key):
+        if not hasattr(local, "client"):
+            local.client = app.test_client()
+        if username not in tokens:
+            tokens[username] = get_session_manager().create(username)[0]
+        response = local.client.post("/api/bookings", json=request, headers={
+            "Authorization": f"Bearer {tokens[username]}",
+            "Idempotency-Key": key
+        })
+        body = response.get_json()
+        if response.status_code == 201:
+            return "created", body["booking"]
+        if response.status_code == 200:
+            return "replayed", body["booking"]
+        return body.get("error", str(response.status_code)), body
+
+    return book
+
+
+def check_invariants(buyers):
+    conn = get_db()
+    try:
+        double_sold = conn.execute("""
+            SELECT COUNT(*) FROM (
+                SELECT showtime_id, seats FROM issued_tickets
+                WHERE seats NOT LIKE '%,%'
+                GROUP BY showtime_id, seats HAVING COUNT(*) > 1
+            )
+        """).fetchone()[0]
+        bookings, booked_total = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(total_price), 0) FROM bookings"
+        ).fetchone()
+        history = conn.execute("SELECT COUNT(*) FROM transaction_history").fetchone()[0]
+        debited = conn.execute("SELECT ? - SUM(saldo) FROM users", (START_SALDO * buyers,)).fetchone()[0]
+        reserved = conn.execute("SELECT COUNT(*) FROM seat_reservations").fetchone()[0]
+    finally:
+        conn.close()
+    return {
+        "bookings": bookings,
+        "seats_reserved": reserved,
+        "double_sold_seats": double_sold,
+        "history_rows_match": history == bookings,
+        "debits_match_bookings": debited == booked_total,
+    }
+
+
+def main(buyers=16, attempts=40):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        models.DATABASE = os.path.join(tmp_dir, "bench_booking.db")
+        init_db()
+        models.enable_wal()
+        seed_users(buyers)
+
+        in_process = run_buyers(buyers, attempts, book_in_process, "service")
+        http = run_buyers(buyers, attempts, make_http_booker(), "http")
+        invariants = check_invariants(buyers)
+
+    print(json.dumps({
+        "in_process": in_process,
+        "http": http,
+        "invariants": invariants,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Benchmark waktu repaint per frame untuk grid 100 kartu film dashboard.
+
+Susunan meniru dashboard: kartu (AnimatedWidget dengan bayangan) di dalam
+frame rekomendasi yang juga berbayangan, di dalam QScrollArea 1280x800.
+Untuk setiap mode render (gui/shadows.py):
+- scroll: scrollbar digeser 40 px lalu viewport digambar ulang penuh
+- hover: Enter ke satu kartu lalu area kartu + bayangannya digambar ulang
+  (mode effects memulai animasi posisi, mode lite hanya mengganti tile glow)
+Juga dicatat biaya ganti mode saat berjalan (set_render_mode) termasuk
+membangun tile nine-patch pertama kali.
+
+Jalankan dari root repo:
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_card_render
+"""
+
+import os
+import json
+import time
+import tempfile
+
+from PyQt5.QtCore import QEvent
+from PyQt5.QtWidgets import QApplication, QFrame, QGridLayout, QScrollArea, QVBoxLayout, QWidget
+
+import models
+from models import init_db, MovieModel
+from gui import shadows
+from gui.dashboard_window import MovieCard
+from gui.shadows import attach_shadow, set_render_mode, RENDER_EFFECTS, RENDER_LITE
+from benchmarks.bench_auth_ui import run_event_loop_until
+
+CARDS = 100
+COLUMNS = 5
+SCROLL_STEP = 40
+SCROLL_FRAMES = 120
+HOVER_FRAMES = 60
+FRAME_BUDGET_MS = 16
+
+
+def percentile(samples, pct):
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return round(ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))], 2)
+
+
+def build_grid(movies):
+    scroll = QScrollArea()
+    scroll.setWidgetResizable(True)
+    scroll.resize(1280, 800)
+    scroll.setStyleSheet("QScrollArea { background-color: #0A0A0A; border: none; }")
+
+    content = QWidget()
+    content_layout = QVBoxLayout(content)
+    content_layout.setContentsMargins(30, 30, 30, 30)
+
+    rec_frame = QFrame()
+    rec_frame.setObjectName("rec_frame")
+    rec_frame.setStyleSheet("""
+        #rec_frame {
+            background-color: #151515;
+            border-radius: 15px;
+            padding: 30px;
+        }
+    """)
+    attach_shadow(rec_frame, blur_radius=20, y_offset=4, radius=15)
+    grid = QGridLayout(rec_frame)
+    grid.setSpacing(20)
+
+    cards = []
+    for index in range(CARDS):
+        card = MovieCard(movies[index % len(movies)])
+        grid.addWidget(card, index // COLUMNS, index % COLUMNS)
+        cards.append(card)
+
+    content_layout.addWidget(rec_frame)
+    scroll.setWidget(content)
+    return scroll, rec_frame, cards
+
+
+def scroll_frames(scroll):
+    bar = scroll.verticalScrollBar()
+    viewport = scroll.viewport()
+    samples = []
+    value = 0
+    for _ in range(SCROLL_FRAMES):
+        value = value + SCROLL_STEP if value + SCROLL_STEP <= bar.maximum() else 0
+        started = time.perf_counter()
+        bar.setValue(value)
+        viewport.repaint()
+        samples.append((time.perf_counter() - started) * 1000)
+    bar.setValue(0)
+    return samples
+
+
+def hover_frames(scroll, rec_frame, cards):
+    visible = [card for card in cards if not card.visibleRegion().isEmpty()]
+    samples = []
+    for index in range(HOVER_FRAMES):
+        card = visible[index % len(visible)]
+        area = card.geometry().adjusted(-30, -30, 30, 30)
+        started = time.perf_counter()
+        QApplication.sendEvent(card, QEvent(QEvent.Enter))
+        rec_frame.repaint(area)
+        samples.append((time.perf_counter() - started) * 1000)
+        QApplication.sendEvent(card, QEvent(QEvent.Leave))
+        # Animasi posisi tidak dibiarkan berjalan agar tata letak antar frame sama
+        for animation in card._animations.values():
+            animation.stop()
+        rec_frame.layout().invalidate()
+        rec_frame.repaint(area)
+    return samples
+
+
+def summary(samples):
+    return {
+        "p50_ms": percentile(samples, 50),
+        "p99_ms": percentile(samples, 99),
+        "max_ms": percentile(samples, 100),
+        "over_budget": sum(1 for sample in samples if sample > FRAME_BUDGET_MS),
+    }
+
+
+def main():
+    app = QApplication.instance() or QApplication([])
+    report = {"cards": CARDS}
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        models.DATABASE = os.path.join(tmp_dir, "bench_card_render.db")
+        init_db()
+        movies = MovieModel.get_all_movies()
+
+        set_render_mode(RENDER_EFFECTS)
+        scroll, rec_frame, cards = build_grid(movies)
+        scroll.show()
+        run_event_loop_until(lambda: False, 0.3)
+
+        for mode in (RENDER_EFFECTS, RENDER_LITE):
+            if mode != shadows.render_mode():
+                shadows._tiles.clear()
+                started = time.perf_counter()
+                set_render_mode(mode)
+                scroll.viewport().repaint()
+                report["switch_to_" + mode + "_ms"] = round((time.perf_counter() - started) * 1000, 2)
+            scroll_frames(scroll)  # pemanasan
+            report[mode] = {
+                "scroll": summary(scroll_frames(scroll)),
+                "hover": summary(hover_frames(scroll, rec_frame, cards)),
+            }
+        scroll.close()
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
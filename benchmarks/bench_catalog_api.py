@@ -0,0 +1,59 @@
+"""
+Benchmark REST API katalog: fetch penuh vs revalidasi dengan If-None-Match.
+
+Mensimulasikan kiosk yang mengecek ulang katalog (film, jadwal, menu)
+secara berkala dan melaporkan byte yang dikirim serta waktu per request
+untuk respons penuh (identity dan gzip) dan respons 304.
+
+Jalankan dari root repo:
+    python -m benchmarks.bench_catalog_api
+"""
+
+import json
+import time
+import statistics
+
+from server.app import create_app
+
+ROUTES = [
+    "/api/catalog/movies?per_page=100",
+    "/api/catalog/showtimes?per_page=100",
+    "/api/catalog/showtimes?city=Jakarta&page=2",
+    "/api/catalog/menu",
+]
+
+
+def timed_get(client, path, headers, rounds):
+    samples = []
+    response = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        response = client.get(path, headers=headers)
+        samples.append((time.perf_counter() - start) * 1000)
+    return response, round(statistics.median(samples), 3)
+
+
+def main(rounds=200):
+    app = create_app()
+    client = app.test_client()
+
+    results = {}
+    for path in ROUTES:
+        identity, identity_ms = timed_get(client, path, {}, rounds)
+        gzipped, gzip_ms = timed_get(client, path, {"Accept-Encoding": "gzip"}, rounds)
+        etag = gzipped.headers["ETag"]
+        not_modified, revalidate_ms = timed_get(
+            client, path, {"Accept-Encoding": "gzip", "If-None-Match": etag}, rounds)
+        assert not_modified.status_code == 304
+
+        results[path] = {
+            "identity": {"bytes": len(identity.data), "ms": identity_ms},
+            "gzip": {"bytes": len(gzipped.data), "ms": gzip_ms},
+            "not_modified": {"bytes": len(not_modified.data), "ms": revalidate_ms},
+        }
+
+    print(json.dumps({"rounds": rounds, "routes": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Benchmark repository async (thread DB) untuk GUI.
+
+- locked_db: koneksi lain memegang write lock SQLite selama 1,5 detik, lalu
+  GUI memotong saldo secara sinkron (cara lama) vs lewat AsyncRepository;
+  jeda frame diukur dengan timer Qt 16 ms
+- batching: 200 get_saldo untuk 10 pengguna dikirim bersamaan; dihitung
+  pemanggilan database yang benar-benar dijalankan dan lama totalnya
+- timeout: request yang antre di belakang penulisan yang tertahan lock
+  gagal cepat dengan TimeoutError tanpa dijalankan
+
+Jalankan dari root repo:
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_db_worker
+"""
+
+import os
+import json
+import time
+import sqlite3
+import tempfile
+import threading
+from concurrent.futures import wait
+
+from PyQt5.QtWidgets import QApplication
+
+import models
+from models import init_db, get_db, UserModel
+from gui.repository import AsyncRepository
+from utils.db_worker import DBWorker, DB_WORKER_REQUESTS
+from benchmarks.bench_auth_ui import FrameProbe, measure
+
+LOCK_SECONDS = 1.5
+USERS = 10
+READS = 200
+
+
+def seed_users():
+    conn = get_db()
+    conn.executemany(
+        "INSERT INTO users (nama, username, password, usia, saldo) VALUES (?, ?, ?, ?, ?)",
+        [(f"Bench {i}", f"user{i}", "-", 20, 1_000_000) for i in range(USERS)]
+    )
+    conn.commit()
+    conn.close()
+
+
+def hold_write_lock(seconds):
+    """Pegang write lock database dari koneksi lain (mis. proses server)"""
+    ready = threading.Event()
+
+    def holder():
+        conn = sqlite3.connect(models.DATABASE)
+        conn.execute("BEGIN IMMEDIATE")
+        ready.set()
+        time.sleep(seconds)
+        conn.rollback()
+        conn.close()
+
+    threading.Thread(target=holder, daemon=True).start()
+    ready.wait()
+
+
+def counted(result):
+    return DB_WORKER_REQUESTS.labels(result).value()
+
+
+def main():
+    app = QApplication.instance() or QApplication([])
+    report = {"lock_seconds": LOCK_SECONDS}
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        models.DATABASE = os.path.join(tmp_dir, "bench_db_worker.db")
+        init_db()
+        seed_users()
+        worker = DBWorker("bench-db-worker")
+        repository = AsyncRepository(worker)
+        probe = FrameProbe()
+
+        # Sebelum: potong saldo di thread GUI saat database terkunci
+        done = []
+
+        def sync_write():
+            hold_write_lock(LOCK_SECONDS)
+            done.append(UserModel.update_saldo("user0", -1000))
+
+        report["locked_db_sync"] = measure(probe, sync_write, lambda: done)
+
+        # Sesudah: lewat repository, GUI hanya menerima callback
+        results = []
+
+        def async_write():
+            hold_write_lock(LOCK_SECONDS)
+            repository.call(UserModel.update_saldo, "user0", -1000, on_result=results.append, timeout=10)
+
+        report["locked_db_async"] = measure(probe, async_write, lambda: results)
+        report["locked_db_async"]["write_succeeded"] = bool(results and results[0][0])
+
+        # Batching: bacaan identik yang datang bersamaan dijalankan sekali
+        executed_before = counted("ok")
+        coalesced_before = counted("coalesced")
+        started = time.perf_counter()
+        futures = [worker.submit(UserModel.get_saldo, f"user{i % USERS}", coalesce=True) for i in range(READS)]
+        wait(futures)
+        batched_ms = (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        for i in range(READS):
+            UserModel.get_saldo(f"user{i % USERS}")
+        sequential_ms = (time.perf_counter() - started) * 1000
+
+        report["batching"] = {
+            "requests": READS,
+            "db_calls_executed": counted("ok") - executed_before,
+            "coalesced": counted("coalesced") - coalesced_before,
+            "batched_ms": round(batched_ms, 1),
+            "sequential_ms": round(sequential_ms, 1),
+            "results_consistent": all(f.result() == 1_000_000 for f in futures[1:USERS]),
+        }
+
+        # Timeout: request di belakang penulisan yang menunggu lock
+        hold_write_lock(LOCK_SECONDS)
+        blocked = worker.submit(UserModel.update_saldo, "user1", 500, timeout=10)
+        time.sleep(0.05)
+        started = time.perf_counter()
+        late = worker.submit(UserModel.get_saldo, "user1", timeout=0.2)
+        try:
+            late.result()
+            timed_out = False
+        except TimeoutError:
+            timed_out = True
+        report["timeout"] = {
+            "timed_out": timed_out,
+            "returned_after_ms": round((time.perf_counter() - started) * 1000, 1),
+            "blocked_write_succeeded": blocked.result()[0],
+        }
+        worker.stop()
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
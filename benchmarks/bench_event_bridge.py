@@ -0,0 +1,151 @@
+"""
+Benchmark jembatan event antar proses (utils/event_bridge.py).
+
+Beberapa proses klien (kiosk tanpa GUI) masing-masing menjalankan
+EventBridge pada database yang sama, lalu proses penulis melakukan top up
+(seperti loket) dan pembelian tiket bergantian:
+- idle: waktu CPU proses klien per detik saat tidak ada perubahan (biaya
+  polling PRAGMA data_version)
+- lag: jeda dari commit di proses penulis sampai event diterima klien
+  (BalanceChanged lewat event bus, SeatsChanged lewat SeatHub)
+- stale: saldo terakhir yang dilihat klien dibanding saldo di database;
+  tanpa jembatan klien tetap memegang saldo saat login
+
+Jalankan dari root repo:
+    python -m benchmarks.bench_event_bridge
+"""
+
+import os
+import json
+import time
+import tempfile
+import multiprocessing
+
+import models
+from models import init_db, get_db, UserModel, BookingModel
+from utils.event_bus import EventBus
+from utils.event_bridge import EventBridge
+from utils.events import BalanceChanged
+from utils.helper import get_showtime_id
+from utils.seat_hub import get_seat_hub
+
+CLIENTS = 4
+WRITES = 40
+WRITE_GAP = 0.05
+IDLE_SECONDS = 2.0
+INITIAL_SALDO = 1_000_000
+USERNAME = "bench_bridge"
+BOOKING = {"movie_title": "Film Bench", "cinema": "CGV Grand Indonesia", "theater": "Theater 1",
+           "studio_type": "Regular", "show_date": "Hari 1", "show_time": "19:00", "total_price": 1}
+ALL_SEATS = [f"{chr(65 + row)}{col + 1}" for row in range(10) for col in range(10)]
+
+
+def percentile(samples, pct):
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return round(ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))], 2)
+
+
+def client(database, showtime_id, ready, stop, results):
+    """Satu proses kiosk: bridge + pelanggan saldo (event bus) dan kursi (SeatHub)"""
+    models.DATABASE = database
+    bus = EventBus("bench")
+    balances, seats = [], []
+    bus.subscribe(BalanceChanged, lambda event: balances.append((event.new_saldo, time.time())))
+    get_seat_hub().add_listener(
+        showtime_id, lambda _, deltas: seats.extend((seat, time.time()) for _, seat, _ in deltas)
+    )
+
+    bridge = EventBridge(bus)
+    bridge.start()
+    cpu_started, wall_started = time.process_time(), time.perf_counter()
+    ready.set()
+    time.sleep(IDLE_SECONDS)
+    idle_cpu = (time.process_time() - cpu_started) * 1000 / (time.perf_counter() - wall_started)
+    stop.wait()
+    bridge.stop()
+    results.put({"idle_cpu_ms_per_s": idle_cpu, "balances": balances, "seats": seats})
+
+
+def main():
+    report = {"clients": CLIENTS, "writes": WRITES}
+    context = multiprocessing.get_context("spawn")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        models.DATABASE = os.path.join(tmp_dir, "bench_bridge.db")
+        init_db()
+        models.enable_wal()
+        conn = get_db()
+        conn.execute("INSERT INTO users (nama, username, password, usia, saldo) VALUES (?, ?, ?, ?, ?)",
+                     ("Bench", USERNAME, "-", 20, INITIAL_SALDO))
+        conn.commit()
+        conn.close()
+        showtime_id = get_showtime_id(BOOKING)
+
+        ready = [context.Event() for _ in range(CLIENTS)]
+        stop = context.Event()
+        results = context.Queue()
+        processes = [
+            context.Process(target=client, args=(models.DATABASE, showtime_id, ready[i], stop, results))
+            for i in range(CLIENTS)
+        ]
+        for process in processes:
+            process.start()
+        for event in ready:
+            event.wait(30)
+        time.sleep(IDLE_SECONDS + 0.2)
+
+        # Top up (saldo selalu naik sehingga nilainya unik) dan pembelian satu kursi bergantian
+        balance_commits, seat_commits = {}, {}
+        for i in range(WRITES):
+            if i % 2 == 0:
+                _, _, new_saldo = UserModel.top_up(USERNAME, 1000 + i, "Cash")
+                balance_commits[new_saldo] = time.time()
+            else:
+                seat = ALL_SEATS[i]
+                success, _, result = BookingModel.create_booking(
+                    USERNAME, dict(BOOKING, seats=[seat]), f"bench-{i}"
+                )
+                committed = time.time()
+                seat_commits[seat] = committed
+                balance_commits[result["new_saldo"]] = committed
+            time.sleep(WRITE_GAP)
+        time.sleep(1.0)
+        stop.set()
+        received = [results.get(timeout=30) for _ in processes]
+        for process in processes:
+            process.join(timeout=10)
+
+        final_saldo = UserModel.get_saldo(USERNAME)
+
+    balance_lag = [(at - balance_commits[saldo]) * 1000
+                   for client_result in received for saldo, at in client_result["balances"]
+                   if saldo in balance_commits]
+    seat_lag = [(at - seat_commits[seat]) * 1000
+                for client_result in received for seat, at in client_result["seats"]
+                if seat in seat_commits]
+    report["idle_cpu_ms_per_s"] = round(max(r["idle_cpu_ms_per_s"] for r in received), 2)
+    report["balance"] = {
+        "delivered": len(balance_lag),
+        "expected": CLIENTS * WRITES,
+        "lag_p50_ms": percentile(balance_lag, 50),
+        "lag_p99_ms": percentile(balance_lag, 99),
+    }
+    report["seats"] = {
+        "delivered": len(seat_lag),
+        "expected": CLIENTS * len(seat_commits),
+        "lag_p50_ms": percentile(seat_lag, 50),
+        "lag_p99_ms": percentile(seat_lag, 99),
+    }
+    report["stale"] = {
+        "database_saldo": final_saldo,
+        "without_bridge": INITIAL_SALDO,
+        "with_bridge": sorted({r["balances"][-1][0] if r["balances"] else None for r in received},
+                              key=str),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Benchmark waktu penanganan event per pembelian di DashboardWindow.
+
+- legacy_chain: urutan panggilan rantai signal lama untuk satu pembelian
+  tiket (update_saldo dari tiga emit, handle_ticket_purchase dua kali karena
+  ticket_purchased tersambung dua kali, masing-masing add_transaction +
+  filter_transactions), dijalankan langsung pada halaman yang sama
+- event_bus: satu publish TicketPurchased lewat bus (saldo SYNC, riwayat
+  QUEUED); waktu di dalam publish (yang menahan pemanggil) dan total waktu
+  handler dari profil bus
+- duplicate: event yang sama dipublish dua kali hanya dicatat sekali
+
+Jalankan dari root repo:
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_event_bus
+"""
+
+import os
+import json
+import time
+import uuid
+import tempfile
+
+from PyQt5.QtWidgets import QApplication
+
+import models
+from models import init_db, get_db
+from gui.dashboard_window import DashboardWindow
+from gui.event_dispatch import get_gui_event_bus
+from utils.event_bus import Event
+from utils.events import TicketPurchased
+from utils.write_behind import get_write_behind
+from benchmarks.bench_auth_ui import run_event_loop_until
+
+USERNAME = "bench_events"
+PURCHASES = 20
+HISTORY_SIZE = 100
+
+
+def percentile(samples, pct):
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return round(ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))], 2)
+
+
+def make_event(i, saldo):
+    return TicketPurchased(
+        username=USERNAME, new_saldo=saldo, transaction_id=uuid.uuid4().hex, ticket_id=f"T{i:07d}",
+        movie_title=f"Film {i % 5}", cinema="CGV Grand Indonesia", theater="Theater 1",
+        studio_type="Regular", seats=[f"A{i % 10 + 1}"], show_date=f"Hari {i}", show_time="19:00",
+        total_price=50000
+    )
+
+
+def legacy_purchase(window, event):
+    """Panggilan yang dulu terjadi untuk satu pembelian lewat rantai signal"""
+    for _ in range(3):
+        window.update_saldo_display(event.new_saldo)
+    legacy_data = {
+        "type": "Tiket", "movie_title": event.movie_title, "total": -event.total_price,
+        "studio": event.studio_type, "theater": event.theater, "cinema": event.cinema,
+        "seats": ", ".join(event.seats), "show_date": event.show_date, "show_time": event.show_time,
+        "status": "Sukses", "timestamp": "01/01/2025 19:00", "transaction_id": event.transaction_id
+    }
+    for _ in range(2):
+        window.history_page.add_transaction(dict(legacy_data))
+        window.history_page.filter_transactions()
+
+
+def main():
+    app = QApplication.instance() or QApplication([])
+    report = {"purchases": PURCHASES, "history_size": HISTORY_SIZE}
+    history_file = os.path.join("data", "history", f"{USERNAME}.json")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        models.DATABASE = os.path.join(tmp_dir, "bench_events.db")
+        init_db()
+        conn = get_db()
+        conn.execute("INSERT INTO users (nama, username, password, usia, saldo) VALUES (?, ?, ?, ?, ?)",
+                     ("Bench", USERNAME, "-", 20, 10_000_000))
+        conn.commit()
+        conn.close()
+
+        window = DashboardWindow({"username": USERNAME, "nama": "Bench", "saldo": 10_000_000,
+                                  "usia": 20, "genre_favorit": "Action"})
+        bus = get_gui_event_bus()
+        run_event_loop_until(lambda: False, 0.5)
+        for i in range(HISTORY_SIZE):
+            window.history_page.transactions.append({
+                "type": "Top Up", "total": 10000, "status": "Sukses", "timestamp": "01/01/2025 10:00",
+                "transaction_id": f"seed-{i}", "payment_method": "Cash"
+            })
+        saldo = 10_000_000
+
+        legacy_ms = []
+        for i in range(PURCHASES):
+            saldo -= 50000
+            started = time.perf_counter()
+            legacy_purchase(window, make_event(i, saldo))
+            legacy_ms.append((time.perf_counter() - started) * 1000)
+        report["legacy_chain"] = {"p50_ms": percentile(legacy_ms, 50), "p99_ms": percentile(legacy_ms, 99)}
+
+        publish_ms, handler_ms = [], []
+        for i in range(PURCHASES):
+            saldo -= 50000
+            before = sum(row["total_ms"] for row in bus.stats())
+            event = make_event(PURCHASES + i, saldo)
+            started = time.perf_counter()
+            bus.publish(event)
+            publish_ms.append((time.perf_counter() - started) * 1000)
+            run_event_loop_until(
+                lambda: any(t.get("transaction_id") == event.transaction_id
+                            for t in window.history_page.transactions), 5)
+            handler_ms.append(sum(row["total_ms"] for row in bus.stats()) - before)
+        report["event_bus"] = {
+            "publish_p50_ms": percentile(publish_ms, 50),
+            "publish_p99_ms": percentile(publish_ms, 99),
+            "handlers_p50_ms": percentile(handler_ms, 50),
+            "handlers_p99_ms": percentile(handler_ms, 99),
+        }
+
+        # Event yang sama dua kali (mis. dua jalur publish): riwayat bertambah satu
+        count_before = len(window.history_page.transactions)
+        event = make_event(2 * PURCHASES, saldo)
+        first = bus.publish(event)
+        second = bus.publish(Event.from_dict(event.to_dict()))
+        run_event_loop_until(lambda: False, 0.2)
+        report["duplicate"] = {
+            "first_delivered": first,
+            "second_delivered": second,
+            "history_added": len(window.history_page.transactions) - count_before,
+        }
+        report["handler_profile"] = [row for row in bus.stats() if row["calls"]]
+
+        window.close()
+        get_write_behind().flush(timeout=5)
+        if os.path.exists(history_file):
+            os.remove(history_file)
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Benchmark validasi tiket di gate.
+
+Mengisi database sementara dengan tiket, lalu mengukur:
+- check-in langsung lewat TicketModel (latensi p50/p99, scan/detik)
+- check-in lewat endpoint Flask /api/gate/check-in dengan beberapa scanner paralel
+- snapshot Bloom filter (ukuran, lookup/detik, false positive rate)
+
+Jalankan dari root repo:
+    python -m benchmarks.bench_gate_scan
+"""
+
+import os
+import json
+import time
+import random
+import tempfile
+import threading
+
+from flask import Flask
+
+import models
+from models import TicketModel, init_db
+from utils.bloom import BloomFilter
+from utils.gate_auth import create_gate_token
+from utils.helper import get_showtime_id
+from utils.qr_payload import encode_ticket_payload
+from utils.ticket_renderer import new_ticket_id
+from server.gate import gate_bp
+
+BOOKING = {
+    "movie_title": "Inception",
+    "cinema": "CGV Grand Indonesia",
+    "theater": "Theater 1",
+    "show_date": "19/03/2025",
+    "show_time": "19:00",
+}
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def seed_tickets(count):
+    ticket_ids = set()
+    while len(ticket_ids) < count:
+        ticket_ids.add(new_ticket_id())
+    ticket_ids = list(ticket_ids)
+    tickets = [(ticket_id, f"{chr(65 + i % 10)}{i % 10 + 1}") for i, ticket_id in enumerate(ticket_ids)]
+    TicketModel.issue_tickets("bench", BOOKING, tickets)
+    return dict(tickets)
+
+
+def bench_direct(ticket_ids):
+    samples = []
+    start = time.perf_counter()
+    for ticket_id in ticket_ids:
+        t0 = time.perf_counter()
+        success, status, _ = TicketModel.check_in(ticket_id)
+        samples.append((time.perf_counter() - t0) * 1000)
+        assert success and status == "valid", status
+    elapsed = time.perf_counter() - start
+
+    # Scan ulang harus ditolak
+    assert TicketModel.check_in(ticket_ids[0])[1] == "used"
+    return {
+        "scans": len(ticket_ids),
+        "scans_per_sec": round(len(ticket_ids) / elapsed),
+        "p50_ms": round(percentile(samples, 50), 3),
+        "p99_ms": round(percentile(samples, 99), 3),
+    }
+
+
+def bench_http(ticket_ids, scanners, seats):
+    app = Flask(__name__)
+    app.register_blueprint(gate_bp)
+    headers = {"Authorization": f"Bearer {create_gate_token('BENCH')}"}
+
+    showtime_id = get_showtime_id(BOOKING)
+    # QR harus memuat jadwal dan kursi yang sama dengan tiket yang diterbitkan
+    payloads = {ticket_id: encode_ticket_payload(ticket_id, showtime_id, [seats[ticket_id]])
+                for ticket_id in ticket_ids}
+    chunks = [ticket_ids[i::scanners] for i in range(scanners)]
+    samples = [[] for _ in range(scanners)]
+    errors = []
+
+    def scanner(index):
+        client = app.test_client()
+        for ticket_id in chunks[index]:
+            payload = payloads[ticket_id]
+            t0 = time.perf_counter()
+            response = client.post("/api/gate/check-in", json={"payload": payload}, headers=headers)
+            samples[index].append((time.perf_counter() - t0) * 1000)
+            if response.status_code != 200:
+                errors.append(response.status_code)
+
+    threads = [threading.Thread(target=scanner, args=(i,)) for i in range(scanners)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    all_samples = [s for chunk in samples for s in chunk]
+    return {
+        "scanners": scanners,
+        "scans": len(all_samples),
+        "errors": len(errors),
+        "scans_per_sec": round(len(all_samples) / elapsed),
+        "p50_ms": round(percentile(all_samples, 50), 3),
+        "p99_ms": round(percentile(all_samples, 99), 3),
+    }
+
+
+def bench_bloom(valid_ids, probes):
+    start = time.perf_counter()
+    bloom = BloomFilter.from_items(valid_ids, 0.001)
+    snapshot = bloom.to_bytes()
+    build_ms = (time.perf_counter() - start) * 1000
+
+    restored = BloomFilter.from_bytes(snapshot)
+    assert all(ticket_id in restored for ticket_id in valid_ids)
+
+    valid_set = set(valid_ids)
+    unknown = []
+    while len(unknown) < probes:
+        ticket_id = new_ticket_id()
+        if ticket_id not in valid_set:
+            unknown.append(ticket_id)
+
+    start = time.perf_counter()
+    false_positives = sum(1 for ticket_id in unknown if ticket_id in restored)
+    elapsed = time.perf_counter() - start
+    return {
+        "items": len(valid_ids),
+        "snapshot_bytes": len(snapshot),
+        "build_ms": round(build_ms, 2),
+        "lookups_per_sec": round(probes / elapsed),
+        "false_positive_rate": round(false_positives / probes, 5),
+    }
+
+
+def main(tickets=20000, scanners=8):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        models.DATABASE = os.path.join(tmp_dir, "bench_gate.db")
+        init_db()
+
+        seats = seed_tickets(tickets)
+        ticket_ids = list(seats)
+        random.shuffle(ticket_ids)
+        half = len(ticket_ids) // 2
+        direct_ids, http_ids = ticket_ids[:half], ticket_ids[half:]
+
+        bloom = bench_bloom(TicketModel.get_valid_ticket_ids(), 50000)
+        direct = bench_direct(direct_ids)
+        http = bench_http(http_ids, scanners, seats)
+
+    print(json.dumps({
+        "tickets": tickets,
+        "direct_check_in": direct,
+        "http_check_in": http,
+        "bloom_snapshot": bloom,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
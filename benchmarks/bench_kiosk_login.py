@@ -0,0 +1,130 @@
+"""
+Benchmark login-sampai-interaktif untuk pengguna kiosk berikutnya.
+
+Diukur dari hasil login (user_data sudah ada, bcrypt tidak ikut dihitung)
+sampai dashboard tampil dan event loop Qt kembali memproses event:
+- rebuild: setiap login membuat DashboardWindow baru (cara lama), window
+  sebelumnya ditutup dan dihapus
+- kiosk: TIKET_KIOSK=1, satu dashboard dipakai ulang lewat open_dashboard/
+  set_user; pengguna pertama (membangun window) tidak dihitung
+
+Juga dicatat pertambahan widget Qt sejak login pertama (kebocoran per pengguna).
+
+Jalankan dari root repo:
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_kiosk_login
+"""
+
+import os
+import glob
+import json
+import time
+import tempfile
+
+from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import QApplication
+
+import models
+from models import init_db, get_db
+from gui import dashboard_window
+from gui.dashboard_window import open_dashboard, KIOSK_ENV
+from utils.write_behind import get_write_behind
+from benchmarks.bench_auth_ui import run_event_loop_until
+
+USERS = 100
+REBUILD_USERS = 15
+GENRES = ["Action", "Drama", "Sci-Fi", "Biography", "Action"]
+PREFIX = "zz_kiosk_"
+
+
+def percentile(samples, pct):
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return round(ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))], 2)
+
+
+def seed_users():
+    conn = get_db()
+    conn.executemany(
+        "INSERT INTO users (nama, username, password, usia, genre_favorit, saldo) VALUES (?, ?, ?, ?, ?, ?)",
+        [(f"Pelanggan {i}", f"{PREFIX}{i}", "-", 20 + i % 30, GENRES[i % len(GENRES)], 100000 + i)
+         for i in range(USERS)]
+    )
+    conn.commit()
+    rows = [dict(row) for row in conn.execute("SELECT * FROM users ORDER BY id")]
+    conn.close()
+    return rows
+
+
+def login_to_interactive(user_data, previous=None):
+    """Waktu (ms) dari hasil login sampai event loop berjalan lagi dengan dashboard tampil"""
+    ready = []
+    started = time.perf_counter()
+    dashboard = open_dashboard(dict(user_data))
+    dashboard.show()
+    if previous is not None and previous is not dashboard:
+        previous.close()
+        previous.deleteLater()
+    QTimer.singleShot(0, lambda: ready.append(time.perf_counter()))
+    run_event_loop_until(lambda: ready, 30)
+    return (ready[0] - started) * 1000, dashboard
+
+
+def run(users):
+    samples = []
+    dashboard = None
+    widgets_after_first = None
+    for index, user in enumerate(users):
+        elapsed, dashboard = login_to_interactive(user, dashboard)
+        if index > 0:
+            samples.append(elapsed)
+        else:
+            widgets_after_first = len(QApplication.allWidgets())
+        if dashboard_window.kiosk_mode():
+            # Logout kiosk: sesi dikosongkan, window disembunyikan
+            dashboard.food_page.clear_cart()
+            dashboard.history_page.clear_history()
+            dashboard.hide()
+    run_event_loop_until(lambda: False, 0.3)
+    return samples, dashboard, len(QApplication.allWidgets()) - widgets_after_first
+
+
+def main():
+    app = QApplication.instance() or QApplication([])
+    report = {"users": USERS}
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        models.DATABASE = os.path.join(tmp_dir, "bench_kiosk.db")
+        init_db()
+        users = seed_users()
+
+        os.environ[KIOSK_ENV] = "0"
+        samples, dashboard, _ = run(users[:REBUILD_USERS])
+        dashboard.close()
+        dashboard.deleteLater()
+        run_event_loop_until(lambda: False, 0.3)
+        report["rebuild"] = {
+            "logins": len(samples),
+            "p50_ms": percentile(samples, 50),
+            "p99_ms": percentile(samples, 99),
+        }
+
+        os.environ[KIOSK_ENV] = "1"
+        samples, dashboard, widget_growth = run(users)
+        report["kiosk"] = {
+            "logins": len(samples),
+            "p50_ms": percentile(samples, 50),
+            "p99_ms": percentile(samples, 99),
+            "widget_growth": widget_growth,
+        }
+        dashboard.close()
+
+        get_write_behind().flush(timeout=5)
+        for path in glob.glob(os.path.join("data", "history", f"{PREFIX}*.json")):
+            os.remove(path)
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark biaya pencatatan metrik.
+
+Mengukur biaya per panggilan (ns) untuk counter.inc, histogram.observe,
+timer context manager dan decorator timed dibanding fungsi kosong, lalu
+memastikan tidak ada update yang hilang saat 8 thread mencatat bersamaan,
+dan mengukur waktu render /metrics.
+
+Jalankan dari root repo:
+    python -m benchmarks.bench_metrics
+"""
+
+import json
+import time
+import timeit
+import threading
+
+from utils.metrics import counter, histogram, timed, render_metrics
+
+CALLS = 1_000_000
+
+
+def per_call_ns(fn, number=CALLS):
+    return timeit.timeit(fn, number=number) / number * 1e9
+
+
+def main(threads=8, per_thread=200_000):
+    hits = counter("bench_hits_total", "Counter benchmark")
+    latency = histogram("bench_latency_seconds", "Histogram benchmark", ("operation",))
+    child = latency.labels("query")
+
+    def noop():
+        pass
+
+    @timed(child)
+    def timed_noop():
+        pass
+
+    def with_timer():
+        with child.time():
+            pass
+
+    baseline = per_call_ns(noop)
+    costs = {
+        "counter_inc_ns": per_call_ns(hits.inc) - baseline,
+        "histogram_observe_ns": per_call_ns(lambda: child.observe(0.0042)) - baseline,
+        "timed_decorator_ns": per_call_ns(timed_noop) - baseline,
+        "timer_context_ns": per_call_ns(with_timer) - baseline,
+    }
+
+    # Update dari banyak thread tidak boleh hilang
+    contended = counter("bench_contended_total", "Counter multi-thread")
+    contended_hist = histogram("bench_contended_seconds", "Histogram multi-thread").labels()
+
+    def worker():
+        for _ in range(per_thread):
+            contended.inc()
+            contended_hist.observe(0.001)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    expected = threads * per_thread
+    _, observed, _ = contended_hist.snapshot()
+
+    start = time.perf_counter()
+    text = render_metrics()
+    render_ms = (time.perf_counter() - start) * 1000
+
+    print(json.dumps({
+        "per_call": {name: round(value, 1) for name, value in costs.items()},
+        "contention": {
+            "threads": threads,
+            "expected": expected,
+            "counter": contended.value(),
+            "histogram_count": observed,
+            "updates_per_sec": round(2 * expected / elapsed),
+        },
+        "render": {"bytes": len(text), "ms": round(render_ms, 3)},
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
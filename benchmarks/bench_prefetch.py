@@ -0,0 +1,160 @@
+"""
+Benchmark klik kartu film sampai detail tergambar, dengan dan tanpa prefetch.
+
+Untuk setiap film di katalog (MoviesPage offscreen):
+- cold: cache poster dan SeatHub kosong; klik kartu (on_movie_clicked +
+  repaint detail) lalu buka booking (setup_for_movie, pindah halaman + repaint;
+  dialog konfirmasi dilewati)
+- prefetched: kartu di-hover dulu (signal hovered), tunggu prefetcher selesai,
+  baru diklik
+Juga diperiksa antrean terbatas: 40 permintaan idle sekaligus, berapa yang
+dibuang, dan pembatalan saat kursor keluar dari kartu.
+
+Jalankan dari root repo:
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_prefetch
+"""
+
+import os
+import json
+import time
+import tempfile
+
+from PyQt5.QtWidgets import QApplication
+
+import models
+from models import init_db, get_db, TicketModel
+from utils.seat_hub import get_seat_hub
+from gui.movies_page import MoviesPage, MovieCard
+from gui.poster_cache import get_poster_cache
+from gui.prefetch import get_prefetcher, PREFETCH_JOBS
+from benchmarks.bench_auth_ui import run_event_loop_until
+
+TICKETS_PER_SHOWTIME = 60
+FRAME_BUDGET_MS = 16
+
+
+def percentile(samples, pct):
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return round(ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))], 2)
+
+
+def seed_tickets(page, movies):
+    """Tiket terbit pada jadwal pertama tiap film agar status kursi perlu di-query"""
+    conn = get_db()
+    for movie in movies:
+        showtime = page.booking_page.predicted_showtime(movie)
+        tickets = [(f"{hash((movie['title'], i)) & 0xFFFFFFFF:08X}", f"{chr(65 + i // 10)}{i % 10 + 1}")
+                   for i in range(TICKETS_PER_SHOWTIME)]
+        TicketModel.insert_tickets(conn, "bench", showtime, tickets)
+    conn.commit()
+    conn.close()
+
+
+def reset_caches(page):
+    """Kosongkan cache poster dan channel SeatHub (halaman booking memakai hub bersama)"""
+    get_poster_cache().clear()
+    page.booking_page.showtime_id = None
+    get_seat_hub()._channels.clear()
+
+
+def click(page, movie):
+    started = time.perf_counter()
+    page.on_movie_clicked(movie)
+    page.movie_detail_page.repaint()
+    detail_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    page.booking_page.setup_for_movie(movie)
+    page.stack_widget.setCurrentIndex(page.pages["booking"])
+    page.booking_page.repaint()
+    booking_ms = (time.perf_counter() - started) * 1000
+    page.show_movies_list()
+    return detail_ms, booking_ms
+
+
+def summary(samples):
+    return {
+        "p50_ms": percentile(samples, 50),
+        "max_ms": percentile(samples, 100),
+        "within_frame": sum(1 for sample in samples if sample < FRAME_BUDGET_MS),
+    }
+
+
+def main():
+    app = QApplication.instance() or QApplication([])
+    report = {}
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        models.DATABASE = os.path.join(tmp_dir, "bench_prefetch.db")
+        init_db()
+
+        page = MoviesPage({"username": "bench", "nama": "Bench", "saldo": 0, "usia": 20})
+        page.resize(1200, 800)
+        page.show()
+        run_event_loop_until(lambda: False, 0.3)
+        prefetcher = get_prefetcher()
+        prefetcher.wait_idle(30)
+        cards = [page.movies_grid.itemAt(i).widget() for i in range(page.movies_grid.count())]
+        cards = [card for card in cards if isinstance(card, MovieCard)]
+        movies = [card.movie_data for card in cards]
+        seed_tickets(page, movies)
+        report["movies"] = len(movies)
+
+        # Cold: tanpa prefetch (idle prefetch dimatikan)
+        page.idle_prefetch_timer.stop()
+        prefetcher._done.clear()
+        detail, booking = [], []
+        for movie in movies:
+            reset_caches(page)
+            detail_ms, booking_ms = click(page, movie)
+            detail.append(detail_ms)
+            booking.append(booking_ms)
+        report["cold"] = {"detail": summary(detail), "booking": summary(booking)}
+
+        # Prefetched: hover dulu, klik setelah prefetch selesai
+        detail, booking, hover_to_ready = [], [], []
+        for card in cards:
+            reset_caches(page)
+            prefetcher._done.clear()
+            started = time.perf_counter()
+            card.hovered.emit(card.movie_data)
+            prefetcher.wait_idle(10)
+            hover_to_ready.append((time.perf_counter() - started) * 1000)
+            detail_ms, booking_ms = click(page, card.movie_data)
+            detail.append(detail_ms)
+            booking.append(booking_ms)
+        report["prefetched"] = {
+            "hover_to_ready_p50_ms": percentile(hover_to_ready, 50),
+            "detail": summary(detail),
+            "booking": summary(booking),
+        }
+
+        # Antrean terbatas dan pembatalan
+        prefetcher._done.clear()
+        reset_caches(page)
+        dropped_before = PREFETCH_JOBS.labels("dropped").value()
+        cancelled_before = PREFETCH_JOBS.labels("cancelled").value()
+        flood = [dict(movie, title=f"{movie['title']} #{i}") for i in range(5) for movie in movies][:40]
+        for movie in flood:
+            prefetcher.request(movie, urgent=False)
+        queued = prefetcher.pending()
+        for movie in flood[1:4]:
+            prefetcher.cancel(movie)
+        prefetcher.wait_idle(30)
+        report["queue"] = {
+            "requested": len(flood),
+            "max_pending": prefetcher.max_pending,
+            "pending_after_flood": queued,
+            "dropped": PREFETCH_JOBS.labels("dropped").value() - dropped_before,
+            "cancelled": PREFETCH_JOBS.labels("cancelled").value() - cancelled_before,
+        }
+        page.close()
+        prefetcher.close()
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+Benchmark jurnal pembelian: fsync per baris vs group commit.
+
+- journal_only: 8 thread mencatat intent (durable) sebanyak mungkin selama
+  beberapa detik; dihitung baris/detik dan rata-rata baris per fsync
+- purchases: pembelian penuh lewat booking_service (intent, transaksi
+  SQLite, commit) dari beberapa thread; dihitung pembelian/detik dan p99
+- recovery: jurnal dengan satu pembelian yang terputus sebelum COMMIT dan
+  satu sesudah COMMIT; recover() harus membatalkan yang pertama dan
+  menulis riwayat yang kedua ke file
+
+Jalankan dari root repo:
+    python -m benchmarks.bench_purchase_journal
+"""
+
+import os
+import json
+import time
+import uuid
+import tempfile
+import threading
+
+import models
+from models import init_db, get_db, BookingModel
+from utils import booking_service
+from utils import purchase_journal
+from utils.admission import Overloaded
+from utils.catalog import get_catalog, ticket_price
+from utils.purchase_journal import PurchaseJournal, JOURNAL_GROUP_SIZE
+
+THREADS = 8
+PURCHASE_THREADS = 4  # dalam batas antrean penulis (max_queue=4)
+DURATION = 3.0
+ALL_SEATS = [f"{chr(65 + row)}{col + 1}" for row in range(10) for col in range(10)]
+
+
+def percentile(samples, pct):
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return round(ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))], 2)
+
+
+def seed_users(count):
+    conn = get_db()
+    conn.executemany(
+        "INSERT INTO users (nama, username, password, usia, saldo) VALUES (?, ?, ?, ?, ?)",
+        [(f"Bench {i}", f"buyer{i}", "-", 20, 1_000_000_000) for i in range(count)]
+    )
+    conn.commit()
+    conn.close()
+
+
+def fsync_count():
+    _, count, _ = JOURNAL_GROUP_SIZE.labels().snapshot()
+    return count
+
+
+def run_threads(threads, target):
+    stop_at = time.perf_counter() + DURATION
+    workers = [threading.Thread(target=target, args=(i, stop_at)) for i in range(threads)]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return time.perf_counter() - started
+
+
+def bench_journal_only(tmp_dir, group_commit):
+    journal = PurchaseJournal(os.path.join(tmp_dir, f"journal_only_{group_commit}.log"), group_commit)
+    counts = [0] * THREADS
+
+    def work(index, stop_at):
+        while time.perf_counter() < stop_at:
+            journal.begin(f"buyer{index}", {"seats": ["A1"]}, uuid.uuid4().hex)
+            counts[index] += 1
+
+    fsyncs_before = fsync_count()
+    elapsed = run_threads(THREADS, work)
+    journal.close()
+    records = sum(counts)
+    fsyncs = fsync_count() - fsyncs_before
+    return {
+        "records": records,
+        "records_per_s": round(records / elapsed, 1),
+        "fsyncs": fsyncs,
+        "records_per_fsync": round(records / max(1, fsyncs), 2),
+    }
+
+
+def bench_purchases(tmp_dir, group_commit):
+    purchase_journal._journal = PurchaseJournal(os.path.join(tmp_dir, f"purchases_{group_commit}.log"),
+                                                group_commit)
+    movie = get_catalog().movies[0]
+    base = {
+        "movie_title": movie["title"],
+        "cinema": "CGV Grand Indonesia",
+        "theater": "Theater 1",
+        "studio_type": "Regular",
+        "show_time": movie["schedule"][0],
+        "total_price": ticket_price(movie, "Regular"),
+    }
+    latencies = []
+    retries = [0]
+    lock = threading.Lock()
+
+    def work(index, stop_at):
+        n = 0
+        while time.perf_counter() < stop_at:
+            booking = dict(base, show_date=f"{group_commit}-{index}-{n // 100}", seats=[ALL_SEATS[n % 100]])
+            started = time.perf_counter()
+            while True:
+                try:
+                    success, _, _ = booking_service.create_booking(f"buyer{index}", booking, uuid.uuid4().hex)
+                    break
+                except Overloaded as e:
+                    with lock:
+                        retries[0] += 1
+                    time.sleep(min(e.retry_after, 0.01))
+            with lock:
+                latencies.append((time.perf_counter() - started) * 1000)
+            n += 1
+
+    elapsed = run_threads(PURCHASE_THREADS, work)
+    purchase_journal._journal.close()
+    return {
+        "purchases": len(latencies),
+        "purchases_per_s": round(len(latencies) / elapsed, 1),
+        "p50_ms": percentile(latencies, 50),
+        "p99_ms": percentile(latencies, 99),
+        "overload_retries": retries[0],
+    }
+
+
+def bench_recovery(tmp_dir):
+    path = os.path.join(tmp_dir, "recovery.log")
+    journal = PurchaseJournal(path)
+    movie = get_catalog().movies[0]
+    booking = {
+        "movie_title": movie["title"], "cinema": "CGV Grand Indonesia", "theater": "Theater 2",
+        "studio_type": "Regular", "show_date": "recovery", "show_time": movie["schedule"][0],
+        "seats": ["A1"], "total_price": ticket_price(movie, "Regular"),
+    }
+
+    # Crash sebelum COMMIT: intent saja, database tidak berubah
+    journal.begin("buyer0", dict(booking, seats=["B1"]), "lost-before-commit")
+
+    # Crash sesudah COMMIT tapi sebelum file riwayat ditulis
+    committed_key = "lost-after-commit"
+    journal.begin("buyer1", booking, committed_key)
+    _, _, result = BookingModel.create_booking("buyer1", booking, committed_key)
+    journal.close()
+
+    recovered = PurchaseJournal(path)
+    summary = recovered.recover()
+    with open(os.path.join("data", "history", "buyer1.json")) as f:
+        history = json.load(f)
+    again = recovered.recover()
+    recovered.close()
+    return {
+        "summary": summary,
+        "history_has_booking": any(t.get("transaction_id") == result["booking_id"] for t in history),
+        "second_run": again,
+        "journal_bytes_after": os.path.getsize(path),
+    }
+
+
+def main():
+    report = {"threads": THREADS, "purchase_threads": PURCHASE_THREADS, "duration_s": DURATION}
+    original_cwd = os.getcwd()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        models.DATABASE = os.path.join(tmp_dir, "bench_journal.db")
+        init_db()
+        models.enable_wal()
+        seed_users(THREADS)
+        get_catalog()  # dimuat dari repo sebelum pindah ke direktori sementara
+        os.chdir(tmp_dir)
+        try:
+            for name, group_commit in (("per_op_fsync", False), ("group_commit", True)):
+                report[name] = {
+                    "journal_only": bench_journal_only(tmp_dir, group_commit),
+                    "purchases": bench_purchases(tmp_dir, group_commit),
+                }
+            report["recovery"] = bench_recovery(tmp_dir)
+        finally:
+            os.chdir(original_cwd)
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
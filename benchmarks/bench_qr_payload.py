@@ -0,0 +1,138 @@
+"""
+Benchmark payload QR: format lama vs payload biner base45.
+
+Untuk tiap format dilaporkan panjang payload, versi QR, waktu encode
+(membangun matriks QR + gambar 200x200) dan waktu decode (scan gambar
+dengan zxing-cpp bila terpasang, ditambah parsing/verifikasi payload).
+
+Jalankan dari root repo:
+    python -m benchmarks.bench_qr_payload
+"""
+
+import json
+import time
+import statistics
+import textwrap
+
+import qrcode
+
+from utils.helper import get_showtime_id
+from utils.qr_payload import encode_ticket_payload, decode_ticket_payload
+
+try:
+    import zxingcpp
+except ImportError:
+    zxingcpp = None
+
+BOOKING = {
+    "movie_title": "Spider-Man: Far From Home",
+    "cinema": "CGV Grand Indonesia",
+    "theater": "Theater 1",
+    "studio_type": "Regular",
+    "city": "Jakarta",
+    "seats": ["E5", "E6", "E7", "E8"],
+    "seat_count": 4,
+    "price_per_ticket": 45000,
+    "total_price": 180000,
+    "show_date": "19/03/2025",
+    "show_time": "19:00",
+    "booking_date": "18/03/2025 10:12",
+    "payment_status": "PAID",
+}
+TICKET_ID = "3FE9DDD4"
+
+
+def legacy_renderer_json():
+    """JSON ringkas yang dulu dipakai render_ticket_image"""
+    return json.dumps({
+        "movie": BOOKING["movie_title"],
+        "cinema": BOOKING["cinema"],
+        "theater": BOOKING["theater"],
+        "date": f"{BOOKING['show_date']} {BOOKING['show_time']}",
+        "seats": ", ".join(BOOKING["seats"]),
+        "id": TICKET_ID,
+    })
+
+
+def legacy_generate_qr_code():
+    """TicketPage.generate_qr_code lama: json.dumps seluruh dict booking"""
+    return json.dumps(dict(BOOKING, ticket_id=TICKET_ID))
+
+
+def legacy_movies_page_text():
+    """Blok teks multi-baris dari MoviesPage.show_e_ticket lama (dengan indentasi)"""
+    return f"""
+            CinemaTIX E-Ticket
+            Film: {BOOKING['movie_title']}
+            Bioskop: {BOOKING['cinema']}
+            Theater: {BOOKING['theater']}
+            Studio: {BOOKING['studio_type']}
+            Tanggal: {BOOKING['show_date']}
+            Waktu: {BOOKING['show_time']}
+            Kursi: {', '.join(BOOKING['seats'])}
+            """
+
+
+def compact_base45():
+    return encode_ticket_payload(TICKET_ID, get_showtime_id(BOOKING), BOOKING["seats"])
+
+
+def build_qr(payload):
+    qr = qrcode.QRCode(version=1, error_correction=qrcode.constants.ERROR_CORRECT_L, box_size=10, border=4)
+    qr.add_data(payload)
+    qr.make(fit=True)
+    img = qr.make_image(fill_color="black", back_color="white").resize((200, 200))
+    return qr.version, img
+
+
+def parse_payload(name, text):
+    if name == "compact_base45":
+        return decode_ticket_payload(text)["ticket_id"]
+    if name == "legacy_movies_page_text":
+        return textwrap.dedent(text).strip().splitlines()
+    return json.loads(text)
+
+
+def timed(func, rounds):
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return round(statistics.median(samples), 3)
+
+
+def main(rounds=200):
+    formats = {
+        "legacy_renderer_json": legacy_renderer_json(),
+        "legacy_generate_qr_code": legacy_generate_qr_code(),
+        "legacy_movies_page_text": legacy_movies_page_text(),
+        "compact_base45": compact_base45(),
+    }
+
+    results = {}
+    for name, payload in formats.items():
+        version, img = build_qr(payload)
+        result = {
+            "payload_chars": len(payload),
+            "qr_version": version,
+            "modules": 17 + 4 * version,
+            "encode_ms": timed(lambda: build_qr(payload), rounds),
+            "parse_ms": timed(lambda: parse_payload(name, payload), rounds),
+        }
+        if zxingcpp is not None:
+            gray = img.convert("L")
+            decoded = zxingcpp.read_barcodes(gray)
+            result["scan_ok"] = bool(decoded) and decoded[0].text == payload
+            result["scan_ms"] = timed(lambda: zxingcpp.read_barcodes(gray), rounds)
+        results[name] = result
+
+    print(json.dumps({
+        "rounds": rounds,
+        "scanner": "zxing-cpp" if zxingcpp is not None else "tidak terpasang (hanya parsing)",
+        "formats": results,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Benchmark cache respons katalog.
+
+Untuk setiap endpoint baca-berat dibandingkan waktu handler (tanpa overhead
+test client) dan waktu request penuh dengan cache dimatikan vs cache hangat,
+lalu file film diubah untuk memastikan cache langsung dikosongkan saat versi
+katalog berubah. Statistik cache (hit ratio, byte dihemat) ikut dilaporkan.
+
+Jalankan dari root repo:
+    python -m benchmarks.bench_response_cache
+"""
+
+import os
+import json
+import time
+import shutil
+import tempfile
+import statistics
+
+import utils.catalog as catalog_module
+from utils.catalog import Catalog, FILM_FILE
+from server.app import create_app
+from server.response_cache import get_response_cache
+
+ROUTES = [
+    "/api/catalog/movies?per_page=100",
+    "/api/catalog/movies/3",
+    "/api/catalog/menu",
+    "/api/catalog/recommendations?genre=action",
+    "/api/catalog/showtimes?per_page=100",
+]
+GZIP = {"Accept-Encoding": "gzip"}
+
+
+def median_us(fn, rounds):
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1e6)
+    return round(statistics.median(samples), 1)
+
+
+def handler_us(app, path, rounds):
+    """Waktu view function saja, di dalam satu request context"""
+    with app.test_request_context(path, headers=GZIP):
+        endpoint, args = app.url_map.bind("").match(path.split("?")[0])
+        view = app.view_functions[endpoint]
+        return median_us(lambda: view(**args), rounds)
+
+
+def main(rounds=500):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        film_path = os.path.join(tmp_dir, "data_film.txt")
+        shutil.copyfile(FILM_FILE, film_path)
+        catalog = Catalog(film_path)
+        catalog_module._catalog = catalog
+
+        app = create_app()
+        client = app.test_client()
+        cache = get_response_cache()
+        budget = cache.max_bytes
+
+        results = {}
+        for path in ROUTES:
+            cache.max_bytes = 0
+            cold_handler = handler_us(app, path, rounds)
+            cold_request = median_us(lambda: client.get(path, headers=GZIP), rounds)
+
+            cache.max_bytes = budget
+            client.get(path, headers=GZIP)
+            warm_handler = handler_us(app, path, rounds)
+            warm_request = median_us(lambda: client.get(path, headers=GZIP), rounds)
+            assert client.get(path, headers=GZIP).headers["X-Cache"] == "HIT"
+
+            results[path] = {
+                "handler_uncached_us": cold_handler,
+                "handler_cached_us": warm_handler,
+                "handler_speedup": round(cold_handler / warm_handler, 1),
+                "request_uncached_us": cold_request,
+                "request_cached_us": warm_request,
+            }
+
+        before = cache.stats()
+
+        # Ubah katalog: entri lama harus hilang dan request berikutnya MISS
+        with open(film_path, "a", encoding="utf-8") as f:
+            f.write("\nFilm Baru|Drama|100|50000|Sinopsis|12:00,15:00|Sutradara|Pemeran|13+\n")
+        catalog._checked_at = 0.0
+        after_change = client.get(ROUTES[0], headers=GZIP)
+        invalidation = {
+            "entries_before": before["entries"],
+            "x_cache_after_change": after_change.headers["X-Cache"],
+            "entries_after": cache.stats()["entries"],
+            "invalidations": cache.stats()["invalidations"],
+        }
+
+    print(json.dumps({
+        "routes": results,
+        "cache": before,
+        "invalidation": invalidation,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
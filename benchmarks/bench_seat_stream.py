@@ -0,0 +1,269 @@
+"""
+Benchmark fan-out status kursi ke 500 subscriber.
+
+1. hub: 500 thread subscriber menunggu langsung di SeatHub
+2. sse: 500 koneksi HTTP ke /api/seats/<id>/stream pada waitress dengan
+   8 thread (default python -m server); route menjawab 307 ke server SSE
+   (server/seat_stream.py) dan klien mengikutinya. Semua stream dibaca satu
+   thread klien dengan selectors
+
+Publisher menerbitkan delta kursi dengan laju tetap; dilaporkan latensi
+publish -> diterima (p50/p99), delta yang hilang, dan biaya publish.
+Terakhir diuji resume dengan Last-Event-ID.
+
+Jalankan dari root repo:
+    python -m benchmarks.bench_seat_stream
+"""
+
+import os
+import json
+import logging
+import time
+import socket
+import selectors
+import tempfile
+import threading
+from urllib.parse import urlsplit
+
+import models
+from models import init_db
+from server.app import create_app
+from server.seat_stream import SeatStreamServer
+from utils.seat_hub import SeatHub, SEAT_BOOKED
+from utils.qr_payload import index_to_seat
+import utils.seat_hub as seat_hub_module
+
+SHOWTIME_ID = 4242
+API_THREADS = 8
+
+_leftover = {}
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def publish_loop(hub, deltas, interval, sent_at):
+    publish_ms = []
+    for i in range(deltas):
+        seat = index_to_seat(i % 100)
+        state = SEAT_BOOKED if (i // 100) % 2 == 0 else "available"
+        start = time.perf_counter()
+        version = hub.publish(SHOWTIME_ID, [seat], state)
+        sent_at[version] = start
+        publish_ms.append((time.perf_counter() - start) * 1000)
+        time.sleep(interval)
+    return publish_ms
+
+
+def summarize(latencies, received, subscribers, deltas, publish_ms):
+    return {
+        "subscribers": subscribers,
+        "deltas": deltas,
+        "missed": subscribers * deltas - received,
+        "latency_p50_ms": round(percentile(latencies, 50), 2),
+        "latency_p99_ms": round(percentile(latencies, 99), 2),
+        "publish_p50_ms": round(percentile(publish_ms, 50), 3),
+        "publish_p99_ms": round(percentile(publish_ms, 99), 3),
+    }
+
+
+def bench_hub(subscribers, deltas, interval):
+    hub = SeatHub()
+    hub.snapshot(SHOWTIME_ID)
+    sent_at = {}
+    latencies = [[] for _ in range(subscribers)]
+    done = threading.Event()
+
+    def subscriber(index):
+        version = 0
+        while version < deltas:
+            changes = hub.wait_for_changes(SHOWTIME_ID, version, 1.0)
+            now = time.perf_counter()
+            for delta_version, _, _ in changes or []:
+                latencies[index].append((now - sent_at.get(delta_version, now)) * 1000)
+                version = delta_version
+            if done.is_set() and not changes:
+                break
+
+    threads = [threading.Thread(target=subscriber, args=(i,), daemon=True) for i in range(subscribers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.5)
+    publish_ms = publish_loop(hub, deltas, interval, sent_at)
+    done.set()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    all_latencies = [value for chunk in latencies for value in chunk]
+    return summarize(all_latencies, len(all_latencies), subscribers, deltas, publish_ms)
+
+
+def open_stream(port, last_event_id=None):
+    """Buka stream lewat server API; redirect 307 ke server SSE diikuti seperti EventSource"""
+    path = f"/api/seats/{SHOWTIME_ID}/stream"
+    while True:
+        sock = socket.create_connection(("127.0.0.1", port))
+        headers = f"GET {path} HTTP/1.1\r\nHost: 127.0.0.1:{port}\r\nAccept: text/event-stream\r\n"
+        if last_event_id:
+            headers += f"Last-Event-ID: {last_event_id}\r\n"
+        sock.sendall((headers + "\r\n").encode("ascii"))
+        head = b""
+        while b"\r\n\r\n" not in head:
+            chunk = sock.recv(4096)
+            if not chunk:
+                break
+            head += chunk
+        status = head.split(b"\r\n", 1)[0]
+        if b" 307 " not in status:
+            break
+        location = urlsplit(next(line.split(b":", 1)[1].strip().decode("ascii")
+                                 for line in head.split(b"\r\n") if line.lower().startswith(b"location:")))
+        sock.close()
+        port, path = location.port, location.path + (f"?{location.query}" if location.query else "")
+    sock.setblocking(False)
+    # Sisa setelah header (event pertama) dibaca lagi oleh pemanggil
+    _leftover[sock] = head.split(b"\r\n\r\n", 1)[1] if b"\r\n\r\n" in head else b""
+    return sock
+
+
+def parse_events(buffer):
+    """Pisahkan event SSE lengkap dari buffer, mengembalikan (events, sisa buffer)"""
+    events = []
+    while b"\n\n" in buffer:
+        raw, buffer = buffer.split(b"\n\n", 1)
+        event = {}
+        for line in raw.decode("utf-8", "replace").splitlines():
+            if line.startswith("event: "):
+                event["event"] = line[7:]
+            elif line.startswith("data: "):
+                event["data"] = json.loads(line[6:])
+            elif line.startswith("id: "):
+                event["id"] = line[4:]
+        if "event" in event:
+            events.append(event)
+    return events, buffer
+
+
+def run_server(server):
+    try:
+        server.run()
+    except OSError:
+        pass  # socket ditutup saat benchmark selesai
+
+
+def bench_sse(subscribers, deltas, interval):
+    from waitress.server import create_server
+    logging.getLogger("waitress").setLevel(logging.ERROR)
+
+    hub = SeatHub()
+    seat_hub_module._hub = hub
+    # Worker waitress sebanyak default server headless; stream tidak memakai satu pun
+    stream_server = SeatStreamServer(hub).start()
+    app = create_app({"SEAT_STREAM_PORT": stream_server.port})
+    server = create_server(app, host="127.0.0.1", port=0, threads=API_THREADS)
+    port = server.effective_port
+    server_thread = threading.Thread(target=run_server, args=(server,), daemon=True)
+    server_thread.start()
+
+    selector = selectors.DefaultSelector()
+    buffers = {}
+    sent_at = {}
+    latencies = []
+    last_ids = {}
+    snapshots = 0
+    for _ in range(subscribers):
+        sock = open_stream(port)
+        selector.register(sock, selectors.EVENT_READ)
+        events, buffers[sock] = parse_events(_leftover.pop(sock))
+        for event in events:
+            last_ids[sock] = event.get("id")
+            snapshots += event["event"] == "snapshot"
+
+    stop = threading.Event()
+
+    def reader():
+        nonlocal snapshots
+        while not stop.is_set():
+            for key, _ in selector.select(timeout=0.2):
+                sock = key.fileobj
+                try:
+                    chunk = sock.recv(65536)
+                except BlockingIOError:
+                    continue
+                if not chunk:
+                    selector.unregister(sock)
+                    continue
+                now = time.perf_counter()
+                events, buffers[sock] = parse_events(buffers[sock] + chunk)
+                for event in events:
+                    last_ids[sock] = event.get("id")
+                    if event["event"] == "snapshot":
+                        snapshots += 1
+                    elif event["event"] == "seat":
+                        version = event["data"]["version"]
+                        latencies.append((now - sent_at.get(version, now)) * 1000)
+
+    reader_thread = threading.Thread(target=reader, daemon=True)
+    reader_thread.start()
+    while snapshots < subscribers:
+        time.sleep(0.05)
+
+    publish_ms = publish_loop(hub, deltas, interval, sent_at)
+    deadline = time.time() + 10
+    while len(latencies) < subscribers * deltas and time.time() < deadline:
+        time.sleep(0.05)
+    stop.set()
+    reader_thread.join()
+
+    result = summarize(latencies, len(latencies), subscribers, deltas, publish_ms)
+    result["resume"] = check_resume(port, hub, next(iter(last_ids.values())))
+
+    result["api_threads"] = API_THREADS
+    for key in list(selector.get_map().values()):
+        key.fileobj.close()
+    server.close()
+    stream_server.close()
+    return result
+
+
+def check_resume(port, hub, last_event_id):
+    """Reconnect dengan Last-Event-ID setelah 5 perubahan terlewat"""
+    _, states = hub.snapshot(SHOWTIME_ID)
+    for i in range(5):
+        seat = f"J{i + 1}"
+        hub.publish(SHOWTIME_ID, [seat], "available" if states.get(seat) == SEAT_BOOKED else SEAT_BOOKED)
+    sock = open_stream(port, last_event_id)
+    sock.setblocking(True)
+    sock.settimeout(5)
+    events, buffer = parse_events(_leftover.pop(sock))
+    try:
+        while len(events) < 5:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            new_events, buffer = parse_events(buffer + chunk)
+            events.extend(new_events)
+    except socket.timeout:
+        pass
+    sock.close()
+    return {
+        "events": len(events),
+        "snapshot_sent": any(event["event"] == "snapshot" for event in events),
+    }
+
+
+def main(subscribers=500, deltas=100, interval=0.05):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        models.DATABASE = os.path.join(tmp_dir, "bench_seats.db")
+        init_db()
+        results = {
+            "hub": bench_hub(subscribers, deltas, interval),
+            "sse": bench_sse(subscribers, deltas, interval),
+        }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
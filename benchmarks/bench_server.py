@@ -0,0 +1,160 @@
+"""
+Benchmark server headless vs server dev Flask yang tertanam di main.py.
+
+Keduanya dijalankan sebagai subprocess di atas database sementara:
+- embedded: `import main` (ikut memuat PyQt dan GUI) lalu app.run() bawaan Flask
+- headless: `python -m server` (waitress multi-thread, SQLite WAL, tanpa PyQt)
+
+Dilaporkan waktu startup (spawn sampai /api/health menjawab) dan
+request/detik dengan beberapa klien keep-alive (80% lookup, 20% check-in).
+
+Jalankan dari root repo:
+    python -m benchmarks.bench_server
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import socket
+import tempfile
+import threading
+import subprocess
+import http.client
+
+import models
+from models import TicketModel, init_db
+from utils.gate_auth import create_gate_token, SECRET_ENV as GATE_SECRET_ENV, ROLE_STAFF
+from utils.ticket_renderer import new_ticket_id
+
+GATE_SECRET = "bench-gate-secret"
+
+EMBEDDED_SCRIPT = """
+import sys
+import models
+models.DATABASE = sys.argv[1]
+import main
+main.app.run(debug=False, port=int(sys.argv[2]))
+"""
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def start_server(mode, db_path, port, threads):
+    if mode == "embedded":
+        cmd = [sys.executable, "-c", EMBEDDED_SCRIPT, db_path, str(port)]
+    else:
+        cmd = [sys.executable, "-m", "server", "--db", db_path, "--port", str(port), "--threads", str(threads)]
+
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    env[GATE_SECRET_ENV] = GATE_SECRET
+    start = time.perf_counter()
+    proc = subprocess.Popen(cmd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    while True:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/api/health")
+            if conn.getresponse().status == 200:
+                conn.close()
+                break
+        except OSError:
+            pass
+        if proc.poll() is not None:
+            raise RuntimeError(f"Server {mode} gagal dijalankan")
+        time.sleep(0.01)
+    return proc, (time.perf_counter() - start) * 1000
+
+
+def run_load(port, ticket_ids, clients, duration):
+    samples = [[] for _ in range(clients)]
+    errors = [0] * clients
+    check_in_pool = list(ticket_ids)
+    random.shuffle(check_in_pool)
+    pool_lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+    gate_token = create_gate_token("BENCH", ROLE_STAFF, GATE_SECRET.encode("utf-8"))
+
+    def client(index):
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+        rng = random.Random(index)
+        while time.perf_counter() < deadline:
+            if rng.random() < 0.2:
+                with pool_lock:
+                    ticket_id = check_in_pool.pop() if check_in_pool else ticket_ids[0]
+                body = json.dumps({"ticket_id": ticket_id, "manual": True})
+                method, path = "POST", "/api/gate/check-in"
+                headers = {"Content-Type": "application/json"}
+            else:
+                body, headers = None, {}
+                method, path = "GET", f"/api/gate/tickets/{rng.choice(ticket_ids)}"
+            headers["Authorization"] = f"Bearer {gate_token}"
+            t0 = time.perf_counter()
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                response = conn.getresponse()
+                response.read()
+                if response.status >= 500:
+                    errors[index] += 1
+            except (OSError, http.client.HTTPException):
+                errors[index] += 1
+                conn.close()
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+                continue
+            samples[index].append((time.perf_counter() - t0) * 1000)
+        conn.close()
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    all_samples = [s for chunk in samples for s in chunk]
+    return {
+        "requests": len(all_samples),
+        "errors": sum(errors),
+        "req_per_sec": round(len(all_samples) / elapsed),
+        "p50_ms": round(percentile(all_samples, 50), 2),
+        "p99_ms": round(percentile(all_samples, 99), 2),
+    }
+
+
+def bench_mode(mode, tmp_dir, tickets, clients, duration, threads):
+    db_path = os.path.join(tmp_dir, f"{mode}.db")
+    models.DATABASE = db_path
+    init_db()
+    ticket_ids = [new_ticket_id() for _ in range(tickets)]
+    TicketModel.issue_tickets("bench", {"movie_title": "Inception"}, [(t, "E5") for t in ticket_ids])
+
+    port = free_port()
+    proc, startup_ms = start_server(mode, db_path, port, threads)
+    try:
+        result = run_load(port, ticket_ids, clients, duration)
+    finally:
+        proc.terminate()
+        proc.wait()
+    result["startup_ms"] = round(startup_ms)
+    return result
+
+
+def main(tickets=20000, clients=16, duration=5.0, threads=8):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        results = {mode: bench_mode(mode, tmp_dir, tickets, clients, duration, threads)
+                   for mode in ("embedded", "headless")}
+    print(json.dumps({"clients": clients, "duration_s": duration, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Benchmark watchdog event loop Qt.
+
+- overhead: tanpa watchdog vs dengan watchdog (ambang 300 ms), tanpa macet:
+  * workload: 300 handler berantai di thread GUI, masing-masing serialisasi
+    riwayat 500 transaksi (beberapa ms, seperti save/filter riwayat); lama total
+  * idle: waktu CPU proses selama event loop menganggur
+- detection: handler di thread GUI tidur 800 ms; watchdog harus mencatat
+  satu kejadian dengan durasi yang sesuai dan stack yang menunjuk handler
+
+Jalankan dari root repo:
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_stall_watchdog
+"""
+
+import os
+import json
+import time
+import tempfile
+
+from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import QApplication
+
+from gui.stall_watchdog import StallWatchdog
+from benchmarks.bench_auth_ui import run_event_loop_until
+
+HANDLERS = 300
+IDLE_SECONDS = 3.0
+ROUNDS = 3
+STALL_SECONDS = 0.8
+HISTORY = [{"transaction_id": f"TX{i:06d}", "type": "Tiket", "movie_title": f"Film {i % 12}",
+            "total": -50000, "seats": "A1, A2", "timestamp": "01/01/2025 18:00"} for i in range(500)]
+
+
+def run_workload():
+    """Lama (ms) menjalankan HANDLERS handler berantai lewat event loop"""
+    remaining = [HANDLERS]
+
+    def handler():
+        json.dumps(HISTORY, indent=4)
+        remaining[0] -= 1
+        if remaining[0]:
+            QTimer.singleShot(0, handler)
+
+    started = time.perf_counter()
+    QTimer.singleShot(0, handler)
+    run_event_loop_until(lambda: not remaining[0], 60)
+    return (time.perf_counter() - started) * 1000
+
+
+def idle_cpu_ms():
+    started = time.process_time()
+    run_event_loop_until(lambda: False, IDLE_SECONDS)
+    return (time.process_time() - started) * 1000
+
+
+def slow_handler():
+    """Simulasi handler yang memblokir thread GUI"""
+    time.sleep(STALL_SECONDS)
+
+
+def main():
+    app = QApplication.instance() or QApplication([])
+    report = {"handlers": HANDLERS, "idle_s": IDLE_SECONDS, "rounds": ROUNDS}
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        log_path = os.path.join(tmp_dir, "stalls.log")
+
+        # Bergantian agar gangguan mesin terbagi rata ke kedua mode
+        results = {"off": ([], []), "on": ([], [])}
+        false_stalls = 0
+        for _ in range(ROUNDS):
+            for mode in ("off", "on"):
+                watchdog = StallWatchdog(300, log_path) if mode == "on" else None
+                if watchdog:
+                    watchdog.start()
+                results[mode][0].append(run_workload())
+                results[mode][1].append(idle_cpu_ms())
+                if watchdog:
+                    false_stalls += len(watchdog.recent_stalls())
+                    watchdog.stop()
+        workload_off, idle_off = (min(values) for values in results["off"])
+        workload_on, idle_on = (min(values) for values in results["on"])
+        report["overhead"] = {
+            "workload_ms_off": round(workload_off, 1),
+            "workload_ms_on": round(workload_on, 1),
+            "workload_delta_pct": round((workload_on - workload_off) / workload_off * 100, 2),
+            "idle_cpu_ms_off": round(idle_off, 1),
+            "idle_cpu_ms_on": round(idle_on, 1),
+            "false_stalls": false_stalls,
+        }
+
+        watchdog = StallWatchdog(300, log_path)
+        watchdog.start()
+        QTimer.singleShot(50, slow_handler)
+        run_event_loop_until(lambda: watchdog.recent_stalls(), 5)
+        watchdog.stop()
+        stalls = watchdog.recent_stalls()
+        with open(log_path) as f:
+            log_text = f.read()
+        report["detection"] = {
+            "blocked_ms": int(STALL_SECONDS * 1000),
+            "stalls": len(stalls),
+            "duration_ms": stalls[0]["duration_ms"] if stalls else None,
+            "samples": len(stalls[0]["samples"]) if stalls else 0,
+            "stack_names_handler": bool(stalls) and "slow_handler" in stalls[0]["samples"][0]["stack"],
+            "logged": "slow_handler" in log_text,
+        }
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Benchmark latensi e-ticket per pembelian.
+
+Membandingkan jalur lama (render QPainter + render PIL, PNG ke temp/ lalu
+dimuat ulang dengan QPixmap, ditambah salinan otomatis ke disk) dengan
+renderer bersama yang merender sekali di memori dan membungkus buffer
+RGBX sebagai QImage.
+
+Jalankan dari root repo:
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_ticket_render
+"""
+
+import io
+import os
+import sys
+import json
+import tempfile
+import statistics
+import time
+
+import qrcode
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtGui import QPixmap, QPainter, QColor, QFont
+from PyQt5.QtCore import Qt, QRectF
+
+from utils.ticket_renderer import render_ticket_image
+from gui.ticket_page import ticket_to_qimage
+
+BOOKING = {
+    "movie_title": "Inception",
+    "cinema": "CGV Grand Indonesia",
+    "theater": "Theater 1",
+    "studio_type": "Regular",
+    "seats": ["A1", "A2", "A3"],
+    "total_price": 210000,
+    "price_per_ticket": 70000,
+    "seat_count": 3,
+    "show_date": "19/03/2025",
+    "show_time": "19:00",
+    "city": "Jakarta",
+}
+
+
+def legacy_qpainter_ticket(ticket_data, out_dir):
+    """Salinan ringkas MoviesPage.show_e_ticket sebelum renderer digabung"""
+    qr = qrcode.QRCode(version=1, error_correction=qrcode.constants.ERROR_CORRECT_L, box_size=10, border=4)
+    qr.add_data(f"CinemaTIX E-Ticket\nFilm: {ticket_data['movie_title']}\nKursi: {', '.join(ticket_data['seats'])}")
+    qr.make(fit=True)
+    qr_bytes = io.BytesIO()
+    qr.make_image(fill_color="black", back_color="white").save(qr_bytes, format='PNG')
+    qr_pixmap = QPixmap()
+    qr_pixmap.loadFromData(qr_bytes.getvalue())
+    qr_pixmap = qr_pixmap.scaled(200, 200, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+    ticket_pixmap = QPixmap(800, 600)
+    ticket_pixmap.fill(QColor("#1A1A1A"))
+    painter = QPainter(ticket_pixmap)
+    painter.setRenderHint(QPainter.Antialiasing)
+    painter.setFont(QFont("Montserrat", 24, QFont.Bold))
+    painter.drawText(QRectF(0, 40, 800, 50), Qt.AlignCenter, "CinemaTIX E-Ticket")
+    y_pos = 120
+    for label, value in ticket_data.items():
+        painter.drawText(50, y_pos, f"{label}: {value}")
+        y_pos += 30
+    painter.drawPixmap(300, y_pos + 20, qr_pixmap)
+    painter.end()
+    ticket_pixmap.save(os.path.join(out_dir, "cinematix_ticket.png"), "PNG")
+    return ticket_pixmap
+
+
+def legacy_path(out_dir):
+    legacy_qpainter_ticket(BOOKING, out_dir)
+    img, qr_data = render_ticket_image(BOOKING)
+    file_path = os.path.join(out_dir, f"ticket_{qr_data['id']}.png")
+    img.save(file_path)
+    pixmap = QPixmap(file_path)
+    return pixmap.scaled(400, 600, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+
+def shared_path(out_dir):
+    img, _ = render_ticket_image(BOOKING)
+    qimage, buffer = ticket_to_qimage(img)
+    pixmap = QPixmap.fromImage(qimage)
+    return pixmap.scaled(400, 600, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+
+def measure(func, out_dir, rounds):
+    func(out_dir)  # pemanasan (font, template)
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func(out_dir)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), max(samples)
+
+
+def main(rounds=30):
+    app = QApplication.instance() or QApplication(sys.argv)
+    with tempfile.TemporaryDirectory() as out_dir:
+        legacy_median, legacy_max = measure(legacy_path, out_dir, rounds)
+        shared_median, shared_max = measure(shared_path, out_dir, rounds)
+
+    print(json.dumps({
+        "rounds": rounds,
+        "legacy_ms": {"median": round(legacy_median, 2), "max": round(legacy_max, 2)},
+        "shared_ms": {"median": round(shared_median, 2), "max": round(shared_max, 2)},
+        "saved_ms_per_purchase": round(legacy_median - shared_median, 2),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
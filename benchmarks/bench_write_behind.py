@@ -0,0 +1,126 @@
+"""
+Benchmark penyimpanan riwayat: tulis sinkron di thread GUI vs write-behind.
+
+Setiap pembelian memanggil save_history dua kali (add_transaction dari
+handle_booking_success dan dari signal ticket_purchased). Diukur:
+- waktu yang dihabiskan thread pemanggil (thread GUI) per pembelian
+- jumlah file yang benar-benar ditulis ke disk
+- isi file akhir sama dengan daftar transaksi di memori setelah flush
+
+Jalankan dari root repo:
+    python -m benchmarks.bench_write_behind
+"""
+
+import os
+import json
+import time
+import tempfile
+from types import SimpleNamespace
+
+from gui.history_page import HistoryPage
+from utils.write_behind import WriteBehindQueue, WRITE_BEHIND_WRITES
+import utils.write_behind as write_behind
+
+HISTORY_SIZE = 500
+PURCHASES = 40
+GAP_SECONDS = 0.05  # jeda antar pembelian (klik pengguna tercepat)
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def make_transaction(i):
+    return {
+        "type": "Tiket",
+        "movie_title": f"Film {i % 12}",
+        "total": -50000,
+        "studio": "Regular",
+        "theater": "Studio 1",
+        "cinema": "Grand Mall",
+        "seats": "A1, A2",
+        "show_date": "01/01/2025",
+        "show_time": "19:00",
+        "status": "Sukses",
+        "timestamp": "01/01/2025 18:00",
+        "transaction_id": f"TX{i:06d}",
+    }
+
+
+def save_history_sync(page):
+    """Cara lama: json.dump langsung ke file di thread GUI"""
+    os.makedirs(os.path.join("data", "history"), exist_ok=True)
+    history_file = os.path.join("data", "history", f"{page.user_data['username']}.json")
+    with open(history_file, 'w') as f:
+        json.dump(page.transactions, f, indent=4)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def run(save):
+    page = SimpleNamespace(
+        user_data={"username": "bench"},
+        transactions=[make_transaction(i) for i in range(HISTORY_SIZE)],
+    )
+    per_purchase_ms = []
+    for i in range(PURCHASES):
+        page.transactions.insert(0, make_transaction(HISTORY_SIZE + i))
+        started = time.perf_counter()
+        save(page)
+        save(page)
+        per_purchase_ms.append((time.perf_counter() - started) * 1000)
+        time.sleep(GAP_SECONDS)
+    return page, per_purchase_ms
+
+
+def summarize(per_purchase_ms):
+    return {
+        "gui_p50_ms": round(percentile(per_purchase_ms, 50), 3),
+        "gui_p99_ms": round(percentile(per_purchase_ms, 99), 3),
+        "gui_total_ms": round(sum(per_purchase_ms), 1),
+    }
+
+
+def main():
+    report = {"history_size": HISTORY_SIZE, "purchases": PURCHASES, "saves_per_purchase": 2}
+    original_cwd = os.getcwd()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        os.chdir(tmp_dir)
+        try:
+            history_file = os.path.join("data", "history", "bench.json")
+
+            _, per_purchase_ms = run(save_history_sync)
+            report["sync"] = summarize(per_purchase_ms)
+            report["sync"]["disk_writes"] = PURCHASES * 2
+
+            # Writer khusus benchmark menggantikan writer bersama
+            writer = WriteBehindQueue("bench-write-behind")
+            write_behind._writer = writer
+            written_before = WRITE_BEHIND_WRITES.labels("written").value()
+            coalesced_before = WRITE_BEHIND_WRITES.labels("coalesced").value()
+
+            page, per_purchase_ms = run(lambda p: HistoryPage.save_history(p))
+            flushed = writer.close()
+            with open(history_file) as f:
+                on_disk = json.load(f)
+
+            report["write_behind"] = summarize(per_purchase_ms)
+            report["write_behind"].update({
+                "disk_writes": WRITE_BEHIND_WRITES.labels("written").value() - written_before,
+                "coalesced": WRITE_BEHIND_WRITES.labels("coalesced").value() - coalesced_before,
+                "flushed_on_close": flushed,
+                "file_matches_memory": on_disk == page.transactions,
+            })
+        finally:
+            os.chdir(original_cwd)
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
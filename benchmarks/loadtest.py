@@ -0,0 +1,490 @@
+"""
+Load generator untuk backend pemesanan (in-process dan lewat HTTP API).
+
+Sejumlah klien asyncio menjalankan campuran aksi yang realistis terhadap
+database SQLite sementara (sepenuhnya offline):
+- browse   : daftar film, detail film, jadwal, rekomendasi
+- seats    : lihat peta kursi satu jadwal dan pilih kursi yang masih kosong
+- buy      : pesan kursi yang dipilih (idempotency key baru per pembelian)
+- topup    : tambah saldo
+- history  : lihat riwayat transaksi
+
+Setiap langkah jumlah klien (--clients 1,8,32) dijalankan selama --duration
+detik; hasilnya kurva throughput berisi persentil latensi, error rate dan
+pembelian/detik per langkah, dicetak sebagai JSON.
+
+Jalankan dari root repo:
+    python -m benchmarks.loadtest
+    python -m benchmarks.loadtest --mode http --clients 1,16,64 --duration 10 --output hasil.json
+    python -m benchmarks.loadtest --mix browse=50,seats=20,buy=20,topup=5,history=5
+"""
+
+import os
+import json
+import time
+import uuid
+import random
+import asyncio
+import logging
+import argparse
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import bcrypt as bcrypt_lib
+
+import models
+from models import init_db, get_db, BookingModel
+from utils.admission import Overloaded
+from utils.booking_service import create_booking, top_up
+from utils.catalog import get_catalog, ticket_price
+from utils.helper import get_showtime_id
+from utils.seat_hub import get_seat_hub, SEAT_BOOKED
+
+DEFAULT_MIX = {"browse": 40, "seats": 20, "buy": 20, "topup": 10, "history": 10}
+PASSWORD = "loadtest123"
+START_SALDO = 2_000_000
+TOP_UP_AMOUNT = 200_000
+CINEMA = "CGV Grand Indonesia"
+THEATERS = ["Theater 1", "Theater 2", "Theater 3"]
+ALL_SEATS = [f"{chr(65 + row)}{col + 1}" for row in range(10) for col in range(10)]
+
+# Hasil aksi: ok, conflict (kursi sudah terjual / saldo kurang: penolakan bisnis),
+# rejected (antrean penulis penuh, 503), error
+OK, CONFLICT, REJECTED, ERROR = "ok", "conflict", "rejected", "error"
+
+
+def percentile(samples, pct):
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return round(ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))], 3)
+
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"Aksi tidak dikenal: {name}")
+        mix[name.strip()] = float(weight)
+    return mix
+
+
+def seed_users(count):
+    """Buat pengguna uji; hash bcrypt cost rendah agar seeding cepat (login tetap lewat bcrypt)"""
+    hashed = bcrypt_lib.hashpw(PASSWORD.encode("utf-8"), bcrypt_lib.gensalt(4)).decode("utf-8")
+    conn = get_db()
+    conn.executemany(
+        "INSERT OR IGNORE INTO users (nama, username, password, usia, genre_favorit, saldo) VALUES (?, ?, ?, ?, ?, ?)",
+        [(f"Load {i}", f"load{i}", hashed, 25, "Action", START_SALDO) for i in range(count)]
+    )
+    conn.commit()
+    conn.close()
+
+
+def make_showtimes(step):
+    """Jadwal tayang per langkah (tanggal berbeda) agar kursi tidak habis dari langkah sebelumnya"""
+    movies = [m for m in get_catalog().movies if m.get("schedule")][:2]
+    show_date = f"{step + 1:02d}/01/2030"
+    showtimes = []
+    for movie in movies:
+        for show_time in movie["schedule"][:2]:
+            for theater in THEATERS:
+                booking = {
+                    "movie_id": movie["id"],
+                    "movie_title": movie["title"],
+                    "cinema": CINEMA,
+                    "theater": theater,
+                    "studio_type": "Regular",
+                    "show_date": show_date,
+                    "show_time": show_time,
+                }
+                booking["showtime_id"] = get_showtime_id(booking)
+                booking["price"] = ticket_price(movie, "Regular")
+                showtimes.append(booking)
+    return showtimes
+
+
+class VirtualUser:
+    def __init__(self, index, showtimes, seed):
+        self.username = f"load{index}"
+        self.showtimes = showtimes
+        self.rng = random.Random(seed)
+        self.showtime = self.rng.choice(showtimes)
+        self.free_seats = list(ALL_SEATS)
+
+    def pick_seats(self):
+        count = min(len(self.free_seats), self.rng.choice((1, 1, 2)))
+        if count == 0:
+            self.showtime = self.rng.choice(self.showtimes)
+            self.free_seats = list(ALL_SEATS)
+            count = 1
+        seats = self.rng.sample(self.free_seats, count)
+        for seat in seats:
+            self.free_seats.remove(seat)
+        return seats
+
+
+class InProcessBackend:
+    """Memanggil layanan langsung (fungsi blocking dijalankan di thread pool)"""
+
+    name = "in_process"
+
+    def __init__(self, clients):
+        self.executor = ThreadPoolExecutor(max_workers=clients)
+
+    async def call(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+
+    async def login(self, user):
+        return True
+
+    async def browse(self, user):
+        def work():
+            catalog = get_catalog()
+            catalog.refresh()
+            movie = user.rng.choice(catalog.movies)
+            genre = movie.get("genre", "").lower()
+            [m for m in catalog.movies if genre in m.get("genre", "").lower()]
+            return catalog.showtimes(movie["title"], "Jakarta")
+        await self.call(work)
+        return OK
+
+    async def seats(self, user):
+        user.showtime = user.rng.choice(user.showtimes)
+        _, states = await self.call(get_seat_hub().snapshot, user.showtime["showtime_id"])
+        user.free_seats = [seat for seat in ALL_SEATS if states.get(seat) != SEAT_BOOKED]
+        return OK
+
+    async def buy(self, user):
+        seats = user.pick_seats()
+        booking = dict(user.showtime, seats=seats, total_price=user.showtime["price"] * len(seats))
+        success, _, result = await self.call(create_booking, user.username, booking, str(uuid.uuid4()))
+        if success:
+            return OK
+        return CONFLICT if result["error"] in ("seats_taken", "insufficient_balance") else ERROR
+
+    async def topup(self, user):
+        success, _, _ = await self.call(top_up, user.username, TOP_UP_AMOUNT, "Load Test")
+        return OK if success else ERROR
+
+    async def history(self, user):
+        await self.call(BookingModel.get_history, user.username)
+        return OK
+
+    def disconnect(self):
+        pass
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+
+
+class HttpConnection:
+    """Klien HTTP/1.1 keep-alive minimal di atas asyncio streams"""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    async def _connect(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    async def request(self, method, path, body=None, headers=None):
+        for attempt in range(2):
+            try:
+                if self.writer is None:
+                    await self._connect()
+                return await self._request(method, path, body, headers or {})
+            except (ConnectionError, asyncio.IncompleteReadError):
+                self.close()
+                if attempt:
+                    raise
+
+    async def _request(self, method, path, body, headers):
+        payload = json.dumps(body).encode("utf-8") if body is not None else b""
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {self.host}:{self.port}", f"Content-Length: {len(payload)}"]
+        if body is not None:
+            lines.append("Content-Type: application/json")
+        lines.extend(f"{key}: {value}" for key, value in headers.items())
+        self.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + payload)
+        await self.writer.drain()
+
+        status_line = await self.reader.readuntil(b"\r\n")
+        status = int(status_line.split()[1])
+        response_headers = {}
+        while True:
+            line = await self.reader.readuntil(b"\r\n")
+            if line == b"\r\n":
+                break
+            key, _, value = line.decode("latin-1").partition(":")
+            response_headers[key.strip().lower()] = value.strip()
+
+        if response_headers.get("transfer-encoding") == "chunked":
+            data = bytearray()
+            while True:
+                size = int((await self.reader.readuntil(b"\r\n")).split(b";")[0], 16)
+                chunk = await self.reader.readexactly(size + 2)
+                if size == 0:
+                    break
+                data.extend(chunk[:-2])
+            data = bytes(data)
+        else:
+            data = await self.reader.readexactly(int(response_headers.get("content-length", 0)))
+
+        if response_headers.get("connection", "").lower() == "close":
+            self.close()
+        return status, data
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+
+class HttpBackend:
+    """Memanggil API Flask lewat HTTP (waitress di thread yang sama prosesnya)"""
+
+    name = "http"
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.connections = {}
+        self.tokens = {}
+
+    def _conn(self, user):
+        if user.username not in self.connections:
+            self.connections[user.username] = HttpConnection(self.host, self.port)
+        return self.connections[user.username]
+
+    def _auth(self, user):
+        return {"Authorization": f"Bearer {self.tokens.get(user.username, '')}"}
+
+    async def login(self, user):
+        if user.username in self.tokens:
+            return True
+        status, data = await self._conn(user).request(
+            "POST", "/api/auth/login", {"username": user.username, "password": PASSWORD}
+        )
+        if status == 200:
+            self.tokens[user.username] = json.loads(data)["token"]
+        return status == 200
+
+    async def browse(self, user):
+        movie = user.rng.choice(get_catalog().movies)
+        path = user.rng.choice([
+            "/api/catalog/movies",
+            f"/api/catalog/movies/{movie['id']}",
+            f"/api/catalog/showtimes?city=Jakarta&movie={movie['title'].replace(' ', '%20')}",
+            f"/api/catalog/recommendations?genre={movie.get('genre', '').split(',')[0].strip()}",
+        ])
+        status, _ = await self._conn(user).request("GET", path)
+        return OK if status == 200 else ERROR
+
+    async def seats(self, user):
+        user.showtime = user.rng.choice(user.showtimes)
+        status, data = await self._conn(user).request("GET", f"/api/seats/{user.showtime['showtime_id']}")
+        if status != 200:
+            return ERROR
+        states = json.loads(data)["seats"]
+        user.free_seats = [seat for seat in ALL_SEATS if states.get(seat) != SEAT_BOOKED]
+        return OK
+
+    async def buy(self, user):
+        body = {key: user.showtime[key] for key in
+                ("movie_id", "cinema", "theater", "studio_type", "show_date", "show_time")}
+        body["seats"] = user.pick_seats()
+        headers = dict(self._auth(user), **{"Idempotency-Key": str(uuid.uuid4())})
+        status, _ = await self._conn(user).request("POST", "/api/bookings", body, headers)
+        if status in (200, 201):
+            return OK
+        if status == 503:
+            return REJECTED
+        return CONFLICT if status in (402, 409) else ERROR
+
+    async def topup(self, user):
+        status, _ = await self._conn(user).request(
+            "POST", "/api/account/topup", {"amount": TOP_UP_AMOUNT, "payment_method": "Load Test"}, self._auth(user)
+        )
+        if status == 503:
+            return REJECTED
+        return OK if status == 200 else ERROR
+
+    async def history(self, user):
+        status, _ = await self._conn(user).request("GET", "/api/account/history?per_page=20", None, self._auth(user))
+        return OK if status == 200 else ERROR
+
+    def disconnect(self):
+        # Koneksi terikat ke event loop langkah ini; langkah berikutnya membuka yang baru
+        for conn in self.connections.values():
+            conn.close()
+        self.connections.clear()
+
+
+async def run_step(backend, clients, duration, mix, step, think_time):
+    showtimes = make_showtimes(step)
+    actions = list(mix)
+    weights = [mix[name] for name in actions]
+    stats = {name: {"latencies": [], OK: 0, CONFLICT: 0, REJECTED: 0, ERROR: 0} for name in actions}
+    purchases = []
+
+    users = [VirtualUser(i, showtimes, f"{backend.name}-{step}-{i}") for i in range(clients)]
+    logged_in = await asyncio.gather(*(backend.login(user) for user in users))
+    if not all(logged_in):
+        raise RuntimeError("Login pengguna uji gagal")
+
+    started = time.perf_counter()
+    deadline = started + duration
+
+    async def client(user):
+        while time.perf_counter() < deadline:
+            name = user.rng.choices(actions, weights)[0]
+            t0 = time.perf_counter()
+            try:
+                outcome = await getattr(backend, name)(user)
+            except Overloaded:
+                outcome = REJECTED
+            except Exception:
+                outcome = ERROR
+            elapsed_ms = (time.perf_counter() - t0) * 1000
+            stats[name]["latencies"].append(elapsed_ms)
+            stats[name][outcome] += 1
+            if name == "buy" and outcome == OK:
+                purchases.append(time.perf_counter() - started)
+            if think_time:
+                await asyncio.sleep(think_time)
+
+    try:
+        await asyncio.gather(*(client(user) for user in users))
+    finally:
+        backend.disconnect()
+    elapsed = time.perf_counter() - started
+
+    all_latencies = [ms for entry in stats.values() for ms in entry["latencies"]]
+    total = len(all_latencies)
+    errors = sum(entry[ERROR] for entry in stats.values())
+    return {
+        "clients": clients,
+        "duration_s": round(elapsed, 2),
+        "requests": total,
+        "throughput_rps": round(total / elapsed, 1),
+        "purchases_per_sec": round(len(purchases) / elapsed, 1),
+        "error_rate": round(errors / total, 4) if total else 0.0,
+        "rejected_rate": round(sum(entry[REJECTED] for entry in stats.values()) / total, 4) if total else 0.0,
+        "p50_ms": percentile(all_latencies, 50),
+        "p90_ms": percentile(all_latencies, 90),
+        "p99_ms": percentile(all_latencies, 99),
+        "actions": {
+            name: {
+                "count": len(entry["latencies"]),
+                "ok": entry[OK],
+                "conflicts": entry[CONFLICT],
+                "rejected": entry[REJECTED],
+                "errors": entry[ERROR],
+                "p50_ms": percentile(entry["latencies"], 50),
+                "p99_ms": percentile(entry["latencies"], 99),
+            }
+            for name, entry in stats.items()
+        },
+    }
+
+
+def run_curve(backend, client_steps, duration, mix, think_time, step_offset):
+    curve = []
+    for index, clients in enumerate(client_steps):
+        result = asyncio.run(run_step(backend, clients, duration, mix, step_offset + index, think_time))
+        print(f"[{backend.name}] {clients} klien: {result['throughput_rps']} req/s, "
+              f"{result['purchases_per_sec']} pembelian/s, p99 {result['p99_ms']} ms", flush=True)
+        curve.append(result)
+    return curve
+
+
+def start_http_server(threads):
+    from waitress.server import create_server
+    from server.app import create_app
+
+    logging.getLogger("waitress").setLevel(logging.ERROR)
+    # Top up lewat API hanya aktif untuk harness ini (lihat server/account.py)
+    server = create_server(create_app({"LOADTEST_TOPUP": True}), host="127.0.0.1", port=0, threads=threads,
+                           connection_limit=1000)
+    thread = threading.Thread(target=server.run, name="loadtest-server", daemon=True)
+    thread.start()
+    return server
+
+
+def check_invariants():
+    conn = get_db()
+    try:
+        double_sold = conn.execute("""
+            SELECT COUNT(*) FROM (
+                SELECT showtime_id, seats FROM issued_tickets WHERE seats NOT LIKE '%,%'
+                GROUP BY showtime_id, seats HAVING COUNT(*) > 1
+            )
+        """).fetchone()[0]
+        negative = conn.execute("SELECT COUNT(*) FROM users WHERE saldo < 0").fetchone()[0]
+        bookings = conn.execute("SELECT COUNT(*) FROM bookings").fetchone()[0]
+    finally:
+        conn.close()
+    return {"bookings": bookings, "double_sold_seats": double_sold, "negative_balances": negative}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test backend pemesanan tiket")
+    parser.add_argument("--mode", choices=("in_process", "http", "both"), default="both")
+    parser.add_argument("--clients", default="1,8,32", help="jumlah klien per langkah, pisahkan dengan koma")
+    parser.add_argument("--duration", type=float, default=5.0, help="detik per langkah")
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX, help="bobot aksi, mis. browse=40,buy=20")
+    parser.add_argument("--think-ms", type=float, default=0.0, help="jeda antar aksi per klien")
+    parser.add_argument("--server-threads", type=int, default=8)
+    parser.add_argument("--output", help="simpan hasil JSON ke file")
+    args = parser.parse_args(argv)
+
+    client_steps = [int(value) for value in args.clients.split(",") if value.strip()]
+    modes = ("in_process", "http") if args.mode == "both" else (args.mode,)
+    report = {
+        "config": {
+            "mode": args.mode,
+            "clients": client_steps,
+            "duration_s": args.duration,
+            "mix": args.mix,
+            "think_ms": args.think_ms,
+            "server_threads": args.server_threads,
+        }
+    }
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        models.DATABASE = os.path.join(tmp_dir, "loadtest.db")
+        init_db()
+        models.enable_wal()
+        seed_users(max(client_steps))
+
+        for offset, mode in enumerate(modes):
+            step_offset = offset * len(client_steps)
+            if mode == "in_process":
+                backend = InProcessBackend(max(client_steps))
+                report["in_process"] = {"curve": run_curve(
+                    backend, client_steps, args.duration, args.mix, args.think_ms / 1000, step_offset)}
+                backend.close()
+            else:
+                server = start_http_server(args.server_threads)
+                backend = HttpBackend("127.0.0.1", server.effective_port)
+                try:
+                    report["http"] = {"curve": run_curve(
+                        backend, client_steps, args.duration, args.mix, args.think_ms / 1000, step_offset)}
+                finally:
+                    server.close()
+
+        report["invariants"] = check_invariants()
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Worker autentikasi: login dan registrasi (bcrypt) di luar thread GUI.
+
+Hash bcrypt butuh ratusan milidetik; dijalankan di QThreadPool sehingga
+event loop Qt tetap menggambar ulang jendela. Hasil dikirim lewat signal
+(queued ke thread GUI). cancel() dipanggil saat jendela ditutup: tugas yang
+masih antre dibuang dan hasil tugas yang sedang jalan diabaikan, tetapi
+worker tetap busy sampai tugas itu benar-benar selesai (thread pool dan
+database masih dipakai).
+"""
+
+import traceback
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from models import UserModel
+from utils.password_hashing import register_users, DEFAULT_ROUNDS
+
+
+class _TaskSignals(QObject):
+    finished = pyqtSignal(int, object)  # id tugas, tuple hasil dari UserModel
+
+
+class _AuthTask(QRunnable):
+    def __init__(self, task_id, kind, func, args):
+        super().__init__()
+        self.task_id = task_id
+        self.kind = kind
+        self.func = func
+        self.args = args
+        self.signals = _TaskSignals()
+        self.cancelled = False
+        # Objek dipegang AuthWorker sampai signal finished diterima (bukan dihapus pool)
+        self.setAutoDelete(False)
+
+    def run(self):
+        result = None
+        if not self.cancelled:
+            try:
+                result = self.func(*self.args)
+            except Exception as e:
+                traceback.print_exc()
+                result = (False, f"Error: {str(e)}", None)
+        # Selalu dikirim agar AuthWorker bisa melepas tugas; hasil tugas batal diabaikan
+        self.signals.finished.emit(self.task_id, result)
+
+
+class AuthWorker(QObject):
+    """Menjalankan UserModel.login_user / register_user di thread pool"""
+
+    login_finished = pyqtSignal(bool, str, object)  # success, pesan, data user
+    register_finished = pyqtSignal(bool, str)
+    bulk_register_finished = pyqtSignal(bool, str, object)  # success, pesan, {registered, skipped}
+    busy_changed = pyqtSignal(bool)
+
+    def __init__(self, bcrypt, parent=None):
+        super().__init__(parent)
+        self.bcrypt = bcrypt
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(2)
+        self._tasks = {}
+        self._next_id = 0
+
+    def is_busy(self):
+        # Tugas batal yang masih berjalan tetap dihitung sampai signal finished-nya diterima
+        return bool(self._tasks)
+
+    def _start(self, kind, func, *args):
+        self._next_id += 1
+        task = _AuthTask(self._next_id, kind, func, args)
+        task.signals.finished.connect(self._on_finished)
+        was_busy = self.is_busy()
+        self._tasks[task.task_id] = task
+        if not was_busy:
+            self.busy_changed.emit(True)
+        self.pool.start(task)
+
+    def login(self, username, password):
+        self._start("login", UserModel.login_user, username, password, self.bcrypt)
+
+    def register(self, nama, username, password, usia, genre_favorit):
+        self._start("register", UserModel.register_user, nama, username, password, usia, genre_favorit,
+                    self.bcrypt)
+
+    def register_many(self, users, use_processes=True):
+        """Enrollment massal; hash dibuat di process pool (utils.password_hashing)"""
+        rounds = getattr(self.bcrypt, "_log_rounds", DEFAULT_ROUNDS)
+        self._start("bulk_register", register_users, users, rounds, use_processes)
+
+    def cancel(self):
+        """Batalkan semua tugas (dipanggil saat jendela ditutup)"""
+        was_busy = self.is_busy()
+        for task_id, task in list(self._tasks.items()):
+            task.cancelled = True
+            # Yang belum mulai dibuang dari antrean; yang sedang jalan (bcrypt tidak bisa
+            # disela) dilepas saat selesai
+            if self.pool.tryTake(task):
+                del self._tasks[task_id]
+        if was_busy and not self.is_busy():
+            self.busy_changed.emit(False)
+
+    def _on_finished(self, task_id, result):
+        task = self._tasks.pop(task_id, None)
+        if task is None:
+            return
+        if not self.is_busy():
+            self.busy_changed.emit(False)
+        if task.cancelled:
+            return
+
+        if task.kind == "login":
+            self.login_finished.emit(result[0], result[1], result[2] if len(result) > 2 else None)
+        elif task.kind == "register":
+            self.register_finished.emit(result[0], result[1])
+        else:
+            self.bulk_register_finished.emit(result[0], result[1], result[2])
@@ -6,51 +6,17 @@ from PyQt5.QtGui import QFont, QPixmap, QIcon, QColor, QPalette
 from PyQt5.QtCore import Qt, pyqtSignal, QSize, QDateTime, QDate
 import os
 import json
-from models import UserModel
-from utils.helper import find_poster_for_film
+import uuid
+from utils.helper import find_poster_for_film, get_showtime_id
 from utils.dialog_styles import setup_message_box
-
-# Data bioskop per kota
-CINEMA_DATA = {
-    "Jakarta": [
-        "CGV Grand Indonesia",
-        "XXI Plaza Indonesia",
-        "XXI Kota Kasablanka",
-        "CGV Central Park",
-        "Cinema 21 Mall Taman Anggrek"
-    ],
-    "Bandung": [
-        "CGV Paris Van Java",
-        "XXI Cihampelas Walk",
-        "CGV BEC Mall",
-        "XXI Trans Studio Mall",
-        "Cinema 21 Bandung Trade Center"
-    ],
-    "Surabaya": [
-        "CGV Tunjungan Plaza",
-        "XXI Pakuwon Mall",
-        "Cinema 21 Grand City",
-        "XXI Royal Plaza",
-        "CGV Marvell City"
-    ],
-    "Yogyakarta": [
-        "CGV Hartono Mall",
-        "XXI Ambarrukmo Plaza",
-        "CGV J-Walk",
-        "XXI Sleman City Hall",
-        "Cinema 21 Jogja City Mall"
-    ],
-    "Bali": [
-        "XXI Beachwalk",
-        "CGV Plaza Renon",
-        "XXI Park 23",
-        "XXI Level 21",
-        "Cinema 21 Galeria Bali"
-    ]
-}
-
-# Daftar teater
-THEATER_NUMBERS = ["Teater 1", "Teater 2", "Teater 3", "Teater 4", "Teater 5"]
+from utils.catalog import CINEMA_DATA, THEATER_NUMBERS, STUDIO_TYPES, ticket_price
+from gui.repository import get_repository
+from gui.poster_cache import get_poster_cache, BOOKING_SIZE
+from gui.event_dispatch import get_gui_event_bus
+from utils.events import TicketPurchased
+from utils.booking_service import request_hash
+from utils.qr_payload import seat_to_index
+from utils.seat_hub import get_seat_hub, SEAT_BOOKED
 
 class SeatButton(QPushButton):
     """Custom button untuk pemilihan kursi"""
@@ -134,7 +100,7 @@ class BookingPage(QWidget):
     
     back_to_detail = pyqtSignal()
     booking_confirmed = pyqtSignal(dict)
-    payment_processed = pyqtSignal(dict)  # Signal baru untuk menandakan pembayaran berhasil
+    seat_states_changed = pyqtSignal(object, list)  # showtime_id, delta (versi, kursi, status) dari SeatHub
     
     def __init__(self, user_data=None):
         super().__init__()
@@ -142,6 +108,12 @@ class BookingPage(QWidget):
         self.movie_data = None
         self.selected_seats = []
         self.total_price = 0
+        self.showtime_id = None
+        self.seat_hub = get_seat_hub()
+        self._setting_up = False  # combo yang diisi ulang tidak memuat kursi jadwal antara
+        self._idempotency_key = None
+        self._idempotency_hash = None
+        self.seat_states_changed.connect(self.on_seat_states_changed)
         self.init_ui()
         
     def init_ui(self):
@@ -326,7 +298,7 @@ class BookingPage(QWidget):
         # Tipe Studio
         studio_label = QLabel("Tipe Studio:")
         self.studio_combo = QComboBox()
-        self.studio_combo.addItems(["Regular", "VIP"])
+        self.studio_combo.addItems(STUDIO_TYPES)
         self.studio_combo.currentTextChanged.connect(self.on_studio_changed)
         form_layout.addWidget(studio_label, 5, 0)
         form_layout.addWidget(self.studio_combo, 5, 1)
@@ -535,6 +507,10 @@ class BookingPage(QWidget):
         
         content_layout.addWidget(self.confirm_button)
         
+        # Status kursi mengikuti jadwal tayang yang dipilih
+        for combo in (self.cinema_combo, self.theater_combo, self.schedule_combo, self.time_combo):
+            combo.currentTextChanged.connect(self.refresh_seat_states)
+        
         # Set scroll area content
         scroll_area.setWidget(content_container)
         main_layout.addWidget(scroll_area)
@@ -549,43 +525,117 @@ class BookingPage(QWidget):
         # Set poster
         poster_path = movie_data.get("poster_path")
         if poster_path and os.path.exists(poster_path):
-            pixmap = QPixmap(poster_path)
-            self.poster_label.setPixmap(pixmap.scaled(
-                self.poster_label.width(),
-                self.poster_label.height(),
-                Qt.KeepAspectRatio,
-                Qt.SmoothTransformation
-            ))
+            pixmap = get_poster_cache().pixmap(poster_path, *BOOKING_SIZE)
+            if pixmap is not None:
+                self.poster_label.setPixmap(pixmap)
         
         # Set informasi film
         self.title_label.setText(movie_data["title"])
         self.info_label.setText(f"{movie_data['genre']} • {movie_data['duration']} menit")
         
-        # Set jadwal
-        self.schedule_combo.clear()
-        if isinstance(movie_data.get("schedule"), list):
-            self.schedule_combo.addItems(movie_data["schedule"])
-        
-        # Update cinema list based on selected city
-        self.on_city_changed(self.city_combo.currentText())
+        # Set jadwal dan daftar bioskop; status kursi dimuat sekali untuk jadwal akhirnya
+        self._setting_up = True
+        try:
+            self.schedule_combo.clear()
+            if isinstance(movie_data.get("schedule"), list):
+                self.schedule_combo.addItems(movie_data["schedule"])
+            
+            # Update cinema list based on selected city
+            self.on_city_changed(self.city_combo.currentText())
+        finally:
+            self._setting_up = False
+        self.refresh_seat_states()
+        
+    def reset_selection(self):
+        """Kosongkan pilihan kursi dan idempotency key (pengguna kiosk berikutnya)"""
+        for row in self.seat_buttons:
+            for button in row:
+                if button.is_selected:
+                    button.is_selected = False
+                    button.update_style()
+        self._idempotency_key = None
+        self._idempotency_hash = None
+        self.update_booking_summary()
         
     def on_city_changed(self, city):
         """Handler when city is changed"""
         self.cinema_combo.clear()
-        cinemas = {
-            "Jakarta": ["CGV Grand Indonesia", "XXI Plaza Indonesia", "CGV Pacific Place"],
-            "Bandung": ["CGV Paris Van Java", "XXI Cihampelas Walk", "CGV BEC Mall"],
-            "Surabaya": ["CGV Tunjungan Plaza", "XXI Galaxy Mall", "CGV Grand City"],
-            "Medan": ["CGV Center Point", "XXI Sun Plaza", "CGV Ring Road"],
-            "Makassar": ["CGV Trans Studio", "XXI Mall Ratu Indah", "CGV Nipah Mall"]
-        }
-        self.cinema_combo.addItems(cinemas.get(city, []))
+        self.cinema_combo.addItems(CINEMA_DATA.get(city, []))
         
     def on_cinema_changed(self, cinema):
         """Handler when cinema is changed"""
         self.theater_combo.clear()
-        theaters = [f"Theater {i}" for i in range(1, 6)]
-        self.theater_combo.addItems(theaters)
+        self.theater_combo.addItems(THEATER_NUMBERS)
+        
+    def predicted_showtime(self, movie_data):
+        """Jadwal yang akan terpilih jika setup_for_movie(movie_data) dipanggil sekarang (untuk prefetch)"""
+        cinemas = CINEMA_DATA.get(self.city_combo.currentText(), [])
+        schedules = movie_data.get("schedule")
+        return {
+            "movie_title": movie_data.get("title", ""),
+            "cinema": cinemas[0] if cinemas else "",
+            "theater": THEATER_NUMBERS[0],
+            "show_date": schedules[0] if isinstance(schedules, list) and schedules else "",
+            "show_time": self.time_combo.currentText()
+        }
+    
+    def current_showtime(self):
+        """Data jadwal tayang yang sedang dipilih (dipakai untuk showtime_id)"""
+        return {
+            "movie_title": self.movie_data["title"] if self.movie_data else "",
+            "cinema": self.cinema_combo.currentText(),
+            "theater": self.theater_combo.currentText(),
+            "show_date": self.schedule_combo.currentText(),
+            "show_time": self.time_combo.currentText()
+        }
+    
+    def refresh_seat_states(self, *args):
+        """Muat status kursi jadwal yang dipilih dan ikuti perubahannya dari SeatHub"""
+        if self.movie_data is None or self._setting_up:
+            return
+        
+        showtime_id = get_showtime_id(self.current_showtime())
+        if showtime_id != self.showtime_id:
+            if self.showtime_id is not None:
+                self.seat_hub.remove_listener(self.showtime_id, self.on_seat_hub_changed)
+            self.showtime_id = showtime_id
+            self.seat_hub.add_listener(showtime_id, self.on_seat_hub_changed)
+        
+        _, states = self.seat_hub.snapshot(showtime_id)
+        for row in range(10):
+            for col in range(10):
+                button = self.seat_buttons[row][col]
+                booked = states.get(f"{chr(65+row)}{col+1}") == SEAT_BOOKED
+                if booked != button.is_booked:
+                    button.is_booked = booked
+                    button.is_selected = button.is_selected and not booked
+                    button.setEnabled(not booked)
+                    button.update_style()
+        self.update_booking_summary()
+    
+    def on_seat_hub_changed(self, showtime_id, deltas):
+        """Dipanggil di thread publisher; teruskan ke thread GUI lewat signal"""
+        self.seat_states_changed.emit(showtime_id, deltas)
+    
+    def on_seat_states_changed(self, showtime_id, deltas):
+        """Terapkan delta kursi dari kiosk lain ke grid"""
+        if showtime_id != self.showtime_id:
+            return
+        changed = False
+        for _, seat, state in deltas:
+            index = seat_to_index(seat)
+            if index is None:
+                continue
+            button = self.seat_buttons[index // 10][index % 10]
+            booked = state == SEAT_BOOKED
+            if booked != button.is_booked:
+                button.is_booked = booked
+                button.is_selected = button.is_selected and not booked
+                button.setEnabled(not booked)
+                button.update_style()
+                changed = True
+        if changed:
+            self.update_booking_summary()
         
     def on_seat_clicked(self):
         """Handler when a seat is clicked"""
@@ -608,9 +658,7 @@ class BookingPage(QWidget):
             self.tickets_count_label.setText(str(len(self.selected_seats)))
             
             # Calculate total price
-            base_price = self.movie_data.get("price", 0)
-            vip_additional = 50000 if self.studio_combo.currentText() == "VIP" else 0
-            self.total_price = (base_price + vip_additional) * len(self.selected_seats)
+            self.total_price = ticket_price(self.movie_data, self.studio_combo.currentText()) * len(self.selected_seats)
             self.total_price_label.setText(f"Rp {self.total_price:,}".replace(',', '.'))
             
             # Enable confirm button
@@ -661,64 +709,121 @@ class BookingPage(QWidget):
         confirm_msg.setDefaultButton(QMessageBox.No)
         
         if confirm_msg.exec_() == QMessageBox.Yes:
-            # Process payment
-            success, message, new_saldo = UserModel.update_saldo(
-                self.user_data['username'],
-                -self.total_price
-            )
+            # Data pemesanan sesuai pilihan saat ini
+            ticket_data = {
+                "movie_title": self.movie_data["title"],
+                "cinema": self.cinema_combo.currentText(),
+                "theater": self.theater_combo.currentText(),
+                "studio_type": self.studio_combo.currentText(),
+                "seats": self.selected_seats,
+                "total_price": self.total_price,
+                "show_date": self.schedule_combo.currentText(),
+                "show_time": self.time_combo.currentText()
+            }
             
-            if success:
-                # Update user data
-                self.user_data['saldo'] = new_saldo
-                
-                # Prepare ticket data
-                ticket_data = {
-                    "movie_title": self.movie_data["title"],
-                    "cinema": self.cinema_combo.currentText(),
-                    "theater": self.theater_combo.currentText(),
-                    "studio_type": self.studio_combo.currentText(),
-                    "seats": self.selected_seats,
-                    "total_price": self.total_price,
-                    "show_date": self.schedule_combo.currentText(),
-                    "show_time": self.time_combo.currentText(),
-                    "status": "Sukses",
-                    "timestamp": QDateTime.currentDateTime().toString("dd/MM/yyyy HH:mm")
-                }
-                
-                # Show success message
-                success_msg = QMessageBox(self)
-                setup_message_box(success_msg,
-                                "Pembelian Berhasil",
-                                "Tiket berhasil dipesan!",
-                                "Anda dapat melihat detail pembelian di halaman History.",
-                                QMessageBox.Information)
-                success_msg.exec_()
-                
-                # Emit booking confirmed signal for e-ticket
-                self.booking_confirmed.emit(ticket_data)
-                
-                # Clear any existing ticket processed flag
-                if hasattr(self, '_ticket_processed'):
-                    delattr(self, '_ticket_processed')
-                
-                # Emit payment processed signal for history and balance update
-                self.payment_processed.emit({
-                    "new_saldo": new_saldo,
-                    "ticket_data": ticket_data
-                })
-                
-                # Go back to movie detail
-                self.back_to_detail.emit()
-            else:
-                # Show error message
-                error_msg = QMessageBox(self)
-                setup_message_box(error_msg,
-                                "Pembelian Gagal",
-                                "Terjadi kesalahan saat memproses pembayaran.",
-                                message,
-                                QMessageBox.Critical)
-                error_msg.exec_()
+            # Pengguna dicatat sekarang: di mode kiosk user_data bisa berganti sebelum hasil tiba
+            username = self.user_data['username']
+            
+            # Key yang sama dipakai ulang jika pembelian yang sama dicoba lagi setelah gagal
+            booking_hash = request_hash(username, ticket_data)
+            if self._idempotency_key is None or booking_hash != self._idempotency_hash:
+                self._idempotency_key = str(uuid.uuid4())
+                self._idempotency_hash = booking_hash
+            
+            # Reservasi kursi, potong saldo, riwayat dan tiket dalam satu transaksi (thread DB)
+            self.set_processing(True)
+            get_repository().create_booking(
+                username,
+                ticket_data,
+                self._idempotency_key,
+                on_result=lambda outcome: self.on_booking_finished(ticket_data, outcome, username),
+                on_error=lambda error: self.on_booking_finished(
+                    # DB sibuk / antrean pembayaran penuh: key dipertahankan agar percobaan ulang tidak dobel
+                    ticket_data, (False, str(error), {"error": "overloaded"}), username
+                )
+            )
     
+    def set_processing(self, processing):
+        """Tombol konfirmasi nonaktif selama pembelian diproses"""
+        self.confirm_button.setEnabled(not processing and bool(self.selected_seats))
+        self.confirm_button.setText("Memproses..." if processing else "Konfirmasi Pesanan")
+    
+    def on_booking_finished(self, ticket_data, outcome, username):
+        """Hasil pembelian dari thread DB untuk pengguna yang menekan konfirmasi"""
+        self.set_processing(False)
+        success, message, result = outcome
+        
+        # Hasil yang tiba setelah pengguna kiosk berganti milik pengguna sebelumnya:
+        # saldo, pesan dan e-tiket tidak untuk pengguna ini. Pembelian sudah tercatat
+        # di database dan masuk riwayat pembeli saat ia login lagi (merge_db_history).
+        if username != self.user_data.get('username'):
+            if success:
+                self._idempotency_key = None
+            print(f"Hasil pembelian untuk {username} diabaikan: pengguna kiosk sudah berganti")
+            return
+        
+        if success:
+            self._idempotency_key = None
+            new_saldo = result["new_saldo"]
+            
+            # Update user data
+            self.user_data['saldo'] = new_saldo
+            
+            # Tiket sudah dibayar dan diterbitkan oleh layanan pemesanan
+            ticket_data.update({
+                "status": "Sukses",
+                "payment_status": "PAID",
+                "booking_id": result["booking_id"],
+                "transaction_id": result["booking_id"],
+                "ticket_id": result["ticket_id"],
+                "ticket_ids": result["ticket_ids"],
+                "timestamp": QDateTime.currentDateTime().toString("dd/MM/yyyy HH:mm")
+            })
+            
+            # Show success message
+            success_msg = QMessageBox(self)
+            setup_message_box(success_msg,
+                            "Pembelian Berhasil",
+                            "Tiket berhasil dipesan!",
+                            "Anda dapat melihat detail pembelian di halaman History.",
+                            QMessageBox.Information)
+            success_msg.exec_()
+            
+            # Emit booking confirmed signal for e-ticket
+            self.booking_confirmed.emit(ticket_data)
+            
+            # Satu event untuk saldo dan riwayat; booking_id mencegah pencatatan ganda
+            get_gui_event_bus().publish(TicketPurchased(
+                username=username,
+                new_saldo=new_saldo,
+                transaction_id=result["booking_id"],
+                ticket_id=result["ticket_id"],
+                movie_title=ticket_data["movie_title"],
+                cinema=ticket_data["cinema"],
+                theater=ticket_data["theater"],
+                studio_type=ticket_data["studio_type"],
+                seats=list(ticket_data["seats"]),
+                show_date=ticket_data["show_date"],
+                show_time=ticket_data["show_time"],
+                total_price=ticket_data["total_price"]
+            ))
+            
+            # Go back to movie detail
+            self.back_to_detail.emit()
+        else:
+            # Show error message
+            error_msg = QMessageBox(self)
+            setup_message_box(error_msg,
+                            "Pembelian Gagal",
+                            "Terjadi kesalahan saat memproses pembayaran.",
+                            message,
+                            QMessageBox.Critical)
+            error_msg.exec_()
+
+            # Kursi diambil kiosk lain: tampilkan status terbaru
+            if result.get("error") == "seats_taken":
+                self.refresh_seat_states()
+
     def on_back_clicked(self):
         """Handler ketika tombol kembali diklik"""
         self.back_to_detail.emit()
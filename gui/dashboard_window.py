@@ -12,22 +12,51 @@ from gui.movies_page import MoviesPage
 from gui.food_page import FoodPage
 from gui.topup_page import TopUpPage
 from gui.history_page import HistoryPage
-from models import UserModel, MovieModel
+from models import MovieModel
+from gui.repository import get_repository
+from gui.poster_cache import get_poster_cache, CARD_SIZE
+from gui.prefetch import get_prefetcher
+from gui.event_dispatch import get_gui_event_bus
+from gui.shadows import attach_shadow, render_mode, RENDER_LITE
+from utils.event_bus import QUEUED
+from utils.events import BalanceEvent, TicketPurchased, FoodOrdered, ToppedUp
 from utils.helper import find_poster_for_film
+from utils.metrics import ACTIVE_PAGE
+
+# Mode kiosk (TIKET_KIOSK=1): satu DashboardWindow dipakai bergantian oleh banyak pengguna
+KIOSK_ENV = "TIKET_KIOSK"
+
+_kiosk_dashboard = None
+
+def kiosk_mode():
+    return os.environ.get(KIOSK_ENV, "0") not in ("", "0")
+
+def open_dashboard(user_data, login_window=None):
+    """Dashboard untuk pengguna yang baru login
+
+    Di mode kiosk window yang sama dipakai ulang: halaman, stylesheet dan
+    gambar tetap, hanya data pengguna yang diganti (set_user).
+    """
+    global _kiosk_dashboard
+    if not kiosk_mode():
+        return DashboardWindow(user_data)
+    if _kiosk_dashboard is None:
+        _kiosk_dashboard = DashboardWindow(user_data)
+    else:
+        _kiosk_dashboard.set_user(user_data)
+    _kiosk_dashboard.login_window = login_window
+    return _kiosk_dashboard
 
 class AnimatedWidget(QWidget):
     """Widget dengan dukungan animasi"""
     def __init__(self, parent=None):
         super().__init__(parent)
         self._animations = {}
+        self._shadow = None
         
-    def add_shadow_effect(self, blur_radius=10, x_offset=0, y_offset=4, color=QColor(0, 0, 0, 60)):
-        """Menambahkan efek bayangan"""
-        shadow = QGraphicsDropShadowEffect(self)
-        shadow.setBlurRadius(blur_radius)
-        shadow.setOffset(x_offset, y_offset)
-        shadow.setColor(color)
-        self.setGraphicsEffect(shadow)
+    def add_shadow_effect(self, blur_radius=10, x_offset=0, y_offset=4, color=QColor(0, 0, 0, 60), radius=12):
+        """Menambahkan efek bayangan (drop shadow Qt, atau nine-patch ter-cache di mode lite)"""
+        self._shadow = attach_shadow(self, blur_radius, x_offset, y_offset, color, radius)
         
     def add_hover_animation(self, property_name, start_value, end_value, duration=200):
         """Menambahkan animasi hover"""
@@ -40,21 +69,31 @@ class AnimatedWidget(QWidget):
         
     def enterEvent(self, event):
         """Handler saat mouse masuk widget"""
-        for animation in self._animations.values():
-            animation.setDirection(QPropertyAnimation.Forward)
-            animation.start()
+        if render_mode() == RENDER_LITE:
+            # Mode lite: glow bayangan, geometri tidak dianimasikan
+            if self._shadow is not None:
+                self._shadow.set_highlighted(True)
+        else:
+            for animation in self._animations.values():
+                animation.setDirection(QPropertyAnimation.Forward)
+                animation.start()
         super().enterEvent(event)
         
     def leaveEvent(self, event):
         """Handler saat mouse keluar widget"""
-        for animation in self._animations.values():
-            animation.setDirection(QPropertyAnimation.Backward)
-            animation.start()
+        if self._shadow is not None:
+            self._shadow.set_highlighted(False)
+        if render_mode() != RENDER_LITE:
+            for animation in self._animations.values():
+                animation.setDirection(QPropertyAnimation.Backward)
+                animation.start()
         super().leaveEvent(event)
 
 class MovieCard(AnimatedWidget):
     """Widget untuk menampilkan film"""
     clicked = pyqtSignal(dict)
+    hovered = pyqtSignal(dict)
+    unhovered = pyqtSignal(dict)
     
     def __init__(self, movie_data, parent=None):
         super().__init__(parent)
@@ -62,7 +101,7 @@ class MovieCard(AnimatedWidget):
         self.init_ui()
         
         # Tambahkan efek bayangan
-        self.add_shadow_effect(blur_radius=15, y_offset=4)
+        self.add_shadow_effect(blur_radius=15, y_offset=4, radius=12)
         
         # Tambahkan animasi hover
         self.add_hover_animation(b"pos", QPoint(0, 0), QPoint(0, -5))
@@ -107,8 +146,10 @@ class MovieCard(AnimatedWidget):
         
         # Load poster image
         poster_path = self.movie_data.get("poster_path", "")
+        pixmap = None
         if poster_path and os.path.exists(poster_path):
-            pixmap = QPixmap(poster_path)
+            pixmap = get_poster_cache().pixmap(poster_path, *CARD_SIZE)
+        if pixmap is not None:
             poster_label.setPixmap(pixmap)
         else:
             # Default poster jika tidak ada
@@ -188,12 +229,21 @@ class MovieCard(AnimatedWidget):
     def mousePressEvent(self, event):
         self.clicked.emit(self.movie_data)
         super().mousePressEvent(event)
+    
+    def enterEvent(self, event):
+        self.hovered.emit(self.movie_data)
+        super().enterEvent(event)
+    
+    def leaveEvent(self, event):
+        self.unhovered.emit(self.movie_data)
+        super().leaveEvent(event)
 
 class DashboardWindow(QMainWindow):
     def __init__(self, user_data):
         super().__init__()
         self.user_data = user_data
         self.recommendations = []
+        self.login_window = None
         self.setWindowTitle("CinemaTIX - Sistem Pemesanan Tiket Bioskop")
         self.setGeometry(100, 100, 900, 600)
         self.init_ui()
@@ -254,11 +304,7 @@ class DashboardWindow(QMainWindow):
         """)
         
         # Add shadow effect to navbar
-        navbar_shadow = QGraphicsDropShadowEffect()
-        navbar_shadow.setBlurRadius(20)
-        navbar_shadow.setColor(QColor(0, 0, 0, 80))
-        navbar_shadow.setOffset(5, 0)
-        navbar_widget.setGraphicsEffect(navbar_shadow)
+        attach_shadow(navbar_widget, blur_radius=20, x_offset=5, y_offset=0, color=QColor(0, 0, 0, 80), radius=0)
         
         navbar_layout = QVBoxLayout(navbar_widget)
         navbar_layout.setContentsMargins(0, 0, 0, 0)
@@ -331,7 +377,10 @@ class DashboardWindow(QMainWindow):
             margin-bottom: 5px;
         """)
         
-        current_saldo = self.user_data.get('saldo', UserModel.get_saldo(self.user_data['username']))
+        # Saldo dari data login; jika belum ada diambil dari database di thread DB
+        current_saldo = self.user_data.get('saldo', 0)
+        if 'saldo' not in self.user_data:
+            get_repository().get_saldo(self.user_data['username'], on_result=self.update_saldo_display)
         self.user_data['saldo'] = current_saldo
         
         self.saldo_value_label = QLabel(f"Rp {current_saldo:,}".replace(',', '.'))
@@ -510,8 +559,8 @@ class DashboardWindow(QMainWindow):
             welcome_pixmap = QPixmap(welcome_icon_path)
             welcome_icon.setPixmap(welcome_pixmap.scaled(32, 32, Qt.KeepAspectRatio, Qt.SmoothTransformation))
         
-        welcome_text = QLabel(f"Selamat datang, {self.user_data['nama']}!")
-        welcome_text.setStyleSheet("""
+        self.welcome_label = QLabel(f"Selamat datang, {self.user_data['nama']}!")
+        self.welcome_label.setStyleSheet("""
             color: #FFFFFF;
             font-size: 28px;
             font-weight: 600;
@@ -519,7 +568,7 @@ class DashboardWindow(QMainWindow):
         """)
         
         welcome_container_layout.addWidget(welcome_icon)
-        welcome_container_layout.addWidget(welcome_text)
+        welcome_container_layout.addWidget(self.welcome_label)
         welcome_container_layout.addStretch()
         
         welcome_layout.addWidget(welcome_container)
@@ -552,11 +601,7 @@ class DashboardWindow(QMainWindow):
         """)
         
         # Add shadow effect
-        card_shadow = QGraphicsDropShadowEffect()
-        card_shadow.setBlurRadius(20)
-        card_shadow.setColor(QColor(0, 0, 0, 60))
-        card_shadow.setOffset(0, 4)
-        saldo_card.setGraphicsEffect(card_shadow)
+        attach_shadow(saldo_card, blur_radius=20, y_offset=4, radius=15)
         
         saldo_card_layout = QVBoxLayout(saldo_card)
         saldo_card_layout.setSpacing(15)
@@ -625,11 +670,7 @@ class DashboardWindow(QMainWindow):
         """)
         
         # Add shadow effect
-        user_card_shadow = QGraphicsDropShadowEffect()
-        user_card_shadow.setBlurRadius(20)
-        user_card_shadow.setColor(QColor(0, 0, 0, 60))
-        user_card_shadow.setOffset(0, 4)
-        user_card.setGraphicsEffect(user_card_shadow)
+        attach_shadow(user_card, blur_radius=20, y_offset=4, radius=15)
         
         user_card_layout = QVBoxLayout(user_card)
         user_card_layout.setSpacing(15)
@@ -663,18 +704,18 @@ class DashboardWindow(QMainWindow):
             margin-top: 5px;
         """
         
-        username_label = QLabel(f"Username: {self.user_data['username']}")
-        username_label.setStyleSheet(user_info_style)
+        self.username_label = QLabel(f"Username: {self.user_data['username']}")
+        self.username_label.setStyleSheet(user_info_style)
         
-        usia_label = QLabel(f"Usia: {self.user_data['usia']} tahun")
-        usia_label.setStyleSheet(user_info_style)
+        self.usia_label = QLabel(f"Usia: {self.user_data['usia']} tahun")
+        self.usia_label.setStyleSheet(user_info_style)
         
-        genre_label = QLabel(f"Genre Favorit: {self.user_data['genre_favorit']}")
-        genre_label.setStyleSheet(user_info_style)
+        self.genre_label = QLabel(f"Genre Favorit: {self.user_data['genre_favorit']}")
+        self.genre_label.setStyleSheet(user_info_style)
         
-        user_card_layout.addWidget(username_label)
-        user_card_layout.addWidget(usia_label)
-        user_card_layout.addWidget(genre_label)
+        user_card_layout.addWidget(self.username_label)
+        user_card_layout.addWidget(self.usia_label)
+        user_card_layout.addWidget(self.genre_label)
         
         # Add cards to layout
         info_cards_layout.addWidget(saldo_card)
@@ -694,11 +735,7 @@ class DashboardWindow(QMainWindow):
         """)
         
         # Add shadow effect
-        rec_shadow = QGraphicsDropShadowEffect()
-        rec_shadow.setBlurRadius(20)
-        rec_shadow.setColor(QColor(0, 0, 0, 60))
-        rec_shadow.setOffset(0, 4)
-        rec_frame.setGraphicsEffect(rec_shadow)
+        attach_shadow(rec_frame, blur_radius=20, y_offset=4, radius=15)
         
         rec_layout = QVBoxLayout(rec_frame)
         rec_layout.setSpacing(25)
@@ -725,39 +762,32 @@ class DashboardWindow(QMainWindow):
         rec_layout.addLayout(rec_header)
         
         # Recommendations subtitle
-        rec_subtitle = QLabel(f"Berdasarkan genre favorit Anda: {self.user_data['genre_favorit']}")
-        rec_subtitle.setStyleSheet("""
+        self.rec_subtitle = QLabel(f"Berdasarkan genre favorit Anda: {self.user_data['genre_favorit']}")
+        self.rec_subtitle.setStyleSheet("""
             color: #B3B3B3;
             font-size: 14px;
             font-weight: 400;
             margin-bottom: 10px;
         """)
-        rec_layout.addWidget(rec_subtitle)
+        rec_layout.addWidget(self.rec_subtitle)
         
-        # Movie recommendations grid
-        rec_grid = QHBoxLayout()
-        rec_grid.setSpacing(20)
+        # Movie recommendations grid (diisi populate_recommendations, juga saat ganti pengguna)
+        self.rec_grid = QHBoxLayout()
+        self.rec_grid.setSpacing(20)
         
-        recommended_movies = self.get_recommended_movies()
+        self.rec_placeholder = QLabel()
+        self.rec_placeholder.setStyleSheet("""
+            color: #888888;
+            font-size: 14px;
+            font-style: italic;
+            padding: 20px 0;
+        """)
+        rec_layout.addWidget(self.rec_placeholder)
         
-        if recommended_movies:
-            for movie in recommended_movies[:3]:
-                movie_card = MovieCard(movie)
-                movie_card.clicked.connect(self.on_recommended_movie_clicked)
-                # Remove the hover animation effect for dashboard cards
-                movie_card._animations.clear()  # Clear all animations
-                rec_grid.addWidget(movie_card)
-        else:
-            rec_placeholder = QLabel(f"Tidak ada film {self.user_data['genre_favorit']} yang tersedia saat ini.")
-            rec_placeholder.setStyleSheet("""
-                color: #888888;
-                font-size: 14px;
-                font-style: italic;
-                padding: 20px 0;
-            """)
-            rec_layout.addWidget(rec_placeholder)
+        self.rec_titles = None
+        self.populate_recommendations()
         
-        rec_layout.addLayout(rec_grid)
+        rec_layout.addLayout(self.rec_grid)
         
         # Browse all movies button
         browse_movies_button = QPushButton("Jelajahi Semua Film")
@@ -788,11 +818,6 @@ class DashboardWindow(QMainWindow):
         
         # Add other pages
         self.movies_page = MoviesPage(self.user_data)
-        if hasattr(self.movies_page, 'switch_page_signal'):
-            self.movies_page.switch_page_signal.connect(self.handle_page_signals)
-        if hasattr(self.movies_page, 'ticket_purchased'):
-            print("Connecting ticket_purchased signal from MoviesPage to handle_ticket_purchase")
-            self.movies_page.ticket_purchased.connect(self.handle_ticket_purchase)
         self.stack_widget.addWidget(self.movies_page)
         
         self.food_page = FoodPage(self.user_data)
@@ -801,9 +826,6 @@ class DashboardWindow(QMainWindow):
         self.topup_page = TopUpPage(self.user_data)
         self.stack_widget.addWidget(self.topup_page)
         
-        # IMPORTANT: Only connect signals once during initialization to avoid duplicates
-        self.topup_page.top_up_success.connect(self.handle_top_up)
-        
         self.history_page = HistoryPage(self.user_data)
         self.stack_widget.addWidget(self.history_page)
         
@@ -814,7 +836,9 @@ class DashboardWindow(QMainWindow):
         main_layout.addWidget(content_widget)
         
         # Set initial page and active button
+        self.stack_widget.currentChanged.connect(ACTIVE_PAGE.set)
         self.stack_widget.setCurrentIndex(0)
+        ACTIVE_PAGE.set(0)
         self.nav_button_list[0].setChecked(True)
     
     def update_saldo_display(self, new_saldo):
@@ -887,12 +911,82 @@ class DashboardWindow(QMainWindow):
         msg = QMessageBox.question(self, 'Konfirmasi', 'Apakah Anda yakin ingin logout?', 
                                    QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
         
-        if msg == QMessageBox.Yes:
+        if msg == QMessageBox.Yes and kiosk_mode():
+            self.end_session()
+        elif msg == QMessageBox.Yes:
             from main import bcrypt
             self.login_window = LoginWindow(bcrypt)
             self.login_window.show()
             self.close()
     
+    def set_user(self, user_data):
+        """Mode kiosk: ganti pengguna tanpa membangun ulang halaman
+        
+        Dict user_data dipakai bersama oleh semua halaman, jadi isinya diganti
+        di tempat; setelah itu hanya bagian yang bergantung pada pengguna yang
+        dimuat ulang (label, saldo, rekomendasi, riwayat).
+        """
+        self.user_data.clear()
+        self.user_data.update(user_data)
+        
+        self.welcome_label.setText(f"Selamat datang, {self.user_data['nama']}!")
+        self.username_label.setText(f"Username: {self.user_data['username']}")
+        self.usia_label.setText(f"Usia: {self.user_data['usia']} tahun")
+        self.genre_label.setText(f"Genre Favorit: {self.user_data['genre_favorit']}")
+        self.rec_subtitle.setText(f"Berdasarkan genre favorit Anda: {self.user_data['genre_favorit']}")
+        
+        if 'saldo' in user_data:
+            self.update_saldo_display(user_data['saldo'])
+        else:
+            self.update_saldo_display(0)
+            get_repository().get_saldo(self.user_data['username'], on_result=self.update_saldo_display)
+        
+        # Kartu rekomendasi hanya dibuat ulang jika filmnya berbeda dari pengguna sebelumnya
+        self.populate_recommendations()
+        self.history_page.update_user_data(self.user_data)
+        self.switch_page(0)
+    
+    def end_session(self):
+        """Mode kiosk: kosongkan data sesi, sembunyikan dashboard dan kembali ke login"""
+        from gui.login_window import LoginWindow
+        self.food_page.clear_cart()
+        self.topup_page.reset_form()
+        self.movies_page.booking_page.reset_selection()
+        self.movies_page.ticket_page.clear_ticket()
+        self.movies_page.show_movies_list()
+        self.history_page.clear_history()
+        self.hide()
+        
+        if self.login_window is None:
+            from main import bcrypt
+            self.login_window = LoginWindow(bcrypt)
+        self.login_window.show()
+    
+    def populate_recommendations(self):
+        """Isi kartu rekomendasi sesuai genre favorit pengguna saat ini"""
+        recommended_movies = self.get_recommended_movies()[:3]
+        titles = [movie.get("title") for movie in recommended_movies]
+        if titles == self.rec_titles:
+            return
+        self.rec_titles = titles
+        
+        while self.rec_grid.count():
+            widget = self.rec_grid.takeAt(0).widget()
+            if widget is not None:
+                widget.deleteLater()
+        
+        for movie in recommended_movies:
+            movie_card = MovieCard(movie)
+            movie_card.clicked.connect(self.on_recommended_movie_clicked)
+            movie_card.hovered.connect(self.prefetch_recommended_movie)
+            movie_card.unhovered.connect(get_prefetcher().cancel)
+            # Remove the hover animation effect for dashboard cards
+            movie_card._animations.clear()  # Clear all animations
+            self.rec_grid.addWidget(movie_card)
+        
+        self.rec_placeholder.setText(f"Tidak ada film {self.user_data['genre_favorit']} yang tersedia saat ini.")
+        self.rec_placeholder.setVisible(not recommended_movies)
+    
     def get_recommended_movies(self):
         """Mendapatkan film rekomendasi berdasarkan genre favorit pengguna"""
         fav_genre = self.user_data.get('genre_favorit', '').lower()
@@ -1069,15 +1163,16 @@ class DashboardWindow(QMainWindow):
         return recommended
 
     def handle_page_signals(self, signal_type, data):
-        """Menangani signal dari halaman lain"""
-        if signal_type == "update_saldo" and 'new_saldo' in data:
-            # Update saldo dari halaman movies
-            self.update_saldo_display(data['new_saldo'])
-            print(f"Dashboard received saldo update: {data['new_saldo']}")
-        elif signal_type == "show_history":
+        """Menangani signal navigasi dari halaman lain"""
+        if signal_type == "show_history":
             # Beralih ke halaman history
             self.show_history()
 
+    def prefetch_recommended_movie(self, movie_data):
+        """Hover kartu rekomendasi: siapkan detail dan booking film itu"""
+        if hasattr(self, 'movies_page'):
+            self.movies_page.prefetch_movie(movie_data)
+    
     def on_recommended_movie_clicked(self, movie_data):
         """Handler ketika kartu film rekomendasi diklik"""
         # Beralih ke halaman movies terlebih dahulu
@@ -1089,237 +1184,115 @@ class DashboardWindow(QMainWindow):
             self.movies_page.movie_detail_page.display_movie_detail(movie_data)
             self.movies_page.stack_widget.setCurrentIndex(self.movies_page.pages["movie_detail"]) 
 
-    def handle_ticket_purchase(self, ticket_data):
-        """Handler untuk pembelian tiket"""
-        try:
-            print("Received ticket data:", ticket_data)  # Debug print
-            
-            # Format data tiket untuk history
-            transaction_data = {
-                "type": "Tiket",
-                "movie_title": ticket_data.get("movie_title", "Unknown Movie"),
-                "total": -ticket_data.get("total_price", 0),  # Menggunakan total_price dari data tiket
-                "studio": ticket_data.get("studio_type", "Regular"),
-                "theater": ticket_data.get("theater", ""),
-                "cinema": ticket_data.get("cinema", ""),
-                "seats": ", ".join(ticket_data.get("seats", [])) if isinstance(ticket_data.get("seats"), list) else ticket_data.get("seats", ""),
-                "show_date": ticket_data.get("show_date", ""),
-                "show_time": ticket_data.get("show_time", ""),
-                "status": "Sukses",
-                "timestamp": QDateTime.currentDateTime().toString("dd/MM/yyyy HH:mm")
-            }
-            
-            print("Formatted transaction data:", transaction_data)  # Debug print
-            
-            # Directly add to transactions in history_page if available
-            if hasattr(self, 'history_page'):
-                print("Adding transaction to history")
-                self.history_page.add_transaction(transaction_data)
-                # Force refresh the history page transactions
-                self.history_page.filter_transactions()
-                print("Transaction added to history page")
-            else:
-                print("Error: history_page not found")
-            
-        except Exception as e:
-            print(f"Error handling ticket purchase: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            # Fallback dengan format minimal
-            transaction_data = {
-                "type": "Tiket",
-                "movie_title": ticket_data.get("movie_title", "Unknown Movie"),
-                "total": -ticket_data.get("total_price", 0),
-                "status": "Sukses",
-                "timestamp": QDateTime.currentDateTime().toString("dd/MM/yyyy HH:mm")
-            }
-            if hasattr(self, 'history_page'):
-                self.history_page.add_transaction(transaction_data)
-                # Force refresh again
-                self.history_page.filter_transactions()
+    def is_own_event(self, event):
+        """Event bus dipakai bersama; abaikan event milik pengguna lain"""
+        return event.username == self.user_data.get('username')
     
-    def handle_food_order(self, order_data):
-        """Handler untuk pemesanan makanan"""
-        try:
-            # Format items untuk history
-            formatted_items = []
-            items = order_data.get("items", [])
-            
-            # Jika items adalah dictionary
-            if isinstance(items, dict):
-                for name, details in items.items():
-                    formatted_items.append({
-                        "name": name,
-                        "quantity": details.get("quantity", 0),
-                        "price": details.get("price", 0)
-                    })
-            # Jika items adalah list
-            elif isinstance(items, list):
-                for item in items:
-                    if isinstance(item, (list, tuple)):
-                        # Jika item adalah tuple/list dengan format [nama, jumlah, harga]
-                        if len(item) >= 3:
-                            formatted_items.append({
-                                "name": item[0],
-                                "quantity": item[1],
-                                "price": item[2]
-                            })
-                        # Jika item adalah tuple/list dengan format [nama, jumlah]
-                        elif len(item) >= 2:
-                            formatted_items.append({
-                                "name": item[0],
-                                "quantity": item[1],
-                                "price": 0
-                            })
-                    elif isinstance(item, dict):
-                        # Jika item sudah dalam format dictionary
-                        formatted_items.append({
-                            "name": item.get("name", ""),
-                            "quantity": item.get("quantity", 0),
-                            "price": item.get("price", 0)
-                        })
-            
-            # Generate a unique transaction ID
-            transaction_id = str(uuid.uuid4())
-            
-            transaction_data = {
-                "type": "Makanan",
-                "items": formatted_items,
-                "total": -order_data.get("total", 0),
-                "status": "Sukses",
-                "transaction_id": transaction_id,  # Add transaction ID
-                "timestamp": QDateTime.currentDateTime().toString("dd/MM/yyyy HH:mm")
-            }
-            
-            # Add to history only once
-            if hasattr(self, 'history_page'):
-                self.history_page.add_transaction(transaction_data)
-                self.history_page.filter_transactions()
-            
-        except Exception as e:
-            print(f"Error handling food order: {str(e)}")
-            # Fallback dengan format minimal
-            transaction_data = {
-                "type": "Makanan",
-                "items": [{"name": "Pesanan Makanan", "quantity": 1, "price": order_data.get("total", 0)}],
-                "total": -order_data.get("total", 0),
-                "status": "Sukses",
-                "transaction_id": str(uuid.uuid4()),  # Add transaction ID here too
-                "timestamp": QDateTime.currentDateTime().toString("dd/MM/yyyy HH:mm")
-            }
-            if hasattr(self, 'history_page'):
-                self.history_page.add_transaction(transaction_data)
-                self.history_page.filter_transactions()
+    def on_balance_event(self, event):
+        """Semua event yang mengubah saldo (pembelian, pesanan makanan, top up)"""
+        if self.is_own_event(event) and event.new_saldo is not None:
+            self.update_saldo_display(event.new_saldo)
     
-    def handle_top_up(self, amount):
-        """Handler untuk top up saldo"""
-        try:
-            print(f"Handle top-up called with amount: {amount}")
-            # Check if amount is a valid number
-            if not isinstance(amount, (int, float)):
-                print(f"Invalid top-up amount format: {amount}")
-                return
-                
-            # Get current balance before updating
-            previous_balance = self.user_data.get('saldo', UserModel.get_saldo(self.user_data['username']))
-            print(f"Previous balance: {previous_balance}")
-            
-            # Calculate new balance
-            new_balance = previous_balance + amount
-            print(f"New balance calculated: {new_balance}")
-            
-            # Update user data in memory
-            self.user_data['saldo'] = new_balance
-            
-            # Update UI
-            self.update_saldo_display(new_balance)
-            
-            # Add transaction to history with the required format
-            if hasattr(self, 'history_page'):
-                # Create timestamp
-                timestamp = QDateTime.currentDateTime().toString("dd/MM/yyyy HH:mm")
-                
-                # Generate a unique transaction ID
-                transaction_id = str(uuid.uuid4())
-                
-                # Get the payment method from topup_page if available
-                payment_method = "Cash"  # Default
-                if hasattr(self, 'topup_page') and hasattr(self.topup_page, 'selected_payment_method'):
-                    payment_method = self.topup_page.selected_payment_method
-                    
-                # Map payment IDs to readable bank names
-                payment_method_map = {
-                    "bca": "Bank BCA",
-                    "bni": "Bank BNI",
-                    "mandiri": "Bank Mandiri",
-                    "bri": "Bank BRI",
-                    "cash": "Cash",
-                    "gopay": "GoPay",
-                    "ovo": "OVO",
-                    "dana": "DANA"
-                }
-                
-                # Get readable payment method name
-                readable_payment = payment_method_map.get(payment_method.lower(), payment_method)
-                
-                # Prepare transaction data with explicit previous and new balance
-                transaction_data = {
-                    "type": "Top Up",
-                    "total": amount,
-                    "previous_balance": previous_balance,
-                    "new_balance": new_balance,
-                    "payment_method": readable_payment,
-                    "status": "Sukses",
-                    "timestamp": timestamp,
-                    "transaction_id": transaction_id
-                }
-                
-                # Add to history and refresh display
-                print(f"Adding top-up transaction to history: {amount}, ID: {transaction_id}, Method: {readable_payment}")
-                self.history_page.add_transaction(transaction_data)
-                self.history_page.filter_transactions()
-        except Exception as e:
-            print(f"Error in handle_top_up: {str(e)}")
+    def handle_ticket_purchase(self, event):
+        """Handler untuk pembelian tiket (TicketPurchased)"""
+        if not self.is_own_event(event):
+            return
+        # Format data tiket untuk history; ID booking sama dengan riwayat di database
+        transaction_data = {
+            "type": "Tiket",
+            "movie_title": event.movie_title,
+            "total": -event.total_price,
+            "studio": event.studio_type,
+            "theater": event.theater,
+            "cinema": event.cinema,
+            "seats": ", ".join(event.seats) if isinstance(event.seats, (list, tuple)) else event.seats,
+            "show_date": event.show_date,
+            "show_time": event.show_time,
+            "ticket_id": event.ticket_id,
+            "status": "Sukses",
+            "timestamp": QDateTime.currentDateTime().toString("dd/MM/yyyy HH:mm"),
+            "transaction_id": event.transaction_id
+        }
+        self.history_page.add_transaction(transaction_data)
+    
+    def handle_food_order(self, event):
+        """Handler untuk pemesanan makanan (FoodOrdered)"""
+        if not self.is_own_event(event):
+            return
+        # Format items untuk history: pasangan (produk, jumlah) dari keranjang
+        formatted_items = []
+        for item in event.items:
+            if isinstance(item, dict):
+                formatted_items.append({
+                    "name": item.get("name", ""),
+                    "quantity": item.get("quantity", 0),
+                    "price": item.get("price", 0)
+                })
+            else:
+                product, quantity = item[0], item[1]
+                price = product.get("price", 0) * quantity if isinstance(product, dict) else 0
+                formatted_items.append({"name": product, "quantity": quantity, "price": price})
+        
+        transaction_data = {
+            "type": "Makanan",
+            "items": formatted_items,
+            "total": -event.total_price,
+            "status": "Sukses",
+            "transaction_id": event.transaction_id,
+            "timestamp": QDateTime.currentDateTime().toString("dd/MM/yyyy HH:mm")
+        }
+        self.history_page.add_transaction(transaction_data)
+    
+    def handle_top_up(self, event):
+        """Handler untuk top up saldo (ToppedUp); saldo tampilan diperbarui on_balance_event"""
+        if not self.is_own_event(event):
+            return
+        # Map payment IDs to readable bank names
+        payment_method_map = {
+            "bca": "Bank BCA",
+            "bni": "Bank BNI",
+            "mandiri": "Bank Mandiri",
+            "bri": "Bank BRI",
+            "cash": "Cash",
+            "gopay": "GoPay",
+            "ovo": "OVO",
+            "dana": "DANA"
+        }
+        payment_method = event.payment_method or "Cash"
+        
+        # Saldo sebelum dan sesudah dari hasil database, bukan hitungan di memori
+        transaction_data = {
+            "type": "Top Up",
+            "total": event.amount,
+            "previous_balance": event.new_saldo - event.amount,
+            "new_balance": event.new_saldo,
+            "payment_method": payment_method_map.get(payment_method.lower(), payment_method),
+            "status": "Sukses",
+            "timestamp": QDateTime.currentDateTime().toString("dd/MM/yyyy HH:mm"),
+            "transaction_id": event.transaction_id
+        }
+        print(f"Adding top-up transaction to history: {event.amount}, ID: {event.transaction_id}")
+        self.history_page.add_transaction(transaction_data)
 
     def setup_signals(self):
-        """Setup signal connections"""
-        print("Setting up signals in DashboardWindow")
-        
-        # Movies page signals
-        if hasattr(self, 'movies_page'):
-            print("Setting up movies_page signals")
-            
-            # Use a flag to check if signals are already connected
-            if not hasattr(self, '_movies_page_signals_connected'):
-                print("Connecting switch_page_signal")
-                self.movies_page.switch_page_signal.connect(self.handle_page_signals)
-                print("Connecting ticket_purchased signal")
-                self.movies_page.ticket_purchased.connect(self.handle_ticket_purchase)
-                
-                # Mark signals as connected
-                self._movies_page_signals_connected = True
-            
-            # Connect ticket_page signals
-            if hasattr(self.movies_page, 'ticket_page'):
-                print("Setting up ticket_page signals")
-                self.movies_page.ticket_page.back_to_movies.connect(lambda: self.movies_page.stack_widget.setCurrentIndex(self.movies_page.pages["movies_list"]))
-                self.movies_page.ticket_page.show_history.connect(self.show_history)
-        
-        # FoodPage signals
-        if hasattr(self, 'food_page'):
-            print("Setting up food_page signals")
-            if not hasattr(self, '_food_page_signals_connected'):
-                # Connect only to update_saldo_display for balance updates
-                self.food_page.order_completed.connect(self.update_saldo_display)
-                # Connect only once to handle_food_order for history updates
-                self.food_page.order_completed.connect(self.handle_food_order)
-                self._food_page_signals_connected = True
-        
-        # TopUpPage signals
-        if hasattr(self, 'topup_page'):
-            print("TopUpPage signals already connected during initialization")
-            # Signals already connected during initialization
-            # DO NOT connect again to avoid duplicates
+        """Sambungkan navigasi dan langganan event bus (sekali, saat window dibuat)"""
+        self.movies_page.switch_page_signal.connect(self.handle_page_signals)
+        
+        # Saldo diperbarui langsung; riwayat (membangun ulang kartu) di giliran event loop berikutnya
+        bus = get_gui_event_bus()
+        self._subscriptions = [
+            bus.subscribe(BalanceEvent, self.on_balance_event),
+            bus.subscribe(TicketPurchased, self.handle_ticket_purchase, QUEUED),
+            bus.subscribe(FoodOrdered, self.handle_food_order, QUEUED),
+            bus.subscribe(ToppedUp, self.handle_top_up, QUEUED),
+        ]
+    
+    def closeEvent(self, event):
+        """Lepas langganan event bus agar window lama tidak ikut menerima event"""
+        for subscription in self._subscriptions:
+            subscription.cancel()
+        self._subscriptions = []
+        super().closeEvent(event)
     
     def show_history(self):
         """Beralih ke halaman history"""
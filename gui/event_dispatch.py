@@ -0,0 +1,41 @@
+"""
+Dispatcher Qt untuk event bus: pengiriman QUEUED dijalankan di thread GUI.
+
+Event yang dipublish dari thread mana pun (thread DB, server) sampai ke
+handler halaman pada giliran event loop berikutnya, sehingga publisher tidak
+menunggu handler yang berat (mis. membangun ulang kartu riwayat).
+
+    bus = get_gui_event_bus()
+"""
+
+from PyQt5.QtCore import QObject, Qt, pyqtSignal
+
+from utils.event_bus import get_event_bus
+
+_dispatcher = None
+
+
+class QtDispatcher(QObject):
+    """Menjalankan callable di thread milik objek ini (selalu lewat antrean event)"""
+
+    _run = pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._run.connect(self._execute, Qt.QueuedConnection)
+
+    def __call__(self, func):
+        self._run.emit(func)
+
+    def _execute(self, func):
+        func()
+
+
+def get_gui_event_bus():
+    """Bus bersama dengan dispatcher Qt (panggil pertama kali dari thread GUI)"""
+    global _dispatcher
+    bus = get_event_bus()
+    if _dispatcher is None:
+        _dispatcher = QtDispatcher()
+        bus.set_dispatcher(_dispatcher)
+    return bus
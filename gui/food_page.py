@@ -6,24 +6,11 @@ from PyQt5.QtCore import Qt, pyqtSignal, QSize
 import os
 import json
 from datetime import datetime
-from models import UserModel
-
-# Data menu makanan dan minuman
-FOOD_MENU = [
-    {"id": "F1", "name": "Popcorn (S)", "price": 25000, "category": "Makanan", "image": "popcorn_mini.jpg"},
-    {"id": "F2", "name": "Popcorn (M)", "price": 35000, "category": "Makanan", "image": "popcorn_medium.jpg"},
-    {"id": "F4", "name": "Popcorn Caramel", "price": 40000, "category": "Makanan", "image": "popcorn_caramel.jpg"},
-    {"id": "F5", "name": "Popcorn Cheese", "price": 40000, "category": "Makanan", "image": "Popcorn_cheese.jpg"},
-    {"id": "F7", "name": "Hotdog", "price": 30000, "category": "Makanan", "image": "hotdog.jpeg"},
-    {"id": "F8", "name": "Nasi Padang", "price": 35000, "category": "Makanan", "image": "nasi_padang.jpeg"}
-]
-
-DRINK_MENU = [
-    {"id": "D1", "name": "Coca Cola (S)", "price": 15000, "category": "Minuman", "image": "cocacola_mini.webp"},
-    {"id": "D2", "name": "Coca Cola (M)", "price": 20000, "category": "Minuman", "image": "coca_cola_medium.png"},
-    {"id": "D4", "name": "Sprite (S)", "price": 15000, "category": "Minuman", "image": "sprite_mini.jpeg"},
-    {"id": "D5", "name": "Sprite (M)", "price": 20000, "category": "Minuman", "image": "sprite_medium.jpg"}
-]
+import uuid
+from gui.repository import get_repository
+from gui.event_dispatch import get_gui_event_bus
+from utils.events import FoodOrdered
+from utils.catalog import FOOD_MENU, DRINK_MENU
 
 class FoodItem(QFrame):
     """Widget untuk menampilkan item makanan/minuman"""
@@ -324,7 +311,6 @@ class CartItem(QFrame):
 
 class FoodPage(QWidget):
     """Halaman untuk pemesanan makanan dan minuman"""
-    order_completed = pyqtSignal(dict)  # Signal ketika order selesai
     
     def __init__(self, user_data=None):
         super().__init__()
@@ -750,21 +736,7 @@ class FoodPage(QWidget):
             QMessageBox.warning(self, "Keranjang Kosong", "Tambahkan item ke keranjang terlebih dahulu.")
             return
         
-        # Hitung total harga
-        total_price = sum(item['price'] * quantity for (item, quantity) in self.cart_items.values())
-        
-        # Cek saldo pengguna
-        if self.user_data and 'username' in self.user_data:
-            current_saldo = UserModel.get_saldo(self.user_data['username'])
-            
-            if current_saldo < total_price:
-                QMessageBox.warning(
-                    self, 
-                    "Saldo Tidak Mencukupi", 
-                    f"Saldo anda (Rp {current_saldo:,}) tidak mencukupi untuk pembelian ini (Rp {total_price:,}).\n\nSilakan top-up saldo Anda terlebih dahulu.".replace(',', '.')
-                )
-                return
-        else:
+        if not self.user_data or 'username' not in self.user_data:
             QMessageBox.warning(
                 self,
                 "Login Diperlukan",
@@ -772,14 +744,44 @@ class FoodPage(QWidget):
             )
             return
         
+        # Cek saldo pengguna di thread DB; lanjut di confirm_checkout. Pengguna dicatat
+        # sekarang: di mode kiosk user_data bisa berganti sebelum hasil tiba
+        username = self.user_data['username']
+        self.set_processing(True)
+        get_repository().get_saldo(
+            username,
+            on_result=lambda saldo: self.confirm_checkout(saldo, username),
+            on_error=lambda error: self.on_payment_error(error, username)
+        )
+    
+    def set_processing(self, processing):
+        """Tombol bayar nonaktif selama menunggu database"""
+        self.checkout_button.setEnabled(not processing and bool(self.cart_items))
+        self.checkout_button.setText("Memproses..." if processing else "Bayar Sekarang")
+    
+    def confirm_checkout(self, current_saldo, username):
+        """Konfirmasi pesanan setelah saldo terbaca"""
+        self.set_processing(False)
+        if username != (self.user_data or {}).get('username'):
+            return  # saldo pengguna sebelumnya
+        
+        # Hitung total harga
+        total_price = sum(item['price'] * quantity for (item, quantity) in self.cart_items.values())
+        
+        if current_saldo < total_price:
+            QMessageBox.warning(
+                self, 
+                "Saldo Tidak Mencukupi", 
+                f"Saldo anda (Rp {current_saldo:,}) tidak mencukupi untuk pembelian ini (Rp {total_price:,}).\n\nSilakan top-up saldo Anda terlebih dahulu.".replace(',', '.')
+            )
+            return
+        
         # Buat daftar item untuk konfirmasi
         item_list = ""
-        item_descriptions = []
         for (item, quantity) in self.cart_items.values():
             subtotal = item['price'] * quantity
             item_str = f"{quantity}x {item['name']} (Rp {subtotal:,})".replace(',', '.')
             item_list += f"- {item_str}\n"
-            item_descriptions.append(item_str)
         
         # Konfirmasi pemesanan
         confirm = QMessageBox.question(
@@ -791,45 +793,68 @@ class FoodPage(QWidget):
         )
         
         if confirm == QMessageBox.Yes:
-            # Proses pembayaran
-            try:
-                success, message, new_saldo = UserModel.update_saldo(
-                    self.user_data['username'], 
-                    -total_price  # Kurangi saldo
-                )
-                
-                if success:
-                    # Siapkan data order
-                    order_data = {
-                        'items': [(item, quantity) for (item, quantity) in self.cart_items.values()],
-                        'total_price': total_price,
-                        'order_time': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                    }
-                    
-                    # Update user data dengan saldo baru
-                    if isinstance(new_saldo, (int, float)):
-                        self.user_data['saldo'] = new_saldo
-                    
-                    # Tampilkan pesan sukses
-                    QMessageBox.information(
-                        self,
-                        "Pemesanan Berhasil",
-                        f"Pesanan Anda telah berhasil. Pembayaran sebesar Rp {total_price:,} telah diproses.\nSaldo Anda sekarang: Rp {new_saldo:,}".replace(',', '.')
-                    )
-                    
-                    # Reset keranjang
-                    self.clear_cart()
-                    
-                    # Emit signal bahwa order selesai
-                    self.order_completed.emit(order_data)
-                else:
-                    # Jika gagal update saldo
-                    QMessageBox.critical(self, "Pembayaran Gagal", message)
-            except Exception as e:
-                # Tangani kesalahan apa pun yang mungkin terjadi
-                error_message = f"Error saat memproses pembayaran: {str(e)}"
-                print(error_message)
-                QMessageBox.critical(self, "Error Pembayaran", error_message)
+            # Siapkan data order dari isi keranjang saat dikonfirmasi
+            order_data = {
+                'items': [(item, quantity) for (item, quantity) in self.cart_items.values()],
+                'total_price': total_price,
+                'order_time': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            }
+            
+            # Proses pembayaran (kurangi saldo) di thread DB
+            self.set_processing(True)
+            get_repository().update_saldo(
+                username,
+                -total_price,
+                on_result=lambda result: self.on_payment_finished(result, order_data, username),
+                on_error=lambda error: self.on_payment_error(error, username)
+            )
+    
+    def on_payment_finished(self, result, order_data, username):
+        """Hasil pembayaran dari thread DB untuk pengguna yang mengonfirmasi"""
+        self.set_processing(False)
+        success, message, new_saldo = result
+        total_price = order_data['total_price']
+        
+        # Hasil yang tiba setelah pengguna kiosk berganti milik pengguna sebelumnya
+        if username != (self.user_data or {}).get('username'):
+            print(f"Hasil pembayaran untuk {username} diabaikan: pengguna kiosk sudah berganti")
+            return
+        
+        if success:
+            # Update user data dengan saldo baru
+            if isinstance(new_saldo, (int, float)):
+                self.user_data['saldo'] = new_saldo
+            
+            # Tampilkan pesan sukses
+            QMessageBox.information(
+                self,
+                "Pemesanan Berhasil",
+                f"Pesanan Anda telah berhasil. Pembayaran sebesar Rp {total_price:,} telah diproses.\nSaldo Anda sekarang: Rp {new_saldo:,}".replace(',', '.')
+            )
+            
+            # Reset keranjang
+            self.clear_cart()
+            
+            # Satu event pesanan: dashboard memperbarui saldo dan riwayat
+            get_gui_event_bus().publish(FoodOrdered(
+                username=username,
+                new_saldo=new_saldo,
+                transaction_id=str(uuid.uuid4()),
+                items=order_data['items'],
+                total_price=total_price
+            ))
+        else:
+            # Jika gagal update saldo
+            QMessageBox.critical(self, "Pembayaran Gagal", message)
+    
+    def on_payment_error(self, error, username):
+        """Database sibuk/terkunci atau antrean pembayaran penuh"""
+        self.set_processing(False)
+        error_message = f"Error saat memproses pembayaran: {str(error)}"
+        print(error_message)
+        if username != (self.user_data or {}).get('username'):
+            return
+        QMessageBox.critical(self, "Error Pembayaran", error_message)
     
     def clear_cart(self):
         """Kosongkan keranjang belanja"""
@@ -3,11 +3,17 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                           QComboBox, QStackedWidget, QSizePolicy, QGraphicsDropShadowEffect)
 from PyQt5.QtGui import QFont, QIcon, QColor, QPainter, QPixmap, QBrush, QPen
 from PyQt5.QtCore import Qt, pyqtSignal, QSize, QDateTime
+import copy
 import json
 import os
 from datetime import datetime
 import uuid
 
+from gui.repository import get_repository
+from utils.metrics import HISTORY_WRITE_SECONDS
+from utils.write_behind import get_write_behind
+from utils.purchase_journal import get_purchase_journal
+
 class TransactionCard(QFrame):
     """Widget untuk menampilkan item riwayat"""
     def __init__(self, transaction_data):
@@ -621,6 +627,9 @@ class HistoryPage(QWidget):
         for existing_transaction in self.transactions:
             # For tickets, check specific ticket details
             if transaction_data["type"] == "Tiket" and existing_transaction.get("type") == "Tiket":
+                if existing_transaction.get("transaction_id") == transaction_data["transaction_id"]:
+                    is_duplicate = True
+                    break
                 if (existing_transaction.get("movie_title") == transaction_data.get("movie_title") and
                     existing_transaction.get("show_date") == transaction_data.get("show_date") and
                     existing_transaction.get("show_time") == transaction_data.get("show_time") and
@@ -650,8 +659,8 @@ class HistoryPage(QWidget):
         if not is_duplicate:
             # Add to transactions list
             self.transactions.insert(0, transaction_data)
-            # Save to file
-            self.save_history()
+            # Save to file (pembelian ditandai selesai di jurnal setelah file tertulis)
+            self.save_history([transaction_data["transaction_id"]])
             # Refresh display
             self.filter_transactions()
             print(f"Added new transaction of type: {transaction_data.get('type')}")
@@ -667,6 +676,8 @@ class HistoryPage(QWidget):
         history_file = os.path.join("data", "history", f"{self.user_data['username']}.json")
         
         try:
+            # Titipan write-behind untuk file ini harus sudah di disk sebelum dibaca
+            get_write_behind().flush(history_file, timeout=2.0)
             if os.path.exists(history_file):
                 with open(history_file, 'r') as f:
                     self.transactions = json.load(f)
@@ -691,29 +702,46 @@ class HistoryPage(QWidget):
                         # Fix dates in old format
                         if isinstance(transaction, dict) and "date" in transaction and "timestamp" not in transaction:
                             self.transactions[i]["timestamp"] = transaction["date"]
-                    
-                    self.filter_transactions()
+            
+            self.filter_transactions()
+            
+            # Gabungkan pembelian yang tercatat di database (mis. lewat API) tapi belum ada di file
+            username = self.user_data['username']
+            get_repository().get_history(username, on_result=lambda db_history: self.merge_db_history(db_history, username))
         except Exception as e:
             print(f"Error loading history: {str(e)}")
             import traceback
             traceback.print_exc()
     
-    def save_history(self):
-        """Simpan data riwayat ke penyimpanan"""
+    def merge_db_history(self, db_history, username=None):
+        """Tambahkan riwayat dari database (hasil thread DB) yang belum ada di file"""
+        # Hasil yang tiba setelah pengguna kiosk berganti milik pengguna sebelumnya
+        if username is not None and username != self.user_data.get('username'):
+            return
+        known_ids = {t.get("transaction_id") for t in self.transactions if isinstance(t, dict)}
+        missing = [t for t in db_history if t.get("transaction_id") not in known_ids]
+        if missing:
+            self.transactions = missing + self.transactions
+            self.save_history([t.get("transaction_id") for t in missing])
+            self.filter_transactions()
+    
+    def save_history(self, transaction_ids=()):
+        """Titipkan data riwayat ke writer background (tanpa I/O file di thread GUI)"""
         if not self.user_data or 'username' not in self.user_data:
             return
             
-        # Buat direktori jika belum ada
-        os.makedirs(os.path.join("data", "history"), exist_ok=True)
-        
         # Path file riwayat
         history_file = os.path.join("data", "history", f"{self.user_data['username']}.json")
         
-        try:
-            with open(history_file, 'w') as f:
-                json.dump(self.transactions, f, indent=4)
-        except Exception as e:
-            print(f"Error saving history: {str(e)}")
+        # Snapshot diambil sekarang (deep copy: dict transaksi dan list items masih bisa
+        # diubah thread GUI); serialisasi dan penulisan di thread writer.
+        # Simpan berulang dalam jendela singkat digabung menjadi satu penulisan.
+        snapshot = copy.deepcopy(self.transactions)
+        journal = get_purchase_journal()
+        pending = [booking_id for booking_id in transaction_ids if booking_id and journal.is_open(booking_id)]
+        on_written = (lambda: [journal.complete(booking_id) for booking_id in pending]) if pending else None
+        get_write_behind().write(history_file, lambda: json.dumps(snapshot, indent=4),
+                                 timer=HISTORY_WRITE_SECONDS, on_written=on_written)
     
     def filter_transactions(self):
         """Filter transaksi berdasarkan tipe dan pencarian"""
@@ -822,8 +850,15 @@ class HistoryPage(QWidget):
     def update_user_data(self, user_data):
         """Update data user dan muat ulang riwayat"""
         self.user_data = user_data
+        # Pengguna tanpa file riwayat tidak boleh melihat riwayat pengguna sebelumnya
+        self.transactions = []
         self.load_history()
     
+    def clear_history(self):
+        """Kosongkan tampilan riwayat (logout di mode kiosk); file tidak diubah"""
+        self.transactions = []
+        self.filter_transactions()
+    
     def ensure_bank_icons_directory(self):
         """Memastikan direktori untuk ikon bank tersedia"""
         banks_dir = os.path.join("assets", "icons", "banks")
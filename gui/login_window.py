@@ -4,14 +4,18 @@ from PyQt5.QtCore import Qt, QPropertyAnimation, QEasingCurve
 from PyQt5.QtGui import QFont, QPixmap, QIcon, QColor, QPalette, QBrush
 import os
 
-from models import UserModel
+from gui.auth_worker import AuthWorker
 from gui.register_window import RegisterWindow
-from gui.dashboard_window import DashboardWindow
+from gui.dashboard_window import open_dashboard, kiosk_mode
 
 class LoginWindow(QMainWindow):
     def __init__(self, bcrypt):
         super().__init__()
         self.bcrypt = bcrypt
+        # Cek password bcrypt di thread pool agar jendela tidak membeku
+        self.auth_worker = AuthWorker(bcrypt, self)
+        self.auth_worker.login_finished.connect(self.on_login_finished)
+        self.auth_worker.busy_changed.connect(self.set_busy)
         self.init_ui()
         
     def init_ui(self):
@@ -331,6 +335,7 @@ class LoginWindow(QMainWindow):
         login_button.setGraphicsEffect(login_shadow)
         
         login_button.clicked.connect(self.handle_login)
+        self.login_button = login_button
         
         register_layout = QHBoxLayout()
         register_layout.setAlignment(Qt.AlignCenter)
@@ -398,18 +403,44 @@ class LoginWindow(QMainWindow):
             QMessageBox.warning(self, 'Error', 'Username dan password harus diisi')
             return
         
-        # Proses login
-        success, message, user_data = UserModel.login_user(username, password, self.bcrypt)
-        
+        # Proses login di worker; hasil diterima di on_login_finished
+        if self.auth_worker.is_busy():
+            return
+        self.auth_worker.login(username, password)
+    
+    def set_busy(self, busy):
+        """Indikator proses login: tombol dan input dinonaktifkan selama bcrypt berjalan"""
+        self.login_button.setEnabled(not busy)
+        self.login_button.setText('Memproses...' if busy else 'Login')
+        self.username_input.setEnabled(not busy)
+        self.password_input.setEnabled(not busy)
+        if busy:
+            self.setCursor(Qt.BusyCursor)
+        else:
+            self.unsetCursor()
+    
+    def on_login_finished(self, success, message, user_data):
         if success:
-            # Buka dashboard
-            self.dashboard = DashboardWindow(user_data)
+            # Buka dashboard (mode kiosk: dashboard yang sama dengan pengguna baru)
+            self.dashboard = open_dashboard(user_data, self)
             self.dashboard.show()
-            self.close()
+            if kiosk_mode():
+                # Window login dipakai lagi saat logout
+                self.username_input.clear()
+                self.password_input.clear()
+                self.hide()
+            else:
+                self.close()
         else:
             QMessageBox.warning(self, 'Login Gagal', message)
     
     def open_register(self):
+        self.auth_worker.cancel()
         self.register_window = RegisterWindow(self.bcrypt)
         self.register_window.show()
-        self.close() 
\ No newline at end of file
+        self.close()
+    
+    def closeEvent(self, event):
+        # Login yang belum selesai dibatalkan; hasilnya diabaikan
+        self.auth_worker.cancel()
+        super().closeEvent(event)
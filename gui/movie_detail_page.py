@@ -4,6 +4,8 @@ from PyQt5.QtGui import QFont, QPixmap, QIcon
 from PyQt5.QtCore import Qt, pyqtSignal
 import os
 
+from gui.poster_cache import get_poster_cache, DETAIL_SIZE
+
 class MovieDetailPage(QWidget):
     """Halaman untuk menampilkan detail film"""
     
@@ -207,15 +209,13 @@ class MovieDetailPage(QWidget):
         self.current_movie = movie_data
         
         # Set poster
+        # Poster dari cache (biasanya sudah di-decode prefetch saat kartu di-hover)
         poster_path = movie_data.get("poster_path")
+        pixmap = None
         if poster_path and os.path.exists(poster_path):
-            pixmap = QPixmap(poster_path)
-            self.poster_label.setPixmap(pixmap.scaled(
-                self.poster_label.width(),
-                self.poster_label.height(),
-                Qt.KeepAspectRatio,
-                Qt.SmoothTransformation
-            ))
+            pixmap = get_poster_cache().pixmap(poster_path, *DETAIL_SIZE)
+        if pixmap is not None:
+            self.poster_label.setPixmap(pixmap)
         else:
             # Default poster jika tidak ada
             default_poster = os.path.join("assets", "no_poster.jpg")
@@ -2,21 +2,26 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                           QLineEdit, QComboBox, QScrollArea, QFrame, QPushButton,
                           QGridLayout, QSizePolicy, QStackedWidget, QMessageBox, QFileDialog)
 from PyQt5.QtGui import QFont, QPixmap, QIcon, QPainter, QColor
-from PyQt5.QtCore import Qt, QSize, pyqtSignal, QDateTime, QRectF, QPoint
+from PyQt5.QtCore import Qt, QSize, pyqtSignal, QDateTime, QRectF, QPoint, QTimer
 import os
 import time
 import traceback
-import qrcode
-from PIL import Image
-import io
 from datetime import datetime
 
 from gui.movie_detail_page import MovieDetailPage
 from gui.booking_page import BookingPage
 from gui.ticket_page import TicketPage
+from gui.event_dispatch import get_gui_event_bus
+from gui.poster_cache import get_poster_cache, CARD_SIZE
+from gui.prefetch import get_prefetcher
+from utils.events import CatalogChanged
 from utils.helper import find_poster_for_film
+from utils.catalog import get_catalog
 from models import MovieModel
 
+# Jeda (ms) tanpa perubahan daftar film sebelum prefetch idle dimulai
+IDLE_PREFETCH_MS = 800
+
 class ClickableLabel(QLabel):
     """Label yang bisa diklik"""
     clicked = pyqtSignal()
@@ -33,6 +38,8 @@ class MovieCard(QWidget):
     
     book_clicked = pyqtSignal(dict)
     movie_clicked = pyqtSignal(dict)
+    hovered = pyqtSignal(dict)
+    unhovered = pyqtSignal(dict)
     
     def __init__(self, movie_data, parent=None):
         super().__init__(parent)
@@ -40,6 +47,9 @@ class MovieCard(QWidget):
         self.init_ui()
         
     def init_ui(self):
+        # Dipasang sekali; setStyleSheet saat hover memicu polish ulang seluruh kartu
+        self.setStyleSheet("background-color: transparent;")
+        
         # Layout Utama
         main_layout = QVBoxLayout(self)
         main_layout.setContentsMargins(0, 0, 0, 0)
@@ -87,12 +97,12 @@ class MovieCard(QWidget):
         # Cari dan set poster image
         poster_path = self.movie_data.get("poster_path")
         print(f"Setting poster for {self.movie_data.get('title')}, path: {poster_path}")
+        pixmap = None
         if poster_path and os.path.exists(poster_path):
             print(f"Poster file exists: {poster_path}")
-            pixmap = QPixmap(poster_path)
-            # Scale poster dengan mempertahankan aspect ratio
-            pixmap = pixmap.scaled(200, 300, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-        else:
+            # Scale poster dengan mempertahankan aspect ratio (ukuran sama dengan halaman booking)
+            pixmap = get_poster_cache().pixmap(poster_path, *CARD_SIZE)
+        if pixmap is None:
             if poster_path:
                 print(f"Poster file does not exist: {poster_path}")
             else:
@@ -243,19 +253,18 @@ class MovieCard(QWidget):
         self.movie_clicked.emit(self.movie_data)
         
     def enterEvent(self, event):
-        """Effect ketika mouse masuk area widget"""
-        self.setStyleSheet("background-color: transparent;")
+        """Effect ketika mouse masuk area widget (highlight dari #card_container:hover)"""
+        self.hovered.emit(self.movie_data)
         
     def leaveEvent(self, event):
         """Effect ketika mouse keluar area widget"""
-        self.setStyleSheet("background-color: transparent;")
+        self.unhovered.emit(self.movie_data)
 
 class MoviesPage(QWidget):
     """Halaman untuk menampilkan daftar film"""
     
     movie_booked = pyqtSignal(dict)
     switch_page_signal = pyqtSignal(str, dict)
-    ticket_purchased = pyqtSignal(dict)
     
     def __init__(self, user_data=None):
         """Initialize MoviesPage with user data if available"""
@@ -268,8 +277,16 @@ class MoviesPage(QWidget):
         # Dictionary untuk menyimpan indeks dari setiap halaman
         self.pages = {}
         
+        # Prefetch kartu yang tampil saat halaman diam (setelah daftar film digambar)
+        self.idle_prefetch_timer = QTimer(self)
+        self.idle_prefetch_timer.setSingleShot(True)
+        self.idle_prefetch_timer.setInterval(IDLE_PREFETCH_MS)
+        self.idle_prefetch_timer.timeout.connect(self.prefetch_visible_movies)
+        
         self.init_ui()
         self.load_movies()
+        # data_film.txt berubah (di proses mana pun): muat ulang grid film saja
+        self._catalog_subscription = get_gui_event_bus().subscribe(CatalogChanged, self.on_catalog_changed)
         
         # Initialize other pages
         self.movie_detail_page = MovieDetailPage(self.user_data)
@@ -281,15 +298,13 @@ class MoviesPage(QWidget):
         self.booking_page = BookingPage(self.user_data)
         self.booking_page.back_to_detail.connect(self.show_movie_detail)
         self.booking_page.booking_confirmed.connect(self.handle_booking_confirmed)
-        self.booking_page.payment_processed.connect(self.handle_payment_processed)
         self.stack_widget.addWidget(self.booking_page)
         self.pages["booking"] = self.stack_widget.count() - 1
         
         self.ticket_page = TicketPage(self.user_data)
         self.ticket_page.back_to_movies.connect(self.show_movies_list)
         # Tambahkan signal show_history untuk menampilkan history setelah melihat e-ticket
-        if hasattr(self, 'switch_page_signal'):
-            self.ticket_page.show_history.connect(lambda: self.switch_page_signal.emit("show_history", {}))
+        self.ticket_page.show_history.connect(lambda: self.switch_page_signal.emit("show_history", {}))
         self.stack_widget.addWidget(self.ticket_page)
         self.pages["ticket"] = self.stack_widget.count() - 1
         
@@ -303,152 +318,14 @@ class MoviesPage(QWidget):
         # Show ticket page
         self.show_ticket_page(ticket_data)
         
-    def handle_payment_processed(self, data):
-        """Handle payment processing and update history"""
-        # Update balance
-        new_saldo = data.get("new_saldo", 0)
-        if hasattr(self, 'switch_page_signal'):
-            self.switch_page_signal.emit("update_saldo", {"new_saldo": new_saldo})
-        
-        # Reset ticket processed flag at the start of new transaction
-        if hasattr(self, '_ticket_processed'):
-            delattr(self, '_ticket_processed')
-        
-        # Emit ticket purchase for history only once
-        ticket_data = data.get("ticket_data", {})
-        if ticket_data and not hasattr(self, '_ticket_processed'):
-            # Format data for history
-            history_data = {
-                "type": "Tiket",
-                "movie_title": ticket_data.get("movie_title", ""),
-                "total": -ticket_data.get("total_price", 0),  # Make sure it's negative for purchases
-                "studio_type": ticket_data.get("studio_type", ""),
-                "theater": ticket_data.get("theater", ""),
-                "cinema": ticket_data.get("cinema", ""),
-                "seats": ticket_data.get("seats", []),
-                "show_date": ticket_data.get("show_date", ""),
-                "show_time": ticket_data.get("show_time", ""),
-                "status": "Sukses",
-                "timestamp": QDateTime.currentDateTime().toString("dd/MM/yyyy HH:mm"),
-                "total_price": ticket_data.get("total_price", 0)  # Add total_price explicitly
-            }
-            
-            # Set the flag to prevent duplicate emissions
-            self._ticket_processed = True
-            
-            # Emit the signal only once
-            self.ticket_purchased.emit(history_data)
-        
     def show_e_ticket(self, ticket_data):
         """Display e-ticket after successful booking"""
         try:
-            # Create QR code
-            qr = qrcode.QRCode(
-                version=1,
-                error_correction=qrcode.constants.ERROR_CORRECT_L,
-                box_size=10,
-                border=4,
-            )
-            
-            # Add ticket data to QR code
-            qr_data = f"""
-            CinemaTIX E-Ticket
-            Film: {ticket_data['movie_title']}
-            Bioskop: {ticket_data['cinema']}
-            Theater: {ticket_data['theater']}
-            Studio: {ticket_data['studio_type']}
-            Tanggal: {ticket_data['show_date']}
-            Waktu: {ticket_data['show_time']}
-            Kursi: {', '.join(ticket_data['seats'])}
-            """
-            qr.add_data(qr_data)
-            qr.make(fit=True)
-            
-            # Create QR code image
-            qr_img = qr.make_image(fill_color="black", back_color="white")
-            
-            # Convert PIL image to QPixmap
-            qr_bytes = io.BytesIO()
-            qr_img.save(qr_bytes, format='PNG')
-            qr_bytes = qr_bytes.getvalue()
-            
-            qr_pixmap = QPixmap()
-            qr_pixmap.loadFromData(qr_bytes)
-            qr_pixmap = qr_pixmap.scaled(200, 200, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            
-            # Create e-ticket image
-            ticket_width = 800
-            ticket_height = 600
-            ticket_pixmap = QPixmap(ticket_width, ticket_height)
-            ticket_pixmap.fill(QColor("#1A1A1A"))
-            
-            # Setup painter
-            painter = QPainter(ticket_pixmap)
-            painter.setRenderHint(QPainter.Antialiasing)
-            
-            # Draw border
-            painter.setPen(QColor("#FFD700"))
-            painter.drawRect(10, 10, ticket_width-20, ticket_height-20)
-            
-            # Set font
-            title_font = QFont("Montserrat", 24, QFont.Bold)
-            header_font = QFont("Montserrat", 14, QFont.Bold)
-            content_font = QFont("Montserrat", 12)
-            
-            # Draw title
-            painter.setFont(title_font)
-            painter.setPen(QColor("#FFD700"))
-            painter.drawText(QRectF(0, 40, ticket_width, 50), Qt.AlignCenter, "CinemaTIX E-Ticket")
-            
-            # Draw content
-            painter.setFont(content_font)
-            painter.setPen(QColor("white"))
-            
-            y_pos = 120
-            line_height = 30
-            
-            # Draw movie details
-            content_items = [
-                ("Film", ticket_data['movie_title']),
-                ("Bioskop", ticket_data['cinema']),
-                ("Theater", ticket_data['theater']),
-                ("Studio", ticket_data['studio_type']),
-                ("Tanggal", ticket_data['show_date']),
-                ("Waktu", ticket_data['show_time']),
-                ("Kursi", ', '.join(ticket_data['seats'])),
-                ("Total", f"Rp {ticket_data['total_price']:,}".replace(',', '.'))
-            ]
-            
-            for label, value in content_items:
-                painter.setFont(header_font)
-                painter.setPen(QColor("#FFD700"))
-                painter.drawText(50, y_pos, f"{label}:")
-                
-                painter.setFont(content_font)
-                painter.setPen(QColor("white"))
-                painter.drawText(200, y_pos, value)
-                y_pos += line_height
-            
-            # Draw QR code
-            qr_x = (ticket_width - qr_pixmap.width()) // 2
-            qr_y = y_pos + 20
-            painter.drawPixmap(qr_x, qr_y, qr_pixmap)
-            
-            # Draw footer text
-            footer_y = qr_y + qr_pixmap.height() + 20
-            painter.setFont(content_font)
-            painter.setPen(QColor("white"))
-            painter.drawText(QRectF(0, footer_y, ticket_width, 30), Qt.AlignCenter, "Silakan tunjukkan e-ticket ini kepada petugas bioskop")
-            
-            painter.end()
-            
-            # Save the ticket image
-            downloads_path = os.path.join(os.path.expanduser("~"), "Downloads")
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"cinematix_ticket_{timestamp}.png"
-            save_path = os.path.join(downloads_path, filename)
-            
-            ticket_pixmap.save(save_path, "PNG")
+            # Render sekali di memori dengan renderer bersama; TicketPage memakai hasil yang sama
+            ticket_image = self.ticket_page.prepare_ticket(ticket_data)
+            if ticket_image is None:
+                raise ValueError("E-ticket tidak dapat dibuat")
+            ticket_pixmap = QPixmap.fromImage(ticket_image)
             
             # Create message box with custom layout
             msg = QMessageBox()
@@ -458,10 +335,10 @@ class MoviesPage(QWidget):
             content_widget = QWidget()
             content_layout = QVBoxLayout(content_widget)
             
-            # Add save location text
-            save_location = QLabel(f"E-Ticket telah berhasil disimpan di:\n{save_path}")
-            save_location.setStyleSheet("color: #FFFFFF; font-family: 'Montserrat';")
-            content_layout.addWidget(save_location)
+            # Info e-ticket
+            ticket_info = QLabel(f"E-Ticket berhasil dibuat (ID: {self.ticket_page.ticket_id})")
+            ticket_info.setStyleSheet("color: #FFFFFF; font-family: 'Montserrat';")
+            content_layout.addWidget(ticket_info)
             
             # Create and add ticket preview label
             ticket_label = QLabel()
@@ -495,7 +372,8 @@ class MoviesPage(QWidget):
                     "Images (*.png)"
                 )
                 if file_name:
-                    ticket_pixmap.save(file_name, "PNG")
+                    # Tulis ke disk hanya saat pengguna mengunduh
+                    self.ticket_page.ticket_image.save(file_name, format='PNG')
                     QMessageBox.information(msg, "Success", f"E-Ticket berhasil disimpan di:\n{file_name}")
             
             download_button.clicked.connect(save_ticket)
@@ -791,6 +669,8 @@ class MoviesPage(QWidget):
                 movie_card = MovieCard(movie)
                 movie_card.book_clicked.connect(self.on_book_clicked)
                 movie_card.movie_clicked.connect(self.on_movie_clicked)
+                movie_card.hovered.connect(self.prefetch_movie)
+                movie_card.unhovered.connect(get_prefetcher().cancel)
                 
                 self.movies_grid.addWidget(movie_card, row, col)
                 
@@ -798,63 +678,34 @@ class MoviesPage(QWidget):
                 if col >= 4:  # 4 columns per row
                     col = 0
                     row += 1
+        
+        self.idle_prefetch_timer.start()
+
+    def prefetch_movie(self, movie_data, urgent=True):
+        """Siapkan poster detail/booking dan kursi jadwal pertama sebelum kartu diklik"""
+        showtime = self.booking_page.predicted_showtime(movie_data) if hasattr(self, 'booking_page') else None
+        get_prefetcher().request(movie_data, showtime, urgent)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.idle_prefetch_timer.start()
+
+    def prefetch_visible_movies(self):
+        """Prefetch idle: kartu yang tampil, urut dari kiri atas"""
+        if not self.isVisible():
+            return
+        for i in range(min(self.movies_grid.count(), get_prefetcher().max_pending)):
+            card = self.movies_grid.itemAt(i).widget()
+            if isinstance(card, MovieCard):
+                self.prefetch_movie(card.movie_data, urgent=False)
 
     def load_movies(self):
-        """Memuat daftar film dari file data_film.txt"""
-        movies = []
-        try:
-            with open('data_film.txt', 'r', encoding='utf-8') as file:
-                # Read all lines
-                lines = file.readlines()
-                
-                # Get header line (first line)
-                header = lines[0].strip().split('|')
-                
-                # Process each movie data line (skip header)
-                for line in lines[1:]:
-                    line = line.strip()
-                    if not line:  # Skip empty lines
-                        continue
-                    
-                    # Split by pipe character
-                    values = line.split('|')
-                    if len(values) < len(header):
-                        continue  # Skip incomplete data
-                    
-                    # Create movie dictionary
-                    movie = {}
-                    for i, field in enumerate(header):
-                        key = field.lower().replace(' ', '_')
-                        value = values[i].strip()
-                        
-                        # Convert values to appropriate types
-                        if key == 'harga':
-                            movie['price'] = int(value)
-                        elif key == 'durasi':
-                            movie['duration'] = int(value)
-                        elif key == 'jadwal':
-                            movie['schedule'] = [time.strip() for time in value.split(',')]
-                        elif key == 'judul_film':
-                            movie['title'] = value
-                        elif key == 'genre':
-                            movie['genre'] = value
-                        elif key == 'sinopsis':
-                            movie['synopsis'] = value
-                        elif key == 'sutradara':
-                            movie['director'] = value
-                        elif key == 'pemeran':
-                            movie['cast'] = value
-                        elif key == 'usia_minimal':
-                            movie['age_rating'] = value
-                    
-                    movies.append(movie)
-        except FileNotFoundError:
-            print("File data_film.txt tidak ditemukan")
-            # Fallback to dummy data if file not found
-            movies = self.load_movies_from_db()
-        except Exception as e:
-            print(f"Error saat membaca file: {e}")
-            # Fallback to dummy data on error
+        """Memuat daftar film dari katalog bersama (data_film.txt)"""
+        catalog = get_catalog()
+        catalog.refresh()
+        movies = [dict(movie) for movie in catalog.movies]
+        if not movies:
+            # Fallback ke database/dummy data jika file tidak ada atau kosong
             movies = self.load_movies_from_db()
         
         # Store all movies for filtering
@@ -878,6 +729,11 @@ class MoviesPage(QWidget):
         
         return movies
 
+    def on_catalog_changed(self, event):
+        """Katalog berubah: bangun ulang daftar film dan filter genre"""
+        print(f"Katalog berubah (versi {event.version}), memuat ulang film")
+        self.load_movies()
+
     def on_book_clicked(self, movie_data):
         """Handler ketika tombol booking diklik"""
         self.current_movie = movie_data
@@ -946,69 +802,13 @@ class MoviesPage(QWidget):
     def show_ticket_page(self, booking_data):
         """Tampilkan halaman tiket setelah booking berhasil"""
         print(f"Showing ticket page with booking data: {booking_data.get('movie_title')}, price: {booking_data.get('total_price')}")
-        # Simpan saldo sebelum menampilkan ticket
-        saldo_before = self.user_data.get('saldo', 0) if self.user_data else 0
-        print(f"Saldo before ticket processing: {saldo_before}")
-        
-        # Jika tiket sudah dibayar di booking page, emit signal update saldo segera
-        if booking_data.get("payment_status") == "PAID" and hasattr(self, 'switch_page_signal'):
-            try:
-                print(f"Emitting immediate saldo update for paid ticket: {self.user_data.get('saldo')}")
-                self.switch_page_signal.emit("update_saldo", {"new_saldo": self.user_data.get('saldo')})
-            except Exception as e:
-                print(f"Error emitting immediate switch_page_signal: {e}")
-        
-        # Set user_data ke ticket_page
-        if hasattr(self, 'ticket_page') and self.user_data:
+        # Saldo sudah diperbarui lewat event bus (TicketPurchased) oleh halaman pembelian
+        if self.user_data:
             self.ticket_page.user_data = self.user_data
         
         self.ticket_page.display_ticket(booking_data)
         self.stack_widget.setCurrentIndex(self.pages["ticket"])
         
-        # Periksa apakah saldo di ticket_page sudah berubah
-        if hasattr(self.ticket_page, 'user_data') and self.ticket_page.user_data:
-            ticket_saldo = self.ticket_page.user_data.get('saldo')
-            print(f"Saldo in ticket_page after processing: {ticket_saldo}")
-            
-            if self.user_data and ticket_saldo is not None:
-                if self.user_data.get('saldo') != ticket_saldo:
-                    print(f"Updating saldo from {self.user_data.get('saldo')} to {ticket_saldo}")
-                    self.user_data['saldo'] = ticket_saldo
-                    # Update saldo di halaman lain
-                    self.update_user_data(self.user_data)
-                    
-                    # Emit signal jika merupakan bagian dari window utama untuk merefresh saldo di semua komponen UI
-                    if hasattr(self, 'switch_page_signal'):
-                        try:
-                            self.switch_page_signal.emit("update_saldo", {"new_saldo": ticket_saldo})
-                            print(f"Emitted switch_page_signal with saldo: {ticket_saldo}")
-                        except Exception as e:
-                            print(f"Error emitting switch_page_signal: {e}")
-                            
-    def update_saldo_after_payment(self, data):
-        """Update saldo setelah pembayaran berhasil"""
-        if 'new_saldo' in data and self.user_data:
-            print(f"Updating saldo after payment: {self.user_data.get('saldo')} -> {data['new_saldo']}")
-            
-            # Perbarui saldo di user_data
-            self.user_data['saldo'] = data['new_saldo']
-            
-            # Emit signal untuk memperbarui saldo di seluruh aplikasi
-            if hasattr(self, 'switch_page_signal'):
-                try:
-                    self.switch_page_signal.emit("update_saldo", {"new_saldo": data['new_saldo']})
-                    print(f"Emitted switch_page_signal with saldo: {data['new_saldo']}")
-                except Exception as e:
-                    print(f"Error emitting switch_page_signal after payment: {e}")
-            
-            # Perbarui saldo di komponen lain yang diperlukan
-            if hasattr(self, 'movie_detail_page'):
-                self.movie_detail_page.user_data = self.user_data
-            if hasattr(self, 'booking_page'):
-                self.booking_page.user_data = self.user_data
-            if hasattr(self, 'ticket_page'):
-                self.ticket_page.user_data = self.user_data
-
     def update_user_data(self, user_data):
         """Update data pengguna"""
         self.user_data = user_data
@@ -1056,93 +856,6 @@ class MoviesPage(QWidget):
             }
         ]
 
-    def handle_booking_success(self, booking_data):
-        """Handle successful booking and emit signals for it"""
-        try:
-            # Extract data
-            print("Handling booking success with data:", booking_data)
-            
-            # Ubah format data untuk ticket page dan history
-            processed_booking_data = {
-                "movie_title": booking_data.get("movie_title", "Unknown Movie"),
-                "selected_seats": booking_data.get("selected_seats", []),
-                "seats": booking_data.get("selected_seats", []),  # Alias untuk selected_seats
-                "seat_count": len(booking_data.get("selected_seats", [])),
-                "total_price": booking_data.get("total_price", 0),
-                "price_per_ticket": booking_data.get("total_price", 0) // max(1, len(booking_data.get("selected_seats", []))),
-                "studio_type": booking_data.get("studio", "Regular"),  # Use studio as studio_type
-                "studio": booking_data.get("studio", "Regular"),
-                "schedule": booking_data.get("show_date", ""),
-                "cinema": booking_data.get("cinema", "Unknown Cinema"),
-                "theater": booking_data.get("theater", ""),
-                "city": booking_data.get("city", "Unknown City"),
-                "payment_status": "PAID",
-                "booking_date": QDateTime.currentDateTime().toString("dd/MM/yyyy HH:mm"),
-                "transaction_type": "Pembelian Tiket",
-                "timestamp": QDateTime.currentDateTime().toString("dd/MM/yyyy HH:mm")
-            }
-            
-            print("Processed booking data for history:", processed_booking_data)
-            
-            # Update saldo user
-            new_saldo = self.user_data["saldo"] - booking_data.get("total_price", 0)
-            self.user_data["saldo"] = new_saldo
-            print(f"Updated user saldo: {new_saldo}")
-            
-            # Emit signal untuk update saldo di dashboard
-            self.switch_page_signal.emit("update_saldo", {"new_saldo": new_saldo})
-            print("Emitted switch_page_signal for saldo update")
-            
-            # Emit signal untuk history transaksi
-            print("Emitting ticket_purchased signal...")
-            
-            # Format data untuk sesuai dengan format yang diharapkan di handle_ticket_purchase
-            ticket_history_data = {
-                "type": "Tiket",
-                "movie_title": processed_booking_data["movie_title"],
-                "movie_id": processed_booking_data.get("movie_id", 0),
-                "total_price": processed_booking_data["total_price"],
-                "studio_type": processed_booking_data["studio_type"],
-                "studio": processed_booking_data["studio"],
-                "theater": processed_booking_data["theater"],
-                "cinema": processed_booking_data["cinema"],
-                "seats": processed_booking_data["selected_seats"],
-                "schedule": processed_booking_data["schedule"] if "schedule" in processed_booking_data else processed_booking_data.get("show_date", ""),
-                "show_date": processed_booking_data["show_date"] if "show_date" in processed_booking_data else processed_booking_data.get("schedule", ""),
-                "show_time": processed_booking_data.get("show_time", ""),
-                "timestamp": processed_booking_data["timestamp"],
-                "status": "Sukses",
-                "total": -processed_booking_data["total_price"]  # Make sure this matches the format expected in history
-            }
-            
-            # Try to add directly to history page if parent has access
-            try:
-                if hasattr(self.parent(), 'history_page'):
-                    print("Adding ticket directly to history")
-                    self.parent().history_page.add_transaction(ticket_history_data)
-                    self.parent().history_page.filter_transactions()
-                    print("Direct history addition completed")
-            except Exception as e:
-                print(f"Error adding to history directly: {e}")
-            
-            # Also emit the signal for DashboardWindow to handle
-            self.ticket_purchased.emit(ticket_history_data)
-            print("Ticket purchased signal emitted with data:", ticket_history_data)
-            
-            # Show ticket page
-            self.show_ticket_page(processed_booking_data)
-            print("Showing ticket page")
-            
-        except Exception as e:
-            print(f"Error in handle_booking_success: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            QMessageBox.warning(
-                self,
-                "Error",
-                f"Terjadi kesalahan saat memproses pemesanan: {str(e)}"
-            )
-
 # Untuk testing
 if __name__ == "__main__":
     import sys
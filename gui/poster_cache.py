@@ -0,0 +1,105 @@
+"""
+Cache poster film yang sudah di-decode dan di-scale per ukuran tampilan.
+
+Decode JPEG + scale halus adalah bagian termahal saat membuka detail film
+dan halaman booking. warm() boleh dipanggil dari thread mana pun (memakai
+QImage); pixmap() dipanggil di thread GUI dan hanya mengubah QImage yang
+sudah siap menjadi QPixmap. Jika belum di-warm, pixmap() memuat langsung
+seperti sebelumnya.
+
+    cache = get_poster_cache()
+    cache.warm(path, 300, 450)          # thread prefetch
+    label.setPixmap(cache.pixmap(path, 300, 450))
+"""
+
+import os
+import threading
+from collections import OrderedDict
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QImage, QPixmap
+
+from utils.metrics import counter
+
+# Ukuran poster di halaman (lebar, tinggi)
+CARD_SIZE = (200, 300)
+DETAIL_SIZE = (300, 450)
+BOOKING_SIZE = (200, 300)
+
+POSTER_CACHE = counter("tiket_poster_cache_total", "Permintaan poster dari cache", ("result",))
+
+_cache = None
+
+
+class PosterCache:
+    """LRU gambar poster per (path, lebar, tinggi)"""
+
+    def __init__(self, max_items=64):
+        self.max_items = max_items
+        self._images = OrderedDict()  # diisi thread mana pun, dijaga _lock
+        self._pixmaps = OrderedDict()  # hanya thread GUI
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(path, width, height):
+        return (os.path.normpath(path), width, height)
+
+    def contains(self, path, width, height):
+        key = self._key(path, width, height)
+        with self._lock:
+            return key in self._images or key in self._pixmaps
+
+    def warm(self, path, width, height):
+        """Decode dan scale poster ke ukuran tampilan; True jika tersedia di cache"""
+        key = self._key(path, width, height)
+        with self._lock:
+            if key in self._images:
+                return True
+        image = QImage(path)
+        if image.isNull():
+            return False
+        image = image.scaled(width, height, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        with self._lock:
+            self._images[key] = image
+            while len(self._images) > self.max_items:
+                self._images.popitem(last=False)
+        return True
+
+    def pixmap(self, path, width, height):
+        """QPixmap siap pakai (thread GUI); None jika file tidak bisa dibaca"""
+        key = self._key(path, width, height)
+        pixmap = self._pixmaps.get(key)
+        if pixmap is not None:
+            self._pixmaps.move_to_end(key)
+            POSTER_CACHE.labels("hit").inc()
+            return pixmap
+
+        with self._lock:
+            image = self._images.get(key)
+        if image is None:
+            POSTER_CACHE.labels("miss").inc()
+            if not self.warm(path, width, height):
+                return None
+            with self._lock:
+                image = self._images.get(key)
+        else:
+            POSTER_CACHE.labels("warm").inc()
+
+        pixmap = QPixmap.fromImage(image)
+        self._pixmaps[key] = pixmap
+        while len(self._pixmaps) > self.max_items:
+            self._pixmaps.popitem(last=False)
+        return pixmap
+
+    def clear(self):
+        with self._lock:
+            self._images.clear()
+        self._pixmaps.clear()
+
+
+def get_poster_cache():
+    """Cache poster bersama (dibuat di thread GUI)"""
+    global _cache
+    if _cache is None:
+        _cache = PosterCache()
+    return _cache
@@ -0,0 +1,157 @@
+"""
+Prefetch data detail film dan booking saat kartu film di-hover atau saat idle.
+
+Satu thread background mengerjakan antrean terbatas (per film):
+1. poster di-decode dan di-scale ke ukuran detail dan booking (PosterCache)
+2. status kursi jadwal tayang pertama yang akan dibuka halaman booking
+   dimuat ke SeatHub (query tiket yang sudah terbit)
+
+Hover mendahulukan film itu (masuk di depan antrean); prefetch idle masuk di
+belakang. Saat antrean penuh, permintaan paling belakang dibuang. Kursor
+keluar dari kartu membatalkan permintaan yang belum selesai.
+
+    prefetcher = get_prefetcher()
+    prefetcher.request(movie_data, showtime, urgent=True)   # hover
+    prefetcher.cancel(movie_data)                           # leave
+"""
+
+import threading
+import traceback
+from collections import OrderedDict
+
+from gui.poster_cache import get_poster_cache, DETAIL_SIZE, BOOKING_SIZE
+from utils.helper import get_showtime_id
+from utils.metrics import counter, gauge
+from utils.seat_hub import get_seat_hub
+
+PREFETCH_JOBS = counter("tiket_prefetch_jobs_total", "Permintaan prefetch", ("result",))
+
+_prefetcher = None
+
+
+class Prefetcher:
+    """Antrean prefetch terbatas dan bisa dibatalkan, dikerjakan satu thread"""
+
+    def __init__(self, max_pending=8, cache=None):
+        self.max_pending = max_pending
+        self.cache = cache or get_poster_cache()
+        self._pending = OrderedDict()  # key -> (movie_data, showtime); depan = dikerjakan duluan
+        self._done = OrderedDict()  # key yang sudah lengkap (terbatas)
+        self._current = None
+        self._cancel_current = False
+        self._closed = False
+        self._condition = threading.Condition()
+        self._idle = threading.Event()
+        self._idle.set()
+        self._thread = threading.Thread(target=self._run, name="prefetch", daemon=True)
+        self._thread.start()
+
+    def pending(self):
+        return len(self._pending)
+
+    @staticmethod
+    def _key(movie_data):
+        return movie_data.get("title"), movie_data.get("poster_path")
+
+    def _is_done(self, key, movie_data):
+        # Poster bisa sudah tergeser dari LRU cache; kursi tetap terpantau SeatHub
+        poster_path = movie_data.get("poster_path")
+        return key in self._done and (not poster_path or all(
+            self.cache.contains(poster_path, width, height) for width, height in (DETAIL_SIZE, BOOKING_SIZE)
+        ))
+
+    def request(self, movie_data, showtime=None, urgent=True):
+        """Minta prefetch satu film; showtime = jadwal yang akan dibuka halaman booking"""
+        key = self._key(movie_data)
+        with self._condition:
+            if self._closed or key == self._current or self._is_done(key, movie_data):
+                return
+            if key not in self._pending:
+                self._pending[key] = (movie_data, showtime)
+                PREFETCH_JOBS.labels("queued").inc()
+            if urgent:
+                self._pending.move_to_end(key, last=False)
+            while len(self._pending) > self.max_pending:
+                self._pending.popitem(last=True)
+                PREFETCH_JOBS.labels("dropped").inc()
+            self._idle.clear()
+            self._condition.notify()
+
+    def cancel(self, movie_data):
+        """Batalkan prefetch film yang belum selesai (mis. kursor keluar dari kartu)"""
+        key = self._key(movie_data)
+        with self._condition:
+            if self._pending.pop(key, None) is not None:
+                PREFETCH_JOBS.labels("cancelled").inc()
+            elif key == self._current:
+                self._cancel_current = True
+
+    def is_warm(self, movie_data):
+        with self._condition:
+            return self._is_done(self._key(movie_data), movie_data)
+
+    def wait_idle(self, timeout=None):
+        """Tunggu sampai antrean kosong (dipakai benchmark)"""
+        return self._idle.wait(timeout)
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._pending.clear()
+            self._condition.notify()
+        self._thread.join(timeout=2)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._idle.set()
+                    self._condition.wait()
+                if self._closed:
+                    self._idle.set()
+                    return
+                key, (movie_data, showtime) = self._pending.popitem(last=False)
+                self._current = key
+                self._cancel_current = False
+
+            try:
+                completed = self._prefetch(movie_data, showtime)
+            except Exception as e:
+                print(f"Error prefetch {key[0]}: {str(e)}")
+                traceback.print_exc()
+                completed = False
+
+            with self._condition:
+                self._current = None
+                if completed:
+                    self._done[key] = True
+                    while len(self._done) > 256:
+                        self._done.popitem(last=False)
+                PREFETCH_JOBS.labels("completed" if completed else "cancelled").inc()
+
+    def _cancelled(self):
+        with self._condition:
+            return self._cancel_current or self._closed
+
+    def _prefetch(self, movie_data, showtime):
+        poster_path = movie_data.get("poster_path")
+        if poster_path:
+            for width, height in (DETAIL_SIZE, BOOKING_SIZE):
+                if self._cancelled():
+                    return False
+                self.cache.warm(poster_path, width, height)
+        if showtime is not None:
+            if self._cancelled():
+                return False
+            # Channel SeatHub dimuat sekali lalu diperbarui oleh publish; booking tinggal membaca snapshot
+            get_seat_hub().snapshot(get_showtime_id(showtime))
+        return True
+
+
+def get_prefetcher():
+    """Prefetcher bersama (dibuat sekali)"""
+    global _prefetcher
+    if _prefetcher is None:
+        _prefetcher = Prefetcher()
+        gauge("tiket_prefetch_pending", "Permintaan prefetch yang menunggu", function=_prefetcher.pending)
+    return _prefetcher
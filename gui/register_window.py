@@ -5,13 +5,17 @@ from PyQt5.QtCore import Qt, QPropertyAnimation, QEasingCurve, QSize
 from PyQt5.QtGui import QFont, QPixmap, QIcon, QColor, QPalette, QBrush
 import os
 
-from models import UserModel
+from gui.auth_worker import AuthWorker
 
 class RegisterWindow(QMainWindow):
     def __init__(self, bcrypt):
         super().__init__()
         self.bcrypt = bcrypt
         self.genre_list = ['Action', 'Biography', 'Drama', 'Sci-Fi']
+        # Hash password bcrypt di thread pool agar jendela tidak membeku
+        self.auth_worker = AuthWorker(bcrypt, self)
+        self.auth_worker.register_finished.connect(self.on_register_finished)
+        self.auth_worker.busy_changed.connect(self.set_busy)
         self.init_ui()
         
     def init_ui(self):
@@ -403,6 +407,7 @@ class RegisterWindow(QMainWindow):
             }
         """)
         register_button.clicked.connect(self.handle_register)
+        self.register_button = register_button
         
         login_layout = QHBoxLayout()
         login_layout.setAlignment(Qt.AlignCenter)
@@ -465,9 +470,24 @@ class RegisterWindow(QMainWindow):
             QMessageBox.warning(self, 'Error', 'Semua field harus diisi')
             return
         
-        # Proses registrasi
-        success, message = UserModel.register_user(nama, username, password, usia, genre_favorit, self.bcrypt)
-        
+        # Proses registrasi di worker; hasil diterima di on_register_finished
+        if self.auth_worker.is_busy():
+            return
+        self.auth_worker.register(nama, username, password, usia, genre_favorit)
+    
+    def set_busy(self, busy):
+        """Indikator proses registrasi: tombol dan input dinonaktifkan selama bcrypt berjalan"""
+        self.register_button.setEnabled(not busy)
+        self.register_button.setText('Memproses...' if busy else 'Daftar Akun')
+        for widget in (self.nama_input, self.username_input, self.password_input, self.usia_input,
+                       self.genre_input):
+            widget.setEnabled(not busy)
+        if busy:
+            self.setCursor(Qt.BusyCursor)
+        else:
+            self.unsetCursor()
+    
+    def on_register_finished(self, success, message):
         if success:
             QMessageBox.information(self, 'Registrasi Berhasil', message)
             self.back_to_login()
@@ -475,7 +495,13 @@ class RegisterWindow(QMainWindow):
             QMessageBox.warning(self, 'Registrasi Gagal', message)
     
     def back_to_login(self):
+        self.auth_worker.cancel()
         from gui.login_window import LoginWindow
         self.login_window = LoginWindow(self.bcrypt)
         self.login_window.show()
-        self.close() 
\ No newline at end of file
+        self.close()
+    
+    def closeEvent(self, event):
+        # Registrasi yang belum selesai dibatalkan; hasilnya diabaikan
+        self.auth_worker.cancel()
+        super().closeEvent(event)
@@ -0,0 +1,87 @@
+"""
+Repository async untuk halaman GUI.
+
+Pemanggilan models.py / booking_service dijalankan di thread DB
+(utils.db_worker); hasilnya dikirim balik ke thread GUI lewat signal Qt lalu
+diteruskan ke callback on_result / on_error. Handler UI cukup memanggil,
+menampilkan status "memproses", dan melanjutkan di callback.
+
+    get_repository().get_saldo(username, on_result=self.show_saldo)
+"""
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from models import UserModel, BookingModel
+from utils import booking_service
+from utils.db_worker import get_db_worker
+
+# Batas waktu menunggu giliran di thread DB (detik)
+READ_TIMEOUT = 5.0
+WRITE_TIMEOUT = 10.0
+
+_repository = None
+
+
+class AsyncRepository(QObject):
+    """Jembatan future thread DB ke signal Qt"""
+
+    _deliver = pyqtSignal(object, object, object)  # on_result, on_error, future
+
+    def __init__(self, worker=None, parent=None):
+        super().__init__(parent)
+        self.worker = worker or get_db_worker()
+        self._deliver.connect(self._on_deliver)
+
+    def call(self, func, *args, on_result=None, on_error=None, timeout=READ_TIMEOUT, coalesce=False, **kwargs):
+        """Jalankan func di thread DB; callback dipanggil di thread GUI"""
+        future = self.worker.submit(func, *args, timeout=timeout, coalesce=coalesce, **kwargs)
+        # add_done_callback berjalan di thread DB; emit diantrekan ke thread GUI
+        future.add_done_callback(lambda done: self._deliver.emit(on_result, on_error, done))
+        return future
+
+    def _on_deliver(self, on_result, on_error, future):
+        error = future.exception()
+        try:
+            if error is None:
+                if on_result is not None:
+                    on_result(future.result())
+            elif on_error is not None:
+                on_error(error)
+            else:
+                print(f"Error database: {str(error)}")
+        except RuntimeError as e:
+            # Widget penerima sudah dihapus sebelum hasil datang
+            print(f"Hasil database diabaikan: {str(e)}")
+
+    # Bacaan (request identik yang datang bersamaan cukup dijalankan sekali)
+    def get_saldo(self, username, on_result=None, on_error=None):
+        return self.call(UserModel.get_saldo, username, on_result=on_result, on_error=on_error, coalesce=True)
+
+    def get_user(self, username, on_result=None, on_error=None):
+        return self.call(UserModel.get_user, username, on_result=on_result, on_error=on_error, coalesce=True)
+
+    def get_history(self, username, on_result=None, on_error=None):
+        return self.call(BookingModel.get_history, username, on_result=on_result, on_error=on_error,
+                         coalesce=True)
+
+    # Penulisan (lewat admission control di booking_service)
+    def update_saldo(self, username, amount, on_result=None, on_error=None):
+        return self.call(booking_service.update_saldo, username, amount,
+                         on_result=on_result, on_error=on_error, timeout=WRITE_TIMEOUT)
+
+    def top_up(self, username, amount, payment_method="Cash", on_result=None, on_error=None):
+        return self.call(booking_service.top_up, username, amount, payment_method,
+                         on_result=on_result, on_error=on_error, timeout=WRITE_TIMEOUT)
+
+    def create_booking(self, username, booking_data, idempotency_key, on_result=None, on_error=None):
+        # Pembelian baru selesai di jurnal setelah file riwayat tertulis (HistoryPage.save_history)
+        return self.call(booking_service.create_booking, username, booking_data, idempotency_key,
+                         defer_completion=True, on_result=on_result, on_error=on_error, timeout=WRITE_TIMEOUT)
+
+
+def get_repository():
+    """Repository bersama (dibuat di thread GUI saat pertama dipakai)"""
+    global _repository
+    if _repository is None:
+        _repository = AsyncRepository()
+    return _repository
@@ -0,0 +1,259 @@
+"""
+Bayangan kartu dengan dua mode render yang bisa diganti saat aplikasi berjalan.
+
+- effects (default): QGraphicsDropShadowEffect per widget. Setiap repaint
+  widget (dan semua child-nya) dirender dulu ke buffer offscreen lalu di-blur.
+- lite: bayangan digambar parent dari nine-patch yang sudah di-blur sekali
+  dan di-cache per (blur, warna, radius). Widget dan child-nya digambar
+  langsung tanpa buffer; hover cukup mengganti tile menjadi glow.
+
+Mode awal dari TIKET_RENDER=effects|lite, bisa diganti dengan
+set_render_mode() (semua bayangan yang hidup langsung dipasang ulang).
+
+    shadow = attach_shadow(card, blur_radius=15, y_offset=4, radius=12)
+    shadow.set_highlighted(True)     # hover di mode lite
+    set_render_mode(RENDER_LITE)
+"""
+
+import os
+import weakref
+
+from PyQt5 import sip
+from PyQt5.QtCore import QObject, QEvent, QRect, QRectF, Qt
+from PyQt5.QtGui import QColor, QImage, QPainter, QPixmap, QRegion
+from PyQt5.QtWidgets import QGraphicsBlurEffect, QGraphicsDropShadowEffect, QGraphicsScene
+
+RENDER_ENV = "TIKET_RENDER"
+RENDER_EFFECTS = "effects"
+RENDER_LITE = "lite"
+RENDER_MODES = (RENDER_EFFECTS, RENDER_LITE)
+
+HIGHLIGHT_COLOR = QColor(255, 215, 0, 90)
+LAYER_NAME = "shadow_layer"
+
+_mode = None
+_shadows = weakref.WeakSet()
+_tiles = {}
+
+
+def render_mode():
+    """Mode render aktif (dibaca dari TIKET_RENDER saat pertama dipakai)"""
+    global _mode
+    if _mode is None:
+        mode = os.environ.get(RENDER_ENV, RENDER_EFFECTS).strip().lower() or RENDER_EFFECTS
+        if mode not in RENDER_MODES:
+            print(f"Warning: {RENDER_ENV}={mode} tidak dikenal, memakai {RENDER_EFFECTS}")
+            mode = RENDER_EFFECTS
+        _mode = mode
+    return _mode
+
+
+def set_render_mode(mode):
+    """Ganti mode render dan pasang ulang semua bayangan yang masih hidup (thread GUI)"""
+    global _mode
+    if mode not in RENDER_MODES:
+        raise ValueError(f"Mode render tidak dikenal: {mode}")
+    if mode == render_mode():
+        return
+    _mode = mode
+    for shadow in list(_shadows):
+        if not sip.isdeleted(shadow):
+            shadow.apply()
+
+
+def shadow_tile(blur_radius, color, radius):
+    """Tile nine-patch ter-blur untuk rounded rect; sudut tile berukuran 2*blur + radius"""
+    key = (blur_radius, color.rgba(), radius)
+    tile = _tiles.get(key)
+    if tile is not None:
+        return tile
+
+    # Bagian tengah tile harus cukup jauh dari sudut agar blur di tepinya sudah jenuh
+    corner = 2 * blur_radius + radius
+    side = 2 * corner + 1
+    image = QImage(side, side, QImage.Format_ARGB32_Premultiplied)
+    image.fill(Qt.transparent)
+    painter = QPainter(image)
+    painter.setRenderHint(QPainter.Antialiasing)
+    painter.setPen(Qt.NoPen)
+    painter.setBrush(color)
+    painter.drawRoundedRect(QRectF(blur_radius, blur_radius, side - 2 * blur_radius, side - 2 * blur_radius),
+                            radius, radius)
+    painter.end()
+
+    tile = QPixmap.fromImage(_blurred(image, blur_radius))
+    _tiles[key] = tile
+    return tile
+
+
+def _blurred(image, blur_radius):
+    """Blur sekali pakai lewat QGraphicsBlurEffect (blur yang sama dengan drop shadow Qt)"""
+    scene = QGraphicsScene()
+    item = scene.addPixmap(QPixmap.fromImage(image))
+    effect = QGraphicsBlurEffect()
+    effect.setBlurRadius(blur_radius)
+    item.setGraphicsEffect(effect)
+
+    result = QImage(image.size(), QImage.Format_ARGB32_Premultiplied)
+    result.fill(Qt.transparent)
+    painter = QPainter(result)
+    scene.render(painter, QRectF(result.rect()), QRectF(image.rect()))
+    painter.end()
+    return result
+
+
+def draw_nine_patch(painter, target, tile, corner, fill_center=True):
+    """Gambar tile ke target: sudut apa adanya, tepi (dan tengah) diregangkan"""
+    size = min(corner, target.width() // 2, target.height() // 2)
+    source_x = (0, corner, tile.width() - corner, tile.width())
+    source_y = (0, corner, tile.height() - corner, tile.height())
+    target_x = (target.left(), target.left() + size, target.right() + 1 - size, target.right() + 1)
+    target_y = (target.top(), target.top() + size, target.bottom() + 1 - size, target.bottom() + 1)
+    for row in range(3):
+        for col in range(3):
+            if row == col == 1 and not fill_center:
+                continue
+            painter.drawPixmap(
+                QRect(target_x[col], target_y[row], target_x[col + 1] - target_x[col],
+                      target_y[row + 1] - target_y[row]),
+                tile,
+                QRect(source_x[col], source_y[row], source_x[col + 1] - source_x[col],
+                      source_y[row + 1] - source_y[row])
+            )
+
+
+class _ShadowLayer(QObject):
+    """Menggambar bayangan child-child di atas latar parent (sebelum child digambar)"""
+
+    def __init__(self, host):
+        super().__init__(host)
+        self.setObjectName(LAYER_NAME)
+        self.host = host
+        self.shadows = []
+        host.installEventFilter(self)
+
+    @staticmethod
+    def for_host(host):
+        layer = host.findChild(_ShadowLayer, LAYER_NAME, Qt.FindDirectChildrenOnly)
+        return layer if layer is not None else _ShadowLayer(host)
+
+    def eventFilter(self, watched, event):
+        # Latar stylesheet parent sudah tergambar sebelum event Paint sampai ke sini
+        if event.type() == QEvent.Paint and watched is self.host and self.shadows:
+            # Widget yang sudah dihapus (mis. kartu rekomendasi lama) dibuang dari daftar
+            self.shadows = [shadow for shadow in self.shadows
+                            if not sip.isdeleted(shadow) and not sip.isdeleted(shadow.widget)]
+            painter = QPainter(self.host)
+            clip = event.rect()
+            for shadow in self.shadows:
+                shadow.paint(painter, clip)
+            painter.end()
+        return False
+
+
+class CachedShadow(QObject):
+    """Bayangan satu widget; bentuknya mengikuti mode render yang aktif"""
+
+    def __init__(self, widget, blur_radius=10, x_offset=0, y_offset=4, color=QColor(0, 0, 0, 60), radius=12):
+        super().__init__(widget)
+        self.widget = widget
+        self.blur_radius = blur_radius
+        self.x_offset = x_offset
+        self.y_offset = y_offset
+        self.color = QColor(color)
+        self.radius = radius
+        self.highlighted = False
+        self._layer = None
+        self._painted_rect = QRect()
+        widget.installEventFilter(self)
+        widget.destroyed.connect(lambda *_, shadow=self: shadow._widget_destroyed())
+        _shadows.add(self)
+        self.apply()
+
+    def apply(self):
+        """Pasang bayangan sesuai render_mode()"""
+        if render_mode() == RENDER_LITE:
+            if isinstance(self.widget.graphicsEffect(), QGraphicsDropShadowEffect):
+                self.widget.setGraphicsEffect(None)
+            self._attach_layer()
+        else:
+            self._detach_layer()
+            effect = QGraphicsDropShadowEffect(self.widget)
+            effect.setBlurRadius(self.blur_radius)
+            effect.setOffset(self.x_offset, self.y_offset)
+            effect.setColor(self.color)
+            self.widget.setGraphicsEffect(effect)
+
+    def set_highlighted(self, highlighted):
+        """Glow hover (mode lite): hanya area bayangan di parent yang digambar ulang"""
+        if highlighted == self.highlighted:
+            return
+        self.highlighted = highlighted
+        if self._layer is not None:
+            self._layer.host.update(self.shadow_rect())
+
+    def shadow_rect(self):
+        """Area bayangan dalam koordinat parent"""
+        margin = self.blur_radius
+        return self.widget.geometry().adjusted(-margin, -margin, margin, margin).translated(
+            self.x_offset, self.y_offset
+        )
+
+    def paint(self, painter, clip):
+        if not self.widget.isVisible():
+            return
+        rect = self.shadow_rect()
+        self._painted_rect = rect
+        if not rect.intersects(clip):
+            return
+        color = HIGHLIGHT_COLOR if self.highlighted else self.color
+        tile = shadow_tile(self.blur_radius, color, self.radius)
+        # Seperti drop shadow Qt, bagian transparan widget tidak ikut gelap/berpendar
+        painter.save()
+        painter.setClipRegion(QRegion(rect).subtracted(QRegion(self.widget.geometry())))
+        draw_nine_patch(painter, rect, tile, 2 * self.blur_radius + self.radius, fill_center=False)
+        painter.restore()
+
+    def _widget_destroyed(self):
+        """Widget sedang dihapus: lepas dari layer tanpa menyentuh widget lagi"""
+        layer, self._layer = self._layer, None
+        if layer is None or sip.isdeleted(layer):
+            return
+        if self in layer.shadows:
+            layer.shadows.remove(self)
+        if not sip.isdeleted(layer.host):
+            layer.host.update(self._painted_rect)
+
+    def _attach_layer(self):
+        host = self.widget.parentWidget()
+        if host is None or (self._layer is not None and self._layer.host is host):
+            return
+        self._detach_layer()
+        self._layer = _ShadowLayer.for_host(host)
+        self._layer.shadows.append(self)
+        host.update(self.shadow_rect())
+
+    def _detach_layer(self):
+        if self._layer is None:
+            return
+        if self in self._layer.shadows:
+            self._layer.shadows.remove(self)
+        if not sip.isdeleted(self._layer.host):
+            self._layer.host.update(self._painted_rect.united(self.shadow_rect()))
+        self._layer = None
+
+    def eventFilter(self, watched, event):
+        kind = event.type()
+        if kind == QEvent.ParentChange:
+            self._detach_layer()
+            if render_mode() == RENDER_LITE:
+                self._attach_layer()
+        elif self._layer is not None and kind in (QEvent.Move, QEvent.Resize, QEvent.Show, QEvent.Hide):
+            # Parent hanya menggambar ulang area child; tepi bayangan lama dan baru ikut diperbarui
+            self._layer.host.update(self._painted_rect.united(self.shadow_rect()))
+        return False
+
+
+def attach_shadow(widget, blur_radius=10, x_offset=0, y_offset=4, color=QColor(0, 0, 0, 60), radius=12):
+    """Pasang bayangan pada widget; menggantikan setGraphicsEffect(QGraphicsDropShadowEffect)"""
+    return CachedShadow(widget, blur_radius, x_offset, y_offset, color, radius)
@@ -0,0 +1,147 @@
+"""
+Watchdog event loop Qt: mendeteksi GUI "macet" dan mencatat di mana macetnya.
+
+Thread GUI memperbarui detak (heartbeat) lewat QTimer; thread monitor
+memeriksa umur detak terakhir. Jika melewati ambang, stack Python thread GUI
+diambil dengan sys._current_frames() (diulang tiap ambang selama masih
+macet, maksimal MAX_SAMPLES). Setelah event loop berjalan lagi, kejadian
+dicatat dengan durasinya ke ring buffer dan ke temp/stalls.log.
+
+Saat tidak ada macet biayanya hanya satu penugasan float per detak di
+thread GUI dan satu pembandingan per ambang di thread monitor.
+
+    watchdog = StallWatchdog(threshold_ms=300)
+    watchdog.start()
+    watchdog.recent_stalls()
+"""
+
+import os
+import sys
+import time
+import threading
+import traceback
+from collections import deque
+from datetime import datetime
+
+from PyQt5.QtCore import QObject, QTimer
+
+from utils.metrics import histogram
+
+STALL_LOG_PATH = os.path.join("temp", "stalls.log")
+STALL_ENV = "TIKET_STALL_MS"  # ambang dalam ms; 0 mematikan watchdog
+DEFAULT_THRESHOLD_MS = 300
+MAX_SAMPLES = 5
+RING_SIZE = 50
+
+GUI_STALL_SECONDS = histogram("tiket_gui_stall_seconds", "Durasi event loop Qt macet di atas ambang",
+                              buckets=(0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0))
+
+
+class StallWatchdog(QObject):
+    """Heartbeat QTimer di thread GUI + thread monitor yang mengambil stack saat macet"""
+
+    def __init__(self, threshold_ms=DEFAULT_THRESHOLD_MS, log_path=STALL_LOG_PATH, parent=None):
+        super().__init__(parent)
+        self.threshold = threshold_ms / 1000.0
+        self.log_path = log_path
+        self.stalls = deque(maxlen=RING_SIZE)
+        self._gui_ident = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stop_event = threading.Event()
+        self._monitor = None
+
+        # Detak lebih rapat dari ambang agar jeda normal timer tidak dianggap macet
+        self._heartbeat = QTimer(self)
+        self._heartbeat.setInterval(max(10, int(threshold_ms / 3)))
+        self._heartbeat.timeout.connect(self._beat)
+
+    def _beat(self):
+        self._last_beat = time.monotonic()
+
+    def start(self):
+        """Mulai dari thread GUI"""
+        if self._monitor is not None:
+            return
+        self._gui_ident = threading.get_ident()
+        self._beat()
+        self._heartbeat.start()
+        self._stop_event.clear()
+        self._monitor = threading.Thread(target=self._monitor_loop, name="stall-watchdog", daemon=True)
+        self._monitor.start()
+
+    def stop(self):
+        self._heartbeat.stop()
+        self._stop_event.set()
+        if self._monitor is not None:
+            self._monitor.join(timeout=2)
+            self._monitor = None
+
+    def recent_stalls(self):
+        return list(self.stalls)
+
+    def _capture_stack(self):
+        frame = sys._current_frames().get(self._gui_ident)
+        if frame is None:
+            return ""
+        return "".join(traceback.format_stack(frame))
+
+    def _monitor_loop(self):
+        wait = self.threshold
+        while not self._stop_event.wait(wait):
+            last_beat = self._last_beat
+            # Tidur sampai detak terakhir tepat berumur ambang (bukan polling rapat)
+            wait = last_beat + self.threshold - time.monotonic()
+            if wait > 0:
+                wait = max(wait, 0.01)
+                continue
+            wait = self.threshold
+
+            # Macet: ambil stack sekarang dan tiap ambang berikutnya sampai detak kembali
+            started = last_beat
+            samples = []
+            while self._last_beat == last_beat and not self._stop_event.is_set():
+                if len(samples) < MAX_SAMPLES:
+                    samples.append({
+                        "at_ms": round((time.monotonic() - started) * 1000),
+                        "stack": self._capture_stack()
+                    })
+                self._stop_event.wait(self.threshold)
+            if self._last_beat == last_beat:
+                return
+            # Detak pertama setelah macet menandai event loop berjalan lagi
+            self._record(started, self._last_beat - started, samples)
+
+    def _record(self, started, duration, samples):
+        stall = {
+            "time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "duration_ms": round(duration * 1000),
+            "samples": samples
+        }
+        self.stalls.append(stall)
+        GUI_STALL_SECONDS.observe(duration)
+        print(f"GUI macet {stall['duration_ms']} ms (lihat {self.log_path})")
+        try:
+            directory = os.path.dirname(self.log_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.log_path, 'a') as f:
+                f.write(f"=== {stall['time']} GUI macet {stall['duration_ms']} ms ===\n")
+                for sample in samples:
+                    f.write(f"--- stack thread GUI pada +{sample['at_ms']} ms ---\n")
+                    f.write(sample["stack"])
+                f.write("\n")
+        except OSError as e:
+            print(f"Error writing stall log: {str(e)}")
+
+
+def install_stall_watchdog(parent=None):
+    """Pasang watchdog sesuai TIKET_STALL_MS (default 300 ms, 0 = mati); dipanggil di thread GUI"""
+    try:
+        threshold_ms = int(os.environ.get(STALL_ENV, DEFAULT_THRESHOLD_MS))
+    except ValueError:
+        threshold_ms = DEFAULT_THRESHOLD_MS
+    if threshold_ms <= 0:
+        return None
+    watchdog = StallWatchdog(threshold_ms, parent=parent)
+    watchdog.start()
+    return watchdog
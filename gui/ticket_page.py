@@ -1,20 +1,73 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-                          QPushButton, QFrame, QScrollArea, QSizePolicy, QGridLayout, QMessageBox, QFileDialog)
-from PyQt5.QtGui import QFont, QPixmap, QIcon, QPainter, QColor, QPen, QBrush
-from PyQt5.QtCore import Qt, pyqtSignal, QSize, QRect, QRectF, QDate, QDateTime, QTimer
+                          QPushButton, QFrame, QScrollArea, QSizePolicy, QGridLayout, QMessageBox, QFileDialog,
+                          QListWidget, QListWidgetItem, QListView)
+from PyQt5.QtGui import QFont, QPixmap, QImage, QIcon, QPainter, QColor, QPen, QBrush
+from PyQt5.QtCore import Qt, pyqtSignal, QSize, QRect, QRectF, QDate, QDateTime, QTimer, QThread
 import os
-import qrcode
-from PIL import Image, ImageDraw, ImageFont
 from PIL.ImageQt import ImageQt
 from io import BytesIO
-import uuid
-import json
 from shutil import copyfile
+import json
 import traceback
-import time
 
-from models import UserModel
-from utils.helper import find_poster_for_film
+from models import TicketModel
+from gui.repository import get_repository, WRITE_TIMEOUT
+from utils.helper import find_poster_for_film, get_showtime_id
+from utils.qr_payload import encode_ticket_payload
+from utils.ticket_renderer import (render_ticket_image, render_error_ticket, render_batch,
+                                   build_pdf, new_ticket_id, ticket_to_rgbx, encode_png, make_qr_image)
+from utils.ticket_store import get_ticket_store
+from utils.events import BalanceChanged
+from gui.event_dispatch import get_gui_event_bus
+
+def ticket_to_qimage(img):
+    """Bungkus buffer RGBX hasil render sebagai QImage tanpa salinan tambahan
+
+    Mengembalikan (qimage, buffer); buffer harus tetap direferensikan selama
+    QImage dipakai karena QImage tidak menyalin datanya.
+    """
+    buffer, width, height = ticket_to_rgbx(img)
+    qimage = QImage(buffer, width, height, width * 4, QImage.Format_RGBX8888)
+    return qimage, buffer
+
+class BatchTicketWorker(QThread):
+    """Thread pengumpul hasil render tiket per kursi dari process pool"""
+    
+    ticket_ready = pyqtSignal(int, str, str, bytes, bytes)  # index, kursi, ticket id, png, thumbnail
+    batch_finished = pyqtSignal(list, bytes)  # daftar ticket id, pdf
+    
+    def __init__(self, booking_data, seats, parent=None, ticket_ids=None):
+        super().__init__(parent)
+        self.booking_data = dict(booking_data)
+        self.seats = list(seats)
+        self.ticket_ids = list(ticket_ids) if ticket_ids else [new_ticket_id() for _ in self.seats]
+        self._cancelled = False
+        
+    def cancel(self):
+        """Batalkan render batch yang sedang berjalan"""
+        self._cancelled = True
+        
+    def run(self):
+        pages = [None] * len(self.seats)
+        store = get_ticket_store()
+        try:
+            for index, seat, ticket_id, png_bytes, thumb_bytes in render_batch(
+                    self.booking_data, self.seats, self.ticket_ids, lambda: self._cancelled):
+                pages[index] = png_bytes
+                # Simpan per ticket ID agar bisa dicetak ulang tanpa render ulang
+                store.put(ticket_id, png_bytes)
+                self.ticket_ready.emit(index, seat, ticket_id, png_bytes, thumb_bytes)
+            
+            if self._cancelled:
+                return
+            
+            # Susun PDF multi-halaman sesuai urutan kursi
+            pdf_bytes = build_pdf([page for page in pages if page is not None])
+            self.batch_finished.emit(self.ticket_ids, pdf_bytes or b"")
+        except Exception as e:
+            print(f"Error rendering batch tickets: {str(e)}")
+            traceback.print_exc()
+            self.batch_finished.emit(self.ticket_ids, b"")
 
 class TicketPage(QWidget):
     """Halaman untuk menampilkan e-ticket"""
@@ -26,7 +79,15 @@ class TicketPage(QWidget):
         super().__init__()
         self.user_data = user_data
         self.booking_data = None
-        self.ticket_image_path = None
+        self.ticket_image = None  # PIL Image hasil render (di memori)
+        self.ticket_qimage = None
+        self.ticket_id = None
+        self._ticket_buffer = None
+        self._rendered_booking = None
+        self.batch_worker = None
+        self._batch_generation = 0  # naik setiap batch dihentikan; hasil penerbitan lama diabaikan
+        self.batch_tickets = {}  # {index: (kursi, ticket id, png bytes)}
+        self.batch_pdf = None
         self.init_ui()
         
     def init_ui(self):
@@ -131,27 +192,73 @@ class TicketPage(QWidget):
         download_button.clicked.connect(self.download_ticket)
         content_layout.addWidget(download_button)
         
+        # Tiket per kursi (mode batch untuk pemesanan grup)
+        self.batch_container = QWidget()
+        batch_layout = QVBoxLayout(self.batch_container)
+        batch_layout.setContentsMargins(0, 0, 0, 0)
+        batch_layout.setSpacing(10)
+        
+        self.batch_status_label = QLabel("Tiket per kursi")
+        self.batch_status_label.setStyleSheet("color: #CCCCCC; font-size: 13px;")
+        batch_layout.addWidget(self.batch_status_label)
+        
+        self.batch_list = QListWidget()
+        self.batch_list.setViewMode(QListView.IconMode)
+        self.batch_list.setFlow(QListView.LeftToRight)
+        self.batch_list.setWrapping(False)
+        self.batch_list.setIconSize(QSize(80, 120))
+        self.batch_list.setFixedHeight(170)
+        self.batch_list.setStyleSheet("""
+            QListWidget {
+                background-color: #1E1E1E;
+                border-radius: 10px;
+                color: #FFFFFF;
+                font-family: 'Montserrat';
+            }
+        """)
+        self.batch_list.itemClicked.connect(self.show_batch_ticket)
+        batch_layout.addWidget(self.batch_list)
+        
+        self.download_pdf_button = QPushButton("Download Semua Tiket (PDF)")
+        self.download_pdf_button.setCursor(Qt.PointingHandCursor)
+        self.download_pdf_button.setEnabled(False)
+        self.download_pdf_button.setStyleSheet("""
+            QPushButton {
+                background-color: #404040;
+                color: #FFFFFF;
+                border: none;
+                border-radius: 5px;
+                padding: 12px;
+                font-weight: bold;
+                font-family: 'Montserrat';
+                font-size: 14px;
+            }
+            QPushButton:hover {
+                background-color: #505050;
+            }
+            QPushButton:disabled {
+                color: #888888;
+            }
+        """)
+        self.download_pdf_button.clicked.connect(self.download_batch_pdf)
+        batch_layout.addWidget(self.download_pdf_button)
+        
+        self.batch_container.setVisible(False)
+        content_layout.addWidget(self.batch_container)
+        
         main_layout.addWidget(content_container)
         
         # Set window background
         self.setStyleSheet("background-color: #1E1E1E;")
         
-    def generate_qr_code(self, data, size=200):
-        """Generate QR code from data"""
-        qr = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.constants.ERROR_CORRECT_L,
-            box_size=10,
-            border=4,
-        )
-        qr.add_data(json.dumps(data))
-        qr.make(fit=True)
-        
-        qr_image = qr.make_image(fill_color="black", back_color="white")
-        return qr_image.resize((size, size))
+    def generate_qr_code(self, booking_data, ticket_id, size=200):
+        """Generate QR code berisi payload tiket ringkas yang ditandatangani"""
+        payload = encode_ticket_payload(ticket_id, get_showtime_id(booking_data), booking_data.get('seats', []))
+        return make_qr_image(payload, size)
         
     def generate_e_ticket(self, booking_data):
         """Generate e-ticket image"""
+        self.ticket_id = None
         try:
             # Ensure booking_data has all required keys
             required_keys = ['movie_title', 'schedule', 'studio_type', 'cinema', 'theater', 'city', 'total_price']
@@ -188,169 +295,57 @@ class TicketPage(QWidget):
             if 'booking_date' not in booking_data:
                 booking_data['booking_date'] = QDateTime.currentDateTime().toString("dd/MM/yyyy HH:mm")
 
-            # Safe access with default values
-            seats = booking_data.get('seats', [])
-            if isinstance(seats, list):
-                seats_str = ", ".join(seats)
-            else:
-                seats_str = str(seats)
-
-            # Create or load template
-            width, height = 800, 1200
-            template_path = "assets/templates/ticket_template.png"
-            
-            if os.path.exists(template_path):
-                # If template exists, load it
-                img = Image.open(template_path)
-                width, height = img.size
-            else:
-                # Create a directory for templates if it doesn't exist
-                os.makedirs("assets/templates", exist_ok=True)
-                
-                # If template doesn't exist, create a new image
-                img = Image.new('RGB', (width, height), '#1E1E1E')
-                
-                # Add a gold header bar
-                draw = ImageDraw.Draw(img)
-                draw.rectangle([0, 0, width, 100], fill='#FFD700')
-                
-                # Save the template for future use
-                img.save(template_path)
-            
-            # Create draw object
-            draw = ImageDraw.Draw(img)
-            
-            # Load fonts
-            try:
-                title_font = ImageFont.truetype("assets/fonts/Montserrat-Bold.ttf", 36)
-                heading_font = ImageFont.truetype("assets/fonts/Montserrat-Bold.ttf", 24)
-                regular_font = ImageFont.truetype("assets/fonts/Montserrat-Regular.ttf", 14)
-                small_font = ImageFont.truetype("assets/fonts/Montserrat-Regular.ttf", 12)
-            except IOError:
-                # Fallback to default font if custom font not found
-                title_font = ImageFont.load_default()
-                heading_font = ImageFont.load_default()
-                regular_font = ImageFont.load_default()
-                small_font = ImageFont.load_default()
-            
-            # Draw title
-            draw.text((width//2, 50), 'E-TICKET', font=title_font, fill='#000000', anchor="mm")
-            
-            # Draw movie title
-            draw.text((40, 140), booking_data.get("movie_title", "Unknown Movie"), font=heading_font, fill='#FFFFFF')
-            
-            # Draw booking details
-            y = 220
-            details = [
-                ("Bioskop:", f"{booking_data.get('cinema', 'N/A')}"),
-                ("Kota:", booking_data.get("city", "N/A")),
-                ("Theater:", booking_data.get("theater", "N/A")),
-                ("Studio:", booking_data.get("studio_type", "Regular")),
-                ("Jadwal:", booking_data.get("schedule", "N/A")),
-                ("Kursi:", seats_str),
-                ("Jumlah Tiket:", str(booking_data.get("seat_count", 0))),
-                ("Harga per Tiket:", f"Rp {booking_data.get('price_per_ticket', 0):,}".replace(',', '.')),
-                ("Total Harga:", f"Rp {booking_data.get('total_price', 0):,}".replace(',', '.')),
-                ("Tanggal Booking:", booking_data.get("booking_date", "N/A"))
-            ]
-            
-            for label, value in details:
-                # Draw label and value
-                draw.text((40, y), label, font=regular_font, fill='#CCCCCC')
-                draw.text((200, y), value, font=regular_font, fill='#FFFFFF')
-                y += 30
-            
-            # Generate QR code
-            qr_data = {
-                "movie": booking_data.get("movie_title", ""),
-                "cinema": booking_data.get("cinema", ""),
-                "theater": booking_data.get("theater", ""),
-                "date": booking_data.get("schedule", ""),
-                "seats": seats_str,
-                "id": uuid.uuid4().hex[:8].upper()
-            }
-            
-            # Convert to JSON and generate QR
-            qr_json = json.dumps(qr_data)
-            qr = qrcode.QRCode(
-                version=1,
-                error_correction=qrcode.constants.ERROR_CORRECT_L,
-                box_size=10,
-                border=4,
-            )
-            qr.add_data(qr_json)
-            qr.make(fit=True)
-            
-            qr_img = qr.make_image(fill_color="black", back_color="white")
-            
-            # Resize QR code
-            qr_size = 200
-            qr_img = qr_img.resize((qr_size, qr_size))
-            
-            # Calculate QR code position (right side of ticket)
-            qr_x = width - qr_size - 40
-            qr_y = 240
-            
-            # Paste QR code onto ticket
-            img.paste(qr_img, (qr_x, qr_y))
-            
-            # Draw note below QR code
-            note_text = "Scan QR code ini di bioskop untuk masuk"
-            draw.text((qr_x + qr_size // 2, qr_y + qr_size + 20), note_text, 
-                    font=small_font, fill='#FFFFFF', anchor="mm")
-            
-            # Add ticket ID
-            ticket_id = f"Ticket ID: {qr_data['id']}"
-            draw.text((qr_x + qr_size // 2, qr_y + qr_size + 40), ticket_id, 
-                    font=small_font, fill='#FFD700', anchor="mm")
-            
-            # Save the ticket
-            os.makedirs("temp", exist_ok=True)
-            file_path = f"temp/ticket_{qr_data['id']}.png"
-            img.save(file_path)
-            
-            return file_path
+            # Render tiket di memori dengan renderer bersama
+            img, qr_data = render_ticket_image(booking_data, booking_data.get('ticket_id'))
+            self.ticket_id = qr_data['id']
+            return img
             
         except Exception as e:
             print(f"Error generating e-ticket: {str(e)}")
             traceback.print_exc()
             # Create a simple error ticket
             try:
-                error_img = Image.new('RGB', (800, 600), color=(30, 30, 30))
-                draw = ImageDraw.Draw(error_img)
-                
-                # Try to use a default font
-                try:
-                    font = ImageFont.truetype("assets/fonts/Montserrat-Bold.ttf", 24)
-                    small_font = ImageFont.truetype("assets/fonts/Montserrat-Regular.ttf", 16)
-                except:
-                    font = ImageFont.load_default()
-                    small_font = ImageFont.load_default()
-                
-                draw.text((400, 100), "Terjadi Kesalahan", font=font, fill=(255, 255, 255), anchor="mm")
-                draw.text((400, 150), "Tidak dapat membuat e-ticket", font=small_font, fill=(255, 255, 255), anchor="mm")
-                draw.text((400, 200), f"Error: {str(e)}", font=small_font, fill=(255, 215, 0), anchor="mm")
-                draw.text((400, 250), "Silakan hubungi customer service", font=small_font, fill=(255, 255, 255), anchor="mm")
-                
-                # Add movie details if available
-                y = 300
-                if 'movie_title' in booking_data:
-                    draw.text((400, y), f"Film: {booking_data.get('movie_title', 'N/A')}", font=small_font, fill=(255, 255, 255), anchor="mm")
-                    y += 30
-                
-                if 'cinema' in booking_data and 'theater' in booking_data:
-                    draw.text((400, y), f"Lokasi: {booking_data.get('cinema', 'N/A')} - {booking_data.get('theater', 'N/A')}", font=small_font, fill=(255, 255, 255), anchor="mm")
-                    y += 30
-                
-                # Save the error ticket
-                os.makedirs("temp", exist_ok=True)
-                error_file_path = f"temp/error_ticket_{int(time.time())}.png"
-                error_img.save(error_file_path)
-                return error_file_path
-                
+                return render_error_ticket(booking_data, e)
             except Exception as inner_e:
                 print(f"Failed to create error ticket: {str(inner_e)}")
                 return None
+    
+    def prepare_ticket(self, booking_data):
+        """Render e-ticket ke memori dan kembalikan QImage untuk ditampilkan
+
+        Tiket di luar layanan pemesanan dicatat dulu lewat show_ticket agar ID di QR
+        pasti ID yang tersimpan (pemesanan lewat layanan sudah mencatatnya).
+        """
+        self.ticket_image = self.generate_e_ticket(booking_data)
+        self._rendered_booking = booking_data
+        if self.ticket_image is None:
+            self.ticket_qimage = None
+            self._ticket_buffer = None
+            return None
+        
+        self.ticket_qimage, self._ticket_buffer = ticket_to_qimage(self.ticket_image)
+        return self.ticket_qimage
+    
+    def issue_tickets(self, booking_data, tickets, on_issued, group_ticket_id=None):
+        """Simpan ticket ID ke tabel issued_tickets di thread DB
+
+        on_issued(issued) dipanggil di thread GUI dengan pasangan (ticket ID final, kursi);
+        daftar kosong jika gagal dicatat.
+        """
+        username = self.user_data.get('username') if self.user_data else None
+        
+        def on_result(result):
+            success, message, issued = result
+            if not success:
+                print(f"Gagal mencatat tiket: {message}")
+            on_issued(issued)
+        
+        def on_error(error):
+            print(f"Gagal mencatat tiket: {str(error)}")
+            on_issued([])
+        
+        get_repository().call(TicketModel.issue_tickets, username, dict(booking_data), tickets, group_ticket_id,
+                              on_result=on_result, on_error=on_error, timeout=WRITE_TIMEOUT)
         
     def display_ticket(self, booking_data):
         """Display the e-ticket"""
@@ -365,64 +360,118 @@ class TicketPage(QWidget):
             total_price = booking_data.get("total_price", 0)
             print(f"Processing payment for ticket: Rp {total_price:,}")
             
-            # Lakukan pembayaran dengan mengurangi saldo
-            try:
-                success, message, new_saldo = UserModel.update_saldo(
-                    self.user_data['username'],
-                    -total_price  # Kurangi saldo
-                )
-                print(f"Payment result: success={success}, message={message}, new_saldo={new_saldo}")
-                
-                if success:
-                    # Update status pembayaran
-                    self.booking_data["payment_status"] = "PAID"
-                    
-                    # Update user data dengan saldo baru
-                    if self.user_data:
-                        print(f"Updating user saldo from {self.user_data.get('saldo', 0)} to {new_saldo}")
-                        self.user_data['saldo'] = new_saldo
-                        
-                    # Tampilkan notifikasi pembayaran berhasil
-                    QMessageBox.information(
-                        self,
-                        "Pembayaran Berhasil",
-                        f"Pembayaran tiket sebesar Rp {total_price:,} berhasil.\nSaldo Anda sekarang: Rp {new_saldo:,}".replace(',', '.')
-                    )
-                else:
-                    # Jika gagal, tampilkan pesan error
-                    QMessageBox.critical(
-                        self,
-                        "Pembayaran Gagal",
-                        f"Gagal melakukan pembayaran: {message}\nSilakan coba lagi atau hubungi customer service."
-                    )
-                    # Kembali ke halaman sebelumnya
-                    self.back_to_movies.emit()
-                    return
-            except Exception as e:
-                print(f"Error during payment processing: {str(e)}")
-                QMessageBox.critical(
-                    self,
-                    "Error Pembayaran",
-                    f"Terjadi kesalahan saat memproses pembayaran: {str(e)}"
-                )
-                self.back_to_movies.emit()
-                return
+            # Lakukan pembayaran dengan mengurangi saldo (thread DB); tiket ditampilkan setelah berhasil.
+            # Pengguna dicatat sekarang: di mode kiosk user_data bisa berganti sebelum hasil tiba
+            username = self.user_data['username']
+            get_repository().update_saldo(
+                username,
+                -total_price,  # Kurangi saldo
+                on_result=lambda result: self.on_payment_finished(booking_data, total_price, result, username),
+                on_error=lambda error: self.on_payment_error(error, username)
+            )
+            return
         # Jika sudah dibayar, pastikan data saldo di user_data terupdate
         elif payment_status == "PAID" and self.user_data and booking_data.get("total_price"):
             print(f"Ticket already paid. Ensuring user data has current saldo.")
             # Pastikan saldo di user_data terupdate dengan yang terbaru dari database
             if 'username' in self.user_data:
-                current_saldo = UserModel.get_saldo(self.user_data['username'])
-                if current_saldo != self.user_data.get('saldo'):
-                    print(f"Updating user_data saldo from {self.user_data.get('saldo')} to {current_saldo}")
-                    self.user_data['saldo'] = current_saldo
+                username = self.user_data['username']
+                get_repository().get_saldo(username, on_result=lambda saldo: self.sync_saldo(saldo, username))
         
-        # Generate e-ticket image
-        self.ticket_image_path = self.generate_e_ticket(booking_data)
+        self.show_ticket(booking_data)
+    
+    def sync_saldo(self, current_saldo, username):
+        """Samakan saldo di user_data dengan database"""
+        if username != self.user_data.get('username'):
+            return  # saldo pengguna kiosk sebelumnya
+        if current_saldo != self.user_data.get('saldo'):
+            print(f"Updating user_data saldo from {self.user_data.get('saldo')} to {current_saldo}")
+            self.user_data['saldo'] = current_saldo
+            get_gui_event_bus().publish(BalanceChanged(username=username, new_saldo=current_saldo))
+    
+    def on_payment_finished(self, booking_data, total_price, result, username):
+        """Hasil pembayaran tiket UNPAID dari thread DB"""
+        success, message, new_saldo = result
+        print(f"Payment result: success={success}, message={message}, new_saldo={new_saldo}")
+        
+        # Hasil yang tiba setelah pengguna kiosk berganti milik pengguna sebelumnya
+        if username != (self.user_data or {}).get('username'):
+            print(f"Hasil pembayaran tiket untuk {username} diabaikan: pengguna kiosk sudah berganti")
+            return
+        
+        if success:
+            # Update status pembayaran
+            self.booking_data["payment_status"] = "PAID"
+            
+            # Update user data dengan saldo baru
+            if self.user_data:
+                print(f"Updating user saldo from {self.user_data.get('saldo', 0)} to {new_saldo}")
+                self.user_data['saldo'] = new_saldo
+                get_gui_event_bus().publish(BalanceChanged(username=username, new_saldo=new_saldo))
+                
+            # Tampilkan notifikasi pembayaran berhasil
+            QMessageBox.information(
+                self,
+                "Pembayaran Berhasil",
+                f"Pembayaran tiket sebesar Rp {total_price:,} berhasil.\nSaldo Anda sekarang: Rp {new_saldo:,}".replace(',', '.')
+            )
+            self.show_ticket(booking_data)
+        else:
+            # Jika gagal, tampilkan pesan error
+            QMessageBox.critical(
+                self,
+                "Pembayaran Gagal",
+                f"Gagal melakukan pembayaran: {message}\nSilakan coba lagi atau hubungi customer service."
+            )
+            # Kembali ke halaman sebelumnya
+            self.back_to_movies.emit()
+    
+    def on_payment_error(self, error, username):
+        """Database sibuk/terkunci atau antrean pembayaran penuh"""
+        print(f"Error during payment processing: {str(error)}")
+        if username != (self.user_data or {}).get('username'):
+            return
+        QMessageBox.critical(
+            self,
+            "Error Pembayaran",
+            f"Terjadi kesalahan saat memproses pembayaran: {str(error)}"
+        )
+        self.back_to_movies.emit()
+    
+    def show_ticket(self, booking_data):
+        """Catat tiket baru (jika perlu) lalu render dan tampilkan e-ticket yang sudah dibayar"""
+        if not booking_data.get('booking_id') and not booking_data.get('ticket_id'):
+            self.issue_tickets(booking_data, [(new_ticket_id(), booking_data.get('seats', []))],
+                               lambda issued: self.on_ticket_issued(booking_data, issued))
+            return
+        self.render_ticket(booking_data)
+    
+    def on_ticket_issued(self, booking_data, issued):
+        """Lanjutkan render setelah tiket tercatat di thread DB"""
+        if self.booking_data is not booking_data:
+            return  # halaman sudah menampilkan tiket lain atau dikosongkan
+        if issued:
+            booking_data['ticket_id'] = issued[0][0]
+        self.render_ticket(booking_data)
+    
+    def render_ticket(self, booking_data):
+        """Render dan tampilkan e-ticket"""
+        # Generate e-ticket image (pakai hasil render sebelumnya jika sudah disiapkan)
+        if self._rendered_booking is not booking_data or self.ticket_qimage is None:
+            self.prepare_ticket(booking_data)
+        
+        # Pemesanan grup: render satu tiket per kursi di background
+        seats = booking_data.get('seats', [])
+        is_batch = isinstance(seats, list) and len(seats) > 1
+        if is_batch:
+            self.start_batch_render(booking_data, seats)
+        else:
+            self.stop_batch_render()
+            self.batch_container.setVisible(False)
         
         # Display the ticket
-        if os.path.exists(self.ticket_image_path):
-            pixmap = QPixmap(self.ticket_image_path)
+        if self.ticket_qimage is not None:
+            pixmap = QPixmap.fromImage(self.ticket_qimage)
             scaled_pixmap = pixmap.scaled(
                 self.ticket_preview.size(),
                 Qt.KeepAspectRatio,
@@ -431,11 +480,139 @@ class TicketPage(QWidget):
             self.ticket_preview.setPixmap(scaled_pixmap)
             
             # Tampilkan history setelah 2 detik (memberikan waktu untuk melihat e-ticket)
-            QTimer.singleShot(2000, self.show_history.emit)
+            # Untuk pemesanan grup tetap di halaman ini agar tiket per kursi bisa diunduh
+            if not is_batch:
+                QTimer.singleShot(2000, self.show_history.emit)
+    
+    def start_batch_render(self, booking_data, seats):
+        """Mulai render tiket per kursi lewat process pool"""
+        self.stop_batch_render()
+        
+        self.batch_tickets = {}
+        self.batch_pdf = None
+        self.batch_list.clear()
+        self.download_pdf_button.setEnabled(False)
+        self.batch_status_label.setText(f"Menyiapkan tiket per kursi: 0/{len(seats)}")
+        self.batch_container.setVisible(True)
+        
+        # Placeholder agar urutan thumbnail sesuai urutan kursi
+        for seat in seats:
+            item = QListWidgetItem(seat)
+            item.setFlags(Qt.NoItemFlags)
+            self.batch_list.addItem(item)
+        
+        batch_data = dict(booking_data)
+        seat_count = len(seats)
+        total_price = batch_data.get('total_price', 0)
+        if isinstance(total_price, int) and total_price > 0:
+            batch_data['price_per_ticket'] = total_price // seat_count
+        
+        # Pakai ticket ID per kursi yang sudah diterbitkan layanan pemesanan jika ada
+        issued = booking_data.get('ticket_ids') or {}
+        ticket_ids = [issued[seat] for seat in seats] if all(seat in issued for seat in seats) else None
+        if ticket_ids is None:
+            # Tiket per kursi ditautkan ke tiket grup agar satu kursi tidak bisa masuk dua kali
+            generation = self._batch_generation
+            self.issue_tickets(batch_data, [(new_ticket_id(), seat) for seat in seats],
+                               lambda issued: self.on_batch_issued(generation, batch_data, seats, issued),
+                               group_ticket_id=self.ticket_id)
+            return
+        self.run_batch_worker(batch_data, seats, ticket_ids)
+    
+    def on_batch_issued(self, generation, batch_data, seats, issued):
+        """Tiket per kursi sudah tercatat: mulai render batch jika belum dibatalkan"""
+        if generation != self._batch_generation:
+            return
+        self.run_batch_worker(batch_data, seats, [ticket_id for ticket_id, _ in issued] or None)
+    
+    def run_batch_worker(self, batch_data, seats, ticket_ids):
+        self.batch_worker = BatchTicketWorker(batch_data, seats, self, ticket_ids)
+        self.batch_worker.ticket_ready.connect(self.on_batch_ticket_ready)
+        self.batch_worker.batch_finished.connect(self.on_batch_finished)
+        self.batch_worker.start()
+    
+    def clear_ticket(self):
+        """Buang tiket yang sedang ditampilkan beserta QR bertanda tangannya (pengguna kiosk berikutnya)"""
+        self.stop_batch_render()
+        self.booking_data = None
+        self.ticket_image = None
+        self.ticket_qimage = None
+        self._ticket_buffer = None
+        self.ticket_id = None
+        self._rendered_booking = None
+        self.batch_tickets = {}
+        self.batch_pdf = None
+        self.batch_list.clear()
+        self.batch_container.setVisible(False)
+        self.ticket_preview.clear()
+    
+    def stop_batch_render(self):
+        """Hentikan render batch yang sedang berjalan (atau yang masih menunggu penerbitan tiket)"""
+        self._batch_generation += 1
+        if self.batch_worker is not None:
+            self.batch_worker.ticket_ready.disconnect()
+            self.batch_worker.batch_finished.disconnect()
+            self.batch_worker.cancel()
+            self.batch_worker = None
+    
+    def on_batch_ticket_ready(self, index, seat, ticket_id, png_bytes, thumb_bytes):
+        """Tampilkan thumbnail tiket kursi yang sudah selesai dirender"""
+        self.batch_tickets[index] = (seat, ticket_id, png_bytes)
+        
+        thumb = QPixmap()
+        thumb.loadFromData(thumb_bytes, "PNG")
+        item = self.batch_list.item(index)
+        if item is not None:
+            item.setIcon(QIcon(thumb))
+            item.setText(f"{seat}\n{ticket_id}")
+            item.setData(Qt.UserRole, index)
+            item.setFlags(Qt.ItemIsEnabled | Qt.ItemIsSelectable)
+        
+        self.batch_status_label.setText(
+            f"Menyiapkan tiket per kursi: {len(self.batch_tickets)}/{self.batch_list.count()}"
+        )
+    
+    def on_batch_finished(self, ticket_ids, pdf_bytes):
+        """Handler ketika seluruh tiket kursi selesai dirender"""
+        self.batch_pdf = pdf_bytes or None
+        self.download_pdf_button.setEnabled(self.batch_pdf is not None)
+        self.batch_status_label.setText(f"{len(self.batch_tickets)} tiket per kursi siap")
+        self.batch_worker = None
+    
+    def show_batch_ticket(self, item):
+        """Tampilkan tiket kursi yang dipilih di area pratinjau"""
+        index = item.data(Qt.UserRole)
+        if index not in self.batch_tickets:
+            return
+        
+        _, _, png_bytes = self.batch_tickets[index]
+        pixmap = QPixmap()
+        pixmap.loadFromData(png_bytes, "PNG")
+        self.ticket_preview.setPixmap(pixmap.scaled(
+            self.ticket_preview.size(),
+            Qt.KeepAspectRatio,
+            Qt.SmoothTransformation
+        ))
+    
+    def download_batch_pdf(self):
+        """Simpan semua tiket per kursi sebagai satu PDF untuk dicetak"""
+        if not self.batch_pdf:
+            return
+        
+        file_name, _ = QFileDialog.getSaveFileName(
+            self,
+            "Save E-Tickets",
+            f"tickets_{self.booking_data['movie_title'].replace(' ', '_')}.pdf",
+            "PDF (*.pdf)"
+        )
+        
+        if file_name:
+            with open(file_name, 'wb') as f:
+                f.write(self.batch_pdf)
             
     def download_ticket(self):
         """Download the e-ticket"""
-        if not self.ticket_image_path or not os.path.exists(self.ticket_image_path):
+        if self.ticket_image is None:
             return
             
         # Open file dialog
@@ -447,13 +624,11 @@ class TicketPage(QWidget):
         )
         
         if file_name:
-            # Copy the temporary file to the selected location
-            copyfile(self.ticket_image_path, file_name)
-    
-    def __del__(self):
-        """Cleanup temporary files when object is destroyed"""
-        if self.ticket_image_path and os.path.exists(self.ticket_image_path):
-            try:
-                os.remove(self.ticket_image_path)
-            except:
-                pass 
\ No newline at end of file
+            # Tulis ke disk hanya saat pengguna mengunduh; salinan di store
+            # dipakai ulang jika tiket yang sama diunduh lagi
+            store = get_ticket_store()
+            cached_path = store.get_path(self.ticket_id) if self.ticket_id else None
+            if cached_path is None:
+                png_bytes = encode_png(self.ticket_image)
+                cached_path = store.put(self.ticket_id or new_ticket_id(), png_bytes)
+            copyfile(cached_path, file_name)
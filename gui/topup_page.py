@@ -4,7 +4,10 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
 from PyQt5.QtGui import QFont, QPixmap, QIcon, QIntValidator
 from PyQt5.QtCore import Qt, pyqtSignal, QSize, QDateTime
 import os
-from models import UserModel
+import uuid
+from gui.repository import get_repository
+from gui.event_dispatch import get_gui_event_bus
+from utils.events import ToppedUp
 from datetime import datetime
 
 class BankButton(QPushButton):
@@ -50,8 +53,6 @@ class BankButton(QPushButton):
 
 class TopUpPage(QWidget):
     """Halaman untuk melakukan top-up saldo"""
-    # Signal ketika top-up berhasil
-    top_up_success = pyqtSignal(int)
     
     def __init__(self, user_data):
         super().__init__()
@@ -61,11 +62,23 @@ class TopUpPage(QWidget):
         self.init_ui()
         
     def update_display_saldo(self, new_saldo):
-        """Memperbarui tampilan saldo pada halaman top up"""
-        # This method is kept for compatibility
-        # The actual updating is done by the dashboard
-        print(f"TopUpPage: Received saldo update request to {new_saldo}")
-        pass
+        """Memperbarui tampilan saldo pada halaman top up (dipanggil dashboard, juga saat ganti pengguna)"""
+        try:
+            self.show_saldo(int(new_saldo))
+        except (TypeError, ValueError):
+            print(f"TopUpPage: saldo tidak valid: {new_saldo}")
+    
+    def reset_form(self):
+        """Kembalikan pilihan nominal, bank dan saldo ke awal (pengguna kiosk berikutnya)"""
+        self.show_saldo(0)
+        for button in self.nominal_buttons:
+            button.setChecked(False)
+        self.other_nominal_input.clear()
+        self.confirm_button.setEnabled(False)
+        if self.bank_buttons:
+            self.bank_buttons[0].setChecked(True)
+            self.selected_bank = self.bank_buttons[0].bank_name
+            self.selected_payment_method = self.bank_buttons[0].property("bank_id")
         
     def init_ui(self):
         """Inisialisasi antarmuka pengguna"""
@@ -120,9 +133,10 @@ class TopUpPage(QWidget):
         current_balance_label = QLabel("Saldo Saat Ini:")
         current_balance_label.setStyleSheet("font-size: 16px; font-weight: bold; color: #FFFFFF; font-family: 'Montserrat';")
         
-        # Ambil saldo saat ini dari database
-        current_saldo = UserModel.get_saldo(self.user_data['username'])
+        # Tampilkan saldo yang diketahui, lalu perbarui dari database di thread DB
+        current_saldo = self.user_data.get('saldo', 0)
         self.saldo_value_label = QLabel(f"Rp {current_saldo:,}".replace(',', '.'))
+        get_repository().get_saldo(self.user_data['username'], on_result=self.show_saldo)
         self.saldo_value_label.setStyleSheet("font-size: 32px; color: #FFD700; font-weight: bold; font-family: 'Montserrat';")
         self.saldo_value_label.setAlignment(Qt.AlignCenter)
         
@@ -439,64 +453,83 @@ class TopUpPage(QWidget):
         )
         
         if msg == QMessageBox.Yes:
-            # Proses top-up
-            success, message, new_saldo = UserModel.update_saldo(self.user_data['username'], nominal)
-            
-            if success:
-                QMessageBox.information(
-                    self,
-                    "Top-Up Berhasil",
-                    f"Saldo berhasil ditambahkan.\nSaldo saat ini: Rp {new_saldo:,}".replace(',', '.')
-                )
-                
-                # Reset UI
-                for button in self.nominal_buttons:
-                    button.setChecked(False)
-                self.other_nominal_input.clear()
-                self.confirm_button.setEnabled(False)
-                
-                # Emit signal top-up berhasil - let dashboard handle everything
-                self.top_up_success.emit(nominal)
-            else:
-                QMessageBox.warning(self, "Top-Up Gagal", message)
+            # Proses top-up di thread DB; hasil diterima di on_top_up_finished
+            self.process_topup(nominal)
     
     def process_topup(self, amount):
         """Process the top-up transaction"""
-        try:
-            if self.user_data and 'username' in self.user_data:
-                # Update the user's balance in the database
-                success, message, new_saldo = UserModel.update_saldo(self.user_data['username'], amount)
-                if success:
-                    # Show success message
-                    QMessageBox.information(
-                        self,
-                        "Top Up Berhasil",
-                        f"Saldo berhasil ditambahkan.\nSaldo akan diperbarui pada tampilan."
-                    )
-                    
-                    # Reset UI elements
-                    for button in self.nominal_buttons:
-                        button.setChecked(False)
-                    self.other_nominal_input.clear()
-                    self.confirm_button.setEnabled(False)
-                    
-                    # Enable back button if it exists
-                    if hasattr(self, 'back_button'):
-                        self.back_button.setEnabled(True)
-                    
-                    # Emit the signal with the amount - the dashboard will handle everything else
-                    print(f"Emitting top_up_success with amount: {amount}")
-                    self.top_up_success.emit(amount)
-                    
-                else:
-                    # Handle error case
-                    QMessageBox.warning(self, "Top Up Gagal", message)
-            else:
-                # Handle error case
-                QMessageBox.warning(self, "Top Up Gagal", "Data pengguna tidak ditemukan")
-        except Exception as e:
-            print(f"Error processing top-up: {str(e)}")
-            QMessageBox.critical(self, "Top Up Gagal", f"Gagal: {str(e)}")
+        if self.user_data and 'username' in self.user_data:
+            # Pengguna dan metode bayar dicatat sekarang: di mode kiosk user_data bisa
+            # berganti sebelum hasil dari thread DB tiba
+            username = self.user_data['username']
+            payment_method = self.selected_payment_method
+            self.set_processing(True)
+            get_repository().update_saldo(
+                username,
+                amount,
+                on_result=lambda result: self.on_top_up_finished(result, amount, username, payment_method),
+                on_error=lambda error: self.on_top_up_error(error, username)
+            )
+        else:
+            # Handle error case
+            QMessageBox.warning(self, "Top Up Gagal", "Data pengguna tidak ditemukan")
+    
+    def show_saldo(self, saldo):
+        """Perbarui label saldo saat ini"""
+        self.saldo_value_label.setText(f"Rp {saldo:,}".replace(',', '.'))
+    
+    def set_processing(self, processing):
+        """Tombol konfirmasi nonaktif selama top-up diproses"""
+        self.confirm_button.setEnabled(not processing and self.get_selected_nominal() > 0)
+        self.confirm_button.setText("Memproses..." if processing else "Konfirmasi Top-Up")
+    
+    def on_top_up_finished(self, result, amount, username, payment_method):
+        """Hasil top-up dari thread DB untuk pengguna yang mengonfirmasi"""
+        self.set_processing(False)
+        success, message, new_saldo = result
+        
+        # Hasil yang tiba setelah pengguna kiosk berganti milik pengguna sebelumnya
+        if username != self.user_data.get('username'):
+            print(f"Hasil top-up untuk {username} diabaikan: pengguna kiosk sudah berganti")
+            return
+        
+        if success:
+            QMessageBox.information(
+                self,
+                "Top-Up Berhasil",
+                f"Saldo berhasil ditambahkan.\nSaldo saat ini: Rp {new_saldo:,}".replace(',', '.')
+            )
+            self.show_saldo(new_saldo)
+            
+            # Reset UI
+            for button in self.nominal_buttons:
+                button.setChecked(False)
+            self.other_nominal_input.clear()
+            self.confirm_button.setEnabled(False)
+            
+            # Enable back button if it exists
+            if hasattr(self, 'back_button'):
+                self.back_button.setEnabled(True)
+            
+            # Satu event top up: dashboard memperbarui saldo dan riwayat
+            print(f"Publishing ToppedUp with amount: {amount}")
+            get_gui_event_bus().publish(ToppedUp(
+                username=username,
+                new_saldo=new_saldo,
+                transaction_id=str(uuid.uuid4()),
+                amount=amount,
+                payment_method=payment_method
+            ))
+        else:
+            QMessageBox.warning(self, "Top-Up Gagal", message)
+    
+    def on_top_up_error(self, error, username):
+        """Database sibuk/terkunci atau antrean pembayaran penuh"""
+        self.set_processing(False)
+        print(f"Error processing top-up: {str(error)}")
+        if username != self.user_data.get('username'):
+            return
+        QMessageBox.critical(self, "Top Up Gagal", f"Gagal: {str(error)}")
 
     def on_topup_clicked(self):
         """Handler for top up button click"""
@@ -1,17 +1,24 @@
 import sys
 import os
 from PyQt5.QtWidgets import QApplication
-from flask import Flask
-from flask_bcrypt import Bcrypt
+from PyQt5.QtCore import QTimer
 import threading
 import sqlite3
 
 from gui.login_window import LoginWindow
+from utils.ticket_store import get_ticket_store
+from utils.write_behind import get_write_behind
+from utils.purchase_journal import recover_purchases
+from gui.stall_watchdog import install_stall_watchdog
+from gui.event_dispatch import get_gui_event_bus
+from gui.prefetch import get_prefetcher
+from utils.event_bridge import start_event_bridge
+from server.app import create_app, bcrypt
+from utils.metrics import QT_WIDGETS
+import models
 
-# Inisialisasi Flask
-app = Flask(__name__)
-app.secret_key = os.urandom(24)
-bcrypt = Bcrypt(app)
+# Inisialisasi Flask (server headless: python -m server)
+app = create_app()
 
 # Konfigurasi database
 DATABASE = 'bioskop.db'
@@ -32,18 +39,53 @@ def init_db():
 def run_flask():
     app.run(debug=False, port=5000)
 
+def sample_widget_metrics():
+    """Catat jumlah widget Qt untuk /metrics (dipanggil di thread GUI)"""
+    QT_WIDGETS.labels("all").set(len(QApplication.allWidgets()))
+    QT_WIDGETS.labels("visible_windows").set(
+        sum(1 for widget in QApplication.topLevelWidgets() if widget.isVisible())
+    )
+
 if __name__ == "__main__":
     # Buat database jika belum ada
     if not os.path.exists(DATABASE):
         init_db()
+    models.enable_wal()
+    # Selesaikan/batalkan pembelian yang terputus sebelum aplikasi berjalan
+    recover_purchases()
     
     # Jalankan server Flask di thread terpisah
     flask_thread = threading.Thread(target=run_flask)
     flask_thread.daemon = True
     flask_thread.start()
     
+    # Bersihkan cache tiket di temp/ secara berkala
+    ticket_store = get_ticket_store()
+    ticket_store.start_evictor()
+    
     # Jalankan aplikasi PyQt
     app_qt = QApplication(sys.argv)
+    app_qt.aboutToQuit.connect(ticket_store.stop)
+    # Tulis riwayat yang masih dititipkan sebelum keluar
+    app_qt.aboutToQuit.connect(get_write_behind().close)
+    
+    # Sampling jumlah widget tiap 5 detik
+    metrics_timer = QTimer()
+    metrics_timer.timeout.connect(sample_widget_metrics)
+    metrics_timer.start(5000)
+    
+    # Catat event loop yang macet beserta stack thread GUI (temp/stalls.log)
+    stall_watchdog = install_stall_watchdog()
+    if stall_watchdog is not None:
+        app_qt.aboutToQuit.connect(stall_watchdog.stop)
+    
+    # Saldo, kursi dan katalog yang diubah proses lain (kiosk lain, loket, server)
+    event_bridge = start_event_bridge(get_gui_event_bus())
+    app_qt.aboutToQuit.connect(event_bridge.stop)
+    
+    # Hentikan prefetch poster/kursi sebelum QApplication dibongkar
+    app_qt.aboutToQuit.connect(get_prefetcher().close)
+    
     login_window = LoginWindow(bcrypt)
     login_window.show()
     sys.exit(app_qt.exec_()) 
\ No newline at end of file
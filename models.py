@@ -1,15 +1,64 @@
+import os
+import json
+import time
+import uuid
 import sqlite3
 from flask_bcrypt import Bcrypt
 from datetime import datetime
 
+from utils.helper import get_showtime_id, new_ticket_id
+from utils.events import BalanceChanged, SeatsChanged
+from utils.seat_hub import SEAT_BOOKED
+from utils.metrics import timed, DB_SECONDS, BCRYPT_SECONDS
+
 # Konfigurasi database
 DATABASE = 'bioskop.db'
+TICKET_ID_ATTEMPTS = 5  # percobaan ID baru jika ticket ID acak bentrok
+
+_origin_nonce = uuid.uuid4().hex[:8]
+
+# Log perubahan (saldo, kursi) untuk diteruskan ke proses klien lain
+CHANGE_EVENTS_SQL = '''
+    CREATE TABLE IF NOT EXISTS change_events (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        origin TEXT NOT NULL,
+        payload TEXT NOT NULL,
+        created_at REAL NOT NULL
+    )
+'''
 
 def get_db():
     conn = sqlite3.connect(DATABASE)
     conn.row_factory = sqlite3.Row
     return conn
 
+def enable_wal():
+    """Aktifkan mode WAL (tersimpan permanen di file database) agar
+    beberapa worker server dan klien desktop bisa membaca saat ada penulisan"""
+    conn = get_db()
+    try:
+        mode = conn.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+    finally:
+        conn.close()
+    return mode
+
+def change_origin():
+    """Identitas proses ini pada tabel change_events (pid berbeda pada proses hasil fork)"""
+    return f"{os.getpid()}-{_origin_nonce}"
+
+def record_change(conn, event):
+    """Catat event (utils.events) di transaksi conn agar proses lain ikut diberi tahu"""
+    row = (change_origin(), json.dumps(event.to_dict()), time.time())
+    sql = "INSERT INTO change_events (origin, payload, created_at) VALUES (?, ?, ?)"
+    try:
+        conn.execute(sql, row)
+    except sqlite3.OperationalError as e:
+        # Database lama yang dibuat sebelum tabel ini ada
+        if "no such table" not in str(e):
+            raise
+        conn.execute(CHANGE_EVENTS_SQL)
+        conn.execute(sql, row)
+
 def init_db():
     """Inisialisasi database dan buat tabel jika belum ada"""
     conn = get_db()
@@ -45,6 +94,87 @@ def init_db():
         )
     ''')
     
+    # Buat tabel tiket yang sudah diterbitkan (untuk validasi di gate)
+    # ticket_id sebagai PRIMARY KEY sehingga lookup dan check-in memakai index
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS issued_tickets (
+            ticket_id TEXT PRIMARY KEY,
+            username TEXT,
+            movie_title TEXT NOT NULL,
+            cinema TEXT,
+            theater TEXT,
+            show_date TEXT,
+            show_time TEXT,
+            seats TEXT NOT NULL,
+            issued_at TEXT NOT NULL,
+            used_at TEXT,
+            showtime_id INTEGER,
+            group_ticket_id TEXT
+        ) WITHOUT ROWID
+    ''')
+    
+    # Database lama: tambahkan kolom showtime_id / group_ticket_id jika belum ada
+    columns = [row[1] for row in cursor.execute("PRAGMA table_info(issued_tickets)")]
+    if "showtime_id" not in columns:
+        cursor.execute("ALTER TABLE issued_tickets ADD COLUMN showtime_id INTEGER")
+    if "group_ticket_id" not in columns:
+        cursor.execute("ALTER TABLE issued_tickets ADD COLUMN group_ticket_id TEXT")
+    
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_issued_tickets_username
+        ON issued_tickets (username)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_issued_tickets_showtime
+        ON issued_tickets (showtime_id)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_issued_tickets_group
+        ON issued_tickets (group_ticket_id)
+    ''')
+    
+    # Kursi yang sudah dipesan per jadwal; PRIMARY KEY mencegah kursi terjual dua kali
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS seat_reservations (
+            showtime_id INTEGER NOT NULL,
+            seat TEXT NOT NULL,
+            booking_id TEXT NOT NULL,
+            PRIMARY KEY (showtime_id, seat)
+        ) WITHOUT ROWID
+    ''')
+    
+    # Pemesanan; idempotency_key unik agar request yang diulang mendapat hasil yang sama
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS bookings (
+            booking_id TEXT PRIMARY KEY,
+            idempotency_key TEXT UNIQUE NOT NULL,
+            request_hash TEXT NOT NULL,
+            username TEXT NOT NULL,
+            showtime_id INTEGER NOT NULL,
+            total_price INTEGER NOT NULL,
+            result TEXT NOT NULL,
+            created_at TEXT NOT NULL
+        )
+    ''')
+    
+    # Riwayat transaksi (format sama dengan data/history/<username>.json)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS transaction_history (
+            transaction_id TEXT PRIMARY KEY,
+            username TEXT NOT NULL,
+            type TEXT NOT NULL,
+            total INTEGER NOT NULL,
+            data TEXT NOT NULL,
+            created_at TEXT NOT NULL
+        )
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_transaction_history_username
+        ON transaction_history (username, created_at)
+    ''')
+    
+    cursor.execute(CHANGE_EVENTS_SQL)
+    
     conn.commit()
     conn.close()
 
@@ -88,6 +218,7 @@ class MovieModel:
             print(f"Error initializing movies: {str(e)}")
     
     @staticmethod
+    @timed(DB_SECONDS.labels("get_all_movies"))
     def get_all_movies():
         """Mendapatkan semua data film"""
         try:
@@ -238,6 +369,7 @@ class MovieModel:
         ]
     
     @staticmethod
+    @timed(DB_SECONDS.labels("get_movie_by_id"))
     def get_movie_by_id(movie_id):
         """Mendapatkan data film berdasarkan id"""
         try:
@@ -270,21 +402,24 @@ class UserModel:
     def login_user(username, password, bcrypt):
         """Verifikasi login pengguna"""
         try:
-            conn = UserModel.get_db()
-            cursor = conn.cursor()
-            
-            # Cari pengguna dengan username yang diberikan
-            cursor.execute("SELECT * FROM users WHERE username = ?", (username,))
-            user = cursor.fetchone()
-            
-            conn.close()
+            with DB_SECONDS.labels("login_user").time():
+                conn = UserModel.get_db()
+                cursor = conn.cursor()
+                
+                # Cari pengguna dengan username yang diberikan
+                cursor.execute("SELECT * FROM users WHERE username = ?", (username,))
+                user = cursor.fetchone()
+                
+                conn.close()
             
             if user is None:
                 return False, "Username tidak ditemukan", None
             
             # Verifikasi password
             stored_password = user["password"]
-            if bcrypt.check_password_hash(stored_password, password):
+            with BCRYPT_SECONDS.labels("check").time():
+                password_ok = bcrypt.check_password_hash(stored_password, password)
+            if password_ok:
                 return True, "Login berhasil", dict(user)
             else:
                 return False, "Password salah", None
@@ -306,7 +441,8 @@ class UserModel:
                 return False, "Username sudah digunakan"
             
             # Hash password
-            hashed_password = bcrypt.generate_password_hash(password).decode('utf-8')
+            with BCRYPT_SECONDS.labels("hash").time():
+                hashed_password = bcrypt.generate_password_hash(password).decode('utf-8')
             
             # Insert pengguna baru
             cursor.execute(
@@ -319,8 +455,57 @@ class UserModel:
             
         except Exception as e:
             return False, f"Error: {str(e)}"
-    
+
     @staticmethod
+    def register_users(users, hash_passwords):
+        """Mendaftarkan banyak pengguna sekaligus (enrollment kiosk)
+
+        users: list dict {nama, username, password, usia, genre_favorit}
+        hash_passwords: fungsi list password -> list hash bcrypt (mis. lewat process pool)
+        """
+        try:
+            conn = UserModel.get_db()
+            usernames = [user["username"] for user in users]
+            placeholders = ",".join("?" * len(usernames))
+            existing = {
+                row["username"] for row in
+                conn.execute(f"SELECT username FROM users WHERE username IN ({placeholders})", usernames)
+            } if usernames else set()
+            conn.close()
+
+            # Username yang sudah ada (atau dobel dalam batch) tidak perlu di-hash
+            new_users = []
+            for user in users:
+                if user["username"] not in existing:
+                    existing.add(user["username"])
+                    new_users.append(user)
+
+            hashed = hash_passwords([user["password"] for user in new_users])
+
+            # Pengguna bisa saja didaftarkan proses lain selama hashing: hanya baris
+            # yang benar-benar masuk yang dilaporkan terdaftar
+            registered = []
+            conn = UserModel.get_db()
+            with conn:
+                for user, password_hash in zip(new_users, hashed):
+                    cursor = conn.execute(
+                        "INSERT OR IGNORE INTO users (username, password, nama, usia, genre_favorit, saldo) VALUES (?, ?, ?, ?, ?, ?)",
+                        (user["username"], password_hash, user["nama"], user.get("usia", 0), user.get("genre_favorit", ""), 0)
+                    )
+                    if cursor.rowcount == 1:
+                        registered.append(user["username"])
+            conn.close()
+            skipped = len(users) - len(registered)
+            return True, f"{len(registered)} pengguna berhasil didaftarkan, {skipped} dilewati", {
+                "registered": registered,
+                "skipped": skipped
+            }
+
+        except Exception as e:
+            return False, f"Error: {str(e)}", None
+
+    @staticmethod
+    @timed(DB_SECONDS.labels("get_user"))
     def get_user(username):
         """Mendapatkan data pengguna"""
         try:
@@ -342,6 +527,7 @@ class UserModel:
             return None
     
     @staticmethod
+    @timed(DB_SECONDS.labels("get_saldo"))
     def get_saldo(username):
         """Mendapatkan saldo pengguna"""
         try:
@@ -363,6 +549,7 @@ class UserModel:
             return 0
     
     @staticmethod
+    @timed(DB_SECONDS.labels("update_saldo"))
     def update_saldo(username, amount):
         """Update saldo pengguna"""
         try:
@@ -390,10 +577,492 @@ class UserModel:
                 "UPDATE users SET saldo = ? WHERE username = ?",
                 (new_saldo, username)
             )
+            record_change(conn, BalanceChanged(username=username, new_saldo=new_saldo))
             conn.commit()
             conn.close()
             
             return True, "Saldo berhasil diperbarui", new_saldo
             
         except Exception as e:
-            return False, f"Error: {str(e)}", 0 
\ No newline at end of file
+            return False, f"Error: {str(e)}", 0 
+    
+    @staticmethod
+    @timed(DB_SECONDS.labels("top_up"))
+    def top_up(username, amount, payment_method="Cash"):
+        """Tambah saldo dan catat riwayat top up dalam satu transaksi, mengembalikan (success, message, saldo)"""
+        try:
+            conn = get_db()
+            try:
+                cursor = conn.execute(
+                    "UPDATE users SET saldo = saldo + ? WHERE username = ?", (amount, username)
+                )
+                if cursor.rowcount == 0:
+                    conn.rollback()
+                    return False, "Pengguna tidak ditemukan", 0
+                new_saldo = conn.execute(
+                    "SELECT saldo FROM users WHERE username = ?", (username,)
+                ).fetchone()[0]
+                
+                now = datetime.now()
+                transaction_id = uuid.uuid4().hex
+                transaction = {
+                    "transaction_id": transaction_id,
+                    "type": "Top Up",
+                    "total": amount,
+                    "previous_balance": new_saldo - amount,
+                    "new_balance": new_saldo,
+                    "payment_method": payment_method,
+                    "status": "Sukses",
+                    "timestamp": now.strftime("%d/%m/%Y %H:%M")
+                }
+                conn.execute(
+                    "INSERT INTO transaction_history (transaction_id, username, type, total, data, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (transaction_id, username, "Top Up", amount, json.dumps(transaction),
+                     now.strftime("%Y-%m-%d %H:%M:%S"))
+                )
+                record_change(conn, BalanceChanged(username=username, new_saldo=new_saldo))
+                conn.commit()
+            finally:
+                conn.close()
+            return True, "Top up berhasil", new_saldo
+            
+        except sqlite3.OperationalError as e:
+            if "no such table" in str(e):
+                init_db()
+                return UserModel.top_up(username, amount, payment_method)
+            print(f"Database error: {str(e)}")
+            return False, f"Error: {str(e)}", 0
+        except Exception as e:
+            print(f"Error top up: {str(e)}")
+            return False, f"Error: {str(e)}", 0
+
+class TicketModel:
+    @staticmethod
+    def normalize_ticket_id(ticket_id):
+        """Samakan format ticket ID (8 karakter hex, huruf besar)"""
+        return str(ticket_id or "").strip().upper()
+    
+    @staticmethod
+    def insert_tickets(conn, username, booking_data, tickets, group_ticket_id=None):
+        """Tulis tiket ke issued_tickets memakai koneksi (transaksi) yang sudah ada
+        
+        group_ticket_id menautkan tiket per kursi ke tiket grupnya (lihat check_in).
+        Jika ticket ID bentrok dengan tiket lain, dibuatkan ID baru; mengembalikan
+        daftar (ticket_id, kursi) yang benar-benar tersimpan.
+        """
+        seats_value = booking_data.get("seats", [])
+        issued_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        showtime_id = get_showtime_id(booking_data)
+        issued = []
+        for ticket_id, seats in tickets:
+            seats_text = ", ".join(seats) if isinstance(seats, list) else seats
+            seats_text = seats_text or (", ".join(seats_value) if isinstance(seats_value, list) else str(seats_value))
+            ticket_id = TicketModel.normalize_ticket_id(ticket_id) or new_ticket_id()
+            for attempt in range(TICKET_ID_ATTEMPTS):
+                try:
+                    conn.execute("""
+                        INSERT INTO issued_tickets
+                            (ticket_id, username, movie_title, cinema, theater, show_date, show_time, seats,
+                             issued_at, showtime_id, group_ticket_id)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """, (
+                        ticket_id,
+                        username,
+                        booking_data.get("movie_title", "Unknown Movie"),
+                        booking_data.get("cinema", ""),
+                        booking_data.get("theater", ""),
+                        booking_data.get("show_date", ""),
+                        booking_data.get("show_time", ""),
+                        seats_text,
+                        issued_at,
+                        showtime_id,
+                        group_ticket_id
+                    ))
+                    break
+                except sqlite3.IntegrityError as e:
+                    # ID acak 32-bit bisa bentrok: jangan sampai pembeli memegang ID milik tiket lain
+                    if "ticket_id" not in str(e) or attempt == TICKET_ID_ATTEMPTS - 1:
+                        raise
+                    ticket_id = new_ticket_id()
+            issued.append((ticket_id, seats))
+        return issued
+    
+    @staticmethod
+    @timed(DB_SECONDS.labels("issue_tickets"))
+    def issue_tickets(username, booking_data, tickets, group_ticket_id=None):
+        """Mencatat tiket yang diterbitkan, tickets berisi pasangan (ticket_id, kursi)
+        
+        Mengembalikan (success, message, issued); issued berisi ticket ID final
+        (bisa berbeda dari permintaan jika ID bentrok).
+        """
+        try:
+            conn = get_db()
+            try:
+                issued = TicketModel.insert_tickets(conn, username, booking_data, tickets, group_ticket_id)
+                conn.commit()
+            finally:
+                conn.close()
+            return True, f"{len(issued)} tiket diterbitkan", issued
+            
+        except sqlite3.OperationalError as e:
+            if "no such table" in str(e) or "no column named" in str(e):
+                init_db()
+                return TicketModel.issue_tickets(username, booking_data, tickets, group_ticket_id)
+            print(f"Database error: {str(e)}")
+            return False, f"Error: {str(e)}", []
+        except Exception as e:
+            print(f"Error issuing tickets: {str(e)}")
+            return False, f"Error: {str(e)}", []
+    
+    @staticmethod
+    @timed(DB_SECONDS.labels("get_ticket"))
+    def get_ticket(ticket_id):
+        """Mendapatkan data tiket berdasarkan ticket ID"""
+        try:
+            conn = get_db()
+            try:
+                ticket = conn.execute(
+                    "SELECT * FROM issued_tickets WHERE ticket_id = ?",
+                    (TicketModel.normalize_ticket_id(ticket_id),)
+                ).fetchone()
+            finally:
+                conn.close()
+            return dict(ticket) if ticket else None
+            
+        except Exception as e:
+            print(f"Error: {str(e)}")
+            return None
+    
+    @staticmethod
+    @timed(DB_SECONDS.labels("check_in"))
+    def check_in(ticket_id, accept=None):
+        """Tandai tiket sudah dipakai secara atomik, mengembalikan (success, status, ticket)
+        
+        status: "valid", "used", "unknown" atau "mismatch" (accept(tiket) False,
+        mis. jadwal/kursi di QR tidak sama dengan tiket yang diterbitkan)
+        
+        Pemesanan grup punya tiket grup dan tiket per kursi untuk kursi yang sama.
+        Tiket grup hanya valid jika belum ada kursinya yang masuk, dan memakainya
+        menandai semua tiket per kursinya; tiket per kursi menandai tiket grupnya.
+        Dengan begitu setiap kursi hanya bisa masuk sekali.
+        """
+        ticket_id = TicketModel.normalize_ticket_id(ticket_id)
+        used_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        try:
+            conn = get_db()
+            conn.isolation_level = None  # transaksi dikelola manual
+            try:
+                # BEGIN IMMEDIATE: cek dan tandai (termasuk tiket tertaut) tidak bisa disela scanner lain
+                conn.execute("BEGIN IMMEDIATE")
+                ticket = conn.execute(
+                    "SELECT * FROM issued_tickets WHERE ticket_id = ?", (ticket_id,)
+                ).fetchone()
+                checked_in = False
+                mismatch = ticket is not None and accept is not None and not accept(dict(ticket))
+                if ticket is not None and ticket["used_at"] is None and not mismatch:
+                    seat_used = conn.execute(
+                        "SELECT 1 FROM issued_tickets WHERE group_ticket_id = ? AND used_at IS NOT NULL",
+                        (ticket_id,)
+                    ).fetchone()
+                    if seat_used is None:
+                        conn.execute(
+                            "UPDATE issued_tickets SET used_at = ? "
+                            "WHERE (ticket_id = ? OR group_ticket_id = ?) AND used_at IS NULL",
+                            (used_at, ticket_id, ticket_id)
+                        )
+                        if ticket["group_ticket_id"]:
+                            conn.execute(
+                                "UPDATE issued_tickets SET used_at = ? WHERE ticket_id = ? AND used_at IS NULL",
+                                (used_at, ticket["group_ticket_id"])
+                            )
+                        checked_in = True
+                        ticket = conn.execute(
+                            "SELECT * FROM issued_tickets WHERE ticket_id = ?", (ticket_id,)
+                        ).fetchone()
+                conn.execute("COMMIT")
+            except BaseException:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+            finally:
+                conn.close()
+            
+            if ticket is None:
+                return False, "unknown", None
+            if mismatch:
+                return False, "mismatch", dict(ticket)
+            if checked_in:
+                return True, "valid", dict(ticket)
+            return False, "used", dict(ticket)
+            
+        except sqlite3.OperationalError as e:
+            if "no such table" in str(e):
+                init_db()
+                return False, "unknown", None
+            if "no such column" in str(e):
+                init_db()
+                return TicketModel.check_in(ticket_id, accept)
+            print(f"Database error: {str(e)}")
+            return False, "error", None
+        except Exception as e:
+            print(f"Error checking in ticket: {str(e)}")
+            return False, "error", None
+    
+    @staticmethod
+    @timed(DB_SECONDS.labels("get_valid_ticket_ids"))
+    def get_valid_ticket_ids():
+        """Mendapatkan semua ticket ID yang belum dipakai (untuk snapshot Bloom filter)"""
+        try:
+            conn = get_db()
+            try:
+                rows = conn.execute(
+                    "SELECT ticket_id FROM issued_tickets WHERE used_at IS NULL"
+                ).fetchall()
+            finally:
+                conn.close()
+            return [row[0] for row in rows]
+            
+        except sqlite3.OperationalError as e:
+            if "no such table" in str(e):
+                init_db()
+                return []
+            print(f"Database error: {str(e)}")
+            return []
+        except Exception as e:
+            print(f"Error: {str(e)}")
+            return []
+    
+    @staticmethod
+    @timed(DB_SECONDS.labels("get_booked_seats"))
+    def get_booked_seats(showtime_id):
+        """Mendapatkan daftar kursi yang sudah terjual untuk satu jadwal tayang"""
+        try:
+            conn = get_db()
+            try:
+                rows = conn.execute(
+                    "SELECT seats FROM issued_tickets WHERE showtime_id = ?", (showtime_id,)
+                ).fetchall()
+            finally:
+                conn.close()
+            
+            booked = set()
+            for row in rows:
+                booked.update(seat.strip() for seat in row[0].split(",") if seat.strip())
+            return sorted(booked)
+            
+        except sqlite3.OperationalError as e:
+            if "no such table" in str(e) or "no such column" in str(e):
+                init_db()
+                return []
+            print(f"Database error: {str(e)}")
+            return []
+        except Exception as e:
+            print(f"Error: {str(e)}")
+            return []
+
+
+class BookingError(Exception):
+    """Pemesanan ditolak; code dipakai API untuk memilih status HTTP"""
+    
+    def __init__(self, code, message, seats=None):
+        super().__init__(message)
+        self.code = code
+        self.seats = seats or []
+
+
+class BookingModel:
+    @staticmethod
+    def _taken_seats(conn, showtime_id, seats):
+        """Kursi yang sudah dipesan, termasuk tiket lama yang belum punya reservasi"""
+        placeholders = ", ".join("?" for _ in seats)
+        taken = {row[0] for row in conn.execute(
+            f"SELECT seat FROM seat_reservations WHERE showtime_id = ? AND seat IN ({placeholders})",
+            (showtime_id, *seats)
+        )}
+        for row in conn.execute("SELECT seats FROM issued_tickets WHERE showtime_id = ?", (showtime_id,)):
+            taken.update(seat.strip() for seat in row[0].split(",") if seat.strip() in seats)
+        return sorted(taken)
+    
+    @staticmethod
+    def _purchase(conn, username, booking_data, idempotency_key, request_hash):
+        seats = booking_data["seats"]
+        total_price = booking_data["total_price"]
+        showtime_id = get_showtime_id(booking_data)
+        
+        # BEGIN IMMEDIATE mengambil write lock di awal: cek lalu tulis tidak bisa disela proses lain
+        conn.execute("BEGIN IMMEDIATE")
+        
+        row = conn.execute(
+            "SELECT request_hash, result FROM bookings WHERE idempotency_key = ?", (idempotency_key,)
+        ).fetchone()
+        if row:
+            if row["request_hash"] != request_hash:
+                raise BookingError("idempotency_conflict",
+                                   "Idempotency key sudah dipakai untuk pemesanan yang berbeda")
+            result = json.loads(row["result"])
+            result["replayed"] = True
+            return result
+        
+        taken = BookingModel._taken_seats(conn, showtime_id, seats)
+        if taken:
+            raise BookingError("seats_taken", f"Kursi sudah terjual: {', '.join(taken)}", taken)
+        
+        # Debit bersyarat: saldo tidak pernah negatif walau ada pembelian bersamaan
+        cursor = conn.execute(
+            "UPDATE users SET saldo = saldo - ? WHERE username = ? AND saldo >= ?",
+            (total_price, username, total_price)
+        )
+        if cursor.rowcount == 0:
+            if conn.execute("SELECT 1 FROM users WHERE username = ?", (username,)).fetchone() is None:
+                raise BookingError("user_not_found", "Pengguna tidak ditemukan")
+            raise BookingError("insufficient_balance", "Saldo tidak mencukupi")
+        new_saldo = conn.execute("SELECT saldo FROM users WHERE username = ?", (username,)).fetchone()[0]
+        
+        booking_id = uuid.uuid4().hex
+        conn.executemany(
+            "INSERT INTO seat_reservations (showtime_id, seat, booking_id) VALUES (?, ?, ?)",
+            [(showtime_id, seat, booking_id) for seat in seats]
+        )
+        
+        # Satu tiket per kursi; pemesanan grup ditambah satu tiket grup yang menautkan
+        # tiket per kursinya (check_in memastikan tiap kursi hanya masuk sekali)
+        group_ticket_id = None
+        if len(seats) > 1:
+            [(group_ticket_id, _)] = TicketModel.insert_tickets(
+                conn, username, booking_data, [(new_ticket_id(), seats)]
+            )
+        seat_tickets = {seat: ticket for ticket, seat in TicketModel.insert_tickets(
+            conn, username, booking_data, [(new_ticket_id(), seat) for seat in seats], group_ticket_id
+        )}
+        ticket_id = group_ticket_id or seat_tickets[seats[0]]
+        
+        now = datetime.now()
+        transaction = {
+            "transaction_id": booking_id,
+            "type": "Tiket",
+            "movie_title": booking_data.get("movie_title", "Unknown Movie"),
+            "total": -total_price,
+            "studio": booking_data.get("studio_type", "Regular"),
+            "theater": booking_data.get("theater", ""),
+            "cinema": booking_data.get("cinema", ""),
+            "seats": ", ".join(seats),
+            "show_date": booking_data.get("show_date", ""),
+            "show_time": booking_data.get("show_time", ""),
+            "ticket_id": ticket_id,
+            "status": "Sukses",
+            "timestamp": now.strftime("%d/%m/%Y %H:%M")
+        }
+        created_at = now.strftime("%Y-%m-%d %H:%M:%S")
+        conn.execute(
+            "INSERT INTO transaction_history (transaction_id, username, type, total, data, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (booking_id, username, "Tiket", -total_price, json.dumps(transaction), created_at)
+        )
+        
+        result = {
+            "booking_id": booking_id,
+            "ticket_id": ticket_id,
+            "ticket_ids": seat_tickets,
+            "showtime_id": showtime_id,
+            "seats": seats,
+            "total_price": total_price,
+            "new_saldo": new_saldo,
+            "created_at": created_at,
+            "replayed": False
+        }
+        conn.execute(
+            "INSERT INTO bookings (booking_id, idempotency_key, request_hash, username, showtime_id, "
+            "total_price, result, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (booking_id, idempotency_key, request_hash, username, showtime_id, total_price,
+             json.dumps(result), created_at)
+        )
+        record_change(conn, BalanceChanged(username=username, new_saldo=new_saldo))
+        record_change(conn, SeatsChanged(showtime_id=showtime_id, seats=seats, state=SEAT_BOOKED))
+        return result
+    
+    @staticmethod
+    def get_booking_id(idempotency_key):
+        """booking_id pemesanan yang sudah COMMIT dengan idempotency key ini, None jika belum ada"""
+        conn = get_db()
+        try:
+            row = conn.execute("SELECT booking_id FROM bookings WHERE idempotency_key = ?",
+                               (idempotency_key,)).fetchone()
+        finally:
+            conn.close()
+        return row[0] if row else None
+    
+    @staticmethod
+    @timed(DB_SECONDS.labels("create_booking"))
+    def create_booking(username, booking_data, idempotency_key, request_hash=""):
+        """Pesan kursi, potong saldo, catat riwayat dan terbitkan tiket dalam satu transaksi
+        
+        Request dengan idempotency_key yang sama mengembalikan hasil pertama
+        (result["replayed"] = True) tanpa memotong saldo lagi.
+        Mengembalikan (success, message, result); saat gagal result berisi "error".
+        """
+        booking_data = dict(booking_data)
+        seats = booking_data.get("seats", [])
+        if isinstance(seats, str):
+            seats = seats.split(",")
+        booking_data["seats"] = sorted({str(seat).strip().upper() for seat in seats if str(seat).strip()})
+        if not idempotency_key or not booking_data["seats"] or booking_data.get("total_price", -1) < 0:
+            return False, "Data pemesanan tidak lengkap", {"error": "invalid"}
+        
+        try:
+            conn = get_db()
+            conn.isolation_level = None  # transaksi dikelola manual
+            try:
+                result = BookingModel._purchase(conn, username, booking_data, idempotency_key, request_hash)
+                conn.execute("COMMIT" if not result["replayed"] else "ROLLBACK")
+            except BaseException:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+            finally:
+                conn.close()
+            
+            if result["replayed"]:
+                return True, "Pemesanan sudah diproses sebelumnya", result
+            return True, "Pemesanan berhasil", result
+            
+        except BookingError as e:
+            return False, str(e), {"error": e.code, "seats": e.seats}
+        except sqlite3.IntegrityError as e:
+            # Hanya terjadi jika ada penulis yang melewati BEGIN IMMEDIATE (mis. skema lama)
+            print(f"Booking conflict: {str(e)}")
+            return False, "Kursi sudah terjual", {"error": "seats_taken", "seats": []}
+        except sqlite3.OperationalError as e:
+            if "no such table" in str(e) or "no such column" in str(e) or "no column named" in str(e):
+                init_db()
+                return BookingModel.create_booking(username, booking_data, idempotency_key, request_hash)
+            print(f"Database error: {str(e)}")
+            return False, f"Error: {str(e)}", {"error": "error"}
+        except Exception as e:
+            print(f"Error creating booking: {str(e)}")
+            return False, f"Error: {str(e)}", {"error": "error"}
+    
+    @staticmethod
+    @timed(DB_SECONDS.labels("get_history"))
+    def get_history(username):
+        """Riwayat transaksi dari database, terbaru lebih dulu"""
+        try:
+            conn = get_db()
+            try:
+                rows = conn.execute(
+                    "SELECT data FROM transaction_history WHERE username = ? ORDER BY created_at DESC",
+                    (username,)
+                ).fetchall()
+            finally:
+                conn.close()
+            return [json.loads(row[0]) for row in rows]
+            
+        except sqlite3.OperationalError as e:
+            if "no such table" in str(e):
+                init_db()
+                return []
+            print(f"Database error: {str(e)}")
+            return []
+        except Exception as e:
+            print(f"Error: {str(e)}")
+            return []
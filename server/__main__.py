@@ -0,0 +1,95 @@
+"""
+Entry point server headless (tanpa PyQt).
+
+Menjalankan Flask app dengan waitress (multi-thread) dan database SQLite
+dalam mode WAL sehingga pembaca tidak terblokir oleh penulis.
+
+Stream SSE status kursi dilayani server terpisah di --stream-port (satu
+thread untuk semua subscriber, lihat server/seat_stream.py) sehingga worker
+waitress hanya dipakai request API.
+
+    python -m server --host 0.0.0.0 --port 5000 --threads 8 --stream-port 5001
+
+Token perangkat scanner gate diterbitkan tanpa menjalankan server:
+
+    python -m server --gate-token GATE-01 [--staff]
+"""
+
+import sys
+import time
+import argparse
+
+_start_time = time.perf_counter()
+
+import models
+from server.app import create_app
+from server.seats import stream_limit, RESERVED_API_THREADS
+from server.seat_stream import SeatStreamServer
+from utils.seat_hub import get_seat_hub
+from utils.purchase_journal import recover_purchases
+from utils.event_bridge import start_event_bridge
+from utils.gate_auth import create_gate_token, ROLE_SCANNER, ROLE_STAFF
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Server backend Tiket Bioskop (headless)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5000)
+    parser.add_argument("--threads", type=int, default=8, help="jumlah worker thread waitress")
+    parser.add_argument("--stream-port", type=int, default=5001,
+                        help="port server SSE status kursi (0 = stream di worker thread waitress)")
+    parser.add_argument("--db", default=models.DATABASE, help="path database SQLite")
+    parser.add_argument("--gate-token", metavar="DEVICE",
+                        help="cetak token scanner gate untuk DEVICE lalu keluar")
+    parser.add_argument("--staff", action="store_true",
+                        help="token gate untuk petugas (boleh input ticket ID manual)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.gate_token:
+        try:
+            print(create_gate_token(args.gate_token, ROLE_STAFF if args.staff else ROLE_SCANNER))
+        except ValueError as e:
+            print(str(e))
+            return 1
+        return 0
+
+    try:
+        from waitress import serve
+    except ImportError:
+        print("waitress belum terpasang, jalankan: pip install waitress")
+        return 1
+
+    models.DATABASE = args.db
+    models.init_db()
+    journal_mode = models.enable_wal()
+    recover_purchases()
+    # Pembelian dari kiosk desktop ikut masuk SeatHub (stream SSE) server ini
+    start_event_bridge()
+
+    if args.stream_port:
+        stream_server = SeatStreamServer(get_seat_hub(), host=args.host, port=args.stream_port).start()
+        app = create_app({"SEAT_STREAM_PORT": stream_server.port})
+        streams = f"stream kursi di port {stream_server.port}"
+    else:
+        limit = stream_limit(args.threads)
+        app = create_app({"SEAT_STREAM_LIMIT": limit})
+        if not limit:
+            print(f"Peringatan: --threads {args.threads} tidak menyisakan thread untuk stream kursi "
+                  f"({RESERVED_API_THREADS} dicadangkan untuk API)")
+        streams = f"maks. {limit} stream kursi di worker thread"
+    print(f"Server siap di http://{args.host}:{args.port} "
+          f"({args.threads} thread, {streams}, journal_mode={journal_mode}, "
+          f"startup {(time.perf_counter() - _start_time) * 1000:.0f} ms)")
+    if any(name.startswith("PyQt5") for name in sys.modules):
+        print("Peringatan: modul PyQt5 ikut terimpor di mode headless")
+
+    serve(app, host=args.host, port=args.port, threads=args.threads, ident="tiket-bioskop")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,57 @@
+"""
+Endpoint akun pengguna (butuh token sesi).
+
+GET  /api/account/balance
+POST /api/account/topup     {"amount", "payment_method"}  (hanya load test, lihat di bawah)
+GET  /api/account/history?page=&per_page=
+
+Top up lewat API tidak melalui pembayaran, jadi hanya aktif jika app dibuat
+dengan create_app({"LOADTEST_TOPUP": True}) (benchmarks/loadtest.py) dan
+request datang dari localhost. Selain itu 404; top up pelanggan tetap lewat
+halaman top up di kiosk.
+"""
+
+from flask import Blueprint, current_app, g, jsonify, request
+
+from models import UserModel, BookingModel
+from server.auth import require_session
+from server.catalog import paginate
+from utils.booking_service import top_up
+
+account_bp = Blueprint("account", __name__, url_prefix="/api/account")
+
+MIN_TOP_UP = 10000
+MAX_TOP_UP = 10000000
+LOOPBACK_ADDRESSES = ("127.0.0.1", "::1")
+
+
+@account_bp.route("/balance", methods=["GET"])
+@require_session
+def balance():
+    return jsonify({"status": "ok", "saldo": UserModel.get_saldo(g.session["username"])})
+
+
+@account_bp.route("/topup", methods=["POST"])
+@require_session
+def post_top_up():
+    if not current_app.config.get("LOADTEST_TOPUP") or request.remote_addr not in LOOPBACK_ADDRESSES:
+        return jsonify({"status": "error", "message": "Not found"}), 404
+
+    body = request.get_json(silent=True) or {}
+    amount = body.get("amount")
+    if not isinstance(amount, int) or not MIN_TOP_UP <= amount <= MAX_TOP_UP:
+        return jsonify({
+            "status": "error",
+            "message": f"Nominal top up harus antara {MIN_TOP_UP} dan {MAX_TOP_UP}"
+        }), 400
+
+    success, message, new_saldo = top_up(g.session["username"], amount, str(body.get("payment_method") or "Cash"))
+    if not success:
+        return jsonify({"status": "error", "message": message}), 500
+    return jsonify({"status": "ok", "message": message, "saldo": new_saldo})
+
+
+@account_bp.route("/history", methods=["GET"])
+@require_session
+def history():
+    return jsonify({"status": "ok", **paginate(BookingModel.get_history(g.session["username"]))})
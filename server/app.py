@@ -0,0 +1,80 @@
+"""
+Pembuatan Flask app backend bioskop.
+
+Modul ini tidak mengimpor PyQt sehingga bisa dipakai oleh klien desktop
+(main.py, server di thread) maupun server headless (python -m server).
+"""
+
+import os
+import time
+
+from flask import Flask, Response, g, jsonify, request
+
+from server.auth import auth_bp, bcrypt, check_protected_routes
+from server.gate import gate_bp
+from server.catalog import catalog_bp
+from server.seats import seats_bp, DEFAULT_STREAM_LIMIT
+from server.bookings import bookings_bp
+from server.assets import assets_bp
+from server.account import account_bp
+from utils.admission import Overloaded
+from utils.metrics import HTTP_SECONDS, HTTP_RESPONSES, render_metrics
+
+
+def create_app(config=None):
+    """Membuat Flask app dan mendaftarkan semua blueprint
+
+    config: override app.config, mis. {"LOADTEST_TOPUP": True} untuk harness load test
+    atau {"SEAT_STREAM_PORT": port} jika stream dilayani server/seat_stream.py
+    """
+    app = Flask(__name__)
+    app.secret_key = os.environ.get("TIKET_SECRET_KEY") or os.urandom(24)
+    app.config["LOADTEST_TOPUP"] = False
+    app.config["SEAT_STREAM_LIMIT"] = DEFAULT_STREAM_LIMIT
+    app.config["SEAT_STREAM_PORT"] = None  # diisi jika server SSE terpisah berjalan
+    app.config.update(config or {})
+    bcrypt.init_app(app)
+
+    app.register_blueprint(auth_bp)
+    app.register_blueprint(gate_bp)
+    app.register_blueprint(catalog_bp)
+    app.register_blueprint(seats_bp)
+    app.register_blueprint(bookings_bp)
+    app.register_blueprint(assets_bp)
+    app.register_blueprint(account_bp)
+    # Saldo hanya boleh dipotong/ditambah untuk pengguna dari token sesi
+    check_protected_routes(app, (bookings_bp.name, account_bp.name))
+    # Check-in dan data tiket di gate hanya untuk perangkat scanner terdaftar
+    check_protected_routes(app, (gate_bp.name,), "requires_gate_device")
+
+    @app.before_request
+    def start_timer():
+        g.request_started = time.perf_counter()
+
+    @app.after_request
+    def record_request(response):
+        started = g.pop("request_started", None)
+        if started is not None:
+            endpoint = request.endpoint or "unknown"
+            HTTP_SECONDS.labels(endpoint, request.method).observe(time.perf_counter() - started)
+            HTTP_RESPONSES.labels(endpoint, response.status_code).inc()
+        return response
+
+    @app.errorhandler(Overloaded)
+    def overloaded(error):
+        # Tolak cepat saat antrean penulis penuh; klien mencoba lagi setelah Retry-After
+        response = jsonify({"status": "error", "error": "overloaded", "message": str(error),
+                            "retry_after": error.retry_after})
+        response.status_code = 503
+        response.headers["Retry-After"] = str(error.retry_after)
+        return response
+
+    @app.route("/api/health", methods=["GET"])
+    def health():
+        return jsonify({"status": "ok"})
+
+    @app.route("/metrics", methods=["GET"])
+    def metrics():
+        return Response(render_metrics(), mimetype="text/plain; version=0.0.4")
+
+    return app
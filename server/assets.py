@@ -0,0 +1,161 @@
+"""
+Penyajian gambar statis (poster film, foto makanan) dari folder assets/.
+
+GET /api/assets/<path>          -> file asli
+GET /api/assets/<path>?w=200    -> varian dengan lebar tertentu (dibuat sekali, disimpan di disk)
+
+ETag kuat diturunkan dari hash isi file (dan lebar varian), sehingga klien
+cukup revalidasi dengan If-None-Match. Varian lama dihapus saat varian dari
+isi sumber yang baru dibuat, jadi temp/assets paling banyak berisi satu set
+lebar per file sumber. Request Range dijawab 206. File
+dikirim lewat send_file yang memakai wsgi.file_wrapper server (streaming,
+tidak dibaca utuh ke memori).
+"""
+
+import os
+import re
+import hashlib
+import threading
+
+from flask import Blueprint, current_app, jsonify, request, send_file
+from werkzeug.utils import safe_join
+
+assets_bp = Blueprint("assets", __name__, url_prefix="/api/assets")
+
+ASSETS_DIR = "assets"
+VARIANT_DIR = os.path.join("temp", "assets")
+IMAGE_TYPES = {
+    ".jpg": ("image/jpeg", "JPEG"),
+    ".jpeg": ("image/jpeg", "JPEG"),
+    ".png": ("image/png", "PNG"),
+    ".webp": ("image/webp", "WEBP"),
+}
+# Hanya lebar ini yang boleh dibuat agar disk tidak diisi varian sembarang
+VARIANT_WIDTHS = (100, 200, 300, 400, 600, 800)
+JPEG_QUALITY = 85
+MAX_AGE = 24 * 3600
+
+# Nama varian sebelum ada prefix file sumber: <hash>_w<lebar>.<ext>
+_LEGACY_VARIANT = re.compile(r"^[0-9a-f]{16}_w\d+\.")
+
+_digests = {}  # path -> (mtime_ns, size, digest)
+_digest_lock = threading.Lock()
+_variant_lock = threading.Lock()
+
+
+def file_digest(path):
+    """Hash isi file (SHA-256, 16 hex), dihitung ulang hanya jika mtime/ukuran berubah"""
+    stat = os.stat(path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    with _digest_lock:
+        cached = _digests.get(path)
+        if cached and cached[:2] == signature:
+            return cached[2]
+
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(64 * 1024), b""):
+            sha.update(chunk)
+    digest = sha.hexdigest()[:16]
+    with _digest_lock:
+        _digests[path] = (*signature, digest)
+    return digest
+
+
+def source_key(path):
+    """Prefix nama varian untuk satu file sumber (hash path relatif terhadap assets/)"""
+    relative = os.path.relpath(path, ASSETS_DIR).replace(os.sep, "/")
+    return hashlib.sha256(relative.encode("utf-8")).hexdigest()[:12]
+
+
+def variant_path(path, digest, width):
+    """Path varian lebar tertentu; nama mengikuti hash sumber sehingga otomatis basi saat sumber berubah"""
+    ext = os.path.splitext(path)[1].lower()
+    return os.path.join(VARIANT_DIR, f"{source_key(path)}_{digest}_w{width}{ext}")
+
+
+def remove_stale_variants(path, digest):
+    """Hapus varian file sumber ini yang dibuat dari isi lama (hash berbeda)
+
+    Dipanggil dengan _variant_lock dipegang, setiap kali varian baru dibuat;
+    varian bernama format lama (tanpa prefix sumber) ikut dibuang. File yang
+    gagal dihapus (mis. masih dikirim di Windows) dicoba lagi berikutnya.
+    """
+    prefix = f"{source_key(path)}_"
+    current = f"{prefix}{digest}_"
+    removed = 0
+    with os.scandir(VARIANT_DIR) as entries:
+        for entry in entries:
+            stale = entry.name.startswith(prefix) and not entry.name.startswith(current)
+            if stale or _LEGACY_VARIANT.match(entry.name):
+                try:
+                    os.remove(entry.path)
+                    removed += 1
+                except OSError:
+                    pass
+    return removed
+
+
+def make_variant(path, digest, width):
+    """Buat varian (sekali) dan kembalikan path-nya"""
+    target = variant_path(path, digest, width)
+    if os.path.exists(target):
+        return target
+
+    from PIL import Image
+
+    with _variant_lock:
+        if os.path.exists(target):
+            return target
+        os.makedirs(VARIANT_DIR, exist_ok=True)
+        image_format = IMAGE_TYPES[os.path.splitext(path)[1].lower()][1]
+        with Image.open(path) as img:
+            if img.width > width:
+                height = max(1, round(img.height * width / img.width))
+                img = img.resize((width, height), Image.LANCZOS)
+            if image_format == "JPEG" and img.mode not in ("RGB", "L"):
+                img = img.convert("RGB")
+            tmp_path = f"{target}.{threading.get_ident()}.tmp"
+            options = {"quality": JPEG_QUALITY, "optimize": True} if image_format == "JPEG" else {"optimize": True}
+            img.save(tmp_path, image_format, **options)
+        os.replace(tmp_path, target)
+        remove_stale_variants(path, digest)
+    return target
+
+
+@assets_bp.route("/<path:filename>", methods=["GET", "HEAD"])
+def get_asset(filename):
+    path = safe_join(ASSETS_DIR, filename)
+    ext = os.path.splitext(filename)[1].lower()
+    if path is None or ext not in IMAGE_TYPES or not os.path.isfile(path):
+        return jsonify({"status": "error", "message": "Asset tidak ditemukan"}), 404
+
+    digest = file_digest(path)
+    etag = digest
+    width = request.args.get("w")
+    if width is not None:
+        try:
+            width = int(width)
+        except ValueError:
+            width = None
+        if width not in VARIANT_WIDTHS:
+            return jsonify({
+                "status": "error",
+                "message": f"Lebar tidak didukung, pilih salah satu dari {list(VARIANT_WIDTHS)}"
+            }), 400
+        etag = f"{digest}-w{width}"
+
+    # Revalidasi: jawab 304 tanpa membuat varian atau membuka file
+    if request.if_none_match.contains(etag):
+        response = current_app.response_class(status=304)
+        response.set_etag(etag)
+        response.cache_control.public = True
+        response.cache_control.max_age = MAX_AGE
+        return response
+
+    if width is not None:
+        path = make_variant(path, digest, width)
+
+    # send_file menangani If-None-Match (304), Range (206) dan streaming file
+    return send_file(os.path.abspath(path), mimetype=IMAGE_TYPES[ext][0], etag=etag,
+                     max_age=MAX_AGE, conditional=True)
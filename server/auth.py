@@ -0,0 +1,116 @@
+"""
+Autentikasi API dengan token sesi.
+
+POST /api/auth/login    {"username", "password"} -> {"token", "expires_at", "user"}
+POST /api/auth/logout   (Authorization: Bearer <token>)
+GET  /api/auth/me       (Authorization: Bearer <token>)
+
+bcrypt hanya dijalankan saat login. Endpoint lain memakai `require_session`
+yang cukup memverifikasi HMAC token dan mencari sesi di tabel memori.
+Endpoint scanner gate memakai `require_gate_device` (token perangkat, lihat
+utils/gate_auth.py).
+"""
+
+from functools import wraps
+
+from flask import Blueprint, g, jsonify, request
+from flask_bcrypt import Bcrypt
+
+from models import UserModel
+from utils.session import get_session_manager
+from utils.gate_auth import verify_gate_token
+
+auth_bp = Blueprint("auth", __name__, url_prefix="/api/auth")
+
+bcrypt = Bcrypt()
+
+
+def bearer_token():
+    header = request.headers.get("Authorization", "")
+    if header[:7].lower() == "bearer ":
+        return header[7:].strip()
+    return None
+
+
+def require_session(view):
+    """Decorator: tolak request tanpa token sesi valid (401), simpan sesi di g.session"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        session = get_session_manager().verify(bearer_token())
+        if session is None:
+            return jsonify({"status": "error", "message": "Token sesi tidak valid atau kedaluwarsa"}), 401, {
+                "WWW-Authenticate": "Bearer"
+            }
+        g.session = session
+        return view(*args, **kwargs)
+    wrapper.requires_session = True
+    return wrapper
+
+
+def require_gate_device(view):
+    """Decorator: tolak request tanpa token perangkat gate valid (401), simpan di g.gate_device"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        device = verify_gate_token(bearer_token())
+        if device is None:
+            return jsonify({"status": "error", "message": "Token perangkat gate tidak valid"}), 401, {
+                "WWW-Authenticate": "Bearer"
+            }
+        g.gate_device = device
+        return view(*args, **kwargs)
+    wrapper.requires_gate_device = True
+    return wrapper
+
+
+def check_protected_routes(app, blueprints, marker="requires_session"):
+    """Pastikan semua route blueprint yang memindahkan saldo memakai require_session
+
+    Dipanggil di create_app: route baru tanpa autentikasi membuat app gagal start,
+    bukan diam-diam menerima username dari body request. marker="requires_gate_device"
+    untuk blueprint yang dipakai scanner gate.
+    """
+    decorator = marker.replace("requires", "require", 1)
+    for rule in app.url_map.iter_rules():
+        if rule.endpoint.split(".", 1)[0] not in blueprints:
+            continue
+        if not getattr(app.view_functions[rule.endpoint], marker, False):
+            raise RuntimeError(f"Route {rule.rule} ({rule.endpoint}) harus memakai {decorator}")
+
+
+@auth_bp.route("/login", methods=["POST"])
+def login():
+    body = request.get_json(silent=True) or {}
+    username = body.get("username")
+    password = body.get("password")
+    if not username or not password:
+        return jsonify({"status": "error", "message": "Username dan password wajib diisi"}), 400
+
+    success, message, user = UserModel.login_user(username, password, bcrypt)
+    if not success:
+        return jsonify({"status": "error", "message": message}), 401
+
+    profile = {
+        "username": user["username"],
+        "nama": user["nama"],
+        "genre_favorit": user["genre_favorit"]
+    }
+    token, expires = get_session_manager().create(user["username"], profile)
+    return jsonify({
+        "status": "ok",
+        "token": token,
+        "expires_at": expires,
+        "user": {**profile, "saldo": user["saldo"]}
+    })
+
+
+@auth_bp.route("/logout", methods=["POST"])
+@require_session
+def logout():
+    get_session_manager().revoke(bearer_token())
+    return jsonify({"status": "ok"})
+
+
+@auth_bp.route("/me", methods=["GET"])
+@require_session
+def me():
+    return jsonify({"status": "ok", "user": g.session["user"], "expires_at": g.session["expires"]})
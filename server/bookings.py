@@ -0,0 +1,118 @@
+"""
+Endpoint pemesanan tiket yang idempotent.
+
+POST /api/bookings
+    Header  Authorization: Bearer <token sesi dari /api/auth/login>
+    Header  Idempotency-Key: <string unik per pembelian, dipakai ulang saat retry>
+    Body    {"movie_id" atau "movie_title", "cinema", "theater",
+             "studio_type", "show_date", "show_time", "seats": ["A1", ...]}
+
+Pembeli diambil dari token sesi (body berisi "username" ditolak) dan harga
+dihitung dari katalog, bukan dari klien. Status:
+201 dibuat, 200 retry dengan key yang sama (header Idempotent-Replayed: true),
+400 request tidak valid, 401 token tidak valid, 402 saldo kurang, 404 pengguna tidak ada,
+409 kursi sudah terjual, 422 key dipakai untuk isi request yang berbeda,
+503 antrean pembayaran penuh (header Retry-After).
+"""
+
+from flask import Blueprint, g, jsonify, request
+
+from server.auth import require_session
+from utils.booking_service import create_booking
+from utils.catalog import get_catalog, ticket_price, CINEMA_DATA, THEATER_NUMBERS, STUDIO_TYPES
+from utils.qr_payload import seat_to_index
+
+bookings_bp = Blueprint("bookings", __name__, url_prefix="/api/bookings")
+
+MAX_KEY_LENGTH = 128
+MAX_SEATS = 10
+
+ERROR_STATUS = {
+    "invalid": 400,
+    "insufficient_balance": 402,
+    "user_not_found": 404,
+    "seats_taken": 409,
+    "idempotency_conflict": 422
+}
+
+
+def _error(message, code=400, **extra):
+    return jsonify({"status": "error", "message": message, **extra}), code
+
+
+def build_booking_data(body):
+    """Validasi body request terhadap katalog, mengembalikan (booking_data, pesan error)"""
+    catalog = get_catalog()
+    catalog.refresh()
+
+    movie = None
+    if body.get("movie_id") is not None:
+        try:
+            movie = catalog.get_movie(int(body["movie_id"]))
+        except (TypeError, ValueError):
+            movie = None
+    elif body.get("movie_title"):
+        movie = next((m for m in catalog.movies if m["title"] == body["movie_title"]), None)
+    if movie is None:
+        return None, "Film tidak ditemukan"
+
+    cinema = body.get("cinema")
+    if not any(cinema in cinemas for cinemas in CINEMA_DATA.values()):
+        return None, "Bioskop tidak ditemukan"
+    if body.get("theater") not in THEATER_NUMBERS:
+        return None, "Theater tidak ditemukan"
+    studio_type = body.get("studio_type", "Regular")
+    if studio_type not in STUDIO_TYPES:
+        return None, "Tipe studio tidak valid"
+    if body.get("show_time") not in movie.get("schedule", []):
+        return None, "Jam tayang tidak tersedia"
+    if not body.get("show_date"):
+        return None, "Tanggal tayang wajib diisi"
+
+    seats = body.get("seats")
+    if not isinstance(seats, list) or not seats or len(seats) > MAX_SEATS:
+        return None, f"Pilih 1 sampai {MAX_SEATS} kursi"
+    seats = sorted({str(seat).strip().upper() for seat in seats})
+    if any(seat_to_index(seat) is None for seat in seats):
+        return None, "Nomor kursi tidak valid"
+
+    return {
+        "movie_title": movie["title"],
+        "cinema": cinema,
+        "theater": body["theater"],
+        "studio_type": studio_type,
+        "show_date": str(body["show_date"]),
+        "show_time": body["show_time"],
+        "seats": seats,
+        "total_price": ticket_price(movie, studio_type) * len(seats)
+    }, None
+
+
+@bookings_bp.route("", methods=["POST"])
+@require_session
+def post_booking():
+    key = request.headers.get("Idempotency-Key", "").strip()
+    if not key or len(key) > MAX_KEY_LENGTH:
+        return _error("Header Idempotency-Key wajib diisi (maks. 128 karakter)")
+
+    body = request.get_json(silent=True)
+    if not isinstance(body, dict):
+        return _error("Body JSON wajib diisi")
+    if "username" in body:
+        # Pembeli selalu pemilik token; username dari body tidak pernah dipakai
+        return _error("Field username tidak diterima, pembeli diambil dari token sesi")
+
+    booking_data, message = build_booking_data(body)
+    if booking_data is None:
+        return _error(message)
+
+    success, message, result = create_booking(g.session["username"], booking_data, key)
+    if not success:
+        code = ERROR_STATUS.get(result["error"], 500)
+        return _error(message, code, error=result["error"], seats=result.get("seats", []))
+
+    response = jsonify({"status": "ok", "message": message, "booking": result})
+    if result["replayed"]:
+        response.headers["Idempotent-Replayed"] = "true"
+        return response, 200
+    return response, 201
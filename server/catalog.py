@@ -0,0 +1,193 @@
+"""
+REST API katalog (read-only) untuk kiosk.
+
+GET /api/catalog/version
+GET /api/catalog/movies?genre=&q=&page=&per_page=
+GET /api/catalog/movies/<id>
+GET /api/catalog/showtimes?movie=&city=&page=&per_page=
+GET /api/catalog/menu?category=&page=&per_page=
+GET /api/catalog/recommendations?genre=&limit=
+GET /api/catalog/cache   -> statistik cache respons (hit ratio, byte yang dihemat)
+
+Setiap respons membawa ETag kuat yang diturunkan dari versi katalog, path,
+parameter dan content-encoding. If-None-Match yang cocok dijawab 304 tanpa
+membangun body. Body JSON di-gzip bila klien mengirim Accept-Encoding: gzip.
+Body (mentah dan gzip) disimpan di ResponseCache per (path, query, versi)
+sehingga request berulang tidak membangun atau mengompresi ulang.
+"""
+
+import gzip
+import json
+import hashlib
+
+from flask import Blueprint, Response, jsonify, request
+
+from server.response_cache import CachedResponse, get_response_cache
+from utils.catalog import get_catalog
+
+catalog_bp = Blueprint("catalog", __name__, url_prefix="/api/catalog")
+
+DEFAULT_PER_PAGE = 20
+DEFAULT_RECOMMENDATIONS = 6
+MAX_RECOMMENDATIONS = 20
+MAX_PER_PAGE = 100
+GZIP_MIN_SIZE = 512
+GZIP_LEVEL = 6
+
+
+def accepts_gzip():
+    return "gzip" in request.headers.get("Accept-Encoding", "").lower()
+
+
+def canonical_query():
+    """Query string dengan parameter terurut (dipakai untuk ETag dan kunci cache)"""
+    return "&".join(f"{key}={value}" for key, value in sorted(request.args.items(multi=True)))
+
+
+def make_etag(version, query, gzipped):
+    """ETag kuat: versi katalog + path + query (urut) + encoding"""
+    digest = hashlib.sha1(f"{request.path}?{query}".encode("utf-8")).hexdigest()[:12]
+    return f'"{version}-{digest}{"-gz" if gzipped else ""}"'
+
+
+def etag_matches(etag):
+    header = request.headers.get("If-None-Match")
+    if not header:
+        return False
+    return header.strip() == "*" or etag in [tag.strip() for tag in header.split(",")]
+
+
+def build_cached_response(build_payload, version, query):
+    """Bangun body JSON dan versi gzip-nya sekali untuk disimpan di cache"""
+    payload = build_payload()
+    if payload is None:
+        status = 404
+        body = json.dumps({"error": "Tidak ditemukan"}).encode("utf-8")
+    else:
+        status = 200
+        payload["catalog_version"] = version
+        body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    # Body kecil tidak di-gzip, tapi ETag tetap per encoding yang diminta
+    gzip_body = None
+    if len(body) >= GZIP_MIN_SIZE:
+        gzip_body = gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+    return CachedResponse(status, body, gzip_body, make_etag(version, query, False), make_etag(version, query, True))
+
+
+def catalog_response(build_payload):
+    """Jawab 304 bila ETag cocok, selain itu kirim body JSON dari cache (dibangun bila belum ada)"""
+    version = get_catalog().refresh()
+    use_gzip = accepts_gzip()
+    query = canonical_query()
+    cache = get_response_cache()
+    key = (request.path, query, version)
+
+    entry = cache.get(key, use_gzip) if cache.enabled else None
+    etag = (entry.gzip_etag if use_gzip else entry.etag) if entry else make_etag(version, query, use_gzip)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding",
+        "X-Catalog-Version": version,
+        "X-Cache": "HIT" if entry else "MISS"
+    }
+    if etag_matches(etag):
+        return Response(status=304, headers=headers)
+
+    if entry is None:
+        entry = build_cached_response(build_payload, version, query)
+        if cache.enabled:
+            cache.put(key, entry)
+
+    body = entry.body
+    if use_gzip and entry.gzip_body is not None:
+        body = entry.gzip_body
+        headers["Content-Encoding"] = "gzip"
+    if entry.status != 200:
+        headers = {"X-Catalog-Version": version}
+    return Response(body, status=entry.status, mimetype="application/json", headers=headers)
+
+
+def paginate(items):
+    """Potong daftar sesuai ?page= dan ?per_page=, mengembalikan dict halaman"""
+    try:
+        page = max(1, int(request.args.get("page", 1)))
+    except ValueError:
+        page = 1
+    try:
+        per_page = min(MAX_PER_PAGE, max(1, int(request.args.get("per_page", DEFAULT_PER_PAGE))))
+    except ValueError:
+        per_page = DEFAULT_PER_PAGE
+
+    total = len(items)
+    pages = max(1, (total + per_page - 1) // per_page)
+    start = (page - 1) * per_page
+    return {
+        "items": items[start:start + per_page],
+        "page": page,
+        "per_page": per_page,
+        "total": total,
+        "pages": pages,
+        "next_page": page + 1 if page < pages else None
+    }
+
+
+@catalog_bp.route("/version", methods=["GET"])
+def catalog_version():
+    return catalog_response(lambda: {})
+
+
+@catalog_bp.route("/movies", methods=["GET"])
+def list_movies():
+    def build():
+        movies = get_catalog().movies
+        genre = request.args.get("genre")
+        query = request.args.get("q", "").strip().lower()
+        if genre:
+            movies = [m for m in movies if genre.lower() in m.get("genre", "").lower()]
+        if query:
+            movies = [m for m in movies if query in m.get("title", "").lower()]
+        return paginate(movies)
+    return catalog_response(build)
+
+
+@catalog_bp.route("/movies/<int:movie_id>", methods=["GET"])
+def get_movie(movie_id):
+    def build():
+        movie = get_catalog().get_movie(movie_id)
+        return {"movie": movie} if movie else None
+    return catalog_response(build)
+
+
+@catalog_bp.route("/showtimes", methods=["GET"])
+def list_showtimes():
+    return catalog_response(lambda: paginate(
+        get_catalog().showtimes(request.args.get("movie"), request.args.get("city"))
+    ))
+
+
+@catalog_bp.route("/menu", methods=["GET"])
+def list_menu():
+    return catalog_response(lambda: paginate(get_catalog().menu(request.args.get("category"))))
+
+
+@catalog_bp.route("/recommendations", methods=["GET"])
+def list_recommendations():
+    def build():
+        movies = get_catalog().movies
+        genre = request.args.get("genre", "").strip().lower()
+        try:
+            limit = min(MAX_RECOMMENDATIONS, max(1, int(request.args.get("limit", DEFAULT_RECOMMENDATIONS))))
+        except ValueError:
+            limit = DEFAULT_RECOMMENDATIONS
+        # Film dengan genre favorit lebih dulu, sisanya sebagai pelengkap
+        matches = [m for m in movies if genre and genre in m.get("genre", "").lower()]
+        others = [m for m in movies if m not in matches]
+        return {"genre": genre or None, "items": (matches + others)[:limit]}
+    return catalog_response(build)
+
+
+@catalog_bp.route("/cache", methods=["GET"])
+def cache_stats():
+    return jsonify(get_response_cache().stats())
@@ -0,0 +1,166 @@
+"""
+Endpoint validasi tiket untuk scanner di gate bioskop.
+
+POST /api/gate/check-in       -> tandai tiket dipakai (atomik, lookup via primary key)
+                                 {"payload": <QR>}, atau {"ticket_id", "manual": true} untuk petugas
+GET  /api/gate/tickets/<id>   -> cek status tiket tanpa check-in
+GET  /api/gate/bloom          -> snapshot Bloom filter ID valid untuk gate offline
+
+Semua endpoint butuh token perangkat gate (Authorization: Bearer <token>,
+diterbitkan dengan `python -m server --gate-token <device>`).
+"""
+
+import json
+import time
+import threading
+from functools import partial
+
+from flask import Blueprint, g, jsonify, request, Response
+
+from models import TicketModel
+from server.auth import require_gate_device
+from utils.bloom import BloomFilter
+from utils.gate_auth import ROLE_STAFF
+from utils.helper import get_showtime_id
+from utils.qr_payload import decode_ticket_payload, seat_to_index, InvalidPayload
+
+gate_bp = Blueprint("gate", __name__, url_prefix="/api/gate")
+
+# Snapshot Bloom filter dibangun ulang paling sering tiap BLOOM_TTL detik
+BLOOM_TTL = 30
+BLOOM_ERROR_RATE = 0.001
+
+# SQLite hanya punya satu writer: antrekan check-in di proses ini daripada
+# membiarkan setiap thread menunggu di busy handler SQLite (backoff sampai 100 ms)
+_check_in_lock = threading.Lock()
+_bloom_lock = threading.Lock()
+_bloom_snapshot = {"data": None, "etag": None, "built_at": 0.0}
+
+
+def extract_ticket_id(body, allow_unsigned=False):
+    """Ambil ticket ID dari body request, mengembalikan (ticket_id, klaim QR)
+
+    {"payload": <isi QR>} base45 yang ditandatangani menghasilkan klaim
+    {"ticket_id", "showtime_id", "seats"} untuk dicocokkan dengan tiket di
+    database. {"ticket_id": ...}, JSON tiket lama atau ID 8 hex yang diketik
+    hanya diterima jika allow_unsigned (input manual petugas), klaimnya None.
+    Selain itu (None, None).
+    """
+    if not isinstance(body, dict):
+        return None, None
+    payload = body.get("payload")
+    if payload and isinstance(payload, str):
+        # Payload biner base45 yang ditandatangani (format tiket saat ini)
+        try:
+            claim = decode_ticket_payload(payload)
+            return claim["ticket_id"], claim
+        except InvalidPayload:
+            pass
+
+    if not allow_unsigned:
+        return None, None
+    if body.get("ticket_id"):
+        return TicketModel.normalize_ticket_id(body["ticket_id"]), None
+    if not payload or not isinstance(payload, str):
+        return None, None
+
+    # Payload JSON dari tiket lama
+    try:
+        data = json.loads(payload)
+    except ValueError:
+        data = None
+    if isinstance(data, dict) and data.get("id"):
+        return TicketModel.normalize_ticket_id(data["id"]), None
+
+    # Ticket ID yang diketik manual oleh petugas
+    ticket_id = TicketModel.normalize_ticket_id(payload)
+    if len(ticket_id) == 8 and all(char in "0123456789ABCDEF" for char in ticket_id):
+        return ticket_id, None
+    return None, None
+
+
+def claim_matches(claim, ticket):
+    """Jadwal dan kursi di QR harus sama dengan tiket yang diterbitkan"""
+    showtime_id = ticket.get("showtime_id")
+    if showtime_id is None:
+        showtime_id = get_showtime_id(ticket)  # tiket sebelum kolom showtime_id ada
+    if claim["showtime_id"] != showtime_id & 0xFFFFFFFF:
+        return False
+    # Bitmap QR hanya memuat kursi di grid A1..J10
+    seats = {seat.strip().upper() for seat in (ticket.get("seats") or "").split(",")}
+    return set(claim["seats"]) == {seat for seat in seats if seat_to_index(seat) is not None}
+
+
+def _public_ticket(ticket):
+    if ticket is None:
+        return None
+    return {
+        "ticket_id": ticket["ticket_id"],
+        "movie_title": ticket["movie_title"],
+        "cinema": ticket["cinema"],
+        "theater": ticket["theater"],
+        "show_date": ticket["show_date"],
+        "show_time": ticket["show_time"],
+        "seats": ticket["seats"],
+        "used_at": ticket["used_at"]
+    }
+
+
+@gate_bp.route("/check-in", methods=["POST"])
+@require_gate_device
+def check_in():
+    body = request.get_json(silent=True)
+    manual = isinstance(body, dict) and body.get("manual") is True
+    if manual and g.gate_device["role"] != ROLE_STAFF:
+        return jsonify({"status": "forbidden", "message": "Input manual hanya untuk perangkat petugas"}), 403
+    ticket_id, claim = extract_ticket_id(body, allow_unsigned=manual)
+    if not ticket_id:
+        return jsonify({"status": "invalid", "message": "QR tidak valid atau ticket ID tidak ditemukan di payload"}), 400
+
+    accept = partial(claim_matches, claim) if claim is not None else None
+    with _check_in_lock:
+        success, status, ticket = TicketModel.check_in(ticket_id, accept)
+    if status == "mismatch":
+        return jsonify({"status": status, "ticket_id": ticket_id,
+                        "message": "Jadwal atau kursi di QR tidak cocok dengan tiket"}), 422
+    code = 200 if success else {"used": 409, "unknown": 404}.get(status, 500)
+    return jsonify({
+        "status": status,
+        "ticket_id": ticket_id,
+        "ticket": _public_ticket(ticket)
+    }), code
+
+
+@gate_bp.route("/tickets/<ticket_id>", methods=["GET"])
+@require_gate_device
+def get_ticket(ticket_id):
+    ticket = TicketModel.get_ticket(ticket_id)
+    if ticket is None:
+        return jsonify({"status": "unknown", "ticket_id": ticket_id.upper()}), 404
+    status = "used" if ticket["used_at"] else "valid"
+    return jsonify({"status": status, "ticket": _public_ticket(ticket)})
+
+
+def build_bloom_snapshot(force=False):
+    """Bangun (atau pakai ulang) snapshot Bloom filter, mengembalikan (data, etag)"""
+    with _bloom_lock:
+        now = time.time()
+        if force or _bloom_snapshot["data"] is None or now - _bloom_snapshot["built_at"] > BLOOM_TTL:
+            bloom = BloomFilter.from_items(TicketModel.get_valid_ticket_ids(), BLOOM_ERROR_RATE)
+            data = bloom.to_bytes()
+            _bloom_snapshot["data"] = data
+            _bloom_snapshot["etag"] = f'"{len(bloom)}-{int(now)}"'
+            _bloom_snapshot["built_at"] = now
+        return _bloom_snapshot["data"], _bloom_snapshot["etag"]
+
+
+@gate_bp.route("/bloom", methods=["GET"])
+@require_gate_device
+def bloom_snapshot():
+    data, etag = build_bloom_snapshot()
+    if request.headers.get("If-None-Match") == etag:
+        return Response(status=304, headers={"ETag": etag})
+    return Response(data, mimetype="application/octet-stream", headers={
+        "ETag": etag,
+        "Cache-Control": f"max-age={BLOOM_TTL}"
+    })
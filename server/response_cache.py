@@ -0,0 +1,103 @@
+"""
+Cache respons API yang sudah diserialisasi dan dikompresi.
+
+Kunci cache adalah (path, query terurut, versi katalog). Body JSON dan
+versi gzip-nya disimpan sekali sehingga request berikutnya tidak perlu
+membangun payload, json.dumps maupun gzip lagi. Entri dibuang LRU bila
+total ukuran melewati batas byte, dan seluruh cache dikosongkan begitu
+versi katalog berubah.
+"""
+
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAX_BYTES = 8 * 1024 * 1024  # 8 MB
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+class CachedResponse:
+    __slots__ = ("status", "body", "gzip_body", "etag", "gzip_etag", "size")
+
+    def __init__(self, status, body, gzip_body, etag, gzip_etag):
+        self.status = status
+        self.body = body
+        self.gzip_body = gzip_body
+        self.etag = etag
+        self.gzip_etag = gzip_etag
+        self.size = len(body) + (len(gzip_body) if gzip_body else 0)
+
+
+class ResponseCache:
+    """Cache LRU dengan batas byte untuk body respons"""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0,
+                       "bytes_saved": 0, "gzip_bytes_saved": 0}
+
+    @property
+    def enabled(self):
+        return self.max_bytes > 0
+
+    def get(self, key, use_gzip=False):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            # Body yang tidak perlu dibangun ulang, dan byte yang dihemat oleh gzip tersimpan
+            self._stats["bytes_saved"] += len(entry.body)
+            if use_gzip and entry.gzip_body is not None:
+                self._stats["gzip_bytes_saved"] += len(entry.body) - len(entry.gzip_body)
+            return entry
+
+    def put(self, key, entry):
+        if entry.size > self.max_bytes:
+            return entry
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old.size
+            self._entries[key] = entry
+            self._bytes += entry.size
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.size
+                self._stats["evictions"] += 1
+        return entry
+
+    def clear(self, *args):
+        """Kosongkan cache (dipakai sebagai listener perubahan versi katalog)"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._stats["invalidations"] += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hit_ratio": round(self._stats["hits"] / lookups, 4) if lookups else 0.0,
+                **self._stats
+            }
+
+
+def get_response_cache():
+    """Mendapatkan ResponseCache bersama yang dikosongkan saat katalog berubah"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            from utils.catalog import get_catalog
+            _cache = ResponseCache()
+            get_catalog().add_listener(_cache.clear)
+        return _cache
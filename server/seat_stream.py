@@ -0,0 +1,328 @@
+"""
+Server SSE status kursi tanpa satu worker thread per klien.
+
+Satu thread menjalankan loop selectors di atas socket non-blocking: semua
+koneksi stream dilayani di sana, sehingga ratusan kiosk/browser yang
+berlangganan tidak memakai worker waitress sama sekali. Perubahan kursi
+masuk lewat SeatHub.add_listener (thread publisher hanya menaruh delta di
+antrean lalu membangunkan loop); setiap delta di-format sekali per jadwal
+lalu ditambahkan ke buffer keluar setiap subscriber jadwal itu.
+
+Protokol sama dengan GET /api/seats/<showtime_id>/stream di server/seats.py
+(event snapshot/seat, id "<epoch>-<versi>", Last-Event-ID atau ?since=);
+route Flask itu mengarahkan klien ke sini (307) saat server ini berjalan.
+Klien yang terlalu lambat (buffer keluar penuh) diputus dan cukup
+reconnect dengan Last-Event-ID.
+
+    stream_server = SeatStreamServer(get_seat_hub(), host="0.0.0.0", port=5001)
+    stream_server.start()
+"""
+
+import re
+import time
+import socket
+import selectors
+import threading
+import weakref
+from collections import deque
+from urllib.parse import parse_qs
+
+from server.seats import HEARTBEAT_INTERVAL, format_event, parse_resume_version
+from utils.metrics import gauge
+
+MAX_STREAMS = 2000
+MAX_REQUEST_BYTES = 8192
+MAX_BUFFER_BYTES = 256 * 1024  # buffer keluar per klien sebelum diputus
+REQUEST_TIMEOUT = 10  # detik untuk mengirim header request
+
+_STREAM_PATH = re.compile(r"^/api/seats/(\d+)/stream$")
+_servers = weakref.WeakSet()
+
+STREAM_CONNECTIONS = gauge("tiket_seat_stream_connections", "Koneksi stream kursi di server SSE",
+                           function=lambda: sum(server.connections() for server in list(_servers)))
+
+_RESPONSE_HEADERS = (
+    "HTTP/1.1 200 OK\r\n"
+    "Content-Type: text/event-stream\r\n"
+    "Cache-Control: no-cache\r\n"
+    "Connection: keep-alive\r\n"
+    "X-Accel-Buffering: no\r\n"
+    "Access-Control-Allow-Origin: *\r\n"
+    "\r\n"
+).encode("ascii")
+_HEARTBEAT = b": ping\n\n"
+
+
+def _error_response(status, message):
+    body = message.encode("utf-8")
+    return (f"HTTP/1.1 {status}\r\nContent-Type: text/plain; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n").encode("ascii") + body
+
+
+class _Connection:
+    __slots__ = ("sock", "inbuf", "outbuf", "showtime_id", "version", "accepted", "last_write", "closing")
+
+    def __init__(self, sock, now):
+        self.sock = sock
+        self.inbuf = b""
+        self.outbuf = bytearray()
+        self.showtime_id = None  # None sampai header request lengkap
+        self.version = 0
+        self.accepted = now
+        self.last_write = now
+        self.closing = False  # tutup setelah buffer terkirim (respons error)
+
+
+class SeatStreamServer:
+    """Loop SSE tunggal untuk semua subscriber status kursi"""
+
+    def __init__(self, hub, host="127.0.0.1", port=0, max_streams=MAX_STREAMS, heartbeat=HEARTBEAT_INTERVAL):
+        self.hub = hub
+        self.max_streams = max_streams
+        self.heartbeat = heartbeat
+
+        self._listener = socket.create_server((host, port))
+        self._listener.setblocking(False)
+        self.port = self._listener.getsockname()[1]
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
+
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._listener, selectors.EVENT_READ)
+        self._selector.register(self._wake_r, selectors.EVENT_READ)
+        self._connections = {}  # socket -> _Connection
+        self._subscribers = {}  # showtime_id -> set(_Connection)
+        self._pending = deque()  # (showtime_id, deltas) dari thread publisher
+        self._pending_lock = threading.Lock()
+        self._stop = False
+        self._thread = None
+        _servers.add(self)
+
+    def connections(self):
+        return len(self._connections)
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="seat-stream", daemon=True)
+            self._thread.start()
+        return self
+
+    def close(self):
+        """Hentikan loop dan tutup semua koneksi"""
+        self._stop = True
+        self._wake()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    # Dipanggil di thread publisher (SeatHub.publish)
+    def _on_publish(self, showtime_id, deltas):
+        with self._pending_lock:
+            self._pending.append((showtime_id, deltas))
+        self._wake()
+
+    def _wake(self):
+        try:
+            self._wake_w.send(b"\0")
+        except OSError:
+            pass  # buffer socketpair penuh: loop memang sudah akan bangun
+
+    # Loop
+    def _run(self):
+        try:
+            while not self._stop:
+                for key, events in self._selector.select(timeout=1.0):
+                    sock = key.fileobj
+                    if sock is self._listener:
+                        self._accept()
+                    elif sock is self._wake_r:
+                        self._drain_wake()
+                    else:
+                        connection = self._connections.get(sock)
+                        if connection is None:
+                            continue
+                        if events & selectors.EVENT_READ:
+                            self._read(connection)
+                        if events & selectors.EVENT_WRITE and sock in self._connections:
+                            self._flush(connection)
+                self._dispatch_pending()
+                self._housekeeping()
+        except Exception as e:
+            print(f"Error in seat stream loop: {str(e)}")
+        finally:
+            for connection in list(self._connections.values()):
+                self._drop(connection)
+            self._selector.close()
+            self._listener.close()
+            self._wake_r.close()
+            self._wake_w.close()
+
+    def _accept(self):
+        while True:
+            try:
+                sock, _ = self._listener.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError as e:
+                print(f"Error accepting seat stream: {str(e)}")
+                return
+            sock.setblocking(False)
+            connection = _Connection(sock, time.monotonic())
+            self._connections[sock] = connection
+            self._selector.register(sock, selectors.EVENT_READ)
+
+    def _drain_wake(self):
+        try:
+            while self._wake_r.recv(4096):
+                pass
+        except (BlockingIOError, InterruptedError):
+            pass
+
+    def _read(self, connection):
+        try:
+            chunk = connection.sock.recv(4096)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            chunk = b""
+        if not chunk:
+            self._drop(connection)
+            return
+        if connection.showtime_id is not None or connection.closing:
+            return  # klien SSE tidak mengirim apa-apa lagi setelah request
+        connection.inbuf += chunk
+        if b"\r\n\r\n" in connection.inbuf:
+            self._handle_request(connection)
+        elif len(connection.inbuf) > MAX_REQUEST_BYTES:
+            self._reject(connection, "431 Request Header Fields Too Large", "Header terlalu besar")
+
+    def _handle_request(self, connection):
+        head = connection.inbuf.split(b"\r\n\r\n", 1)[0].decode("latin-1")
+        connection.inbuf = b""
+        lines = head.split("\r\n")
+        parts = lines[0].split(" ")
+        if len(parts) != 3 or parts[0] != "GET":
+            self._reject(connection, "405 Method Not Allowed", "Hanya GET")
+            return
+        path, _, query = parts[1].partition("?")
+        match = _STREAM_PATH.match(path)
+        if match is None:
+            self._reject(connection, "404 Not Found", "Tidak ditemukan")
+            return
+        if self._stream_count() >= self.max_streams:
+            self._reject(connection, "503 Service Unavailable", "Terlalu banyak stream kursi terbuka")
+            return
+
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        resume = headers.get("last-event-id") or (parse_qs(query).get("since") or [None])[0]
+        self._subscribe(connection, int(match.group(1)), parse_resume_version(self.hub, resume))
+
+    def _stream_count(self):
+        return sum(len(connections) for connections in self._subscribers.values())
+
+    def _subscribe(self, connection, showtime_id, since):
+        # Listener dipasang sebelum snapshot: delta di antara keduanya tetap sampai,
+        # yang versinya sudah termasuk snapshot dilewati di _dispatch_pending
+        subscribers = self._subscribers.get(showtime_id)
+        if subscribers is None:
+            subscribers = self._subscribers[showtime_id] = set()
+            self.hub.add_listener(showtime_id, self._on_publish)
+        subscribers.add(connection)
+        connection.showtime_id = showtime_id
+
+        out = bytearray(_RESPONSE_HEADERS)
+        deltas = self.hub.changes_since(showtime_id, since) if since is not None else None
+        if deltas is None:
+            version, states = self.hub.snapshot(showtime_id)
+            out += format_event("snapshot", {"version": version, "seats": states},
+                                f"{self.hub.epoch}-{version}").encode("utf-8")
+            connection.version = version
+        else:
+            connection.version = since
+            for delta_version, seat, state in deltas:
+                out += self._format_delta(delta_version, seat, state)
+                connection.version = delta_version
+        self._send(connection, out)
+
+    def _format_delta(self, version, seat, state):
+        return format_event("seat", {"seat": seat, "state": state, "version": version},
+                            f"{self.hub.epoch}-{version}").encode("utf-8")
+
+    def _dispatch_pending(self):
+        with self._pending_lock:
+            pending, self._pending = self._pending, deque()
+        for showtime_id, deltas in pending:
+            subscribers = self._subscribers.get(showtime_id)
+            if not subscribers:
+                continue
+            # Di-format sekali per delta, dipakai bersama semua subscriber jadwal ini
+            formatted = [(version, self._format_delta(version, seat, state)) for version, seat, state in deltas]
+            for connection in list(subscribers):
+                data = b"".join(event for version, event in formatted if version > connection.version)
+                if data:
+                    connection.version = formatted[-1][0]
+                    self._send(connection, data)
+
+    def _housekeeping(self):
+        now = time.monotonic()
+        for connection in list(self._connections.values()):
+            if connection.showtime_id is None:
+                if not connection.closing and now - connection.accepted > REQUEST_TIMEOUT:
+                    self._drop(connection)
+            elif not connection.outbuf and now - connection.last_write >= self.heartbeat:
+                # Heartbeat juga cara mendeteksi klien yang sudah putus
+                self._send(connection, _HEARTBEAT)
+
+    # Penulisan
+    def _send(self, connection, data):
+        if connection.sock not in self._connections:
+            return
+        connection.outbuf += data
+        if len(connection.outbuf) > MAX_BUFFER_BYTES:
+            # Klien terlalu lambat: diputus, reconnect dengan Last-Event-ID melanjutkan dari versinya
+            self._drop(connection)
+            return
+        self._flush(connection)
+
+    def _flush(self, connection):
+        try:
+            sent = connection.sock.send(connection.outbuf)
+        except (BlockingIOError, InterruptedError):
+            sent = 0
+        except OSError:
+            self._drop(connection)
+            return
+        del connection.outbuf[:sent]
+        if sent:
+            connection.last_write = time.monotonic()
+        if connection.outbuf:
+            self._selector.modify(connection.sock, selectors.EVENT_READ | selectors.EVENT_WRITE)
+        elif connection.closing:
+            self._drop(connection)
+        else:
+            self._selector.modify(connection.sock, selectors.EVENT_READ)
+
+    def _reject(self, connection, status, message):
+        connection.closing = True
+        self._send(connection, _error_response(status, message))
+
+    def _drop(self, connection):
+        sock = connection.sock
+        if self._connections.pop(sock, None) is None:
+            return
+        showtime_id = connection.showtime_id
+        subscribers = self._subscribers.get(showtime_id)
+        if subscribers is not None:
+            subscribers.discard(connection)
+            if not subscribers:
+                del self._subscribers[showtime_id]
+                self.hub.remove_listener(showtime_id, self._on_publish)
+        try:
+            self._selector.unregister(sock)
+        except (KeyError, ValueError):
+            pass
+        sock.close()
@@ -0,0 +1,150 @@
+"""
+Status kursi real-time per jadwal tayang.
+
+GET /api/seats/<showtime_id>          -> snapshot {version, seats}
+GET /api/seats/<showtime_id>/stream   -> Server-Sent Events
+
+Stream mengirim event "snapshot" saat terhubung, lalu event "seat" berisi
+delta {seat, state, version}. Setiap event punya id "<epoch>-<versi>";
+browser mengirimnya lagi sebagai Last-Event-ID saat reconnect (atau klien
+memakai ?since=<epoch>-<versi>) sehingga hanya delta yang terlewat yang
+dikirim.
+
+Server headless melayani stream di server SSE terpisah (server/seat_stream.py,
+satu thread untuk semua subscriber, --stream-port); route di sini menjawab
+307 ke sana jika app.config["SEAT_STREAM_PORT"] diisi. Tanpa server itu
+(mis. server Flask di dalam klien desktop) stream dijalankan di worker
+thread: setiap koneksi memegang satu thread selama terhubung, jadi
+jumlahnya dibatasi app.config["SEAT_STREAM_LIMIT"] dan stream di atas batas
+ditolak 503 + Retry-After agar login, pembelian dan /metrics tetap jalan.
+"""
+
+import json
+import threading
+from urllib.parse import urlsplit
+
+from flask import Blueprint, Response, current_app, jsonify, redirect, request
+
+from utils.seat_hub import get_seat_hub
+from utils.metrics import gauge
+
+seats_bp = Blueprint("seats", __name__, url_prefix="/api/seats")
+
+HEARTBEAT_INTERVAL = 15  # detik
+RESERVED_API_THREADS = 4  # worker thread yang tidak pernah dipakai stream (tanpa server SSE)
+DEFAULT_STREAM_LIMIT = 4
+STREAM_RETRY_AFTER = 5  # detik
+
+_open_streams = 0
+_streams_lock = threading.Lock()
+
+SEAT_STREAMS = gauge("tiket_seat_streams_open", "Koneksi stream SSE status kursi yang terbuka",
+                     function=lambda: _open_streams)
+
+
+def stream_limit(threads):
+    """Batas stream untuk waitress dengan jumlah worker thread tertentu"""
+    return max(0, threads - RESERVED_API_THREADS)
+
+
+def _acquire_stream(limit):
+    global _open_streams
+    with _streams_lock:
+        if _open_streams >= limit:
+            return False
+        _open_streams += 1
+        return True
+
+
+def _release_stream():
+    global _open_streams
+    with _streams_lock:
+        _open_streams -= 1
+
+
+def format_event(event, data, event_id=None):
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, separators=(',', ':'))}")
+    return "\n".join(lines) + "\n\n"
+
+
+def parse_resume_version(hub, value):
+    """Ambil versi dari "<epoch>-<versi>"; None jika kosong atau dari proses lain"""
+    if not value:
+        return None
+    epoch, _, version = value.rpartition("-")
+    if epoch != hub.epoch or not version.isdigit():
+        return None
+    return int(version)
+
+
+@seats_bp.route("/<int:showtime_id>", methods=["GET"])
+def seat_snapshot(showtime_id):
+    hub = get_seat_hub()
+    version, states = hub.snapshot(showtime_id)
+    return jsonify({
+        "showtime_id": showtime_id,
+        "epoch": hub.epoch,
+        "version": version,
+        "seats": states
+    })
+
+
+def seat_events(hub, showtime_id, since):
+    deltas = hub.changes_since(showtime_id, since) if since is not None else None
+    if deltas is None:
+        version, states = hub.snapshot(showtime_id)
+        yield format_event("snapshot", {"version": version, "seats": states}, f"{hub.epoch}-{version}")
+    else:
+        version = since
+
+    while True:
+        for delta_version, seat, state in deltas or []:
+            version = delta_version
+            yield format_event("seat", {"seat": seat, "state": state, "version": version},
+                               f"{hub.epoch}-{version}")
+
+        deltas = hub.wait_for_changes(showtime_id, version, HEARTBEAT_INTERVAL)
+        if deltas is None:
+            # Tertinggal terlalu jauh: kirim snapshot baru
+            version, states = hub.snapshot(showtime_id)
+            yield format_event("snapshot", {"version": version, "seats": states}, f"{hub.epoch}-{version}")
+        elif not deltas:
+            yield ": ping\n\n"
+
+
+def stream_url(stream_port):
+    """URL request ini di server SSE: host yang sama dengan yang dipakai klien, port stream"""
+    host = urlsplit(f"//{request.host}").hostname or "localhost"
+    if ":" in host:
+        host = f"[{host}]"
+    return f"{request.scheme}://{host}:{stream_port}{request.full_path.rstrip('?')}"
+
+
+@seats_bp.route("/<int:showtime_id>/stream", methods=["GET"])
+def seat_stream(showtime_id):
+    stream_port = current_app.config.get("SEAT_STREAM_PORT")
+    if stream_port:
+        return redirect(stream_url(stream_port), code=307)
+
+    if not _acquire_stream(current_app.config["SEAT_STREAM_LIMIT"]):
+        # Semua slot stream terpakai: klien memakai snapshot GET dan mencoba lagi nanti
+        response = jsonify({"status": "error", "error": "too_many_streams",
+                            "message": "Terlalu banyak stream kursi terbuka",
+                            "retry_after": STREAM_RETRY_AFTER})
+        response.status_code = 503
+        response.headers["Retry-After"] = str(STREAM_RETRY_AFTER)
+        return response
+
+    hub = get_seat_hub()
+    since = parse_resume_version(hub, request.headers.get("Last-Event-ID") or request.args.get("since"))
+    response = Response(seat_events(hub, showtime_id, since), mimetype="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no"
+    })
+    # Slot dilepas saat waitress menutup respons (klien putus terdeteksi saat heartbeat)
+    response.call_on_close(_release_stream)
+    return response
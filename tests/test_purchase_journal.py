@@ -0,0 +1,71 @@
+"""Pemulihan dan pemadatan jurnal pembelian (utils.purchase_journal)"""
+
+import os
+import json
+
+import models
+from models import init_db, get_db, BookingModel
+from utils import purchase_journal
+from utils.purchase_journal import PurchaseJournal
+
+BOOKING = {
+    "movie_title": "Film Uji", "cinema": "CGV Grand Indonesia", "theater": "Theater 1",
+    "studio_type": "Regular", "show_date": "01/01/2030", "show_time": "19:00",
+    "seats": ["A1"], "total_price": 50000,
+}
+
+
+def _setup(tmp_path, monkeypatch):
+    monkeypatch.setattr(models, "DATABASE", str(tmp_path / "journal.db"))
+    monkeypatch.setattr(purchase_journal, "HISTORY_DIR", str(tmp_path / "history"))
+    init_db()
+    conn = get_db()
+    conn.execute("INSERT INTO users (nama, username, password, usia, saldo) VALUES (?, ?, ?, ?, ?)",
+                 ("Pembeli", "buyer", "-", 20, 1_000_000))
+    conn.commit()
+    conn.close()
+
+
+def test_recover_rolls_back_and_completes(tmp_path, monkeypatch):
+    _setup(tmp_path, monkeypatch)
+    path = str(tmp_path / "journal" / "purchases-test.log")
+    journal = PurchaseJournal(path)
+
+    # Crash sebelum COMMIT: hanya intent, database tidak berubah
+    journal.begin("buyer", dict(BOOKING, seats=["B1"]), "lost-before-commit")
+    # Crash sesudah COMMIT tetapi sebelum file riwayat ditulis
+    journal.begin("buyer", BOOKING, "lost-after-commit")
+    success, _, result = BookingModel.create_booking("buyer", BOOKING, "lost-after-commit")
+    assert success
+    journal.close()
+
+    recovered = PurchaseJournal(path)
+    try:
+        assert recovered.recover() == {"completed": 1, "rolled_back": 1, "failed": 0}
+        with open(os.path.join(purchase_journal.HISTORY_DIR, "buyer.json")) as f:
+            history = json.load(f)
+        assert [t["transaction_id"] for t in history] == [result["booking_id"]]
+        assert os.path.getsize(path) == 0
+
+        # Pemulihan kedua tidak menemukan apa pun dan tidak menggandakan riwayat
+        assert recovered.recover() == {"completed": 0, "rolled_back": 0, "failed": 0}
+        with open(os.path.join(purchase_journal.HISTORY_DIR, "buyer.json")) as f:
+            assert len(json.load(f)) == 1
+    finally:
+        recovered.close()
+
+
+def test_journal_is_compacted_while_running(tmp_path, monkeypatch):
+    _setup(tmp_path, monkeypatch)
+    path = str(tmp_path / "journal" / "purchases-test.log")
+    journal = PurchaseJournal(path, compact_lines=64)
+    for i in range(200):
+        purchase_id = journal.begin("buyer", BOOKING, f"key-{i}")
+        journal.abort(purchase_id, "rejected")
+    still_open = journal.begin("buyer", BOOKING, "still-open")
+    journal.close()
+
+    records = journal.read_records()
+    assert len(records) < 64
+    assert any(r["op"] == "intent" and r["id"] == still_open for r in records)
+    assert not os.path.exists(f"{path}.tmp")
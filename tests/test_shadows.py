@@ -0,0 +1,54 @@
+"""Bayangan mode lite tetap aman saat widget berbayangan dihapus dari parent-nya"""
+
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QEvent
+from PyQt5.QtWidgets import QApplication, QFrame, QHBoxLayout, QWidget
+
+from gui import shadows
+from gui.shadows import attach_shadow, set_render_mode, RENDER_LITE, RENDER_EFFECTS
+
+
+def _app():
+    return QApplication.instance() or QApplication([])
+
+
+def test_deleted_children_are_dropped_from_layer():
+    app = _app()
+    previous = shadows.render_mode()
+    set_render_mode(RENDER_LITE)
+    try:
+        host = QFrame()
+        layout = QHBoxLayout(host)
+        for _ in range(3):
+            card = QWidget()
+            card.setFixedSize(80, 120)
+            attach_shadow(card, blur_radius=10, radius=8)
+            layout.addWidget(card)
+        host.resize(400, 200)
+        host.show()
+        app.processEvents()
+
+        # Sama seperti populate_recommendations saat pengguna kiosk berganti
+        while layout.count():
+            layout.takeAt(0).widget().deleteLater()
+        QApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+        app.processEvents()
+        host.repaint()
+
+        layer = host.findChild(shadows._ShadowLayer)
+        assert layer is not None
+        assert layer.shadows == []
+
+        replacement = QWidget()
+        replacement.setFixedSize(80, 120)
+        attach_shadow(replacement, blur_radius=10, radius=8)
+        layout.addWidget(replacement)
+        app.processEvents()
+        host.repaint()
+        assert len(layer.shadows) == 1
+        host.close()
+    finally:
+        set_render_mode(previous if previous in (RENDER_LITE, RENDER_EFFECTS) else RENDER_EFFECTS)
@@ -0,0 +1,184 @@
+"""
+Admission control untuk jalur tulis (pemesanan, top up, potong saldo).
+
+SQLite hanya punya satu penulis; daripada puluhan koneksi menunggu write
+lock sampai timeout, request antre di sini dengan batas yang jelas:
+- concurrency: jumlah request yang boleh jalan bersamaan (1 = satu penulis)
+- max_queue: panjang antrean; jika penuh request langsung ditolak (Overloaded)
+- max_per_user: batas antrean per pengguna; antrean dilayani bergiliran
+  (round-robin) per pengguna sehingga satu klien yang agresif tidak
+  menghabiskan giliran pengguna lain
+- max_wait: request yang diperkirakan/terlanjur menunggu lebih lama ditolak
+
+    writes = AdmissionController("booking_writes")
+    with writes.admit(username):
+        BookingModel.create_booking(...)
+
+prepare (opsional) dijalankan setelah request lolos cek antrean tetapi
+sebelum menunggu giliran, mis. fsync jurnal pembelian: request yang ditolak
+tidak pernah sampai ke situ, dan waktunya tumpang tindih dengan antrean.
+"""
+
+import math
+import time
+import threading
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+
+from utils.metrics import counter, gauge, histogram
+
+QUEUE_DEPTH = gauge("tiket_admission_queue_depth", "Jumlah request yang menunggu giliran", ("queue",))
+QUEUE_WAIT_SECONDS = histogram(
+    "tiket_admission_wait_seconds", "Waktu tunggu di antrean sebelum dijalankan", ("queue",),
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+)
+ADMISSION_RESULTS = counter("tiket_admission_total", "Hasil admission control", ("queue", "result"))
+
+
+class Overloaded(Exception):
+    """Antrean penuh; klien sebaiknya mencoba lagi setelah retry_after detik"""
+
+    def __init__(self, message, retry_after=1):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class _Waiter:
+    __slots__ = ("event", "granted")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.granted = False
+
+
+class AdmissionController:
+    """Antrean terbatas dan adil per pengguna di depan sumber daya berkapasitas kecil"""
+
+    def __init__(self, name, concurrency=1, max_queue=64, max_per_user=2, max_wait=2.0):
+        self.name = name
+        self.concurrency = concurrency
+        self.max_queue = max_queue
+        self.max_per_user = max_per_user
+        self.max_wait = max_wait
+
+        self._lock = threading.Lock()
+        self._active = 0
+        self._queued = 0
+        self._queues = OrderedDict()  # pengguna -> deque[_Waiter], urutan giliran
+        self._service_time = 0.005  # rata-rata bergerak lama satu operasi (detik)
+
+        self._depth = QUEUE_DEPTH.labels(name)
+        self._wait = QUEUE_WAIT_SECONDS.labels(name)
+        self._admitted = ADMISSION_RESULTS.labels(name, "admitted")
+        self._rejected = {
+            reason: ADMISSION_RESULTS.labels(name, reason)
+            for reason in ("queue_full", "user_limit", "timeout")
+        }
+
+    @contextmanager
+    def admit(self, user, prepare=None):
+        """Tunggu giliran untuk user; raise Overloaded jika ditolak"""
+        waiter = self._enter(user)
+        enqueued = time.perf_counter()
+        if prepare is not None:
+            try:
+                prepare()
+            except BaseException:
+                self._abandon(user, waiter)
+                raise
+        if waiter is not None:
+            self._await(user, waiter, enqueued)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._leave(time.perf_counter() - start)
+
+    def _reject(self, reason, estimated):
+        self._rejected[reason].inc()
+        retry_after = max(1, math.ceil(estimated))
+        raise Overloaded(f"Antrean pembayaran sedang penuh, coba lagi dalam {retry_after} detik", retry_after)
+
+    def _enter(self, user):
+        """Cek antrean; None jika langsung mendapat giliran, selain itu _Waiter di antrean"""
+        with self._lock:
+            if self._active < self.concurrency and not self._queued:
+                self._active += 1
+                self._admitted.inc()
+                self._wait.observe(0.0)
+                return None
+
+            estimated = (self._queued + 1) * self._service_time / self.concurrency
+            queue = self._queues.get(user)
+            if self._queued >= self.max_queue or estimated > self.max_wait:
+                self._reject("queue_full", estimated)
+            if queue is not None and len(queue) >= self.max_per_user:
+                self._reject("user_limit", estimated)
+
+            waiter = _Waiter()
+            if queue is None:
+                queue = self._queues[user] = deque()
+            queue.append(waiter)
+            self._queued += 1
+            self._depth.set(self._queued)
+        return waiter
+
+    def _await(self, user, waiter, enqueued):
+        remaining = max(0.0, self.max_wait - (time.perf_counter() - enqueued))
+        if not waiter.event.wait(remaining):
+            with self._lock:
+                # Bisa saja giliran diberikan tepat saat timeout
+                if not waiter.granted:
+                    self._dequeue(user, waiter)
+                    self._reject("timeout", self._queued * self._service_time / self.concurrency)
+        self._admitted.inc()
+        self._wait.observe(time.perf_counter() - enqueued)
+
+    def _dequeue(self, user, waiter):
+        """Keluarkan waiter yang belum mendapat giliran (dipanggil dengan lock dipegang)"""
+        queue = self._queues[user]
+        queue.remove(waiter)
+        if not queue:
+            del self._queues[user]
+        self._queued -= 1
+        self._depth.set(self._queued)
+
+    def _abandon(self, user, waiter):
+        """prepare gagal: lepas giliran yang sudah didapat atau keluar dari antrean"""
+        with self._lock:
+            if waiter is not None and not waiter.granted:
+                self._dequeue(user, waiter)
+                return
+            self._active -= 1
+            self._grant_next()
+
+    def _leave(self, elapsed):
+        with self._lock:
+            self._service_time = 0.8 * self._service_time + 0.2 * elapsed
+            self._active -= 1
+            self._grant_next()
+
+    def _grant_next(self):
+        """Berikan giliran ke antrean berikutnya (dipanggil dengan lock dipegang)"""
+        # Giliran berikutnya: kepala antrean pengguna terdepan, lalu pengguna itu pindah ke belakang
+        while self._active < self.concurrency and self._queues:
+            user, queue = next(iter(self._queues.items()))
+            waiter = queue.popleft()
+            if queue:
+                self._queues.move_to_end(user)
+            else:
+                del self._queues[user]
+            self._queued -= 1
+            self._active += 1
+            waiter.granted = True
+            waiter.event.set()
+        self._depth.set(self._queued)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "active": self._active,
+                "queued": self._queued,
+                "users_waiting": len(self._queues),
+                "service_time_ms": round(self._service_time * 1000, 3),
+            }
@@ -0,0 +1,77 @@
+"""
+Bloom filter sederhana untuk snapshot ticket ID yang valid.
+
+Snapshot dikirim ke perangkat gate yang sedang offline: ID yang tidak ada
+di filter pasti tidak valid, ID yang ada kemungkinan besar valid (dengan
+tingkat false positive sesuai kapasitas).
+"""
+
+import math
+import struct
+import hashlib
+
+# Header snapshot: magic, jumlah bit, jumlah hash, jumlah item
+_HEADER = struct.Struct(">4sIHI")
+_MAGIC = b"BLM1"
+
+
+class BloomFilter:
+    """Bloom filter dengan double hashing di atas BLAKE2b"""
+
+    def __init__(self, num_bits, num_hashes, bits=None, count=0):
+        self.num_bits = max(8, int(num_bits))
+        self.num_hashes = max(1, int(num_hashes))
+        self.bits = bytearray(bits) if bits is not None else bytearray((self.num_bits + 7) // 8)
+        self.count = count
+
+    @classmethod
+    def for_capacity(cls, capacity, error_rate=0.001):
+        """Membuat filter dengan ukuran optimal untuk kapasitas dan false positive rate"""
+        capacity = max(1, int(capacity))
+        num_bits = math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        num_hashes = max(1, round(num_bits / capacity * math.log(2)))
+        return cls(num_bits, num_hashes)
+
+    @classmethod
+    def from_items(cls, items, error_rate=0.001):
+        items = list(items)
+        bloom = cls.for_capacity(len(items), error_rate)
+        for item in items:
+            bloom.add(item)
+        return bloom
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(str(item).encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:], "big") | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, item):
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, item):
+        bits = self.bits
+        for pos in self._positions(item):
+            if not bits[pos >> 3] & (1 << (pos & 7)):
+                return False
+        return True
+
+    def __len__(self):
+        return self.count
+
+    def to_bytes(self):
+        """Serialisasi filter menjadi snapshot biner"""
+        return _HEADER.pack(_MAGIC, self.num_bits, self.num_hashes, self.count) + bytes(self.bits)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Memuat filter dari snapshot biner"""
+        magic, num_bits, num_hashes, count = _HEADER.unpack_from(data)
+        if magic != _MAGIC:
+            raise ValueError("Snapshot Bloom filter tidak valid")
+        bits = data[_HEADER.size:]
+        if len(bits) != (num_bits + 7) // 8:
+            raise ValueError("Ukuran snapshot Bloom filter tidak sesuai")
+        return cls(num_bits, num_hashes, bits, count)
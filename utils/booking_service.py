@@ -0,0 +1,102 @@
+"""
+Layanan pemesanan tiket yang idempotent.
+
+Dipakai langsung oleh GUI (in-process) maupun endpoint POST /api/bookings.
+Seluruh pembelian (reservasi kursi, potong saldo, riwayat, ticket ID)
+terjadi dalam satu transaksi SQLite di BookingModel.create_booking; klien
+yang mengulang request dengan idempotency key yang sama mendapat hasil
+pertama tanpa dipotong saldo dua kali.
+
+Semua penulisan saldo lewat admission controller yang sama (satu penulis,
+antrean terbatas dan adil per pengguna); saat antrean penuh fungsi di sini
+melempar Overloaded yang dijawab server dengan 503 + Retry-After.
+
+Setiap pembelian dicatat di jurnal (utils.purchase_journal): intent sebelum
+transaksi database, commit sesudahnya. Intent baru ditulis setelah request
+lolos admission control (sambil menunggu giliran), jadi request yang ditolak
+503 dan replay idempotency tidak menulis apa pun ke jurnal. Klien desktop yang masih harus menulis
+file riwayat memakai defer_completion=True lalu menandai selesai lewat
+jurnal setelah file tertulis.
+"""
+
+import json
+import hashlib
+
+from models import BookingModel, UserModel
+from utils.admission import AdmissionController
+from utils.purchase_journal import get_purchase_journal
+from utils.seat_hub import get_seat_hub, SEAT_BOOKED
+
+# Penulis dalam satu proses antre di sini, bukan di busy handler SQLite.
+# Antrean lebih pendek dari jumlah thread waitress (8) agar selalu ada thread
+# yang bebas untuk request baca dan untuk menolak cepat saat beban puncak.
+_writes = AdmissionController("booking_writes", concurrency=1, max_queue=4, max_per_user=2, max_wait=1.0)
+
+BOOKING_FIELDS = ("movie_title", "cinema", "theater", "studio_type", "show_date", "show_time", "seats",
+                  "total_price")
+
+
+def request_hash(username, booking_data):
+    """Sidik jari isi request; key yang sama dengan isi berbeda ditolak"""
+    seats = booking_data.get("seats", [])
+    if isinstance(seats, str):
+        seats = seats.split(",")
+    content = {field: booking_data.get(field) for field in BOOKING_FIELDS}
+    content["seats"] = sorted(str(seat).strip().upper() for seat in seats)
+    content["username"] = username
+    return hashlib.sha256(json.dumps(content, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def create_booking(username, booking_data, idempotency_key, defer_completion=False):
+    """Pesan tiket, mengembalikan (success, message, result) dari BookingModel"""
+    journal = get_purchase_journal()
+    purchase = []
+
+    def write_intent():
+        # Dijalankan setelah lolos cek antrean, selagi menunggu giliran penulis. Replay
+        # idempotency tidak dijurnal; intent pembelian yang antre bersamaan berbagi satu
+        # fsync (group commit)
+        if idempotency_key and BookingModel.get_booking_id(idempotency_key) is not None:
+            return
+        purchase.append(journal.begin(username, booking_data, idempotency_key))
+
+    try:
+        with _writes.admit(username, prepare=write_intent):
+            success, message, result = BookingModel.create_booking(
+                username, booking_data, idempotency_key, request_hash(username, booking_data)
+            )
+    except BaseException:
+        if purchase:
+            journal.abort(purchase[0], "rejected")
+        raise
+    if not purchase:
+        return success, message, result
+    purchase_id = purchase[0]
+
+    if not success:
+        journal.abort(purchase_id, result["error"])
+    elif result["replayed"]:
+        journal.abort(purchase_id, "replayed")
+    else:
+        journal.commit(purchase_id, result["booking_id"], complete=not defer_completion)
+
+    # Kursi baru terjual: umumkan ke kiosk dan stream SSE
+    if success and not result["replayed"]:
+        get_seat_hub().publish(result["showtime_id"], result["seats"], SEAT_BOOKED)
+    return success, message, result
+
+
+def top_up(username, amount, payment_method="Cash"):
+    """Top up saldo lewat antrean penulis yang sama dengan pemesanan"""
+    with _writes.admit(username):
+        return UserModel.top_up(username, amount, payment_method)
+
+
+def update_saldo(username, amount):
+    """Tambah/kurangi saldo (makanan, top up di GUI) lewat antrean penulis"""
+    with _writes.admit(username):
+        return UserModel.update_saldo(username, amount)
+
+
+def write_queue_stats():
+    return _writes.stats()
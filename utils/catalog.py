@@ -0,0 +1,246 @@
+"""
+Katalog bersama: film (data_film.txt), bioskop per kota, jadwal tayang dan menu makanan.
+
+Dipakai oleh halaman GUI maupun REST API. Katalog punya `version` (hash isi)
+yang berubah setiap kali datanya berubah; API memakainya untuk ETag.
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+
+FILM_FILE = "data_film.txt"
+
+# Data bioskop per kota
+CINEMA_DATA = {
+    "Jakarta": [
+        "CGV Grand Indonesia",
+        "XXI Plaza Indonesia",
+        "XXI Kota Kasablanka",
+        "CGV Central Park",
+        "Cinema 21 Mall Taman Anggrek"
+    ],
+    "Bandung": [
+        "CGV Paris Van Java",
+        "XXI Cihampelas Walk",
+        "CGV BEC Mall",
+        "XXI Trans Studio Mall",
+        "Cinema 21 Bandung Trade Center"
+    ],
+    "Surabaya": [
+        "CGV Tunjungan Plaza",
+        "XXI Pakuwon Mall",
+        "Cinema 21 Grand City",
+        "XXI Royal Plaza",
+        "CGV Marvell City"
+    ],
+    "Yogyakarta": [
+        "CGV Hartono Mall",
+        "XXI Ambarrukmo Plaza",
+        "CGV J-Walk",
+        "XXI Sleman City Hall",
+        "Cinema 21 Jogja City Mall"
+    ],
+    "Bali": [
+        "XXI Beachwalk",
+        "CGV Plaza Renon",
+        "XXI Park 23",
+        "XXI Level 21",
+        "Cinema 21 Galeria Bali"
+    ]
+}
+
+# Daftar teater
+THEATER_NUMBERS = ["Theater 1", "Theater 2", "Theater 3", "Theater 4", "Theater 5"]
+
+# Tambahan harga per kursi untuk studio VIP
+STUDIO_TYPES = ["Regular", "VIP"]
+VIP_SURCHARGE = 50000
+
+# Data menu makanan dan minuman
+FOOD_MENU = [
+    {"id": "F1", "name": "Popcorn (S)", "price": 25000, "category": "Makanan", "image": "popcorn_mini.jpg"},
+    {"id": "F2", "name": "Popcorn (M)", "price": 35000, "category": "Makanan", "image": "popcorn_medium.jpg"},
+    {"id": "F4", "name": "Popcorn Caramel", "price": 40000, "category": "Makanan", "image": "popcorn_caramel.jpg"},
+    {"id": "F5", "name": "Popcorn Cheese", "price": 40000, "category": "Makanan", "image": "Popcorn_cheese.jpg"},
+    {"id": "F7", "name": "Hotdog", "price": 30000, "category": "Makanan", "image": "hotdog.jpeg"},
+    {"id": "F8", "name": "Nasi Padang", "price": 35000, "category": "Makanan", "image": "nasi_padang.jpeg"}
+]
+
+DRINK_MENU = [
+    {"id": "D1", "name": "Coca Cola (S)", "price": 15000, "category": "Minuman", "image": "cocacola_mini.webp"},
+    {"id": "D2", "name": "Coca Cola (M)", "price": 20000, "category": "Minuman", "image": "coca_cola_medium.png"},
+    {"id": "D4", "name": "Sprite (S)", "price": 15000, "category": "Minuman", "image": "sprite_mini.jpeg"},
+    {"id": "D5", "name": "Sprite (M)", "price": 20000, "category": "Minuman", "image": "sprite_medium.jpg"}
+]
+
+# Seberapa sering (detik) file film dicek ulang untuk perubahan
+RELOAD_INTERVAL = 1.0
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+
+def parse_film_file(path=FILM_FILE):
+    """Membaca data film dari file teks berformat pipe (|), baris pertama header"""
+    movies = []
+    with open(path, 'r', encoding='utf-8') as file:
+        lines = file.readlines()
+
+    header = lines[0].strip().split('|')
+    for line in lines[1:]:
+        line = line.strip()
+        if not line:  # Lewati baris kosong
+            continue
+
+        values = line.split('|')
+        if len(values) < len(header):
+            continue  # Lewati data yang tidak lengkap
+
+        movie = {}
+        for i, field in enumerate(header):
+            key = field.lower().replace(' ', '_')
+            value = values[i].strip()
+
+            if key == 'harga':
+                movie['price'] = int(value)
+            elif key == 'durasi':
+                movie['duration'] = int(value)
+            elif key == 'jadwal':
+                movie['schedule'] = [slot.strip() for slot in value.split(',')]
+            elif key == 'judul_film':
+                movie['title'] = value
+            elif key == 'genre':
+                movie['genre'] = value
+            elif key == 'sinopsis':
+                movie['synopsis'] = value
+            elif key == 'sutradara':
+                movie['director'] = value
+            elif key == 'pemeran':
+                movie['cast'] = value
+            elif key == 'usia_minimal':
+                movie['age_rating'] = value
+
+        movies.append(movie)
+    return movies
+
+
+class Catalog:
+    """Snapshot katalog yang dimuat ulang otomatis saat data_film.txt berubah"""
+
+    def __init__(self, film_path=FILM_FILE):
+        self.film_path = film_path
+        self.movies = []
+        self.version = None
+        self._file_signature = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self._listeners = []
+        self.reload()
+
+    def _stat_signature(self):
+        try:
+            stat = os.stat(self.film_path)
+            return (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            return None
+
+    def reload(self):
+        """Muat ulang data film dan hitung versi katalog"""
+        with self._lock:
+            signature = self._stat_signature()
+            try:
+                movies = parse_film_file(self.film_path)
+            except FileNotFoundError:
+                print(f"File {self.film_path} tidak ditemukan")
+                movies = []
+            except Exception as e:
+                print(f"Error saat membaca file: {e}")
+                movies = []
+
+            for index, movie in enumerate(movies, start=1):
+                movie['id'] = index
+
+            content = json.dumps({
+                "movies": movies,
+                "cinemas": CINEMA_DATA,
+                "theaters": THEATER_NUMBERS,
+                "menu": FOOD_MENU + DRINK_MENU
+            }, sort_keys=True).encode('utf-8')
+            version = hashlib.sha256(content).hexdigest()[:16]
+
+            changed = version != self.version
+            self.movies = movies
+            self.version = version
+            self._file_signature = signature
+            self._checked_at = time.monotonic()
+            listeners = list(self._listeners) if changed else []
+
+        for listener in listeners:
+            try:
+                listener(version)
+            except Exception as e:
+                print(f"Error in catalog listener: {e}")
+        return version
+
+    def refresh(self):
+        """Cek (paling sering tiap RELOAD_INTERVAL) apakah file berubah, mengembalikan versi"""
+        now = time.monotonic()
+        if now - self._checked_at < RELOAD_INTERVAL:
+            return self.version
+        self._checked_at = now
+        if self._stat_signature() != self._file_signature:
+            return self.reload()
+        return self.version
+
+    def add_listener(self, callback):
+        """Daftarkan callback(version) yang dipanggil saat katalog berubah"""
+        self._listeners.append(callback)
+
+    def get_movie(self, movie_id):
+        for movie in self.movies:
+            if movie['id'] == movie_id:
+                return movie
+        return None
+
+    def menu(self, category=None):
+        items = FOOD_MENU + DRINK_MENU
+        if category:
+            items = [item for item in items if item['category'].lower() == category.lower()]
+        return items
+
+    def showtimes(self, movie_title=None, city=None):
+        """Jadwal tayang per (film, bioskop): kota, bioskop, daftar theater dan jam tayang"""
+        result = []
+        for movie in self.movies:
+            if movie_title and movie['title'] != movie_title:
+                continue
+            for city_name, cinemas in CINEMA_DATA.items():
+                if city and city_name.lower() != city.lower():
+                    continue
+                for cinema in cinemas:
+                    result.append({
+                        "movie_id": movie['id'],
+                        "movie_title": movie['title'],
+                        "city": city_name,
+                        "cinema": cinema,
+                        "theaters": THEATER_NUMBERS,
+                        "times": movie.get('schedule', [])
+                    })
+        return result
+
+
+def ticket_price(movie, studio_type="Regular"):
+    """Harga satu kursi untuk film dan tipe studio"""
+    return movie.get("price", 0) + (VIP_SURCHARGE if studio_type == "VIP" else 0)
+
+
+def get_catalog():
+    """Mendapatkan katalog bersama (dibuat sekali)"""
+    global _catalog
+    with _catalog_lock:
+        if _catalog is None:
+            _catalog = Catalog()
+        return _catalog
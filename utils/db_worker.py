@@ -0,0 +1,192 @@
+"""
+Thread database khusus dengan antrean request dan future.
+
+Semua pemanggilan models.py dari GUI dikirim ke sini sehingga thread GUI
+tidak pernah menunggu SQLite. Request yang datang bersamaan diambil sebagai
+satu batch: dijalankan berurutan, dan bacaan identik (coalesce=True, mis.
+get_saldo untuk user yang sama) cukup dijalankan sekali. Penulisan di
+tengah batch membatalkan hasil bacaan sebelumnya agar tidak basi.
+
+timeout adalah batas waktu menunggu giliran: request yang belum mulai
+saat batas lewat langsung digagalkan dengan TimeoutError (aman untuk
+penulisan, karena tidak ada yang sempat dijalankan). Request yang sudah
+mulai selalu diselesaikan.
+
+    worker = get_db_worker()
+    future = worker.submit(UserModel.get_saldo, "andi", timeout=5.0, coalesce=True)
+"""
+
+import time
+import heapq
+import queue
+import itertools
+import threading
+from concurrent.futures import Future
+
+from utils.metrics import counter, gauge, histogram
+
+DB_QUEUE_WAIT_SECONDS = histogram("tiket_db_worker_wait_seconds", "Waktu request menunggu di antrean thread DB")
+DB_BATCH_SIZE = histogram("tiket_db_worker_batch_size", "Jumlah request per batch thread DB",
+                          buckets=(1, 2, 4, 8, 16, 32))
+DB_WORKER_REQUESTS = counter("tiket_db_worker_requests_total", "Request thread DB", ("result",))
+
+_STOP = object()
+_worker = None
+_worker_lock = threading.Lock()
+
+
+class _Request:
+    __slots__ = ("func", "args", "kwargs", "future", "enqueued", "deadline", "coalesce")
+
+    def __init__(self, func, args, kwargs, future, timeout, coalesce):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.future = future
+        self.enqueued = time.monotonic()
+        self.deadline = self.enqueued + timeout if timeout else None
+        self.coalesce = coalesce
+
+
+class DBWorker:
+    """Satu thread yang menjalankan semua pemanggilan database secara berurutan"""
+
+    def __init__(self, name="db-worker", max_batch=32):
+        self.name = name
+        self.max_batch = max_batch
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._lock = threading.Lock()
+        # Transisi future (mulai dijalankan vs digagalkan timeout) dijaga satu lock
+        self._state_lock = threading.Lock()
+        self._deadlines = []  # heap (deadline, urutan, request)
+        self._deadline_cond = threading.Condition()
+        self._deadline_thread = None
+        self._sequence = itertools.count()
+        self._results = {
+            result: DB_WORKER_REQUESTS.labels(result)
+            for result in ("ok", "error", "coalesced", "timeout", "cancelled")
+        }
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+
+    def stop(self, wait=True):
+        """Hentikan thread setelah request yang sudah antre selesai"""
+        self._queue.put(_STOP)
+        if wait and self._thread is not None:
+            self._thread.join()
+        self._thread = None
+
+    def qsize(self):
+        return self._queue.qsize()
+
+    def submit(self, func, *args, timeout=None, coalesce=False, **kwargs):
+        """Jadwalkan func(*args, **kwargs) di thread DB, mengembalikan concurrent.futures.Future"""
+        future = Future()
+        request = _Request(func, args, kwargs, future, timeout, coalesce)
+        if request.deadline is not None:
+            self._watch_deadline(request)
+        self._queue.put(request)
+        if self._thread is None:
+            self.start()
+        return future
+
+    def _watch_deadline(self, request):
+        with self._deadline_cond:
+            heapq.heappush(self._deadlines, (request.deadline, next(self._sequence), request))
+            if self._deadline_thread is None:
+                self._deadline_thread = threading.Thread(
+                    target=self._expire_deadlines, name=f"{self.name}-timeout", daemon=True
+                )
+                self._deadline_thread.start()
+            self._deadline_cond.notify()
+
+    def _expire_deadlines(self):
+        while True:
+            with self._deadline_cond:
+                while not self._deadlines:
+                    self._deadline_cond.wait()
+                deadline, _, request = self._deadlines[0]
+                delay = deadline - time.monotonic()
+                if delay > 0:
+                    self._deadline_cond.wait(delay)
+                    continue
+                heapq.heappop(self._deadlines)
+            with self._state_lock:
+                if request.future.done() or request.future.running():
+                    continue
+                request.future.set_exception(TimeoutError("Database sibuk, permintaan melewati batas waktu"))
+            self._results["timeout"].inc()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            # Ambil request lain yang sudah menunggu (tanpa menunggu yang belum datang)
+            batch = [item]
+            stop = False
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+            self._execute(batch)
+            if stop:
+                return
+
+    def _execute(self, batch):
+        DB_BATCH_SIZE.observe(len(batch))
+        reads = {}
+        for request in batch:
+            with self._state_lock:
+                if request.future.done():
+                    # Sudah digagalkan karena timeout
+                    continue
+                if not request.future.set_running_or_notify_cancel():
+                    self._results["cancelled"].inc()
+                    continue
+            DB_QUEUE_WAIT_SECONDS.observe(time.monotonic() - request.enqueued)
+
+            key = None
+            if request.coalesce:
+                key = (request.func, request.args, tuple(sorted(request.kwargs.items())))
+            else:
+                # Penulisan: hasil bacaan sebelumnya di batch ini bisa sudah basi
+                reads.clear()
+
+            if key is not None and key in reads:
+                self._results["coalesced"].inc()
+                result, error = reads[key]
+            else:
+                try:
+                    result, error = request.func(*request.args, **request.kwargs), None
+                except Exception as e:
+                    result, error = None, e
+                if key is not None:
+                    reads[key] = (result, error)
+                self._results["ok" if error is None else "error"].inc()
+
+            if error is None:
+                request.future.set_result(result)
+            else:
+                request.future.set_exception(error)
+
+
+def get_db_worker():
+    """Thread DB bersama untuk GUI (dibuat sekali)"""
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = DBWorker()
+            _worker.start()
+            gauge("tiket_db_worker_queue_depth", "Request yang menunggu thread DB", function=_worker.qsize)
+        return _worker
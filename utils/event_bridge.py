@@ -0,0 +1,151 @@
+"""
+Jembatan event antar proses (beberapa kiosk, server, loket top up) lewat SQLite.
+
+Setiap penulisan saldo/kursi di models.py ikut mencatat event di tabel
+change_events dalam transaksi yang sama (models.record_change). Tiap proses
+menjalankan satu EventBridge yang memeriksa PRAGMA data_version (berubah
+jika koneksi lain melakukan commit, tanpa membaca tabel apa pun) lalu hanya
+membaca baris baru saat memang ada commit. Event dari proses lain diteruskan:
+- SeatsChanged ke SeatHub lokal (peta kursi kiosk dan stream SSE)
+- event lain ke event bus (mis. BalanceChanged -> label saldo dashboard)
+
+Perubahan data_film.txt dideteksi tiap proses dari file yang sama
+(Catalog.refresh) dan diumumkan sebagai CatalogChanged.
+
+    bridge = start_event_bridge(get_gui_event_bus())
+    ...
+    bridge.stop()
+"""
+
+import json
+import time
+import sqlite3
+import threading
+
+import models
+from utils.catalog import get_catalog
+from utils.event_bus import Event, get_event_bus
+from utils.events import SeatsChanged, CatalogChanged
+from utils.metrics import counter, histogram
+from utils.seat_hub import get_seat_hub
+
+POLL_INTERVAL = 0.2
+# Baris change_events lebih tua dari ini dihapus (proses yang mati lebih lama memuat ulang penuh)
+RETENTION = 600
+PRUNE_INTERVAL = 60
+
+BRIDGE_EVENTS = counter("tiket_bridge_events_total", "Event dari proses lain yang diteruskan", ("event",))
+BRIDGE_LAG_SECONDS = histogram("tiket_bridge_lag_seconds", "Jeda commit di proses lain sampai event diteruskan",
+                               buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0))
+
+_bridge = None
+_bridge_lock = threading.Lock()
+
+
+class EventBridge:
+    """Meneruskan change_events dari proses lain ke event bus dan SeatHub proses ini"""
+
+    def __init__(self, bus=None, interval=POLL_INTERVAL, database=None):
+        self.bus = bus or get_event_bus()
+        self.interval = interval
+        self.database = database
+        self._conn = None
+        self._data_version = None
+        self._last_id = 0
+        self._pruned_at = 0.0
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def _connect(self):
+        conn = sqlite3.connect(self.database or models.DATABASE, check_same_thread=False)
+        conn.execute(models.CHANGE_EVENTS_SQL)
+        conn.commit()
+        return conn
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._conn = self._connect()
+        # Mulai dari ujung log: keadaan awal sudah dibaca halaman saat dibuat
+        self._last_id = self._conn.execute("SELECT COALESCE(MAX(id), 0) FROM change_events").fetchone()[0]
+        self._data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        get_catalog().add_listener(self._on_catalog_changed)
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._loop, name="event-bridge", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _loop(self):
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.poll()
+                get_catalog().refresh()
+                if time.monotonic() - self._pruned_at >= PRUNE_INTERVAL:
+                    self._prune()
+            except sqlite3.Error as e:
+                print(f"Error event bridge: {str(e)}")
+
+    def poll(self):
+        """Teruskan event baru dari proses lain, mengembalikan jumlahnya"""
+        data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        if data_version == self._data_version:
+            return 0
+        self._data_version = data_version
+
+        origin_self = models.change_origin()
+        rows = self._conn.execute(
+            "SELECT id, origin, payload, created_at FROM change_events WHERE id > ? ORDER BY id",
+            (self._last_id,)
+        ).fetchall()
+        forwarded = 0
+        for change_id, origin, payload, created_at in rows:
+            self._last_id = change_id
+            # Event dari proses ini sudah dipublish langsung di tempat asalnya
+            if origin == origin_self:
+                continue
+            event = Event.from_dict(json.loads(payload))
+            if event is None:
+                continue
+            BRIDGE_EVENTS.labels(type(event).__name__).inc()
+            BRIDGE_LAG_SECONDS.observe(max(0.0, time.time() - created_at))
+            self._forward(event)
+            forwarded += 1
+        return forwarded
+
+    def _forward(self, event):
+        if isinstance(event, SeatsChanged):
+            # SeatHub aman dipanggil dari thread mana pun dan memberi tahu listener-nya sendiri
+            get_seat_hub().publish(event.showtime_id, event.seats, event.state)
+        else:
+            self.bus.post(event)
+
+    def _on_catalog_changed(self, version):
+        self.bus.post(CatalogChanged(version=version))
+
+    def _prune(self):
+        self._pruned_at = time.monotonic()
+        try:
+            self._conn.execute("DELETE FROM change_events WHERE created_at < ?", (time.time() - RETENTION,))
+            self._conn.commit()
+        except sqlite3.OperationalError as e:
+            # Database sedang dikunci penulis lain; coba lagi di putaran berikutnya
+            self._conn.rollback()
+            print(f"Event bridge prune ditunda: {str(e)}")
+
+
+def start_event_bridge(bus=None):
+    """Jalankan jembatan bersama untuk proses ini (dibuat sekali)"""
+    global _bridge
+    with _bridge_lock:
+        if _bridge is None:
+            _bridge = EventBridge(bus)
+            _bridge.start()
+        return _bridge
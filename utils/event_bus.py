@@ -0,0 +1,229 @@
+"""
+Event bus dalam proses untuk event domain (pembelian, top up, saldo).
+
+Satu publish per kejadian; halaman yang berkepentingan berlangganan per
+tipe event (termasuk kelas induknya, mis. BalanceEvent menerima semua event
+yang mengubah saldo). Pengiriman:
+- SYNC: handler dipanggil langsung di dalam publish
+- QUEUED: handler dijadwalkan lewat dispatcher (GUI: giliran event loop Qt
+  berikutnya, lihat gui/event_dispatch.py); tanpa dispatcher event ditampung
+  sampai pump() dipanggil
+
+Event dengan dedupe_key yang sama (mis. transaction_id pembelian) hanya
+dikirim sekali. Waktu tiap handler dicatat (stats() dan metrik
+tiket_event_handler_seconds) agar handler yang lambat mudah ditemukan.
+
+    bus = get_event_bus()
+    bus.subscribe(TicketPurchased, dashboard.handle_ticket_purchase, QUEUED)
+    bus.publish(TicketPurchased(username="andi", transaction_id="...", ...))
+"""
+
+import time
+import weakref
+import threading
+import traceback
+from collections import OrderedDict, deque
+
+from utils.metrics import counter, histogram
+
+SYNC = "sync"
+QUEUED = "queued"
+
+EVENT_HANDLER_SECONDS = histogram("tiket_event_handler_seconds", "Waktu handler event bus", ("event", "handler"))
+EVENT_PUBLISHED = counter("tiket_events_published_total", "Event yang dipublish", ("event", "result"))
+
+_bus = None
+_bus_lock = threading.Lock()
+
+
+class Event:
+    """Dasar event domain; subclass mengisi FIELDS (nama field -> nilai default)"""
+
+    FIELDS = {}
+    _types = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        Event._types[cls.__name__] = cls
+
+    def __init__(self, **values):
+        unknown = set(values) - set(self.FIELDS)
+        if unknown:
+            raise TypeError(f"{type(self).__name__} tidak punya field {', '.join(sorted(unknown))}")
+        for name, default in self.FIELDS.items():
+            setattr(self, name, values.get(name, default))
+        self.published_at = None
+
+    def dedupe_key(self):
+        """Kunci duplikasi; None berarti event selalu dikirim"""
+        return None
+
+    def to_dict(self):
+        data = {name: getattr(self, name) for name in self.FIELDS}
+        data["type"] = type(self).__name__
+        return data
+
+    @staticmethod
+    def from_dict(data):
+        """Kebalikan to_dict (dipakai saat event dikirim antar proses)"""
+        data = dict(data)
+        event_type = Event._types.get(data.pop("type", None))
+        if event_type is None:
+            return None
+        return event_type(**{name: value for name, value in data.items() if name in event_type.FIELDS})
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.FIELDS)
+        return f"{type(self).__name__}({fields})"
+
+
+class Subscription:
+    """Satu handler yang berlangganan; cancel() untuk berhenti"""
+
+    def __init__(self, bus, event_type, handler, mode):
+        self.bus = bus
+        self.event_type = event_type
+        self.mode = mode
+        # Method widget dipegang lemah agar halaman yang sudah dibuang tidak tertahan bus
+        if hasattr(handler, "__self__") and hasattr(handler, "__func__"):
+            self._ref = weakref.WeakMethod(handler)
+        else:
+            self._ref = lambda: handler
+        owner = getattr(handler, "__self__", None)
+        prefix = f"{type(owner).__name__}." if owner is not None else ""
+        self.name = prefix + getattr(handler, "__name__", repr(handler))
+        self.active = True
+        self.calls = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self._timer = EVENT_HANDLER_SECONDS.labels(event_type.__name__, self.name)
+
+    def handler(self):
+        return self._ref()
+
+    def cancel(self):
+        self.bus.unsubscribe(self)
+
+
+class EventBus:
+    """Bus event in-process dengan pengiriman SYNC/QUEUED dan penekanan duplikat"""
+
+    def __init__(self, name="app", dedupe_size=1024):
+        self.name = name
+        self.dedupe_size = dedupe_size
+        self._lock = threading.Lock()
+        self._subscriptions = {}  # tipe event -> [Subscription]
+        self._recent = OrderedDict()  # (tipe, dedupe_key) yang sudah dipublish
+        self._dispatcher = None
+        self._pending = deque()
+
+    def set_dispatcher(self, dispatcher):
+        """dispatcher(callable) menjadwalkan pengiriman QUEUED (mis. ke event loop Qt)"""
+        self._dispatcher = dispatcher
+
+    def subscribe(self, event_type, handler, mode=SYNC):
+        subscription = Subscription(self, event_type, handler, mode)
+        with self._lock:
+            self._subscriptions.setdefault(event_type, []).append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        subscription.active = False
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.event_type, [])
+            if subscription in subscriptions:
+                subscriptions.remove(subscription)
+
+    def publish(self, event):
+        """Kirim event ke semua pelanggan; False jika event duplikat ditekan"""
+        event_name = type(event).__name__
+        key = event.dedupe_key()
+        with self._lock:
+            if key is not None:
+                dedupe = (event_name, key)
+                if dedupe in self._recent:
+                    EVENT_PUBLISHED.labels(event_name, "duplicate").inc()
+                    return False
+                self._recent[dedupe] = True
+                if len(self._recent) > self.dedupe_size:
+                    self._recent.popitem(last=False)
+            subscriptions = [
+                subscription
+                for event_type in type(event).__mro__
+                for subscription in self._subscriptions.get(event_type, ())
+            ]
+        event.published_at = time.monotonic()
+        EVENT_PUBLISHED.labels(event_name, "delivered").inc()
+
+        for subscription in subscriptions:
+            if subscription.mode == SYNC:
+                self._deliver(subscription, event)
+            elif self._dispatcher is not None:
+                self._dispatcher(lambda subscription=subscription: self._deliver(subscription, event))
+            else:
+                self._pending.append((subscription, event))
+        return True
+
+    def post(self, event):
+        """Publish dari thread lain: seluruh publish (termasuk handler SYNC) dijalankan dispatcher"""
+        if self._dispatcher is None:
+            return self.publish(event)
+        self._dispatcher(lambda: self.publish(event))
+        return True
+
+    def pump(self):
+        """Kirim event QUEUED yang tertampung (tanpa dispatcher); mengembalikan jumlahnya"""
+        delivered = 0
+        while self._pending:
+            subscription, event = self._pending.popleft()
+            self._deliver(subscription, event)
+            delivered += 1
+        return delivered
+
+    def _deliver(self, subscription, event):
+        # Pengiriman QUEUED bisa tiba setelah langganan dibatalkan
+        if not subscription.active:
+            return
+        handler = subscription.handler()
+        if handler is None:
+            self.unsubscribe(subscription)
+            return
+        started = time.perf_counter()
+        try:
+            handler(event)
+        except RuntimeError as e:
+            # Widget penerima sudah dihapus Qt
+            print(f"Handler {subscription.name} dilepas: {str(e)}")
+            self.unsubscribe(subscription)
+        except Exception as e:
+            print(f"Error di handler {subscription.name} untuk {type(event).__name__}: {str(e)}")
+            traceback.print_exc()
+        finally:
+            elapsed = time.perf_counter() - started
+            subscription.calls += 1
+            subscription.total_seconds += elapsed
+            subscription.max_seconds = max(subscription.max_seconds, elapsed)
+            subscription._timer.observe(elapsed)
+
+    def stats(self):
+        """Waktu per handler, paling lama lebih dulu"""
+        with self._lock:
+            subscriptions = [s for group in self._subscriptions.values() for s in group]
+        rows = [{
+            "event": subscription.event_type.__name__,
+            "handler": subscription.name,
+            "mode": subscription.mode,
+            "calls": subscription.calls,
+            "total_ms": round(subscription.total_seconds * 1000, 2),
+            "max_ms": round(subscription.max_seconds * 1000, 2),
+        } for subscription in subscriptions]
+        return sorted(rows, key=lambda row: row["total_ms"], reverse=True)
+
+
+def get_event_bus():
+    """Bus bersama untuk seluruh proses (dibuat sekali)"""
+    global _bus
+    with _bus_lock:
+        if _bus is None:
+            _bus = EventBus()
+        return _bus
@@ -0,0 +1,61 @@
+"""
+Event domain aplikasi yang dikirim lewat utils.event_bus.
+
+Semua event yang mengubah saldo turunan BalanceEvent (berisi username dan
+new_saldo) sehingga tampilan saldo cukup berlangganan satu tipe. Event yang
+dicatat models.record_change juga sampai ke proses lain lewat
+utils/event_bridge.py.
+"""
+
+from utils.event_bus import Event
+
+
+class BalanceEvent(Event):
+    """Saldo pengguna berubah"""
+
+    FIELDS = {"username": None, "new_saldo": None}
+
+
+class BalanceChanged(BalanceEvent):
+    """Saldo berubah tanpa transaksi yang perlu dicatat di riwayat (mis. sinkronisasi)"""
+
+
+class TicketPurchased(BalanceEvent):
+    """Pembelian tiket berhasil; transaction_id = booking_id dari layanan pemesanan"""
+
+    FIELDS = dict(BalanceEvent.FIELDS, transaction_id=None, ticket_id=None, movie_title="Unknown Movie",
+                  cinema="", theater="", studio_type="Regular", seats=(), show_date="", show_time="",
+                  total_price=0)
+
+    def dedupe_key(self):
+        return self.transaction_id
+
+
+class FoodOrdered(BalanceEvent):
+    """Pesanan makanan sudah dibayar; items berisi pasangan (produk, jumlah)"""
+
+    FIELDS = dict(BalanceEvent.FIELDS, transaction_id=None, items=(), total_price=0)
+
+    def dedupe_key(self):
+        return self.transaction_id
+
+
+class ToppedUp(BalanceEvent):
+    """Top up saldo berhasil"""
+
+    FIELDS = dict(BalanceEvent.FIELDS, transaction_id=None, amount=0, payment_method="Cash")
+
+    def dedupe_key(self):
+        return self.transaction_id
+
+
+class SeatsChanged(Event):
+    """Status kursi suatu jadwal berubah (diteruskan ke SeatHub proses lain)"""
+
+    FIELDS = {"showtime_id": None, "seats": (), "state": None}
+
+
+class CatalogChanged(Event):
+    """Isi katalog (data_film.txt) berubah; version = Catalog.version yang baru"""
+
+    FIELDS = {"version": None}
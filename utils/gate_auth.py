@@ -0,0 +1,79 @@
+"""
+Token perangkat scanner gate yang ditandatangani HMAC.
+
+Setiap scanner di gate memakai token tetap yang diterbitkan petugas:
+    g1.<device id>.<peran>.<HMAC-SHA256 base64url>
+Peran "scanner" untuk check-in dari QR bertanda tangan; "staff" juga boleh
+memasukkan ticket ID manual atau tiket lama tanpa tanda tangan. Verifikasi
+cukup HMAC (compare_digest, waktu konstan), tanpa database.
+
+Kunci dari TIKET_GATE_SECRET, atau data/gate_secret.key (dibuat sekali);
+mengganti kunci mencabut semua token scanner sekaligus.
+
+    python -m server --gate-token GATE-01 [--staff]
+"""
+
+import os
+import re
+import hmac
+import hashlib
+import threading
+
+from utils.qr_payload import load_or_create_secret
+from utils.session import _b64
+
+TOKEN_VERSION = "g1"
+SECRET_ENV = "TIKET_GATE_SECRET"
+SECRET_PATH = os.path.join("data", "gate_secret.key")
+
+ROLE_SCANNER = "scanner"
+ROLE_STAFF = "staff"
+ROLES = (ROLE_SCANNER, ROLE_STAFF)
+
+_DEVICE_ID = re.compile(r"^[A-Za-z0-9_-]{1,32}$")
+
+_secret = None
+_secret_lock = threading.Lock()
+
+
+def get_secret():
+    """Kunci HMAC token gate: dari environment, atau dari data/gate_secret.key"""
+    global _secret
+    with _secret_lock:
+        if _secret is None:
+            env_secret = os.environ.get(SECRET_ENV)
+            if env_secret:
+                _secret = env_secret.encode("utf-8")
+            else:
+                _secret = load_or_create_secret(SECRET_PATH)
+        return _secret
+
+
+def _sign(message, secret):
+    return _b64(hmac.new(secret, message.encode("ascii"), hashlib.sha256).digest())
+
+
+def create_gate_token(device_id, role=ROLE_SCANNER, secret=None):
+    """Terbitkan token untuk satu perangkat gate"""
+    if not _DEVICE_ID.match(device_id or ""):
+        raise ValueError("Device ID hanya boleh huruf, angka, '-' atau '_' (maks. 32 karakter)")
+    if role not in ROLES:
+        raise ValueError(f"Peran gate tidak dikenal: {role}")
+    message = f"{TOKEN_VERSION}.{device_id}.{role}"
+    return f"{message}.{_sign(message, secret or get_secret())}"
+
+
+def verify_gate_token(token, secret=None):
+    """Periksa token gate, mengembalikan {"device", "role"} atau None"""
+    if not token or not isinstance(token, str):
+        return None
+    parts = token.split(".")
+    if len(parts) != 4 or parts[0] != TOKEN_VERSION:
+        return None
+    if not _DEVICE_ID.match(parts[1]) or parts[2] not in ROLES:
+        return None
+    message = ".".join(parts[:3])
+    signature = _sign(message, secret or get_secret()).encode("ascii")
+    if not hmac.compare_digest(parts[3].encode("utf-8"), signature):
+        return None
+    return {"device": parts[1], "role": parts[2]}
@@ -1,4 +1,6 @@
 import os
+import uuid
+import hashlib
 
 def find_poster_for_film(title):
     """Mencari poster film berdasarkan judul"""
@@ -85,6 +87,16 @@ def find_poster_for_film(title):
     # Default placeholder
     return os.path.join("assets", "no_poster.jpg")
 
+def new_ticket_id():
+    """Membuat ID tiket 8 karakter hex"""
+    return uuid.uuid4().hex[:8].upper()
+
+def get_showtime_id(booking_data):
+    """Membuat ID numerik (32-bit) untuk satu jadwal tayang: film, bioskop, theater, tanggal dan jam"""
+    key = "|".join(str(booking_data.get(field, "")).strip() for field in
+                   ("movie_title", "cinema", "theater", "show_date", "show_time"))
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=4).digest(), "big")
+
 def create_movie_card(movie_data):
     """Fungsi helper untuk membuat movie card"""
     from gui.movies_page import MovieCard
@@ -0,0 +1,283 @@
+"""
+Metrik aplikasi (counter, gauge, histogram) dalam format teks Prometheus.
+
+Pencatatan dibuat semurah mungkin untuk jalur panas: counter dan histogram
+menulis ke shard milik thread pemanggil (threading.local) sehingga tidak
+perlu lock dan tidak ada update yang hilang. Lock hanya dipakai saat thread
+pertama kali mencatat, saat thread selesai (shard-nya digabung ke nilai dasar)
+dan saat /metrics membaca (menjumlahkan semua shard).
+
+    DB_SECONDS = histogram("tiket_db_query_seconds", "Latensi query database", ("operation",))
+    DB_SECONDS.labels("login_user").observe(0.0012)
+
+    @timed(DB_SECONDS.labels("get_user"))
+    def get_user(...): ...
+"""
+
+import time
+import weakref
+from bisect import bisect_left
+import threading
+from functools import wraps
+
+# Bucket default (detik), cocok untuk query DB sampai render tiket
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+_registry = []
+_registry_lock = threading.Lock()
+
+
+def _format_labels(names, values, extra=None):
+    pairs = list(zip(names, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+class _ShardOwner:
+    """Penanda shard di threading.local; ikut hilang saat thread pemiliknya selesai"""
+    __slots__ = ("__weakref__",)
+
+
+class _Sharded:
+    """Nilai per thread; setiap thread hanya menulis ke shard miliknya
+
+    Shard thread yang sudah selesai digabung ke _base sehingga jumlah shard
+    mengikuti jumlah thread yang hidup, bukan semua thread yang pernah mencatat.
+    """
+
+    def __init__(self, size):
+        self._size = size
+        self._local = threading.local()
+        self._shards = {}
+        self._base = [0] * size
+        # RLock: finalizer shard bisa terpanggil (GC) saat thread yang sama memegang lock
+        self._lock = threading.RLock()
+
+    def _shard(self):
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = [0] * self._size
+            owner = _ShardOwner()
+            with self._lock:
+                self._shards[id(shard)] = shard
+            weakref.finalize(owner, self._retire, shard)
+            self._local.owner = owner
+            self._local.shard = shard
+            return shard
+
+    def _retire(self, shard):
+        with self._lock:
+            if self._shards.pop(id(shard), None) is None:
+                return
+            for i, value in enumerate(shard):
+                self._base[i] += value
+
+    def _totals(self):
+        with self._lock:
+            totals = list(self._base)
+            shards = list(self._shards.values())
+        for shard in shards:
+            for i, value in enumerate(shard):
+                totals[i] += value
+        return totals
+
+
+class _CounterChild(_Sharded):
+    def __init__(self):
+        super().__init__(1)
+
+    def inc(self, amount=1):
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._shard()
+        shard[0] += amount
+
+    def value(self):
+        return self._totals()[0]
+
+
+class _GaugeChild:
+    def __init__(self, function=None):
+        self._value = 0
+        self._function = function
+        self._lock = threading.Lock()
+
+    def set(self, value):
+        self._value = value
+
+    def inc(self, amount=1):
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount=1):
+        with self._lock:
+            self._value -= amount
+
+    def value(self):
+        if self._function is not None:
+            try:
+                return self._function()
+            except Exception as e:
+                print(f"Error reading gauge: {str(e)}")
+                return 0
+        return self._value
+
+
+class _HistogramChild(_Sharded):
+    # Shard: hitungan per bucket (termasuk +Inf), lalu jumlah nilai
+    def __init__(self, buckets):
+        super().__init__(len(buckets) + 2)
+        self._buckets = buckets
+
+    def observe(self, value):
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._shard()
+        shard[bisect_left(self._buckets, value)] += 1
+        shard[-1] += value
+
+    def time(self):
+        return _Timer(self)
+
+    def snapshot(self):
+        """(hitungan kumulatif per bucket, jumlah data, total nilai)"""
+        totals = self._totals()
+        cumulative = []
+        running = 0
+        for count in totals[:-1]:
+            running += count
+            cumulative.append(running)
+        return cumulative, running, totals[-1]
+
+
+class _Timer:
+    __slots__ = ("_histogram", "_start")
+
+    def __init__(self, histogram):
+        self._histogram = histogram
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._histogram.observe(time.perf_counter() - self._start)
+        return False
+
+
+class Metric:
+    """Metrik dengan nama, deskripsi dan (opsional) label"""
+
+    def __init__(self, kind, name, documentation, labelnames=(), child_factory=None):
+        self.kind = kind
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._child_factory = child_factory
+        self._children = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            # Metrik tanpa label: inc/set/observe/time langsung ke child default
+            default = self.labels()
+            for attr in ("inc", "dec", "set", "observe", "time", "value"):
+                if hasattr(default, attr):
+                    setattr(self, attr, getattr(default, attr))
+
+    def labels(self, *values):
+        """Child untuk kombinasi label tertentu (dibuat sekali, simpan di variabel untuk jalur panas)"""
+        values = tuple(str(value) for value in values)
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} membutuhkan label {self.labelnames}")
+            with self._lock:
+                child = self._children.setdefault(values, self._child_factory())
+        return child
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            children = sorted(self._children.items())
+        for values, child in children:
+            if self.kind == "histogram":
+                cumulative, count, total = child.snapshot()
+                for bound, bucket_count in zip(child._buckets + (float("inf"),), cumulative):
+                    labels = _format_labels(self.labelnames, values, ("le", _format_value(float(bound))))
+                    lines.append(f"{self.name}_bucket{labels} {bucket_count}")
+                labels = _format_labels(self.labelnames, values)
+                lines.append(f"{self.name}_sum{labels} {_format_value(float(total))}")
+                lines.append(f"{self.name}_count{labels} {count}")
+            else:
+                labels = _format_labels(self.labelnames, values)
+                lines.append(f"{self.name}{labels} {_format_value(child.value())}")
+        return "\n".join(lines)
+
+
+def _register(metric):
+    with _registry_lock:
+        for existing in _registry:
+            if existing.name == metric.name:
+                return existing
+        _registry.append(metric)
+    return metric
+
+
+def counter(name, documentation, labelnames=()):
+    return _register(Metric("counter", name, documentation, labelnames, _CounterChild))
+
+
+def gauge(name, documentation, labelnames=(), function=None):
+    """Gauge; jika function diberikan nilainya dibaca saat /metrics diminta"""
+    return _register(Metric("gauge", name, documentation, labelnames, lambda: _GaugeChild(function)))
+
+
+def histogram(name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+    buckets = tuple(sorted(buckets))
+    return _register(Metric("histogram", name, documentation, labelnames, lambda: _HistogramChild(buckets)))
+
+
+def timed(histogram_child):
+    """Decorator: catat durasi fungsi ke histogram (child) yang diberikan"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                histogram_child.observe(time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+def render_metrics():
+    """Semua metrik terdaftar dalam format teks Prometheus (versi 0.0.4)"""
+    with _registry_lock:
+        metrics = list(_registry)
+    return "\n".join(metric.render() for metric in metrics) + "\n"
+
+
+# Metrik bersama yang dipakai di beberapa modul
+DB_SECONDS = histogram("tiket_db_query_seconds", "Latensi pemanggilan database di models.py", ("operation",))
+BCRYPT_SECONDS = histogram("tiket_bcrypt_seconds", "Waktu hash/cek password bcrypt", ("operation",))
+TICKET_RENDER_SECONDS = histogram("tiket_ticket_render_seconds", "Waktu render gambar e-ticket", ("kind",))
+HISTORY_WRITE_SECONDS = histogram("tiket_history_write_seconds", "Waktu menulis file riwayat transaksi")
+HTTP_SECONDS = histogram("tiket_http_request_seconds", "Latensi request API", ("endpoint", "method"))
+HTTP_RESPONSES = counter("tiket_http_responses_total", "Jumlah respons API", ("endpoint", "status"))
+ACTIVE_PAGE = gauge("tiket_dashboard_active_page", "Indeks halaman dashboard yang sedang aktif")
+QT_WIDGETS = gauge("tiket_qt_widgets", "Jumlah widget Qt yang hidup", ("kind",))
@@ -0,0 +1,69 @@
+"""
+Hash password bcrypt untuk pendaftaran massal.
+
+Login dan registrasi satu pengguna cukup dijalankan di thread pool Qt
+(gui/auth_worker.py). Untuk enrollment kiosk (puluhan pengguna sekaligus)
+hash dibuat di ProcessPoolExecutor karena bcrypt tidak selalu melepas GIL
+secara merata. Modul ini tidak mengimpor PyQt agar aman dipakai worker.
+"""
+
+import os
+import time
+import atexit
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import bcrypt as bcrypt_lib
+
+from models import UserModel
+from utils.metrics import BCRYPT_SECONDS
+
+DEFAULT_ROUNDS = 12
+# Batch kecil lebih cepat di thread pemanggil daripada ongkos kirim ke proses lain
+MIN_POOL_BATCH = 4
+
+_hash_pool = None
+
+
+def hash_password(password, rounds=DEFAULT_ROUNDS):
+    """Hash bcrypt yang kompatibel dengan flask_bcrypt.check_password_hash"""
+    return bcrypt_lib.hashpw(password.encode("utf-8"), bcrypt_lib.gensalt(rounds)).decode("utf-8")
+
+
+def get_hash_pool():
+    """Mendapatkan process pool bersama untuk hash bcrypt (dibuat sekali)"""
+    global _hash_pool
+    if _hash_pool is None:
+        # spawn agar worker tidak mewarisi state Qt dari proses GUI
+        context = multiprocessing.get_context("spawn")
+        workers = max(1, min(4, (os.cpu_count() or 2) - 1))
+        _hash_pool = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+        atexit.register(shutdown_hash_pool)
+    return _hash_pool
+
+
+def shutdown_hash_pool():
+    """Menutup process pool hash"""
+    global _hash_pool
+    if _hash_pool is not None:
+        _hash_pool.shutdown(wait=False, cancel_futures=True)
+        _hash_pool = None
+
+
+def hash_passwords(passwords, rounds=DEFAULT_ROUNDS, use_processes=True):
+    """Hash banyak password, urutan hasil sama dengan input"""
+    started = time.perf_counter()
+    if use_processes and len(passwords) >= MIN_POOL_BATCH:
+        hashed = list(get_hash_pool().map(hash_password, passwords, [rounds] * len(passwords)))
+    else:
+        hashed = [hash_password(password, rounds) for password in passwords]
+    if passwords:
+        BCRYPT_SECONDS.labels("bulk_hash").observe(time.perf_counter() - started)
+    return hashed
+
+
+def register_users(users, rounds=DEFAULT_ROUNDS, use_processes=True):
+    """Daftarkan banyak pengguna, mengembalikan (success, message, {registered, skipped})"""
+    return UserModel.register_users(
+        users, lambda passwords: hash_passwords(passwords, rounds, use_processes)
+    )
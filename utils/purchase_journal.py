@@ -0,0 +1,453 @@
+"""
+Jurnal pembelian append-only dengan group commit dan pemulihan saat start.
+
+Pembelian tiket terdiri dari beberapa langkah yang tidak atomik satu sama
+lain: transaksi SQLite (kursi, saldo, tiket, riwayat DB) lalu file riwayat
+data/history/<username>.json di klien desktop. Setiap langkah dicatat di
+jurnal sebagai satu baris JSON:
+
+    intent    sebelum transaksi database (ditunggu sampai tersimpan di disk)
+    commit    transaksi database sudah COMMIT, berisi booking_id
+    complete  langkah sesudahnya selesai (file riwayat tertulis)
+    abort     pembelian tidak terjadi (gagal, ditolak, atau replay idempotency)
+
+Baris dari banyak pembelian dikumpulkan thread flusher dan disimpan dengan
+satu fsync (group commit); pemanggil yang butuh durabilitas menunggu sampai
+nomor urut barisnya ikut di-fsync. Jika grupnya gagal ditulis, begin()
+melempar OSError sehingga pembelian gagal sebelum saldo dipotong.
+
+Setiap proses (kiosk, server headless) menulis ke file jurnalnya sendiri,
+data/journal/purchases-<pid>-<nonce>.log, dan memegang lock file tersebut
+selama hidup. Proses lain tidak pernah menyentuh jurnal yang masih dikunci.
+
+recover() dijalankan saat aplikasi start: pembelian dengan intent tanpa
+commit dicek ke tabel bookings (idempotency key); jika transaksinya tidak
+ada, pembelian dibatalkan (saldo memang belum terpotong). Pembelian yang
+sudah commit diselesaikan dengan menulis riwayatnya ke file. Yang dipulihkan
+adalah jurnal proses ini dan jurnal proses lain yang lock-nya sudah lepas
+(prosesnya mati); jurnal yang selesai dipulihkan dipadatkan atau dihapus.
+
+Selama proses berjalan jurnal dipadatkan setiap compact_lines baris: isinya
+ditulis ulang (tmp + fsync + rename, lock ikut pindah ke file baru) hanya
+dengan baris pembelian yang belum complete/abort, sehingga ukurannya
+mengikuti jumlah pembelian yang sedang berjalan, bukan umur proses.
+"""
+
+import os
+import json
+import time
+import uuid
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+import models
+from utils.write_behind import atomic_write
+from utils.metrics import counter, histogram
+
+JOURNAL_DIR = os.path.join("data", "journal")
+JOURNAL_PREFIX = "purchases"
+COMPACT_LINES = 4096  # baris tertulis sebelum jurnal dipadatkan
+HISTORY_DIR = os.path.join("data", "history")
+
+JOURNAL_FSYNC_SECONDS = histogram("tiket_journal_fsync_seconds", "Waktu write + fsync satu grup jurnal")
+JOURNAL_GROUP_SIZE = histogram("tiket_journal_group_size", "Jumlah baris jurnal per fsync",
+                               buckets=(1, 2, 4, 8, 16, 32, 64))
+JOURNAL_RECOVERED = counter("tiket_journal_recovered_total", "Pembelian yang dipulihkan saat start",
+                            ("action",))
+
+_journal = None
+_journal_lock = threading.Lock()
+
+
+def journal_path():
+    """File jurnal milik proses ini (pid + nonce seperti models.change_origin)"""
+    return os.path.join(JOURNAL_DIR, f"{JOURNAL_PREFIX}-{models.change_origin()}.log")
+
+
+def _try_lock(f):
+    """Kunci eksklusif tanpa menunggu; lock lepas sendiri saat file ditutup atau proses mati"""
+    try:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
+
+class PurchaseJournal:
+    """File jurnal pembelian; group_commit=False menulis dan fsync setiap baris sendiri"""
+
+    def __init__(self, path=None, group_commit=True, max_delay=0.0, compact_lines=COMPACT_LINES):
+        self.path = path or journal_path()
+        self.group_commit = group_commit
+        self.max_delay = max_delay  # tunggu tambahan agar grup lebih besar (detik)
+        self.compact_lines = compact_lines
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = _open_locked(self.path)
+        self._cond = threading.Condition()
+        self._buffer = []
+        self._next_seq = 0
+        self._flushed_seq = 0
+        self._waiting = {}  # seq baris durable -> OSError jika grupnya gagal ditulis
+        self._closed = False
+        self._open = {}  # booking_id -> purchase_id yang menunggu complete
+        self._live = {}  # purchase_id -> baris jurnal pembelian yang belum selesai
+        self._written_lines = 0
+        self._compact_at = compact_lines
+        self._flusher = None
+        if group_commit:
+            self._flusher = threading.Thread(target=self._flush_loop, name="purchase-journal", daemon=True)
+            self._flusher.start()
+
+    # Pencatatan langkah pembelian
+    def begin(self, username, booking_data, idempotency_key):
+        """Catat intent dan tunggu sampai tersimpan; mengembalikan purchase_id"""
+        purchase_id = uuid.uuid4().hex
+        self._append({"op": "intent", "id": purchase_id, "username": username,
+                      "key": idempotency_key, "booking": booking_data}, durable=True)
+        return purchase_id
+
+    def commit(self, purchase_id, booking_id, complete=False):
+        """Transaksi database sudah COMMIT; complete=True jika tidak ada langkah lanjutan"""
+        if complete:
+            self._append({"op": "complete", "id": purchase_id, "booking_id": booking_id})
+            return
+        with self._cond:
+            self._open[booking_id] = purchase_id
+        self._append({"op": "commit", "id": purchase_id, "booking_id": booking_id})
+
+    def complete(self, booking_id):
+        """Langkah sesudah database (file riwayat) selesai; False jika booking tidak ditunggu"""
+        with self._cond:
+            purchase_id = self._open.pop(booking_id, None)
+        if purchase_id is None:
+            return False
+        self._append({"op": "complete", "id": purchase_id, "booking_id": booking_id})
+        return True
+
+    def is_open(self, booking_id):
+        with self._cond:
+            return booking_id in self._open
+
+    def abort(self, purchase_id, reason):
+        self._append({"op": "abort", "id": purchase_id, "reason": reason})
+
+    # Penulisan
+    def _append(self, record, durable=False):
+        line = (json.dumps(record, separators=(",", ":")) + "\n").encode("utf-8")
+        if not self.group_commit:
+            with self._cond:
+                self._track(record, line)
+                self._write_lines([line])
+                self._after_write(1)
+            return
+        with self._cond:
+            self._track(record, line)
+            if self._closed:
+                self._write_lines([line])
+                return
+            self._buffer.append(line)
+            self._next_seq += 1
+            seq = self._next_seq
+            if durable:
+                self._waiting[seq] = None
+            self._cond.notify_all()
+            if not durable:
+                return
+            while self._flushed_seq < seq:
+                self._cond.wait()
+            error = self._waiting.pop(seq)
+        if error is not None:
+            # Intent tidak tersimpan: pembelian tidak boleh dilanjutkan
+            raise error
+
+    def _track(self, record, line):
+        """Catat baris pembelian yang masih terbuka untuk pemadatan (dipanggil dengan _cond dipegang)"""
+        if record["op"] in ("complete", "abort"):
+            self._live.pop(record["id"], None)
+        else:
+            self._live.setdefault(record["id"], []).append(line)
+
+    def _after_write(self, count):
+        """Hitung baris tertulis; padatkan jurnal jika sudah melewati batas (_cond dipegang)"""
+        self._written_lines += count
+        if self.compact_lines and self._written_lines >= self._compact_at:
+            self._compact()
+
+    def _compact(self):
+        """Tulis ulang jurnal hanya dengan pembelian yang belum selesai (dipanggil dengan _cond dipegang)"""
+        # Baris di buffer yang belum di-flush bisa ikut tertulis di sini lalu sekali lagi
+        # oleh flusher; baris ganda tidak mengubah hasil pemulihan
+        lines = [line for purchase_lines in self._live.values() for line in purchase_lines]
+        tmp_path = f"{self.path}.tmp"
+        try:
+            f = open(tmp_path, 'wb')
+        except OSError as e:
+            print(f"Error compacting purchase journal: {str(e)}")
+            self._written_lines = 0
+            return
+        try:
+            # File baru dikunci sebelum menggantikan yang lama: proses lain tidak pernah
+            # melihat jurnal ini tanpa lock
+            _try_lock(f)
+            f.write(b"".join(lines))
+            f.flush()
+            os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Error compacting purchase journal: {str(e)}")
+            f.close()
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            self._written_lines = 0
+            return
+        self._file.close()
+        self._file = f
+        self._written_lines = len(lines)
+        # Banyak pembelian yang masih terbuka: tunggu sampai file berlipat dua agar biaya
+        # tulis ulang tetap sebanding dengan baris yang ditambahkan
+        self._compact_at = max(self.compact_lines, 2 * len(lines))
+
+    def _write_lines(self, lines):
+        started = time.perf_counter()
+        self._file.flush()
+        size = os.fstat(self._file.fileno()).st_size
+        try:
+            self._file.write(b"".join(lines))
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        except OSError:
+            # Buang baris yang terpotong agar baris berikutnya tetap terbaca saat pemulihan
+            try:
+                self._file.truncate(size)
+            except OSError:
+                pass
+            raise
+        JOURNAL_FSYNC_SECONDS.observe(time.perf_counter() - started)
+        JOURNAL_GROUP_SIZE.observe(len(lines))
+
+    def _flush_loop(self):
+        while True:
+            with self._cond:
+                while not self._buffer and not self._closed:
+                    self._cond.wait()
+                if not self._buffer:
+                    return
+            if self.max_delay:
+                time.sleep(self.max_delay)
+            with self._cond:
+                lines, self._buffer = self._buffer, []
+                seq = self._next_seq
+            # fsync di luar lock: pemanggil lain tetap bisa menambah baris ke grup berikutnya
+            error = None
+            try:
+                self._write_lines(lines)
+            except OSError as e:
+                print(f"Error writing purchase journal: {str(e)}")
+                error = e
+            with self._cond:
+                if error is not None:
+                    for waiting_seq in self._waiting:
+                        if self._flushed_seq < waiting_seq <= seq:
+                            self._waiting[waiting_seq] = error
+                self._flushed_seq = seq
+                self._cond.notify_all()
+                if error is None:
+                    self._after_write(len(lines))
+
+    def close(self):
+        """Simpan baris yang tersisa lalu tutup file"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._flusher is not None:
+            self._flusher.join()
+            self._flusher = None
+        with self._cond:
+            if self._buffer:
+                self._write_lines(self._buffer)
+                self._buffer = []
+            self._file.close()
+
+    # Pemulihan
+    def read_records(self, path=None):
+        """Baca semua baris jurnal; baris terakhir yang terpotong (crash saat menulis) diabaikan"""
+        records = []
+        try:
+            with open(path or self.path, 'rb') as f:
+                for line in f:
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        break
+        except OSError:
+            pass
+        return records
+
+    def recover(self):
+        """Selesaikan atau batalkan pembelian yang terputus, lalu padatkan jurnal"""
+        summary = {"completed": 0, "rolled_back": 0, "failed": 0}
+
+        # Jurnal sendiri: tidak ada proses lain yang menulis ke file ini
+        with self._cond:
+            self._file.flush()
+        if not _recover_records(self.read_records(), summary):
+            # Ditulis ulang tanpa pembelian yang sudah dipulihkan; lock ikut pindah ke file baru
+            with self._cond:
+                self._compact()
+
+        # Jurnal proses lain hanya dipulihkan jika lock-nya bisa diambil (prosesnya sudah mati)
+        for path in self._orphan_paths():
+            try:
+                f = open(path, 'ab')
+            except OSError:
+                continue
+            try:
+                if not _try_lock(f) or not _same_file(f, path):
+                    continue
+                if not _recover_records(self.read_records(path), summary):
+                    os.remove(path)
+                    # Sisa pemadatan yang terputus saat proses itu mati
+                    if os.path.exists(f"{path}.tmp"):
+                        os.remove(f"{path}.tmp")
+            except OSError as e:
+                print(f"Error recovering purchase journal {path}: {str(e)}")
+            finally:
+                f.close()
+        return summary
+
+    def _orphan_paths(self):
+        directory = os.path.dirname(self.path) or "."
+        try:
+            names = sorted(os.listdir(directory))
+        except OSError:
+            return []
+        own = os.path.abspath(self.path)
+        paths = []
+        for name in names:
+            # purchases.log: jurnal bersama dari versi lama
+            if name != f"{JOURNAL_PREFIX}.log" and not (name.startswith(JOURNAL_PREFIX + "-")
+                                                         and name.endswith(".log")):
+                continue
+            path = os.path.join(directory, name)
+            if os.path.abspath(path) != own:
+                paths.append(path)
+        return paths
+
+
+def _open_locked(path):
+    """Buka jurnal untuk append dan kunci; dibuka ulang jika file sempat dihapus pemulihan proses lain"""
+    while True:
+        f = open(path, 'ab')
+        if not _try_lock(f):
+            print(f"Warning: jurnal pembelian {path} dikunci proses lain")
+            return f
+        if _same_file(f, path):
+            return f
+        f.close()
+
+
+def _same_file(f, path):
+    """File yang dikunci masih file di path (belum dihapus proses lain yang memulihkannya)"""
+    try:
+        return os.path.samestat(os.fstat(f.fileno()), os.stat(path))
+    except OSError:
+        return False
+
+
+def _recover_records(records, summary):
+    """Pulihkan pembelian dari satu jurnal; mengembalikan jumlah yang gagal"""
+    purchases = {}
+    for record in records:
+        purchase = purchases.setdefault(record.get("id"), {})
+        purchase[record["op"]] = record
+
+    failed = 0
+    for purchase_id, purchase in purchases.items():
+        intent = purchase.get("intent")
+        if intent is None or "complete" in purchase or "abort" in purchase:
+            continue
+        booking_id = purchase["commit"]["booking_id"] if "commit" in purchase else None
+        try:
+            if booking_id is None:
+                booking_id = _committed_booking_id(intent["key"])
+            if booking_id is None:
+                # Transaksi database tidak pernah COMMIT: tidak ada saldo yang terpotong
+                action = "rolled_back"
+            else:
+                transaction = _booking_transaction(booking_id)
+                if transaction is None:
+                    action = "failed"
+                else:
+                    _merge_history_file(intent["username"], transaction)
+                    action = "completed"
+        except Exception as e:
+            print(f"Error recovering purchase {purchase_id}: {str(e)}")
+            action = "failed"
+        summary[action] += 1
+        failed += action == "failed"
+        JOURNAL_RECOVERED.labels(action).inc()
+        print(f"Jurnal pembelian: {purchase_id} {action}")
+    return failed
+
+
+def _committed_booking_id(idempotency_key):
+    conn = models.get_db()
+    try:
+        row = conn.execute("SELECT booking_id FROM bookings WHERE idempotency_key = ?",
+                           (idempotency_key,)).fetchone()
+    finally:
+        conn.close()
+    return row[0] if row else None
+
+
+def _booking_transaction(booking_id):
+    conn = models.get_db()
+    try:
+        row = conn.execute("SELECT data FROM transaction_history WHERE transaction_id = ?",
+                           (booking_id,)).fetchone()
+    finally:
+        conn.close()
+    return json.loads(row[0]) if row else None
+
+
+def _merge_history_file(username, transaction):
+    """Tambahkan transaksi ke data/history/<username>.json jika belum ada"""
+    history_file = os.path.join(HISTORY_DIR, f"{username}.json")
+    transactions = []
+    if os.path.exists(history_file):
+        with open(history_file, 'r') as f:
+            transactions = json.load(f)
+    if any(isinstance(t, dict) and t.get("transaction_id") == transaction["transaction_id"]
+           for t in transactions):
+        return
+    transactions.insert(0, transaction)
+    atomic_write(history_file, json.dumps(transactions, indent=4))
+
+
+def get_purchase_journal():
+    """Jurnal pembelian bersama (dibuat sekali)"""
+    global _journal
+    with _journal_lock:
+        if _journal is None:
+            _journal = PurchaseJournal()
+        return _journal
+
+
+def recover_purchases():
+    """Dipanggil saat start (GUI maupun server) sebelum menerima pembelian baru"""
+    summary = get_purchase_journal().recover()
+    if summary["completed"] or summary["rolled_back"] or summary["failed"]:
+        print(f"Pemulihan jurnal pembelian: {summary}")
+    return summary
@@ -0,0 +1,189 @@
+"""
+Payload QR biner yang ringkas dan ditandatangani.
+
+Format (30 byte, lalu di-encode base45 menjadi 45 karakter alfanumerik QR):
+    versi (1) | ticket id (4) | showtime id (4) | bitmap kursi 10x10 (13) | HMAC-SHA256 terpotong (8)
+
+Base45 (RFC 9285) hanya memakai karakter mode alfanumerik QR sehingga
+QR yang dihasilkan cukup versi 2, jauh lebih kecil dari payload JSON.
+"""
+
+import os
+import hmac
+import time
+import struct
+import hashlib
+import threading
+
+PAYLOAD_VERSION = 1
+SEAT_ROWS = 10
+SEAT_COLS = 10
+SIGNATURE_SIZE = 8
+SECRET_SIZE = 32
+
+SECRET_ENV = "TIKET_QR_SECRET"
+SECRET_PATH = os.path.join("data", "qr_secret.key")
+
+BASE45_CHARSET = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ $%*+-./:"
+_BASE45_INDEX = {char: index for index, char in enumerate(BASE45_CHARSET)}
+
+_BITMAP_SIZE = (SEAT_ROWS * SEAT_COLS + 7) // 8
+_BODY = struct.Struct(f">B4sI{_BITMAP_SIZE}s")
+PAYLOAD_SIZE = _BODY.size + SIGNATURE_SIZE
+
+_secret = None
+_secret_lock = threading.Lock()
+
+
+class InvalidPayload(ValueError):
+    """Payload QR rusak atau tanda tangannya tidak cocok"""
+
+
+def base45_encode(data):
+    """Encode bytes ke string base45"""
+    chars = []
+    for i in range(0, len(data) - 1, 2):
+        value = data[i] * 256 + data[i + 1]
+        value, c = divmod(value, 45)
+        e, d = divmod(value, 45)
+        chars.extend((BASE45_CHARSET[c], BASE45_CHARSET[d], BASE45_CHARSET[e]))
+    if len(data) % 2:
+        d, c = divmod(data[-1], 45)
+        chars.extend((BASE45_CHARSET[c], BASE45_CHARSET[d]))
+    return "".join(chars)
+
+
+def base45_decode(text):
+    """Decode string base45 ke bytes"""
+    try:
+        values = [_BASE45_INDEX[char] for char in text]
+    except KeyError:
+        raise InvalidPayload("Karakter base45 tidak valid")
+    if len(values) % 3 == 1:
+        raise InvalidPayload("Panjang base45 tidak valid")
+
+    out = bytearray()
+    for i in range(0, len(values), 3):
+        chunk = values[i:i + 3]
+        if len(chunk) == 3:
+            value = chunk[0] + chunk[1] * 45 + chunk[2] * 45 * 45
+            if value > 0xFFFF:
+                raise InvalidPayload("Nilai base45 di luar jangkauan")
+            out.extend(divmod(value, 256))
+        else:
+            value = chunk[0] + chunk[1] * 45
+            if value > 0xFF:
+                raise InvalidPayload("Nilai base45 di luar jangkauan")
+            out.append(value)
+    return bytes(out)
+
+
+def get_secret():
+    """Kunci HMAC: dari environment, atau dari data/qr_secret.key (dibuat sekali)"""
+    global _secret
+    with _secret_lock:
+        if _secret is None:
+            env_secret = os.environ.get(SECRET_ENV)
+            if env_secret:
+                _secret = env_secret.encode("utf-8")
+            else:
+                _secret = _load_or_create_secret()
+        return _secret
+
+
+def _load_or_create_secret():
+    return load_or_create_secret(SECRET_PATH)
+
+
+def load_or_create_secret(path, size=SECRET_SIZE):
+    """Buat file kunci secara eksklusif (0600); jika sudah ada, pakai isinya"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0), 0o600)
+    except FileExistsError:
+        return _read_secret(path, size)
+    secret = os.urandom(size)
+    with os.fdopen(fd, "wb") as f:
+        f.write(secret)
+        f.flush()
+        os.fsync(f.fileno())
+    return secret
+
+
+def _read_secret(path, size):
+    # Proses lain bisa saja baru membuat file dan belum selesai menulis kuncinya
+    for _ in range(100):
+        with open(path, "rb") as f:
+            secret = f.read()
+        if len(secret) >= size:
+            return secret
+        time.sleep(0.01)
+    raise RuntimeError(f"File kunci {path} kosong atau terpotong")
+
+
+def seat_to_index(seat):
+    """Ubah nama kursi (A1..J10) ke indeks bit, None jika di luar grid"""
+    seat = str(seat).strip().upper()
+    if len(seat) < 2 or not seat[1:].isdigit():
+        return None
+    row = ord(seat[0]) - 65
+    col = int(seat[1:]) - 1
+    if 0 <= row < SEAT_ROWS and 0 <= col < SEAT_COLS:
+        return row * SEAT_COLS + col
+    return None
+
+
+def index_to_seat(index):
+    row, col = divmod(index, SEAT_COLS)
+    return f"{chr(65 + row)}{col + 1}"
+
+
+def seats_to_bitmap(seats):
+    bitmap = bytearray(_BITMAP_SIZE)
+    for seat in seats:
+        index = seat_to_index(seat)
+        if index is not None:
+            bitmap[index >> 3] |= 0x80 >> (index & 7)
+    return bytes(bitmap)
+
+
+def bitmap_to_seats(bitmap):
+    return [index_to_seat(index) for index in range(SEAT_ROWS * SEAT_COLS)
+            if bitmap[index >> 3] & (0x80 >> (index & 7))]
+
+
+def _sign(body, secret):
+    return hmac.new(secret, body, hashlib.sha256).digest()[:SIGNATURE_SIZE]
+
+
+def encode_ticket_payload(ticket_id, showtime_id, seats, secret=None):
+    """Membuat teks QR base45 untuk satu tiket"""
+    if isinstance(seats, str):
+        seats = [seat for seat in seats.replace(" ", "").split(",") if seat]
+    body = _BODY.pack(
+        PAYLOAD_VERSION,
+        bytes.fromhex(ticket_id),
+        showtime_id & 0xFFFFFFFF,
+        seats_to_bitmap(seats)
+    )
+    return base45_encode(body + _sign(body, secret or get_secret()))
+
+
+def decode_ticket_payload(text, secret=None):
+    """Decode dan verifikasi teks QR, mengembalikan dict ticket_id/showtime_id/seats"""
+    data = base45_decode(text)
+    if len(data) != PAYLOAD_SIZE:
+        raise InvalidPayload("Ukuran payload tidak valid")
+
+    body, signature = data[:_BODY.size], data[_BODY.size:]
+    if not hmac.compare_digest(signature, _sign(body, secret or get_secret())):
+        raise InvalidPayload("Tanda tangan payload tidak cocok")
+
+    version, ticket_bytes, showtime_id, bitmap = _BODY.unpack(body)
+    if version != PAYLOAD_VERSION:
+        raise InvalidPayload(f"Versi payload {version} tidak dikenal")
+    return {
+        "ticket_id": ticket_bytes.hex().upper(),
+        "showtime_id": showtime_id,
+        "seats": bitmap_to_seats(bitmap)
+    }
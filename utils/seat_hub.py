@@ -0,0 +1,142 @@
+"""
+Hub pub/sub in-process untuk perubahan status kursi per jadwal tayang.
+
+Setiap jadwal tayang (showtime_id) punya satu channel berisi status kursi
+terkini, nomor versi yang naik setiap perubahan, dan log delta terbatas.
+Subscriber tidak punya antrean sendiri: mereka menunggu di satu Condition
+per channel lalu membaca log mulai dari versi terakhir yang mereka lihat,
+sehingga publish tetap O(1) berapa pun jumlah subscriber-nya.
+"""
+
+import os
+import threading
+from collections import deque
+
+SEAT_AVAILABLE = "available"
+SEAT_BOOKED = "booked"
+
+# Jumlah delta yang disimpan per jadwal untuk resume setelah reconnect
+LOG_SIZE = 1000
+
+_hub = None
+_hub_lock = threading.Lock()
+
+
+class _Channel:
+    def __init__(self, states):
+        self.version = 0
+        self.states = states
+        self.log = deque(maxlen=LOG_SIZE)  # (version, seat, state)
+        self.condition = threading.Condition()
+        self.listeners = []
+
+
+class SeatHub:
+    """Pub/sub status kursi dengan versi per jadwal tayang"""
+
+    def __init__(self, loader=None):
+        # loader(showtime_id) -> daftar kursi yang sudah terjual (isi awal channel)
+        self.loader = loader
+        # epoch berubah setiap proses dimulai; versi dari proses lain tidak bisa di-resume
+        self.epoch = os.urandom(4).hex()
+        self._channels = {}
+        self._lock = threading.Lock()
+
+    def _channel(self, showtime_id):
+        channel = self._channels.get(showtime_id)
+        if channel is not None:
+            return channel
+
+        booked = self.loader(showtime_id) if self.loader else []
+        with self._lock:
+            channel = self._channels.get(showtime_id)
+            if channel is None:
+                channel = _Channel({seat: SEAT_BOOKED for seat in booked})
+                self._channels[showtime_id] = channel
+        return channel
+
+    def publish(self, showtime_id, seats, state):
+        """Ubah status beberapa kursi, mengembalikan versi terbaru"""
+        channel = self._channel(showtime_id)
+        deltas = []
+        with channel.condition:
+            for seat in seats:
+                if channel.states.get(seat, SEAT_AVAILABLE) == state:
+                    continue
+                channel.version += 1
+                if state == SEAT_AVAILABLE:
+                    channel.states.pop(seat, None)
+                else:
+                    channel.states[seat] = state
+                delta = (channel.version, seat, state)
+                channel.log.append(delta)
+                deltas.append(delta)
+            version = channel.version
+            listeners = list(channel.listeners)
+            if deltas:
+                channel.condition.notify_all()
+
+        for listener in listeners if deltas else []:
+            try:
+                listener(showtime_id, deltas)
+            except Exception as e:
+                print(f"Error in seat listener: {str(e)}")
+        return version
+
+    def snapshot(self, showtime_id):
+        """Status kursi saat ini, mengembalikan (versi, {kursi: status})"""
+        channel = self._channel(showtime_id)
+        with channel.condition:
+            return channel.version, dict(channel.states)
+
+    def _changes_locked(self, channel, version):
+        if version >= channel.version:
+            return []
+        if not channel.log or channel.log[0][0] > version + 1:
+            return None  # log sudah terpotong, klien perlu snapshot
+        return [delta for delta in channel.log if delta[0] > version]
+
+    def changes_since(self, showtime_id, version):
+        """Delta setelah versi tertentu; None jika versi terlalu lama untuk di-resume"""
+        channel = self._channel(showtime_id)
+        with channel.condition:
+            if version > channel.version:
+                return None
+            return self._changes_locked(channel, version)
+
+    def wait_for_changes(self, showtime_id, version, timeout=None):
+        """Blok sampai ada delta setelah versi tertentu (atau timeout)
+
+        Mengembalikan daftar delta (kosong jika timeout) atau None jika
+        klien tertinggal terlalu jauh dan harus memuat snapshot.
+        """
+        channel = self._channel(showtime_id)
+        with channel.condition:
+            channel.condition.wait_for(lambda: channel.version != version, timeout)
+            if version > channel.version:
+                return None
+            return self._changes_locked(channel, version)
+
+    def add_listener(self, showtime_id, callback):
+        """Callback(showtime_id, deltas) dipanggil di thread publisher setiap ada perubahan"""
+        channel = self._channel(showtime_id)
+        with channel.condition:
+            channel.listeners.append(callback)
+
+    def remove_listener(self, showtime_id, callback):
+        channel = self._channels.get(showtime_id)
+        if channel is None:
+            return
+        with channel.condition:
+            if callback in channel.listeners:
+                channel.listeners.remove(callback)
+
+
+def get_seat_hub():
+    """Mendapatkan SeatHub bersama, diisi awal dari tiket yang sudah terbit"""
+    global _hub
+    with _hub_lock:
+        if _hub is None:
+            from models import TicketModel
+            _hub = SeatHub(loader=TicketModel.get_booked_seats)
+        return _hub
@@ -0,0 +1,126 @@
+"""
+Token sesi API yang ditandatangani HMAC.
+
+Login memeriksa password dengan bcrypt satu kali lalu menerbitkan token:
+    v1.<session id>.<kedaluwarsa (unix)>.<HMAC-SHA256 base64url>
+Request berikutnya cukup memverifikasi tanda tangan (compare_digest, waktu
+konstan) dan mencari sesi di tabel memori (LRU), tanpa bcrypt dan tanpa
+query database. Token palsu atau kedaluwarsa ditolak sebelum tabel disentuh.
+"""
+
+import os
+import hmac
+import time
+import base64
+import hashlib
+import secrets
+import threading
+from collections import OrderedDict
+
+TOKEN_VERSION = "v1"
+SECRET_ENV = "TIKET_SECRET_KEY"
+
+DEFAULT_TTL = 12 * 3600  # 12 jam
+DEFAULT_MAX_SESSIONS = 10000
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def _b64(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+class SessionManager:
+    """Penerbit dan pemeriksa token sesi dengan tabel sesi LRU di memori"""
+
+    def __init__(self, secret=None, ttl=DEFAULT_TTL, max_sessions=DEFAULT_MAX_SESSIONS):
+        if isinstance(secret, str):
+            secret = secret.encode("utf-8")
+        self.secret = secret or os.urandom(32)
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self._sessions = OrderedDict()  # session id -> {"username", "user", "expires"}
+        self._lock = threading.Lock()
+        self._stats = {"issued": 0, "verified": 0, "rejected": 0, "evicted": 0}
+
+    def _sign(self, message):
+        return _b64(hmac.new(self.secret, message.encode("ascii"), hashlib.sha256).digest())
+
+    def create(self, username, user=None):
+        """Buat sesi baru, mengembalikan (token, waktu kedaluwarsa)"""
+        session_id = secrets.token_urlsafe(16)
+        expires = int(time.time()) + self.ttl
+        message = f"{TOKEN_VERSION}.{session_id}.{expires}"
+        token = f"{message}.{self._sign(message)}"
+
+        with self._lock:
+            self._sessions[session_id] = {"username": username, "user": user or {}, "expires": expires}
+            self._stats["issued"] += 1
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+                self._stats["evicted"] += 1
+        return token, expires
+
+    def _parse(self, token):
+        """Periksa format, tanda tangan dan umur token, mengembalikan session id atau None"""
+        if not token or not isinstance(token, str):
+            return None
+        parts = token.split(".")
+        if len(parts) != 4 or parts[0] != TOKEN_VERSION:
+            return None
+        message = ".".join(parts[:3])
+        if not hmac.compare_digest(parts[3], self._sign(message)):
+            return None
+        try:
+            expires = int(parts[2])
+        except ValueError:
+            return None
+        if expires < time.time():
+            return None
+        return parts[1]
+
+    def verify(self, token):
+        """Data sesi untuk token yang valid, None jika palsu, kedaluwarsa atau sudah logout"""
+        session_id = self._parse(token)
+        with self._lock:
+            session = self._sessions.get(session_id) if session_id else None
+            if session is not None and session["expires"] < time.time():
+                del self._sessions[session_id]
+                session = None
+            if session is None:
+                self._stats["rejected"] += 1
+                return None
+            self._sessions.move_to_end(session_id)
+            self._stats["verified"] += 1
+            return session
+
+    def revoke(self, token):
+        """Logout: hapus sesi dari tabel"""
+        session_id = self._parse(token)
+        if session_id is None:
+            return False
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def purge_expired(self):
+        """Hapus semua sesi yang sudah kedaluwarsa, mengembalikan jumlahnya"""
+        now = time.time()
+        with self._lock:
+            expired = [sid for sid, session in self._sessions.items() if session["expires"] < now]
+            for session_id in expired:
+                del self._sessions[session_id]
+        return len(expired)
+
+    def stats(self):
+        with self._lock:
+            return {"sessions": len(self._sessions), **self._stats}
+
+
+def get_session_manager():
+    """Mendapatkan SessionManager bersama (kunci dari TIKET_SECRET_KEY bila ada)"""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = SessionManager(os.environ.get(SECRET_ENV))
+        return _manager
@@ -0,0 +1,268 @@
+"""
+Renderer e-ticket berbasis PIL.
+
+Modul ini sengaja tidak mengimpor PyQt sehingga bisa dipakai di dalam
+worker ProcessPoolExecutor untuk merender tiket per kursi secara paralel.
+"""
+
+import os
+import io
+import time
+import atexit
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import qrcode
+from PIL import Image, ImageDraw, ImageFont
+
+from utils.helper import get_showtime_id, new_ticket_id
+from utils.qr_payload import encode_ticket_payload
+from utils.metrics import timed, TICKET_RENDER_SECONDS
+
+TEMPLATE_PATH = os.path.join("assets", "templates", "ticket_template.png")
+FONT_BOLD = os.path.join("assets", "fonts", "Montserrat-Bold.ttf")
+FONT_REGULAR = os.path.join("assets", "fonts", "Montserrat-Regular.ttf")
+
+# Ukuran thumbnail yang dikirim balik ke GUI untuk pratinjau batch
+THUMBNAIL_SIZE = (160, 240)
+
+_template_cache = {}
+_font_cache = {}
+_render_pool = None
+
+
+def _load_font(path, size):
+    """Memuat font sekali per proses"""
+    key = (path, size)
+    if key not in _font_cache:
+        try:
+            _font_cache[key] = ImageFont.truetype(path, size)
+        except IOError:
+            _font_cache[key] = ImageFont.load_default()
+    return _font_cache[key]
+
+
+def _load_template(width=800, height=1200):
+    """Memuat template tiket (di-cache per proses) dan mengembalikan salinannya"""
+    if "ticket" not in _template_cache:
+        if os.path.exists(TEMPLATE_PATH):
+            img = Image.open(TEMPLATE_PATH)
+            img.load()
+        else:
+            img = Image.new('RGB', (width, height), '#1E1E1E')
+            draw = ImageDraw.Draw(img)
+            draw.rectangle([0, 0, width, 100], fill='#FFD700')
+            try:
+                os.makedirs(os.path.dirname(TEMPLATE_PATH), exist_ok=True)
+                img.save(TEMPLATE_PATH)
+            except OSError:
+                pass
+        _template_cache["ticket"] = img
+    return _template_cache["ticket"].copy()
+
+
+def _format_rupiah(value):
+    return f"Rp {value:,}".replace(',', '.')
+
+
+def make_qr_image(qr_text, size=200):
+    """Membuat gambar QR code dari teks payload"""
+    qr = qrcode.QRCode(
+        version=1,
+        error_correction=qrcode.constants.ERROR_CORRECT_L,
+        box_size=10,
+        border=4,
+    )
+    qr.add_data(qr_text)
+    qr.make(fit=True)
+    qr_img = qr.make_image(fill_color="black", back_color="white")
+    return qr_img.resize((size, size))
+
+
+@timed(TICKET_RENDER_SECONDS.labels("ticket"))
+def render_ticket_image(booking_data, ticket_id=None):
+    """Render satu e-ticket menjadi PIL Image, mengembalikan (image, qr_data)"""
+    ticket_id = ticket_id or new_ticket_id()
+
+    seats = booking_data.get('seats', [])
+    if isinstance(seats, list):
+        seats_str = ", ".join(seats)
+    else:
+        seats_str = str(seats)
+
+    # Data dari BookingPage memakai show_date/show_time, bukan schedule
+    schedule = booking_data.get("schedule")
+    if not schedule or schedule == "N/A":
+        schedule = " ".join(filter(None, [booking_data.get("show_date"), booking_data.get("show_time")])) or "N/A"
+
+    img = _load_template()
+    width, height = img.size
+    draw = ImageDraw.Draw(img)
+
+    title_font = _load_font(FONT_BOLD, 36)
+    heading_font = _load_font(FONT_BOLD, 24)
+    regular_font = _load_font(FONT_REGULAR, 14)
+    small_font = _load_font(FONT_REGULAR, 12)
+
+    # Judul dan nama film
+    draw.text((width // 2, 50), 'E-TICKET', font=title_font, fill='#000000', anchor="mm")
+    draw.text((40, 140), booking_data.get("movie_title", "Unknown Movie"), font=heading_font, fill='#FFFFFF')
+
+    # Detail pemesanan
+    y = 220
+    details = [
+        ("Bioskop:", f"{booking_data.get('cinema', 'N/A')}"),
+        ("Kota:", booking_data.get("city", "N/A")),
+        ("Theater:", booking_data.get("theater", "N/A")),
+        ("Studio:", booking_data.get("studio_type", "Regular")),
+        ("Jadwal:", schedule),
+        ("Kursi:", seats_str),
+        ("Jumlah Tiket:", str(booking_data.get("seat_count", 0))),
+        ("Harga per Tiket:", _format_rupiah(booking_data.get('price_per_ticket', 0))),
+        ("Total Harga:", _format_rupiah(booking_data.get('total_price', 0))),
+        ("Tanggal Booking:", booking_data.get("booking_date", "N/A"))
+    ]
+    for label, value in details:
+        draw.text((40, y), label, font=regular_font, fill='#CCCCCC')
+        draw.text((200, y), str(value), font=regular_font, fill='#FFFFFF')
+        y += 30
+
+    # QR code di sisi kanan tiket: payload biner bertanda tangan (base45)
+    showtime_id = get_showtime_id(booking_data)
+    qr_data = {
+        "id": ticket_id,
+        "showtime_id": showtime_id,
+        "seats": seats_str,
+        "payload": encode_ticket_payload(ticket_id, showtime_id, seats if isinstance(seats, list) else seats_str)
+    }
+    qr_size = 200
+    qr_img = make_qr_image(qr_data["payload"], qr_size)
+    qr_x = width - qr_size - 40
+    qr_y = 240
+    img.paste(qr_img, (qr_x, qr_y))
+
+    draw.text((qr_x + qr_size // 2, qr_y + qr_size + 20), "Scan QR code ini di bioskop untuk masuk",
+              font=small_font, fill='#FFFFFF', anchor="mm")
+    draw.text((qr_x + qr_size // 2, qr_y + qr_size + 40), f"Ticket ID: {ticket_id}",
+              font=small_font, fill='#FFD700', anchor="mm")
+
+    return img, qr_data
+
+
+def render_error_ticket(booking_data, error):
+    """Render tiket pengganti ketika e-ticket gagal dibuat"""
+    error_img = Image.new('RGB', (800, 600), color=(30, 30, 30))
+    draw = ImageDraw.Draw(error_img)
+    font = _load_font(FONT_BOLD, 24)
+    small_font = _load_font(FONT_REGULAR, 16)
+
+    draw.text((400, 100), "Terjadi Kesalahan", font=font, fill=(255, 255, 255), anchor="mm")
+    draw.text((400, 150), "Tidak dapat membuat e-ticket", font=small_font, fill=(255, 255, 255), anchor="mm")
+    draw.text((400, 200), f"Error: {str(error)}", font=small_font, fill=(255, 215, 0), anchor="mm")
+    draw.text((400, 250), "Silakan hubungi customer service", font=small_font, fill=(255, 255, 255), anchor="mm")
+
+    # Tambahkan detail film jika ada
+    y = 300
+    if 'movie_title' in booking_data:
+        draw.text((400, y), f"Film: {booking_data.get('movie_title', 'N/A')}", font=small_font, fill=(255, 255, 255), anchor="mm")
+        y += 30
+    if 'cinema' in booking_data and 'theater' in booking_data:
+        draw.text((400, y), f"Lokasi: {booking_data.get('cinema', 'N/A')} - {booking_data.get('theater', 'N/A')}", font=small_font, fill=(255, 255, 255), anchor="mm")
+
+    return error_img
+
+
+def ticket_to_rgbx(img):
+    """Ekspor piksel tiket sebagai buffer RGBX 32-bit, mengembalikan (buffer, lebar, tinggi)
+
+    Satu-satunya salinan piksel pada jalur tampilan; buffer ini bisa langsung
+    dibungkus QImage (Format_RGBX8888) tanpa encode PNG maupun file sementara.
+    """
+    if img.mode != 'RGB':
+        img = img.convert('RGB')
+    width, height = img.size
+    return img.tobytes('raw', 'RGBX'), width, height
+
+
+def encode_png(img, compress_level=1):
+    """Encode tiket ke PNG di memori"""
+    buffer = io.BytesIO()
+    img.save(buffer, format='PNG', compress_level=compress_level)
+    return buffer.getvalue()
+
+
+def seat_booking_data(booking_data, seat):
+    """Membuat salinan booking_data untuk satu kursi"""
+    seat_data = dict(booking_data)
+    price_per_ticket = booking_data.get('price_per_ticket', 0)
+    seat_data['seats'] = [seat]
+    seat_data['seat_count'] = 1
+    seat_data['price_per_ticket'] = price_per_ticket
+    seat_data['total_price'] = price_per_ticket
+    return seat_data
+
+
+def render_seat_ticket(booking_data, seat, ticket_id):
+    """Worker: render tiket untuk satu kursi, mengembalikan PNG dan thumbnail PNG"""
+    img, _ = render_ticket_image(seat_booking_data(booking_data, seat), ticket_id)
+
+    thumb = img.copy()
+    thumb.thumbnail(THUMBNAIL_SIZE)
+    return seat, ticket_id, encode_png(img), encode_png(thumb)
+
+
+def get_render_pool():
+    """Mendapatkan process pool bersama untuk render batch (dibuat sekali)"""
+    global _render_pool
+    if _render_pool is None:
+        # spawn agar worker tidak mewarisi state Qt dari proses GUI
+        context = multiprocessing.get_context("spawn")
+        workers = max(1, min(4, (os.cpu_count() or 2) - 1))
+        _render_pool = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+        atexit.register(shutdown_render_pool)
+    return _render_pool
+
+
+def shutdown_render_pool():
+    """Menutup process pool render"""
+    global _render_pool
+    if _render_pool is not None:
+        _render_pool.shutdown(wait=False, cancel_futures=True)
+        _render_pool = None
+
+
+def render_batch(booking_data, seats, ticket_ids=None, is_cancelled=None):
+    """Render tiket per kursi secara paralel, yield hasil begitu selesai
+
+    Setiap item yang di-yield: (index, seat, ticket_id, png_bytes, thumb_bytes)
+    """
+    ticket_ids = ticket_ids or [new_ticket_id() for _ in seats]
+    started = time.perf_counter()
+    pool = get_render_pool()
+    futures = {}
+    for index, (seat, ticket_id) in enumerate(zip(seats, ticket_ids)):
+        future = pool.submit(render_seat_ticket, booking_data, seat, ticket_id)
+        futures[future] = index
+
+    try:
+        for future in as_completed(futures):
+            if is_cancelled and is_cancelled():
+                break
+            seat, ticket_id, png_bytes, thumb_bytes = future.result()
+            yield futures[future], seat, ticket_id, png_bytes, thumb_bytes
+        # Render per kursi berjalan di proses worker; yang dicatat di sini waktu satu batch penuh
+        TICKET_RENDER_SECONDS.labels("batch").observe(time.perf_counter() - started)
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+def build_pdf(png_pages):
+    """Menggabungkan daftar PNG (bytes) menjadi satu PDF multi-halaman"""
+    if not png_pages:
+        return None
+
+    pages = [Image.open(io.BytesIO(data)).convert('RGB') for data in png_pages]
+    buffer = io.BytesIO()
+    pages[0].save(buffer, format='PDF', save_all=True, append_images=pages[1:], resolution=150)
+    return buffer.getvalue()
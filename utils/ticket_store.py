@@ -0,0 +1,211 @@
+"""
+Penyimpanan artefak e-ticket di temp/.
+
+Satu file per ticket ID (temp/tickets/<ticket_id>.png): PNG tiket memuat QR
+dengan ticket ID-nya sendiri sehingga isi dua tiket tidak pernah sama, dan
+cetak ulang / unduh ulang cukup lookup O(1) berdasarkan ticket ID. Daftar
+file dibangun dari isi direktori saat start. Evictor di background menjaga
+ukuran direktori dan umur file tetap terbatas.
+"""
+
+import os
+import time
+import re
+import glob
+import hashlib
+import threading
+
+from utils.write_behind import atomic_write
+
+STORE_DIR = os.path.join("temp", "tickets")
+LEGACY_DIR = "temp"
+LEGACY_PATTERNS = ("ticket_*.png", "error_ticket_*.png")
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024  # 64 MB
+DEFAULT_MAX_AGE = 7 * 24 * 3600  # 7 hari
+DEFAULT_EVICT_INTERVAL = 300  # detik
+
+_SAFE_NAME = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+class TicketStore:
+    """Cache file tiket dengan batas ukuran dan umur"""
+
+    def __init__(self, root=STORE_DIR, max_bytes=DEFAULT_MAX_BYTES, max_age=DEFAULT_MAX_AGE,
+                 evict_interval=DEFAULT_EVICT_INTERVAL):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.evict_interval = evict_interval
+
+        self._lock = threading.Lock()
+        self._entries = {}  # nama file -> {"size", "created", "last_used"}
+        self._total_bytes = 0
+        self._stop_event = threading.Event()
+        self._evictor = None
+
+        os.makedirs(self.root, exist_ok=True)
+        self._load_entries()
+
+    @staticmethod
+    def _name(ticket_id):
+        """Nama file untuk ticket ID; ID yang tidak aman untuk nama file di-hash"""
+        ticket_id = str(ticket_id)
+        if _SAFE_NAME.match(ticket_id):
+            return ticket_id
+        return hashlib.sha256(ticket_id.encode("utf-8")).hexdigest()[:32]
+
+    def _file_path(self, name):
+        return os.path.join(self.root, f"{name}.png")
+
+    def _load_entries(self):
+        """Bangun daftar file dari isi direktori"""
+        # index.json dari versi lama (file bernama hash isi) tidak dipakai lagi;
+        # file lamanya dibuang evictor seiring umur
+        try:
+            os.remove(os.path.join(self.root, "index.json"))
+        except OSError:
+            pass
+
+        for entry in os.scandir(self.root):
+            if not entry.name.endswith(".png"):
+                continue
+            stat = entry.stat()
+            self._entries[entry.name[:-4]] = {
+                "size": stat.st_size,
+                "created": stat.st_mtime,
+                "last_used": stat.st_mtime
+            }
+            self._total_bytes += stat.st_size
+
+    def put(self, ticket_id, png_bytes):
+        """Simpan PNG tiket (menimpa render sebelumnya untuk ticket ID yang sama), mengembalikan path file"""
+        name = self._name(ticket_id)
+        path = self._file_path(name)
+        now = time.time()
+
+        with self._lock:
+            atomic_write(path, png_bytes)
+            entry = self._entries.get(name)
+            if entry is not None:
+                self._total_bytes -= entry["size"]
+            self._entries[name] = {"size": len(png_bytes), "created": now, "last_used": now}
+            self._total_bytes += len(png_bytes)
+            over_budget = self._total_bytes > self.max_bytes
+
+        if over_budget:
+            self.evict()
+        return path
+
+    def get_path(self, ticket_id):
+        """Lookup O(1) path file tiket berdasarkan ticket ID"""
+        name = self._name(ticket_id)
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None:
+                return None
+            entry["last_used"] = time.time()
+            return self._file_path(name)
+
+    def get_bytes(self, ticket_id):
+        """Baca PNG tiket dari cache, None jika tidak ada"""
+        path = self.get_path(ticket_id)
+        if path is None:
+            return None
+        try:
+            with open(path, 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def stats(self):
+        """Statistik singkat untuk monitoring"""
+        with self._lock:
+            return {
+                "files": len(self._entries),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes
+            }
+
+    def evict(self):
+        """Hapus file yang kedaluwarsa lalu yang paling lama tidak dipakai sampai di bawah batas"""
+        now = time.time()
+        removed = 0
+        with self._lock:
+            expired = [n for n, e in self._entries.items() if now - e["created"] > self.max_age]
+            victims = set(expired)
+
+            remaining = self._total_bytes - sum(self._entries[n]["size"] for n in expired)
+            if remaining > self.max_bytes:
+                by_last_used = sorted(
+                    (n for n in self._entries if n not in victims),
+                    key=lambda n: self._entries[n]["last_used"]
+                )
+                for name in by_last_used:
+                    if remaining <= self.max_bytes:
+                        break
+                    victims.add(name)
+                    remaining -= self._entries[name]["size"]
+
+            for name in victims:
+                entry = self._entries.pop(name)
+                self._total_bytes -= entry["size"]
+                try:
+                    os.remove(self._file_path(name))
+                except OSError:
+                    pass
+                removed += 1
+
+        return removed
+
+    def sweep_legacy_files(self, legacy_dir=LEGACY_DIR):
+        """Hapus file tiket lama (temp/ticket_*.png, temp/error_ticket_*.png) yang tidak dikelola"""
+        removed = 0
+        for pattern in LEGACY_PATTERNS:
+            for path in glob.glob(os.path.join(legacy_dir, pattern)):
+                try:
+                    os.remove(path)
+                    removed += 1
+                except OSError:
+                    pass
+        return removed
+
+    def start_evictor(self):
+        """Jalankan evictor di thread background"""
+        if self._evictor is not None:
+            return
+        self._stop_event.clear()
+        self._evictor = threading.Thread(target=self._evictor_loop, name="ticket-store-evictor", daemon=True)
+        self._evictor.start()
+
+    def stop(self):
+        """Hentikan evictor"""
+        self._stop_event.set()
+        if self._evictor is not None:
+            self._evictor.join(timeout=2)
+            self._evictor = None
+
+    def _evictor_loop(self):
+        try:
+            self.sweep_legacy_files()
+        except Exception as e:
+            print(f"Error sweeping legacy tickets: {str(e)}")
+        while True:
+            try:
+                self.evict()
+            except Exception as e:
+                print(f"Error evicting tickets: {str(e)}")
+            if self._stop_event.wait(self.evict_interval):
+                break
+
+
+def get_ticket_store():
+    """Mendapatkan TicketStore bersama (dibuat sekali)"""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = TicketStore()
+        return _default_store
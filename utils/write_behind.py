@@ -0,0 +1,248 @@
+"""
+Antrean write-behind untuk file lokal (riwayat transaksi, index tiket).
+
+Thread GUI cukup menitipkan isi file; penulisan ke disk dilakukan thread
+background. Penulisan ke path yang sama dalam jendela coalesce_window
+digabung sehingga hanya isi terakhir yang ditulis (mis. add_transaction yang
+terpanggil dua kali per pembelian). Setiap file ditulis atomik: file .tmp,
+fsync, lalu os.replace, sehingga crash di tengah penulisan tidak pernah
+meninggalkan file setengah jadi.
+
+data boleh berupa bytes/str atau callable yang mengembalikannya; callable
+dijalankan di thread writer (serialisasi JSON ikut keluar dari thread GUI).
+
+    writer = get_write_behind()
+    writer.write(path, lambda snapshot=list(rows): json.dumps(snapshot))
+    writer.flush()  # saat aplikasi ditutup
+"""
+
+import os
+import time
+import atexit
+import threading
+from collections import OrderedDict
+
+from utils.metrics import counter, gauge, histogram
+
+WRITE_BEHIND_SECONDS = histogram("tiket_write_behind_seconds", "Waktu menulis file oleh thread write-behind")
+WRITE_BEHIND_LAG_SECONDS = histogram("tiket_write_behind_lag_seconds",
+                                     "Jarak waktu dari titip pertama sampai file ditulis")
+WRITE_BEHIND_WRITES = counter("tiket_write_behind_writes_total", "Penulisan write-behind", ("result",))
+
+DEFAULT_WINDOW = 0.2  # detik
+DEFAULT_MAX_PENDING = 64
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def atomic_write(path, data):
+    """Tulis file secara atomik (tmp + fsync + rename)"""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class _Pending:
+    __slots__ = ("data", "timer", "first", "due", "callbacks")
+
+    def __init__(self, data, timer, now, window):
+        self.data = data
+        self.timer = timer
+        self.first = now
+        self.due = now + window
+        self.callbacks = []
+
+
+class WriteBehindQueue:
+    """Satu thread yang menulis file titipan secara atomik, digabung per path"""
+
+    def __init__(self, name="write-behind", coalesce_window=DEFAULT_WINDOW, max_pending=DEFAULT_MAX_PENDING):
+        self.name = name
+        self.coalesce_window = coalesce_window
+        self.max_pending = max_pending
+        self._pending = OrderedDict()  # path -> _Pending, urut titip pertama
+        self._writing = None
+        self._flush_all = False
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = None
+        self._results = {
+            result: WRITE_BEHIND_WRITES.labels(result)
+            for result in ("written", "coalesced", "error", "sync")
+        }
+
+    def start(self):
+        with self._cond:
+            if self._thread is None or not self._thread.is_alive():
+                self._closed = False
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+
+    def pending(self):
+        with self._cond:
+            return len(self._pending) + (1 if self._writing else 0)
+
+    def write(self, path, data, timer=None, on_written=None):
+        """Titipkan isi file untuk ditulis di background; isi lama yang belum ditulis diganti
+
+        on_written dipanggil (di thread writer) setelah isi ini, atau isi yang
+        menggantikannya, sudah tersimpan di disk.
+        """
+        with self._cond:
+            if self._closed:
+                # Sudah ditutup (aplikasi keluar): tulis langsung agar tidak hilang
+                sync = True
+            else:
+                sync = False
+                entry = self._pending.get(path)
+                if entry is not None:
+                    # Jendela tidak diperpanjang: isi terakhir tetap ditulis paling lambat first + window
+                    entry.data = data
+                    entry.timer = timer or entry.timer
+                    if on_written is not None:
+                        entry.callbacks.append(on_written)
+                    self._results["coalesced"].inc()
+                    return
+                # Antrean penuh: tunggu sampai ada path yang selesai ditulis (backpressure)
+                self._flush_all = self._flush_all or len(self._pending) >= self.max_pending
+                self._cond.notify_all()
+                while len(self._pending) >= self.max_pending and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    sync = True
+                else:
+                    entry = _Pending(data, timer, time.monotonic(), self.coalesce_window)
+                    if on_written is not None:
+                        entry.callbacks.append(on_written)
+                    self._pending[path] = entry
+                    self._cond.notify_all()
+        if sync:
+            self._write(path, data, timer, time.monotonic(), [on_written] if on_written else [])
+            self._results["sync"].inc()
+            return
+        if self._thread is None:
+            self.start()
+
+    def flush(self, path=None, timeout=None):
+        """Tulis sekarang semua titipan (atau satu path) dan tunggu selesai; False jika timeout"""
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        with self._cond:
+            if path is not None and path in self._pending:
+                self._pending[path].due = 0
+            elif path is None:
+                self._flush_all = True
+            self._cond.notify_all()
+
+            def done():
+                if path is None:
+                    return not self._pending and self._writing is None
+                return path not in self._pending and self._writing != path
+
+            while not done():
+                if self._thread is None or not self._thread.is_alive():
+                    break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            if path is None:
+                self._flush_all = False
+            leftover = [(p, self._pending.pop(p)) for p in list(self._pending)
+                        if path is None or p == path] if not done() else []
+        # Thread writer tidak berjalan: tulis sisa titipan di thread pemanggil
+        for pending_path, entry in leftover:
+            self._write(pending_path, entry.data, entry.timer, entry.first, entry.callbacks)
+        return True
+
+    def close(self, timeout=5.0):
+        """Tulis semua titipan lalu hentikan thread (dipanggil saat aplikasi keluar)"""
+        flushed = self.flush(timeout=timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            thread = self._thread
+            self._thread = None
+        if thread is not None:
+            thread.join(timeout)
+        return flushed
+
+    def _next_due(self):
+        """Path berikutnya yang jatuh tempo, atau (None, detik tunggu); dipanggil dengan lock"""
+        now = time.monotonic()
+        earliest = None
+        for path, entry in self._pending.items():
+            if self._flush_all or entry.due <= now:
+                return path, 0
+            if earliest is None or entry.due < earliest:
+                earliest = entry.due
+        return None, (None if earliest is None else earliest - now)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    path, wait = self._next_due()
+                    if path is not None:
+                        break
+                    if self._closed:
+                        return
+                    self._cond.wait(wait)
+                entry = self._pending.pop(path)
+                self._writing = path
+                if not self._pending:
+                    self._flush_all = False
+                self._cond.notify_all()
+            self._write(path, entry.data, entry.timer, entry.first, entry.callbacks)
+            with self._cond:
+                self._writing = None
+                self._cond.notify_all()
+
+    def _write(self, path, data, timer, first, callbacks):
+        try:
+            if callable(data):
+                data = data()
+            started = time.perf_counter()
+            atomic_write(path, data)
+            elapsed = time.perf_counter() - started
+            WRITE_BEHIND_SECONDS.observe(elapsed)
+            if timer is not None:
+                timer.observe(elapsed)
+            WRITE_BEHIND_LAG_SECONDS.observe(time.monotonic() - first)
+            self._results["written"].inc()
+        except Exception as e:
+            self._results["error"].inc()
+            print(f"Error writing {path}: {str(e)}")
+            return
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"Error after writing {path}: {str(e)}")
+
+
+def get_write_behind():
+    """Writer bersama untuk aplikasi (dibuat sekali, ditutup saat proses keluar)"""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = WriteBehindQueue()
+            _writer.start()
+            gauge("tiket_write_behind_pending", "File yang menunggu ditulis write-behind", function=_writer.pending)
+            atexit.register(_writer.close)
+        return _writer